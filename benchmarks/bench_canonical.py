@@ -0,0 +1,127 @@
+"""
+Benchmark: canonical JSON serialization of large compositions.
+
+Compares the compiled single-pass serializer used by ``to_canonical`` with
+the previous ``model_dump`` + ``_add_types_recursive`` path on synthetic
+COMPOSITIONs holding an increasing number of ELEMENTs.
+
+Usage:
+    python benchmarks/bench_canonical.py [--elements 100 1000 5000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from oehrpy.rm import (
+    CLUSTER,
+    CODE_PHRASE,
+    COMPOSITION,
+    DV_CODED_TEXT,
+    DV_DATE_TIME,
+    DV_QUANTITY,
+    DV_TEXT,
+    ELEMENT,
+    EVENT_CONTEXT,
+    HISTORY,
+    ITEM_TREE,
+    OBSERVATION,
+    PARTY_IDENTIFIED,
+    POINT_EVENT,
+    TERMINOLOGY_ID,
+)
+from oehrpy.serialization.canonical import _to_canonical_via_model_dump, to_canonical
+
+
+def _code(terminology: str, code: str) -> CODE_PHRASE:
+    return CODE_PHRASE(terminology_id=TERMINOLOGY_ID(value=terminology), code_string=code)
+
+
+def build_composition(element_count: int) -> COMPOSITION:
+    """Build a COMPOSITION with ``element_count`` DV_QUANTITY ELEMENTs."""
+    elements = [
+        ELEMENT(
+            archetype_node_id=f"at{i:04d}",
+            name=DV_TEXT(value=f"Element {i}"),
+            value=DV_QUANTITY(magnitude=float(i), units="mm[Hg]", property=_code("openehr", "382")),
+        )
+        for i in range(element_count)
+    ]
+    # Group elements into clusters of 10 to get a realistic nesting depth
+    clusters = [
+        CLUSTER(
+            archetype_node_id="openEHR-EHR-CLUSTER.bench.v1",
+            name=DV_TEXT(value=f"Cluster {i}"),
+            items=elements[i : i + 10],
+        )
+        for i in range(0, element_count, 10)
+    ]
+    observation = OBSERVATION(
+        archetype_node_id="openEHR-EHR-OBSERVATION.bench.v1",
+        name=DV_TEXT(value="Benchmark"),
+        language=_code("ISO_639-1", "en"),
+        encoding=_code("IANA_character-sets", "UTF-8"),
+        subject={"_type": "PARTY_SELF"},
+        data=HISTORY(
+            archetype_node_id="at0001",
+            name=DV_TEXT(value="History"),
+            origin=DV_DATE_TIME(value="2024-01-01T00:00:00Z"),
+            events=[
+                POINT_EVENT(
+                    archetype_node_id="at0002",
+                    name=DV_TEXT(value="Any event"),
+                    time=DV_DATE_TIME(value="2024-01-01T00:00:00Z"),
+                    data=ITEM_TREE(
+                        archetype_node_id="at0003",
+                        name=DV_TEXT(value="Tree"),
+                        items=clusters,
+                    ),
+                )
+            ],
+        ),
+    )
+    return COMPOSITION(
+        archetype_node_id="openEHR-EHR-COMPOSITION.encounter.v1",
+        name=DV_TEXT(value="Benchmark composition"),
+        language=_code("ISO_639-1", "en"),
+        territory=_code("ISO_3166-1", "US"),
+        category=DV_CODED_TEXT(value="event", defining_code=_code("openehr", "433")),
+        composer=PARTY_IDENTIFIED(name="Dr. Bench"),
+        context=EVENT_CONTEXT(
+            start_time=DV_DATE_TIME(value="2024-01-01T00:00:00Z"),
+            setting=DV_CODED_TEXT(value="other care", defining_code=_code("openehr", "238")),
+        ),
+        content=[observation],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--elements", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'elements':>10} {'model_dump (ms)':>16} {'compiled (ms)':>14} {'speedup':>8}")
+    for count in args.elements:
+        composition = build_composition(count)
+        assert to_canonical(composition) == _to_canonical_via_model_dump(composition)
+
+        legacy = min(
+            timeit.repeat(
+                lambda c=composition: _to_canonical_via_model_dump(c),
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        compiled = min(
+            timeit.repeat(lambda c=composition: to_canonical(c), number=1, repeat=args.repeat)
+        )
+        print(
+            f"{count:>10} {legacy * 1000:>16.2f} {compiled * 1000:>14.2f} "
+            f"{legacy / compiled:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: encoding CONTRIBUTION request bodies.
+
+Compares ``json.dumps(ContributionBuilder(...).build())``, which builds the
+audit and lifecycle dicts for every version, with ``build_json()`` on a
+shared precompiled ``ContributionTemplate``, for contributions of an
+increasing number of small FLAT-sized compositions.
+
+Usage:
+    python benchmarks/bench_contribution.py [--versions 1 10 100] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from typing import Any
+
+from oehrpy.client import ContributionBuilder, ContributionTemplate
+
+SYSTEM_ID = "bench.example.org"
+
+
+def build_composition(i: int) -> dict[str, Any]:
+    """Build a small CANONICAL COMPOSITION-like dict."""
+    return {
+        "_type": "COMPOSITION",
+        "name": {"_type": "DV_TEXT", "value": f"Vitals {i}"},
+        "archetype_node_id": "openEHR-EHR-COMPOSITION.encounter.v1",
+        "content": [
+            {
+                "_type": "ELEMENT",
+                "archetype_node_id": "at0004",
+                "value": {"_type": "DV_QUANTITY", "magnitude": 120.0 + i, "units": "mm[Hg]"},
+            }
+        ],
+    }
+
+
+def legacy(compositions: list[dict[str, Any]]) -> bytes:
+    builder = ContributionBuilder(system_id=SYSTEM_ID)
+    for composition in compositions:
+        builder.add_creation(composition)
+    builder.set_audit(committer="loader")
+    return json.dumps(builder.build(), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def templated(template: ContributionTemplate, compositions: list[dict[str, Any]]) -> bytes:
+    builder = ContributionBuilder(template=template)
+    for composition in compositions:
+        builder.add_creation(composition)
+    return builder.build_json()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--versions", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    template = ContributionTemplate(SYSTEM_ID, committer="loader")
+    print(f"{'versions':>10} {'dict+dumps (us)':>16} {'template (us)':>14} {'speedup':>8}")
+    for count in args.versions:
+        compositions = [build_composition(i) for i in range(count)]
+        assert len(json.loads(templated(template, compositions))["versions"]) == count
+
+        per_call = 1e6 / args.number
+        before = min(
+            timeit.repeat(lambda c=compositions: legacy(c), number=args.number, repeat=args.repeat)
+        )
+        after = min(
+            timeit.repeat(
+                lambda c=compositions: templated(template, c),
+                number=args.number,
+                repeat=args.repeat,
+            )
+        )
+        print(
+            f"{count:>10} {before * per_call:>16.1f} {after * per_call:>14.1f} "
+            f"{before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: FLAT composition validation throughput.
+
+Compares validating against a compiled, cached ``ValidationIndex`` (what
+``FlatValidator`` does) with compiling the template for every composition
+(what ``validate_composition`` did before the index was cached), on a
+synthetic Web Template with about 1,000 nodes, then the throughput of
+``FlatValidator.validate_many`` with an increasing number of worker processes.
+
+Usage:
+    python benchmarks/bench_flat_validation.py [--nodes 1000] [--invalid 0 10] [--seconds 2]
+        [--batch 2000] [--workers 1 2 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from oehrpy.validation import FlatValidator, ValidationResult, parse_web_template
+from oehrpy.validation.index import _compile
+from oehrpy.validation.path_checker import validate_with_index
+
+LEAF_TYPES = ("DV_QUANTITY", "DV_CODED_TEXT", "DV_TEXT", "DV_DATE_TIME", "DV_COUNT")
+
+
+def _node(
+    node_id: str, rm_type: str, children: list[dict[str, Any]] | None = None
+) -> dict[str, Any]:
+    return {"id": node_id, "name": node_id, "rmType": rm_type, "children": children or []}
+
+
+def build_web_template(node_count: int) -> dict[str, Any]:
+    """Build a Web Template with about ``node_count`` nodes.
+
+    Observations hold clusters of ten elements of mixed data types.
+    """
+    context = _node(
+        "context",
+        "EVENT_CONTEXT",
+        [_node("start_time", "DV_DATE_TIME"), _node("setting", "DV_CODED_TEXT")],
+    )
+    children = [
+        _node("category", "DV_CODED_TEXT"),
+        _node("language", "CODE_PHRASE"),
+        _node("territory", "CODE_PHRASE"),
+        _node("composer", "PARTY_IDENTIFIED"),
+        context,
+    ]
+    count = 8
+    o = 0
+    while count < node_count:
+        clusters = []
+        for c in range(5):
+            elements = [
+                _node(f"element_{o}_{c}_{e}", LEAF_TYPES[e % len(LEAF_TYPES)]) for e in range(10)
+            ]
+            clusters.append(_node(f"cluster_{c}", "CLUSTER", elements))
+        children.append(_node(f"observation_{o}", "OBSERVATION", clusters))
+        count += 56
+        o += 1
+    tree = _node("bench", "COMPOSITION", children)
+    return {"templateId": "bench.v1", "tree": tree}
+
+
+def build_flat(validator: FlatValidator, invalid: int) -> dict[str, object]:
+    """A FLAT composition using every fifth valid path plus some misspelled keys."""
+    flat: dict[str, object] = dict.fromkeys(validator.valid_paths[::5], "x")
+    elements = [path for path in validator.valid_paths if "/element_" in path]
+    for path in elements[1 : 1 + invalid * 7 : 7]:
+        flat[path.replace("/element_", "/elemnt_")] = "x"
+    return flat
+
+
+def throughput(validate: Callable[[], ValidationResult], seconds: float) -> float:
+    """Validations per second over about ``seconds``."""
+    count = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        validate()
+        count += 1
+    return count / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--invalid", type=int, nargs="+", default=[0, 10])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--batch", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    parsed = parse_web_template(build_web_template(args.nodes))
+    validator = FlatValidator(parsed)
+    print(f"{len(parsed.nodes)} nodes, {len(validator.valid_paths)} valid paths")
+    print(
+        f"{'invalid keys':>12} {'compile per call (/s)':>22} "
+        f"{'compiled index (/s)':>20} {'speedup':>8}"
+    )
+    for invalid in args.invalid:
+        flat = build_flat(validator, invalid)
+        assert len(validator.validate(flat).errors) == invalid
+
+        uncached = throughput(
+            lambda f=flat: validate_with_index(f, _compile(parsed, "ehrbase")), args.seconds
+        )
+        cached = throughput(lambda f=flat: validator.validate(f), args.seconds)
+        print(f"{invalid:>12} {uncached:>22.1f} {cached:>20.1f} {cached / uncached:>7.1f}x")
+
+    flat = build_flat(validator, 1)
+    print(f"\nvalidate_many, {args.batch} compositions with one invalid key each")
+    print(f"{'workers':>12} {'validations/s':>22}")
+    for workers in args.workers:
+        start = time.perf_counter()
+        batch = validator.validate_many((flat for _ in range(args.batch)), workers=workers)
+        assert sum(1 for _ in batch) == args.batch
+        print(f"{workers:>12} {args.batch / (time.perf_counter() - start):>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
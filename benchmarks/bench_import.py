@@ -0,0 +1,59 @@
+"""
+Benchmark: cold-start import time of oehrpy entry points.
+
+Runs each import in a fresh interpreter with ``python -X importtime`` and
+reports the cumulative import time of the requested module, plus the cost
+of the first RM class access (which loads the generated RM models).
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS: dict[str, str] = {
+    "oehrpy": "import oehrpy",
+    "oehrpy.validation": "import oehrpy.validation",
+    "oehrpy.client": "import oehrpy.client",
+    "oehrpy.rm (first class)": "from oehrpy.rm import COMPOSITION",
+}
+
+
+def import_time_us(statement: str) -> int:
+    """Return the cumulative import time (µs) reported for a statement."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, module = line.split("|")
+        # Nested imports are indented below the top-level import that caused them
+        name = module[1:]
+        if cumulative_us.strip().isdigit() and not name.startswith(" "):
+            total += int(cumulative_us)
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'statement':<26} {'median (ms)':>12} {'min (ms)':>10}")
+    for label, statement in STATEMENTS.items():
+        samples = [import_time_us(statement) / 1000 for _ in range(args.repeat)]
+        print(f"{label:<26} {statistics.median(samples):>12.1f} {min(samples):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: "did you mean?" suggestions for misspelled FLAT paths.
+
+Compares ``suggest_path`` (difflib over every valid path) with a
+``PathSuggester`` trigram index on a synthetic Web Template with about
+20,000 valid paths, for paths with a single-character typo. Reports the
+time per lookup and how often both agree on the best suggestion and on
+all suggestions.
+
+Usage:
+    python benchmarks/bench_suggestions.py [--nodes 6200] [--queries 200] [--baseline 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from bench_flat_validation import build_web_template
+
+from oehrpy.validation import FlatValidator, parse_web_template
+from oehrpy.validation.suggestions import PathSuggester, suggest_path
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz_"
+
+
+def misspell(path: str, rng: random.Random) -> str:
+    """Delete, insert or replace one character of ``path``."""
+    i = rng.randrange(len(path))
+    edit = rng.randrange(3)
+    if edit == 0:
+        return path[:i] + path[i + 1 :]
+    if edit == 1:
+        return path[:i] + rng.choice(ALPHABET) + path[i:]
+    return path[:i] + rng.choice(ALPHABET) + path[i + 1 :]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=6200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument(
+        "--baseline", type=int, default=10, help="queries also run through difflib (slow)"
+    )
+    args = parser.parse_args()
+
+    paths = FlatValidator(parse_web_template(build_web_template(args.nodes))).valid_paths
+    valid = set(paths)
+    rng = random.Random(42)
+    queries: list[str] = []
+    while len(queries) < args.queries:
+        query = misspell(rng.choice(paths), rng)
+        if query not in valid:
+            queries.append(query)
+
+    start = time.perf_counter()
+    suggester = PathSuggester(paths)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [suggester._suggest(q, 3, 0.4) for q in queries]
+    per_lookup = (time.perf_counter() - start) / len(queries)
+
+    sample = queries[: args.baseline]
+    start = time.perf_counter()
+    expected = [suggest_path(q, paths) for q in sample]
+    baseline = (time.perf_counter() - start) / len(sample)
+
+    top1 = sum(a[:1] == b[:1] for a, b in zip(indexed, expected, strict=False))
+    same = sum(a == b for a, b in zip(indexed, expected, strict=False))
+    print(f"{len(paths)} valid paths, index built in {build * 1000:.0f} ms")
+    print(f"{'difflib':>10}: {baseline * 1000:>9.2f} ms/lookup")
+    print(
+        f"{'indexed':>10}: {per_lookup * 1000:>9.2f} ms/lookup ({baseline / per_lookup:.0f}x), "
+        f"same best suggestion {top1}/{len(sample)}, same list {same}/{len(sample)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: unflattening large FLAT compositions.
+
+Compares ``unflatten_dict`` with the previous implementation, which split
+and regex-matched every segment of every key and grew lists one item at a
+time, on synthetic FLAT compositions of increasing size.
+
+Usage:
+    python benchmarks/bench_unflatten.py [--keys 1000 10000 100000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import timeit
+from typing import Any
+
+from oehrpy.serialization.flat import unflatten_dict
+
+
+def unflatten_dict_reference(data: dict[str, Any]) -> dict[str, Any]:
+    """The previous ``unflatten_dict`` implementation, kept as a baseline."""
+    result: dict[str, Any] = {}
+
+    for path, value in data.items():
+        parts = path.replace("|", "/").split("/")
+        current = result
+
+        for part in parts[:-1]:
+            match = re.match(r"^(.+):(\d+)$", part)
+            if match:
+                name, idx = match.group(1), int(match.group(2))
+                if name not in current:
+                    current[name] = []
+                while len(current[name]) <= idx:
+                    current[name].append({})
+                current = current[name][idx]
+            else:
+                if part not in current:
+                    current[part] = {}
+                current = current[part]
+
+        final_key = parts[-1]
+        match = re.match(r"^(.+):(\d+)$", final_key)
+        if match:
+            name, idx = match.group(1), int(match.group(2))
+            if name not in current:
+                current[name] = []
+            while len(current[name]) <= idx:
+                current[name].append(None)
+            current[name][idx] = value
+        else:
+            current[final_key] = value
+
+    return result
+
+
+def build_flat(key_count: int) -> dict[str, Any]:
+    """Build a FLAT composition with roughly ``key_count`` keys."""
+    flat: dict[str, Any] = {
+        "vital_signs/language|code": "en",
+        "vital_signs/language|terminology": "ISO_639-1",
+        "vital_signs/territory|code": "US",
+        "vital_signs/territory|terminology": "ISO_3166-1",
+    }
+    # Eight keys per event, ten events per observation
+    for i in range((key_count - len(flat)) // 8):
+        prefix = f"vital_signs/blood_pressure:{i // 10}/any_event:{i % 10}"
+        flat[f"{prefix}/systolic|magnitude"] = 120 + i % 40
+        flat[f"{prefix}/systolic|unit"] = "mm[Hg]"
+        flat[f"{prefix}/diastolic|magnitude"] = 80 + i % 20
+        flat[f"{prefix}/diastolic|unit"] = "mm[Hg]"
+        flat[f"{prefix}/position|code"] = "at1001"
+        flat[f"{prefix}/position|value"] = "Sitting"
+        flat[f"{prefix}/position|terminology"] = "local"
+        flat[f"{prefix}/time"] = "2024-01-01T00:00:00Z"
+    return flat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'keys':>10} {'reference (ms)':>15} {'trie (ms)':>10} {'speedup':>8}")
+    for count in args.keys:
+        flat = build_flat(count)
+        assert unflatten_dict(flat) == unflatten_dict_reference(flat)
+
+        reference = min(
+            timeit.repeat(lambda f=flat: unflatten_dict_reference(f), number=1, repeat=args.repeat)
+        )
+        trie = min(timeit.repeat(lambda f=flat: unflatten_dict(f), number=1, repeat=args.repeat))
+        print(
+            f"{len(flat):>10} {reference * 1000:>15.2f} {trie * 1000:>10.2f} "
+            f"{reference / trie:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
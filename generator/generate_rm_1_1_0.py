@@ -146,8 +146,9 @@ class SimpleRMGenerator:
                 # Optional field
                 f.write(f"    {prop_name}: {py_type} = None\n")
 
-        # Add model config
-        f.write("\n    model_config = ConfigDict(populate_by_name=True)\n")
+        # Add model config. Schema building is deferred to first use so that
+        # importing the module does not pay for all ~134 models up front.
+        f.write("\n    model_config = ConfigDict(populate_by_name=True, defer_build=True)\n")
 
     def generate(self, output_file: Path) -> None:
         """Generate all RM classes to a single file."""
@@ -172,20 +173,6 @@ class SimpleRMGenerator:
             for definition in sorted_defs:
                 self._write_class(f, definition)
 
-            # Add model_rebuild calls to resolve forward references
-            f.write("\n\n# Rebuild all models to resolve forward references\n")
-            f.write("import sys as _sys\n")
-            f.write("_module = _sys.modules[__name__]\n")
-            f.write("for _name in dir(_module):\n")
-            f.write("    _obj = getattr(_module, _name)\n")
-            f.write(
-                "    if isinstance(_obj, type) and issubclass(_obj, BaseModel) and _obj is not BaseModel:\n"
-            )
-            f.write("        try:\n")
-            f.write("            _obj.model_rebuild()\n")
-            f.write("        except Exception:\n")
-            f.write("            pass  # Skip if rebuild fails\n")
-
         print(f"✓ Generated {len(self.definitions)} classes")
 
 
@@ -0,0 +1,131 @@
+"""Incremental decoding of JSON text that arrives in chunks.
+
+:class:`JSONStreamBuffer` is the I/O-free core shared by the streaming
+readers (:func:`oehrpy.serialization.iter_flat` and the streamed AQL result
+rows of the client). The reader feeds it text as it arrives and asks for one
+value at a time. The buffer tracks nesting depth and string state across
+feeds, so it finds where each value ends by scanning every character once,
+then decodes the value with a single ``raw_decode`` call. Consumed text is
+dropped from the buffer on the next feed, so memory use is bounded by the
+chunk size plus the largest value.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+_JSON_WHITESPACE = " \t\n\r"
+_SCALAR_END_RE = re.compile(r"[ \t\n\r,\]}]")
+_STRING_SPECIAL_RE = re.compile(r'["\\]')
+_NESTING_RE = re.compile(r'["\[\]{}]')
+
+
+class JSONStreamBuffer:
+    """Buffer of JSON text, decoded value by value as more text is fed."""
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        # Number of characters dropped from the front of the buffer
+        self._offset = 0
+        # Scan state of the value at _pos: resume index (-1: not started),
+        # nesting depth and whether the scan is inside a string
+        self._scan = -1
+        self._depth = 0
+        self._in_string = False
+
+    @property
+    def offset(self) -> int:
+        """Stream offset (in characters) of the next unconsumed character."""
+        return self._offset + self._pos
+
+    def feed(self, text: str) -> None:
+        """Append text, dropping the consumed prefix of the buffer."""
+        self._buf = self._buf[self._pos :] + text
+        self._offset += self._pos
+        if self._scan >= 0:
+            self._scan -= self._pos
+        self._pos = 0
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or "" if more text is needed."""
+        buf = self._buf
+        pos = self._pos
+        while pos < len(buf) and buf[pos] in _JSON_WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else ""
+
+    def advance(self) -> None:
+        """Consume the character returned by :meth:`peek`."""
+        self._pos += 1
+
+    def value_complete(self) -> bool:
+        """Whether the buffer holds the whole JSON value that starts at the next character.
+
+        Call after :meth:`peek` returned a character. Numbers and literals
+        are only complete once a delimiter follows, so at the end of the
+        stream, decode without waiting for this to become True.
+        """
+        buf = self._buf
+        if self._scan < 0:
+            if buf[self._pos] not in '"{[':
+                return _SCALAR_END_RE.search(buf, self._pos) is not None
+            self._scan = self._pos
+            self._depth = 0
+            self._in_string = False
+
+        i = self._scan
+        depth = self._depth
+        in_string = self._in_string
+        while True:
+            if in_string:
+                match = _STRING_SPECIAL_RE.search(buf, i)
+                if match is None:
+                    i = len(buf)
+                    break
+                i = match.end()
+                if match.group() == "\\":
+                    if i == len(buf):
+                        # Resume at the backslash once the escaped character arrives
+                        i -= 1
+                        break
+                    i += 1
+                    continue
+                in_string = False
+            else:
+                match = _NESTING_RE.search(buf, i)
+                if match is None:
+                    i = len(buf)
+                    break
+                i = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = True
+                    continue
+                depth += 1 if char in "[{" else -1
+            if depth <= 0:
+                self._scan = -1
+                return True
+
+        self._scan = i
+        self._depth = depth
+        self._in_string = in_string
+        return False
+
+    def decode(self) -> Any:
+        """Decode and consume the JSON value that starts at the next character.
+
+        Raises:
+            json.JSONDecodeError: If the text is not valid JSON; ``pos`` is
+                the stream offset of the error.
+        """
+        self._scan = -1
+        try:
+            value, self._pos = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError as exc:
+            raise json.JSONDecodeError(exc.msg, exc.doc, self._offset + exc.pos) from None
+        return value
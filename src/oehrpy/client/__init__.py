@@ -1,14 +1,28 @@
 """
 REST client for EHRBase and openEHR CDR servers.
 
-This module provides async HTTP clients for interacting with
-openEHR Clinical Data Repositories.
+This module provides async and synchronous HTTP clients for interacting
+with openEHR Clinical Data Repositories.
 """
 
-from .contribution import ContributionBuilder
+from .bulk import (
+    BulkCompositionItem,
+    BulkCompositionResult,
+    BulkCompositionUpload,
+    BulkUploadStats,
+    ContributionBatchStats,
+    ContributionBatchUpload,
+    ContributionChange,
+    ContributionChunk,
+    ContributionChunker,
+    ContributionChunkResult,
+)
+from .contribution import ContributionBuilder, ContributionTemplate
 from .ehrbase import (
     AuthenticationError,
     CDRType,
+    CircuitBreakerPolicy,
+    CircuitOpenError,
     CompositionFormat,
     CompositionResponse,
     CompositionVersionResponse,
@@ -20,26 +34,76 @@ from .ehrbase import (
     NotFoundError,
     PreconditionFailedError,
     QueryResponse,
+    RetryPolicy,
     TemplateResponse,
     ValidationError,
     VersionedCompositionResponse,
+    create_transport,
+)
+from .limits import AdaptiveConcurrency, OperationClass, RequestLimit
+from .metrics import ClientHooks, Histogram, MetricsCollector, RequestEvent
+from .streaming import QueryStream
+from .sync import (
+    SyncBulkCompositionUpload,
+    SyncContributionBatchUpload,
+    SyncEHRBaseClient,
+    SyncQueryStream,
+    create_sync_transport,
+)
+from .template_cache import (
+    CachedWebTemplate,
+    DiskWebTemplateCache,
+    MemoryWebTemplateCache,
+    WebTemplateCache,
 )
 
 __all__ = [
     "CDRType",
     "EHRBaseClient",
     "EHRBaseConfig",
+    "SyncEHRBaseClient",
+    "RetryPolicy",
+    "CircuitBreakerPolicy",
+    "OperationClass",
+    "RequestLimit",
+    "AdaptiveConcurrency",
+    "ClientHooks",
+    "RequestEvent",
+    "MetricsCollector",
+    "Histogram",
+    "create_transport",
+    "create_sync_transport",
     "EHRResponse",
     "CompositionResponse",
     "CompositionFormat",
     "CompositionVersionResponse",
+    "BulkCompositionItem",
+    "BulkCompositionResult",
+    "BulkCompositionUpload",
+    "BulkUploadStats",
+    "SyncBulkCompositionUpload",
     "ContributionBuilder",
+    "ContributionTemplate",
+    "ContributionChange",
+    "ContributionChunk",
+    "ContributionChunker",
+    "ContributionChunkResult",
+    "ContributionBatchStats",
+    "ContributionBatchUpload",
+    "SyncContributionBatchUpload",
     "ContributionResponse",
     "QueryResponse",
+    "QueryStream",
+    "SyncQueryStream",
     "TemplateResponse",
+    "CachedWebTemplate",
+    "WebTemplateCache",
+    "MemoryWebTemplateCache",
+    "DiskWebTemplateCache",
     "VersionedCompositionResponse",
     "EHRBaseError",
     "AuthenticationError",
+    "CircuitOpenError",
     "NotFoundError",
     "PreconditionFailedError",
     "ValidationError",
@@ -0,0 +1,550 @@
+"""Bulk composition and contribution uploads with bounded concurrency.
+
+:meth:`EHRBaseClient.create_compositions_bulk` creates many compositions
+concurrently without loading the whole input: items are pulled from the
+(async) iterable only when a request slot is free, and results are yielded
+as requests complete. Server-side rejections are returned as failed results
+instead of aborting the batch.
+
+:meth:`EHRBaseClient.create_contributions_batched` does the same for a stream
+of version changes, grouping the changes of each EHR into contributions of
+bounded size so that a failure only rolls back one chunk.
+
+Example::
+
+    items = ((ehr_id, flat, "IDCR - Vital Signs Encounter.v1", "FLAT") for ehr_id, flat in rows)
+    upload = client.create_compositions_bulk(items, max_concurrency=32)
+    async for result in upload:
+        if not result.ok:
+            print(f"item {result.index} failed: {result.error}")
+    print(f"{upload.stats.throughput:.1f} compositions/s")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+)
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import httpx
+
+from .contribution import ContributionBuilder, ContributionTemplate, _json
+from .ehrbase import CompositionFormat, CompositionResponse, ContributionResponse, EHRBaseError
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BulkCompositionItem:
+    """One composition to create in a bulk upload.
+
+    Plain ``(ehr_id, composition, template_id, format)`` tuples are accepted
+    wherever items are expected; trailing fields may be omitted.
+    """
+
+    ehr_id: str
+    composition: dict[str, Any]
+    template_id: str | None = None
+    format: str | CompositionFormat = CompositionFormat.FLAT
+
+    @classmethod
+    def coerce(cls, item: BulkCompositionItem | tuple[Any, ...]) -> BulkCompositionItem:
+        """Return ``item`` as a BulkCompositionItem."""
+        if isinstance(item, BulkCompositionItem):
+            return item
+        return cls(*item)
+
+
+@dataclass
+class BulkCompositionResult:
+    """Outcome of one item of a bulk upload."""
+
+    index: int
+    item: BulkCompositionItem
+    response: CompositionResponse | None = None
+    error: Exception | None = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the composition was created."""
+        return self.error is None
+
+
+@dataclass
+class BulkUploadStats:
+    """Running totals of a bulk upload, updated as results are yielded."""
+
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        """Number of items that have finished, successfully or not."""
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Completed items per second."""
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+async def _aiter(items: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def _next_item(iterator: AsyncIterator[T]) -> tuple[bool, T | None]:
+    try:
+        return True, await iterator.__anext__()
+    except StopAsyncIteration:
+        return False, None
+
+
+async def _bounded_map(
+    items: Iterable[T] | AsyncIterable[T],
+    worker: Callable[[int, T], Awaitable[R]],
+    max_concurrency: int,
+) -> AsyncGenerator[R, None]:
+    """Run ``worker(index, item)`` for each item, yielding results as they complete.
+
+    At most ``max_concurrency`` workers run at once, and the next item is
+    only pulled from ``items`` when a worker slot is free. Unfinished workers
+    are cancelled if the caller stops iterating early.
+    """
+    if max_concurrency < 1:
+        msg = f"max_concurrency must be at least 1, got {max_concurrency}"
+        raise ValueError(msg)
+
+    iterator = _aiter(items)
+    running: set[asyncio.Future[R]] = set()
+    pulling: asyncio.Future[tuple[bool, T | None]] | None = None
+    exhausted = False
+    index = 0
+    try:
+        while True:
+            if pulling is None and not exhausted and len(running) < max_concurrency:
+                pulling = asyncio.ensure_future(_next_item(iterator))
+            waiting: set[asyncio.Future[Any]] = set(running)
+            if pulling is not None:
+                waiting.add(pulling)
+            if not waiting:
+                return
+
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if pulling is not None and pulling in done:
+                has_item, item = pulling.result()
+                pulling = None
+                if has_item:
+                    running.add(asyncio.ensure_future(worker(index, item)))  # type: ignore[arg-type]
+                    index += 1
+                else:
+                    exhausted = True
+            for future in done:
+                if future in running:
+                    running.discard(future)
+                    yield future.result()
+    finally:
+        pending: list[asyncio.Future[Any]] = list(running)
+        if pulling is not None:
+            pending.append(pulling)
+        for future in pending:
+            future.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+class BulkCompositionUpload:
+    """Async iterable of the results of a bulk composition upload.
+
+    Created by :meth:`EHRBaseClient.create_compositions_bulk`; requests start
+    when iteration starts. ``stats`` is updated as results are yielded. Call
+    :meth:`aclose` after leaving the loop early to cancel in-flight requests
+    immediately rather than when the iterator is garbage collected.
+    """
+
+    def __init__(
+        self,
+        create: Callable[..., Awaitable[CompositionResponse]],
+        items: Iterable[BulkCompositionItem | tuple[Any, ...]]
+        | AsyncIterable[BulkCompositionItem | tuple[Any, ...]],
+        max_concurrency: int,
+    ) -> None:
+        if max_concurrency < 1:
+            msg = f"max_concurrency must be at least 1, got {max_concurrency}"
+            raise ValueError(msg)
+        self._create = create
+        self._items = items
+        self._max_concurrency = max_concurrency
+        self._results: AsyncGenerator[BulkCompositionResult, None] | None = None
+        self.stats = BulkUploadStats()
+
+    def __aiter__(self) -> AsyncIterator[BulkCompositionResult]:
+        if self._results is not None:
+            raise RuntimeError("A bulk upload can only be iterated once")
+        self._results = self._run()
+        return self._results
+
+    async def aclose(self) -> None:
+        """Stop the upload, cancelling requests that are still in flight."""
+        if self._results is not None:
+            await self._results.aclose()
+
+    async def _run(self) -> AsyncGenerator[BulkCompositionResult, None]:
+        start = time.perf_counter()
+        results = _bounded_map(self._items, self._upload, self._max_concurrency)
+        try:
+            async for result in results:
+                if result.ok:
+                    self.stats.succeeded += 1
+                else:
+                    self.stats.failed += 1
+                self.stats.elapsed = time.perf_counter() - start
+                yield result
+        finally:
+            await results.aclose()
+            self.stats.elapsed = time.perf_counter() - start
+
+    async def _upload(
+        self, index: int, item: BulkCompositionItem | tuple[Any, ...]
+    ) -> BulkCompositionResult:
+        item = BulkCompositionItem.coerce(item)
+        self.stats.submitted += 1
+        start = time.perf_counter()
+        try:
+            response = await self._create(
+                ehr_id=item.ehr_id,
+                composition=item.composition,
+                template_id=item.template_id,
+                format=item.format,
+            )
+        except (EHRBaseError, httpx.HTTPError) as exc:
+            return BulkCompositionResult(
+                index, item, error=exc, duration=time.perf_counter() - start
+            )
+        return BulkCompositionResult(
+            index, item, response=response, duration=time.perf_counter() - start
+        )
+
+
+# Size of an ORIGINAL_VERSION wrapper (audit, lifecycle state, preceding
+# version UID) around a composition, in serialized bytes
+_VERSION_OVERHEAD = 600
+
+
+@dataclass
+class ContributionChange:
+    """One version to commit in a batched contribution upload.
+
+    ``change_type`` is ``"creation"``, ``"amendment"``, ``"modification"``
+    or ``"deleted"``; all but creations need ``preceding_version_uid``, and
+    all but deletions need a CANONICAL ``composition``.
+    """
+
+    ehr_id: str
+    change_type: str = "creation"
+    composition: dict[str, Any] | None = None
+    preceding_version_uid: str | None = None
+    lifecycle_state: str = "complete"
+    description: str | None = None
+    # The composition as JSON, encoded by estimated_size and reused by add_to
+    _encoded: bytes | None = field(default=None, init=False, repr=False, compare=False)
+
+    def add_to(self, builder: ContributionBuilder) -> None:
+        """Add this change as a version to a ContributionBuilder."""
+        if self.change_type == "creation":
+            builder.add_creation(
+                _require(self.composition, self),
+                lifecycle_state=self.lifecycle_state,
+                description=self.description,
+                encoded=self._encoded,
+            )
+        elif self.change_type in ("amendment", "modification"):
+            add = (
+                builder.add_amendment
+                if self.change_type == "amendment"
+                else builder.add_modification
+            )
+            add(
+                _require(self.preceding_version_uid, self),
+                _require(self.composition, self),
+                lifecycle_state=self.lifecycle_state,
+                description=self.description,
+                encoded=self._encoded,
+            )
+        elif self.change_type == "deleted":
+            builder.add_deletion(
+                _require(self.preceding_version_uid, self), description=self.description
+            )
+        else:
+            msg = f"Unknown change_type {self.change_type!r}"
+            raise ValueError(msg)
+
+    def estimated_size(self) -> int:
+        """Estimated size of this version in the request body, in bytes.
+
+        Encodes the composition once; building the request body reuses it.
+        """
+        if self.composition is None:
+            return _VERSION_OVERHEAD
+        if self._encoded is None:
+            self._encoded = _json(self.composition)
+        return _VERSION_OVERHEAD + len(self._encoded)
+
+
+def _require(value: T | None, change: ContributionChange) -> T:
+    if value is None:
+        msg = f"A {change.change_type!r} change is missing a composition or preceding version UID"
+        raise ValueError(msg)
+    return value
+
+
+@dataclass
+class ContributionChunk:
+    """A group of changes to one EHR, committed as one contribution.
+
+    ``sequence`` numbers the chunks of each EHR; they are committed in that
+    order.
+    """
+
+    ehr_id: str
+    sequence: int
+    changes: list[ContributionChange]
+    size: int = 0
+
+    def build(
+        self,
+        system_id: str | None = None,
+        committer: str | None = None,
+        description: str | None = None,
+    ) -> dict[str, Any]:
+        """Build the CANONICAL CONTRIBUTION request body for this chunk."""
+        template = ContributionTemplate(system_id, committer=committer, description=description)
+        return self._builder(template).build()
+
+    def build_json(self, template: ContributionTemplate) -> bytes:
+        """Encode the request body for this chunk with a precompiled template."""
+        return self._builder(template).build_json()
+
+    def _builder(self, template: ContributionTemplate) -> ContributionBuilder:
+        builder = ContributionBuilder(template=template)
+        for change in self.changes:
+            change.add_to(builder)
+        return builder
+
+
+@dataclass
+class ContributionChunkResult:
+    """Outcome of one chunk of a batched contribution upload.
+
+    A chunk is ``skipped`` (and carries the earlier error) when a previous
+    chunk of the same EHR failed, since its changes may depend on it.
+    """
+
+    index: int
+    chunk: ContributionChunk
+    response: ContributionResponse | None = None
+    error: Exception | None = None
+    skipped: bool = False
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the chunk was committed."""
+        return self.error is None
+
+
+@dataclass
+class ContributionBatchStats(BulkUploadStats):
+    """Running totals of a batched contribution upload, counted in chunks."""
+
+    skipped: int = 0
+    versions_committed: int = 0
+
+
+class ContributionChunker:
+    """Groups a stream of changes into per-EHR contribution chunks.
+
+    Changes are buffered per EHR; a chunk is emitted once it holds
+    ``max_versions`` changes or adding the next change would exceed
+    ``max_bytes``. When more than ``max_open_ehrs`` EHRs have buffered
+    changes, the least recently extended chunk is emitted early, which
+    bounds memory for inputs that interleave many EHRs.
+
+    Args:
+        max_versions: Maximum number of versions per contribution.
+        max_bytes: Maximum estimated request body size, or None. A single
+            version larger than this is sent on its own.
+        max_open_ehrs: Maximum number of EHRs with buffered changes.
+    """
+
+    def __init__(
+        self, max_versions: int = 100, max_bytes: int | None = None, max_open_ehrs: int = 1000
+    ) -> None:
+        if max_versions < 1 or max_open_ehrs < 1:
+            msg = (
+                "max_versions and max_open_ehrs must be at least 1, "
+                f"got {max_versions} and {max_open_ehrs}"
+            )
+            raise ValueError(msg)
+        self.max_versions = max_versions
+        self.max_bytes = max_bytes
+        self.max_open_ehrs = max_open_ehrs
+        self._open: OrderedDict[str, ContributionChunk] = OrderedDict()
+        self._sequences: dict[str, int] = {}
+
+    def add(self, change: ContributionChange) -> list[ContributionChunk]:
+        """Buffer a change and return the chunks that are complete."""
+        ready: list[ContributionChunk] = []
+        size = change.estimated_size() if self.max_bytes is not None else 0
+        chunk = self._open.get(change.ehr_id)
+        if chunk is not None and self.max_bytes is not None and chunk.size + size > self.max_bytes:
+            ready.append(self._close(change.ehr_id))
+            chunk = None
+        if chunk is None:
+            chunk = self._open[change.ehr_id] = ContributionChunk(change.ehr_id, 0, [])
+            if len(self._open) > self.max_open_ehrs:
+                ready.append(self._close(next(iter(self._open))))
+        else:
+            self._open.move_to_end(change.ehr_id)
+        chunk.changes.append(change)
+        chunk.size += size
+        if len(chunk.changes) >= self.max_versions:
+            ready.append(self._close(change.ehr_id))
+        return ready
+
+    def flush(self) -> list[ContributionChunk]:
+        """Return all buffered changes as chunks."""
+        return [self._close(ehr_id) for ehr_id in list(self._open)]
+
+    def _close(self, ehr_id: str) -> ContributionChunk:
+        chunk = self._open.pop(ehr_id)
+        chunk.sequence = self._sequences.get(ehr_id, 0)
+        self._sequences[ehr_id] = chunk.sequence + 1
+        return chunk
+
+
+class _EHRTurn:
+    """Per-EHR commit order of a batched contribution upload."""
+
+    def __init__(self) -> None:
+        self.next = 0
+        self.error: Exception | None = None
+        self.condition = asyncio.Condition()
+
+
+class ContributionBatchUpload:
+    """Async iterable of the per-chunk outcomes of a batched contribution upload.
+
+    Created by :meth:`EHRBaseClient.create_contributions_batched`; requests
+    start when iteration starts. Chunks of different EHRs are committed
+    concurrently, chunks of the same EHR one after another in input order.
+    """
+
+    def __init__(
+        self,
+        create: Callable[[str, bytes], Awaitable[ContributionResponse]],
+        changes: Iterable[ContributionChange] | AsyncIterable[ContributionChange],
+        chunker: ContributionChunker,
+        max_concurrency: int,
+        *,
+        system_id: str | None = None,
+        committer: str | None = None,
+        description: str | None = None,
+    ) -> None:
+        if max_concurrency < 1:
+            msg = f"max_concurrency must be at least 1, got {max_concurrency}"
+            raise ValueError(msg)
+        self._create = create
+        self._changes = changes
+        self._chunker = chunker
+        self._max_concurrency = max_concurrency
+        self._template = ContributionTemplate(
+            system_id, committer=committer, description=description
+        )
+        self._turns: dict[str, _EHRTurn] = {}
+        self._results: AsyncGenerator[ContributionChunkResult, None] | None = None
+        self.stats = ContributionBatchStats()
+
+    def __aiter__(self) -> AsyncIterator[ContributionChunkResult]:
+        if self._results is not None:
+            raise RuntimeError("A batched upload can only be iterated once")
+        self._results = self._run()
+        return self._results
+
+    async def aclose(self) -> None:
+        """Stop the upload, cancelling requests that are still in flight."""
+        if self._results is not None:
+            await self._results.aclose()
+
+    async def _chunks(self) -> AsyncIterator[ContributionChunk]:
+        async for change in _aiter(self._changes):
+            for chunk in self._chunker.add(change):
+                yield chunk
+        for chunk in self._chunker.flush():
+            yield chunk
+
+    async def _run(self) -> AsyncGenerator[ContributionChunkResult, None]:
+        start = time.perf_counter()
+        results = _bounded_map(self._chunks(), self._commit, self._max_concurrency)
+        try:
+            async for result in results:
+                _count(self.stats, result)
+                self.stats.elapsed = time.perf_counter() - start
+                yield result
+        finally:
+            await results.aclose()
+            self.stats.elapsed = time.perf_counter() - start
+
+    async def _commit(self, index: int, chunk: ContributionChunk) -> ContributionChunkResult:
+        self.stats.submitted += 1
+        turn = self._turns.get(chunk.ehr_id)
+        if turn is None:
+            turn = self._turns[chunk.ehr_id] = _EHRTurn()
+        async with turn.condition:
+            await turn.condition.wait_for(lambda: turn.next == chunk.sequence)
+        try:
+            if turn.error is not None:
+                return ContributionChunkResult(index, chunk, error=turn.error, skipped=True)
+            start = time.perf_counter()
+            try:
+                response = await self._create(chunk.ehr_id, chunk.build_json(self._template))
+            except (EHRBaseError, httpx.HTTPError, ValueError) as exc:
+                turn.error = exc
+                return ContributionChunkResult(
+                    index, chunk, error=exc, duration=time.perf_counter() - start
+                )
+            return ContributionChunkResult(
+                index, chunk, response=response, duration=time.perf_counter() - start
+            )
+        finally:
+            async with turn.condition:
+                turn.next += 1
+                turn.condition.notify_all()
+
+
+def _count(stats: ContributionBatchStats, result: ContributionChunkResult) -> None:
+    """Add a chunk outcome to the running totals."""
+    if result.skipped:
+        stats.skipped += 1
+    if result.ok:
+        stats.succeeded += 1
+        stats.versions_committed += len(result.chunk.changes)
+    else:
+        stats.failed += 1
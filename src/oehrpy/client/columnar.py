@@ -0,0 +1,143 @@
+"""Columnar views of AQL result sets.
+
+Transposes the row-oriented ``rows`` payload of an AQL response into one
+sequence per column, keyed by column name, without building a dict per row.
+Numeric columns can be turned into NumPy arrays and whole result sets into
+Apache Arrow tables (and Parquet files) for analytics tooling. NumPy and
+PyArrow are optional dependencies, imported only when used::
+
+    pip install oehrpy[numpy]   # as_arrays()
+    pip install oehrpy[arrow]   # to_arrow(), to_parquet()
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from os import PathLike
+
+
+def rows_to_columns(names: Sequence[str], rows: Sequence[Sequence[Any]]) -> dict[str, list[Any]]:
+    """Transpose result rows into one list per column.
+
+    Args:
+        names: Column names, in column order.
+        rows: Result rows, each with one value per column.
+
+    Returns:
+        Dict mapping each column name to its values, in row order.
+
+    Raises:
+        ValueError: If a row does not have one value per column.
+    """
+    if not rows:
+        return {name: [] for name in names}
+    try:
+        return {
+            name: list(values) for name, values in zip(names, zip(*rows, strict=True), strict=True)
+        }
+    except ValueError:
+        msg = f"AQL result rows do not all have {len(names)} columns"
+        raise ValueError(msg) from None
+
+
+def _numeric_dtype(values: list[Any]) -> str | None:
+    """Return the NumPy dtype for a column of JSON scalars, or None if not numeric."""
+    types = {type(value) for value in values}
+    has_null = type(None) in types
+    types.discard(type(None))
+    if not types:
+        return None
+    if types == {bool}:
+        return None if has_null else "bool"
+    if types <= {int, float}:
+        return "float64" if has_null or float in types else "int64"
+    return None
+
+
+def columns_to_arrays(columns: dict[str, list[Any]]) -> dict[str, Any]:
+    """Convert numeric and boolean columns to NumPy arrays.
+
+    Integer columns become ``int64`` arrays and float columns ``float64``
+    arrays; nulls in numeric columns become NaN. Other columns, including
+    integers that overflow ``int64``, are left as lists.
+
+    Args:
+        columns: Columns as returned by :func:`rows_to_columns`.
+
+    Returns:
+        Dict mapping each column name to a NumPy array or list.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError(
+            "NumPy arrays require numpy; install it with: pip install oehrpy[numpy]"
+        ) from None
+
+    arrays: dict[str, Any] = {}
+    for name, values in columns.items():
+        dtype = _numeric_dtype(values)
+        if dtype is None:
+            arrays[name] = values
+            continue
+        try:
+            arrays[name] = np.array(values, dtype=dtype)
+        except OverflowError:
+            arrays[name] = values
+    return arrays
+
+
+def columns_to_arrow(columns: dict[str, list[Any]]) -> Any:
+    """Build an Arrow table from result columns.
+
+    Column types are inferred by Arrow; nested RM objects become struct
+    columns. Columns whose values Arrow cannot give a single type (e.g.
+    mixed objects and scalars) are stored as JSON strings.
+
+    Args:
+        columns: Columns as returned by :func:`rows_to_columns`.
+
+    Returns:
+        A ``pyarrow.Table``.
+
+    Raises:
+        ImportError: If PyArrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError(
+            "Arrow export requires pyarrow; install it with: pip install oehrpy[arrow]"
+        ) from None
+
+    arrays = []
+    for values in columns.values():
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([None if v is None else json.dumps(v) for v in values]))
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+
+def write_parquet(columns: dict[str, list[Any]], path: str | PathLike[str], **kwargs: Any) -> None:
+    """Write result columns to a Parquet file.
+
+    Args:
+        columns: Columns as returned by :func:`rows_to_columns`.
+        path: Destination file path.
+        **kwargs: Passed to ``pyarrow.parquet.write_table`` (e.g. compression).
+
+    Raises:
+        ImportError: If PyArrow is not installed.
+    """
+    table = columns_to_arrow(columns)
+    import pyarrow.parquet as pq
+
+    pq.write_table(table, path, **kwargs)
@@ -24,13 +24,26 @@ Example::
 
     result = await client.create_contribution(ehr_id, contribution)
 
+Most of a contribution's scaffolding (audit blocks, coded texts, lifecycle
+states) is the same for every version. :class:`ContributionTemplate`
+precompiles it once as JSON fragments with a slot for ``time_committed``, so
+ingest paths that commit many contributions with the same audit settings can
+share one template and write request bodies straight to JSON bytes::
+
+    template = ContributionTemplate(system_id="ingest.example.org", committer="loader")
+    for ehr_id, canonical in rows:
+        body = ContributionBuilder(template=template).add_creation(canonical).build_json()
+        await client.create_contribution(ehr_id, body)
+
 See PRD-0003 (Audit & Contributions) for the full specification.
 """
 
 from __future__ import annotations
 
+import json
+from collections.abc import Sequence
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, NamedTuple
 
 # openEHR change-type terminology codes (terminology id "openehr").
 _CHANGE_TYPE_CODES: dict[str, str] = {
@@ -40,6 +53,12 @@ _CHANGE_TYPE_CODES: dict[str, str] = {
     "deleted": "523",
 }
 
+# openEHR version lifecycle states terminology codes (group 273).
+_LIFECYCLE_CODES: dict[str, str] = {"complete": "532", "incomplete": "531", "deleted": "533"}
+
+# Placeholder for ``time_committed`` in precompiled JSON fragments
+_TIME_SLOT = "\x00time_committed\x00"
+
 
 def _coded_text(value: str, code_string: str) -> dict[str, Any]:
     """Build a DV_CODED_TEXT block using the ``openehr`` terminology."""
@@ -60,14 +79,15 @@ def _audit_details(
     system_id: str | None = None,
     committer: str | None = None,
     description: str | None = None,
+    time_committed: str | None = None,
 ) -> dict[str, Any]:
     """Build an AUDIT_DETAILS block.
 
     ``system_id`` is a required RM field, but EHRBase populates it (and
     ``time_committed``) server-side when omitted. When ``system_id`` is provided,
-    ``time_committed`` is auto-filled with the current UTC time so the audit is
-    RM-complete. ``committer`` is likewise optional (server-derived from the
-    authenticated principal when omitted).
+    ``time_committed`` is filled with the given time, or the current UTC time,
+    so the audit is RM-complete. ``committer`` is likewise optional
+    (server-derived from the authenticated principal when omitted).
     """
     audit: dict[str, Any] = {
         "_type": "AUDIT_DETAILS",
@@ -77,7 +97,7 @@ def _audit_details(
         audit["system_id"] = system_id
         audit["time_committed"] = {
             "_type": "DV_DATE_TIME",
-            "value": datetime.now(timezone.utc).isoformat(),
+            "value": time_committed if time_committed is not None else _now(),
         }
     if committer is not None:
         audit["committer"] = {"_type": "PARTY_IDENTIFIED", "name": committer}
@@ -92,10 +112,183 @@ def _lifecycle_state(state: str) -> dict[str, Any]:
     openEHR ``version lifecycle states`` terminology (group 273):
     ``532`` complete, ``531`` incomplete, ``533`` deleted.
     """
-    codes = {"complete": "532", "incomplete": "531", "deleted": "533"}
-    if state not in codes:
-        raise ValueError(f"Unknown lifecycle_state {state!r}; expected one of {sorted(codes)}.")
-    return _coded_text(state, codes[state])
+    _check_lifecycle_state(state)
+    return _coded_text(state, _LIFECYCLE_CODES[state])
+
+
+def _check_lifecycle_state(state: str) -> None:
+    if state not in _LIFECYCLE_CODES:
+        raise ValueError(
+            f"Unknown lifecycle_state {state!r}; expected one of {sorted(_LIFECYCLE_CODES)}."
+        )
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _json(value: Any) -> bytes:
+    """Encode ``value`` the way httpx encodes ``json=`` request bodies."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
+
+
+def _fragments(block: dict[str, Any]) -> tuple[bytes, ...]:
+    """Encode ``block`` without its closing brace, split at the time slots."""
+    return tuple(_json(block)[:-1].split(_json(_TIME_SLOT)))
+
+
+class _Version(NamedTuple):
+    """One version added to a ContributionBuilder."""
+
+    change_type: str
+    composition: dict[str, Any] | None
+    preceding_version_uid: str | None
+    lifecycle_state: str
+    description: str | None
+    encoded: bytes | None = None
+
+
+class ContributionTemplate:
+    """Precompiled contribution scaffolding shared by many contributions.
+
+    The ``commit_audit`` and ``lifecycle_state`` blocks of each kind of
+    version, and the contribution-level audit, are encoded once as immutable
+    JSON fragments; only ``time_committed`` (one timestamp per contribution),
+    preceding version UIDs and compositions are filled in per build. Pass a
+    template to :class:`ContributionBuilder` to use it.
+
+    Args:
+        system_id: Identifier of the originating system (see ContributionBuilder).
+        committer: Committer of the contribution-level audit.
+        description: Description of the contribution-level audit. The audit is
+            only included when ``committer`` or ``description`` is given, or
+            after :meth:`with_audit`.
+    """
+
+    def __init__(
+        self,
+        system_id: str | None = None,
+        *,
+        committer: str | None = None,
+        description: str | None = None,
+    ) -> None:
+        self.system_id = system_id
+        self._audit: dict[str, Any] | None = None
+        self._audit_fragments: tuple[bytes, ...] = ()
+        self._version_fragments: dict[tuple[str, str], tuple[bytes, ...]] = {}
+        if committer is not None or description is not None:
+            self._set_audit("creation", committer, description)
+
+    def with_audit(
+        self,
+        *,
+        committer: str | None = None,
+        description: str | None = None,
+        change_type: str = "creation",
+    ) -> ContributionTemplate:
+        """Return a template with the given contribution-level audit."""
+        template = ContributionTemplate(self.system_id)
+        template._version_fragments = self._version_fragments
+        template._set_audit(change_type, committer, description)
+        return template
+
+    def _set_audit(self, change_type: str, committer: str | None, description: str | None) -> None:
+        self._audit = {
+            "change_type": change_type,
+            "system_id": self.system_id,
+            "committer": committer,
+            "description": description,
+        }
+        self._audit_fragments = _fragments(_audit_details(**self._audit, time_committed=_TIME_SLOT))
+
+    def _commit_audit(self, version: _Version, time_committed: str) -> dict[str, Any]:
+        return _audit_details(
+            version.change_type,
+            system_id=self.system_id,
+            description=version.description,
+            time_committed=time_committed,
+        )
+
+    def _fragments(self, version: _Version) -> tuple[bytes, ...]:
+        key = (version.change_type, version.lifecycle_state)
+        cached = self._version_fragments.get(key) if version.description is None else None
+        if cached is not None:
+            return cached
+        fragments = _fragments(
+            {
+                "_type": "ORIGINAL_VERSION",
+                "commit_audit": self._commit_audit(version, _TIME_SLOT),
+                "lifecycle_state": _lifecycle_state(version.lifecycle_state),
+            }
+        )
+        if version.description is None:
+            self._version_fragments[key] = fragments
+        return fragments
+
+    def _build(
+        self, versions: Sequence[_Version], time_committed: str | None = None
+    ) -> dict[str, Any]:
+        """Assemble a CANONICAL CONTRIBUTION as a dict of fresh objects.
+
+        Raises:
+            ValueError: If ``versions`` is empty.
+        """
+        if not versions:
+            raise ValueError("A contribution must contain at least one version.")
+        stamp = time_committed if time_committed is not None else _now()
+        body: dict[str, Any] = {"_type": "CONTRIBUTION", "versions": []}
+        for version in versions:
+            block: dict[str, Any] = {
+                "_type": "ORIGINAL_VERSION",
+                "commit_audit": self._commit_audit(version, stamp),
+                "lifecycle_state": _lifecycle_state(version.lifecycle_state),
+            }
+            if version.preceding_version_uid is not None:
+                block["preceding_version_uid"] = {
+                    "_type": "OBJECT_VERSION_ID",
+                    "value": version.preceding_version_uid,
+                }
+            if version.composition is not None:
+                block["data"] = version.composition
+            body["versions"].append(block)
+        if self._audit is not None:
+            body["audit"] = _audit_details(**self._audit, time_committed=stamp)
+        return body
+
+    def _dumps(self, versions: Sequence[_Version], time_committed: str | None = None) -> bytes:
+        """Encode a CANONICAL CONTRIBUTION directly as JSON bytes.
+
+        Produces the same document as ``json.dumps(_build(...))`` without
+        building the intermediate dicts; only the compositions are encoded,
+        unless they were added pre-encoded.
+
+        Raises:
+            ValueError: If ``versions`` is empty.
+        """
+        if not versions:
+            raise ValueError("A contribution must contain at least one version.")
+        stamp = _json(time_committed if time_committed is not None else _now())
+        parts = [b'{"_type":"CONTRIBUTION","versions":[']
+        for i, version in enumerate(versions):
+            if i:
+                parts.append(b",")
+            parts.append(stamp.join(self._fragments(version)))
+            if version.preceding_version_uid is not None:
+                parts += (
+                    b',"preceding_version_uid":{"_type":"OBJECT_VERSION_ID","value":',
+                    _json(version.preceding_version_uid),
+                    b"}",
+                )
+            if version.encoded is not None:
+                parts += (b',"data":', version.encoded)
+            elif version.composition is not None:
+                parts += (b',"data":', _json(version.composition))
+            parts.append(b"}")
+        parts.append(b"]")
+        if self._audit is not None:
+            parts += (b',"audit":', stamp.join(self._audit_fragments), b"}")
+        parts.append(b"}")
+        return b"".join(parts)
 
 
 class ContributionBuilder:
@@ -110,12 +303,16 @@ class ContributionBuilder:
         system_id: Identifier of the originating system. ``AUDIT_DETAILS``
             requires it, but EHRBase fills it (and ``time_committed``)
             server-side when omitted; pass it to emit an RM-complete audit.
+        template: Precompiled ContributionTemplate to build with, shared
+            between builders; its ``system_id`` is used instead of the
+            ``system_id`` argument.
     """
 
-    def __init__(self, system_id: str | None = None) -> None:
-        self._system_id = system_id
-        self._versions: list[dict[str, Any]] = []
-        self._audit: dict[str, Any] | None = None
+    def __init__(
+        self, system_id: str | None = None, *, template: ContributionTemplate | None = None
+    ) -> None:
+        self._template = template if template is not None else ContributionTemplate(system_id)
+        self._versions: list[_Version] = []
 
     def _add_version(
         self,
@@ -125,22 +322,19 @@ class ContributionBuilder:
         preceding_version_uid: str | None,
         lifecycle_state: str,
         description: str | None,
+        encoded: bytes | None = None,
     ) -> ContributionBuilder:
-        version: dict[str, Any] = {
-            "_type": "ORIGINAL_VERSION",
-            "commit_audit": _audit_details(
-                change_type, system_id=self._system_id, description=description
-            ),
-            "lifecycle_state": _lifecycle_state(lifecycle_state),
-        }
-        if preceding_version_uid is not None:
-            version["preceding_version_uid"] = {
-                "_type": "OBJECT_VERSION_ID",
-                "value": preceding_version_uid,
-            }
-        if composition is not None:
-            version["data"] = composition
-        self._versions.append(version)
+        _check_lifecycle_state(lifecycle_state)
+        self._versions.append(
+            _Version(
+                change_type,
+                composition,
+                preceding_version_uid,
+                lifecycle_state,
+                description,
+                encoded,
+            )
+        )
         return self
 
     def add_creation(
@@ -149,14 +343,20 @@ class ContributionBuilder:
         *,
         lifecycle_state: str = "complete",
         description: str | None = None,
+        encoded: bytes | None = None,
     ) -> ContributionBuilder:
-        """Append a ``creation`` version for a brand-new composition."""
+        """Append a ``creation`` version for a brand-new composition.
+
+        ``encoded`` may hold ``composition`` already encoded as JSON bytes;
+        :meth:`build_json` then writes it as is instead of encoding again.
+        """
         return self._add_version(
             "creation",
             composition=composition,
             preceding_version_uid=None,
             lifecycle_state=lifecycle_state,
             description=description,
+            encoded=encoded,
         )
 
     def add_amendment(
@@ -166,14 +366,19 @@ class ContributionBuilder:
         *,
         lifecycle_state: str = "complete",
         description: str | None = None,
+        encoded: bytes | None = None,
     ) -> ContributionBuilder:
-        """Append an ``amendment`` version updating an existing composition."""
+        """Append an ``amendment`` version updating an existing composition.
+
+        ``encoded`` is as for :meth:`add_creation`.
+        """
         return self._add_version(
             "amendment",
             composition=composition,
             preceding_version_uid=preceding_version_uid,
             lifecycle_state=lifecycle_state,
             description=description,
+            encoded=encoded,
         )
 
     def add_modification(
@@ -183,14 +388,19 @@ class ContributionBuilder:
         *,
         lifecycle_state: str = "complete",
         description: str | None = None,
+        encoded: bytes | None = None,
     ) -> ContributionBuilder:
-        """Append a ``modification`` version updating an existing composition."""
+        """Append a ``modification`` version updating an existing composition.
+
+        ``encoded`` is as for :meth:`add_creation`.
+        """
         return self._add_version(
             "modification",
             composition=composition,
             preceding_version_uid=preceding_version_uid,
             lifecycle_state=lifecycle_state,
             description=description,
+            encoded=encoded,
         )
 
     def add_deletion(
@@ -220,11 +430,8 @@ class ContributionBuilder:
         Both ``committer`` and ``description`` are optional; when omitted the
         server fills in the committer from the authenticated principal.
         """
-        self._audit = _audit_details(
-            change_type,
-            system_id=self._system_id,
-            committer=committer,
-            description=description,
+        self._template = self._template.with_audit(
+            committer=committer, description=description, change_type=change_type
         )
         return self
 
@@ -234,12 +441,16 @@ class ContributionBuilder:
         Raises:
             ValueError: If no versions have been added.
         """
-        if not self._versions:
-            raise ValueError("A contribution must contain at least one version.")
-        body: dict[str, Any] = {
-            "_type": "CONTRIBUTION",
-            "versions": list(self._versions),
-        }
-        if self._audit is not None:
-            body["audit"] = self._audit
-        return body
+        return self._template._build(self._versions)
+
+    def build_json(self) -> bytes:
+        """Assemble the CANONICAL CONTRIBUTION request body as JSON bytes.
+
+        Equivalent to encoding :meth:`build`, but writes the precompiled
+        audit and lifecycle fragments directly; pass the result to
+        ``create_contribution``.
+
+        Raises:
+            ValueError: If no versions have been added.
+        """
+        return self._template._dumps(self._versions)
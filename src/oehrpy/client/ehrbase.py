@@ -21,13 +21,51 @@ Example:
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import asyncio
+import email.utils
+import functools
+import importlib.util
+import os
+import random
+import time
+import urllib.request
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generator,
+    Hashable,
+    Iterable,
+    Sequence,
+)
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 import httpx
 from defusedxml import ElementTree as ET
 
+from ._transport import _ReleasingStream
+from .limits import OperationClass, RequestLimit, _LimitTransport
+from .metrics import ATTEMPTS_EXTENSION, ClientHooks, _InstrumentedTransport
+
+if TYPE_CHECKING:
+    from oehrpy.validation.web_template import ParsedWebTemplate
+
+    from ..aql import AQLQuery
+    from .bulk import (
+        BulkCompositionItem,
+        BulkCompositionUpload,
+        ContributionBatchUpload,
+        ContributionChange,
+    )
+    from .streaming import QueryStream
+    from .template_cache import CachedWebTemplate, WebTemplateCache
+
+T = TypeVar("T")
+
 
 class CDRType(str, Enum):
     """Supported CDR backends."""
@@ -86,6 +124,32 @@ class PreconditionFailedError(EHRBaseError):
     pass
 
 
+class CircuitOpenError(EHRBaseError):
+    """The circuit breaker is open; the request was not sent to the CDR."""
+
+    pass
+
+
+# Exception raised for each error status, with the message used when the
+# response body does not provide one; other statuses raise EHRBaseError
+_STATUS_ERRORS: dict[int, tuple[type[EHRBaseError], str]] = {
+    400: (ValidationError, "Validation error"),
+    401: (AuthenticationError, "Authentication failed"),
+    404: (NotFoundError, "Resource not found"),
+    409: (ValidationError, "Conflict: resource cannot be modified"),
+    412: (
+        PreconditionFailedError,
+        "Version conflict: the preceding version UID does not match the latest version",
+    ),
+    422: (ValidationError, "Validation error"),
+}
+
+
+def _status_error(status_code: int) -> type[EHRBaseError]:
+    """Return the exception class raised for an error status."""
+    return _STATUS_ERRORS.get(status_code, (EHRBaseError, ""))[0]
+
+
 # Response dataclasses
 
 
@@ -166,13 +230,59 @@ class QueryResponse:
             rows=data.get("rows", []),
         )
 
+    @property
+    def column_names(self) -> list[str]:
+        """Column names, in column order (``col_<i>`` for unnamed columns)."""
+        return [col.get("name", f"col_{i}") for i, col in enumerate(self.columns)]
+
     def as_dicts(self) -> list[dict[str, Any]]:
         """Convert rows to list of dictionaries with column names as keys."""
         if not self.columns:
             return []
-        col_names = [col.get("name", f"col_{i}") for i, col in enumerate(self.columns)]
+        col_names = self.column_names
         return [dict(zip(col_names, row, strict=False)) for row in self.rows]
 
+    def as_columns(self) -> dict[str, list[Any]]:
+        """Transpose rows into one list per column, keyed by column name.
+
+        Raises:
+            ValueError: If a row does not have one value per column.
+        """
+        from .columnar import rows_to_columns
+
+        return rows_to_columns(self.column_names, self.rows)
+
+    def as_arrays(self) -> dict[str, Any]:
+        """Return columns as NumPy arrays where numeric, lists otherwise.
+
+        Requires NumPy (``pip install oehrpy[numpy]``).
+        """
+        from .columnar import columns_to_arrays
+
+        return columns_to_arrays(self.as_columns())
+
+    def to_arrow(self) -> Any:
+        """Return the result set as a ``pyarrow.Table``.
+
+        Requires PyArrow (``pip install oehrpy[arrow]``).
+        """
+        from .columnar import columns_to_arrow
+
+        return columns_to_arrow(self.as_columns())
+
+    def to_parquet(self, path: str | os.PathLike[str], **kwargs: Any) -> None:
+        """Write the result set to a Parquet file.
+
+        Requires PyArrow (``pip install oehrpy[arrow]``).
+
+        Args:
+            path: Destination file path.
+            **kwargs: Passed to ``pyarrow.parquet.write_table``.
+        """
+        from .columnar import write_parquet
+
+        write_parquet(self.as_columns(), path, **kwargs)
+
 
 @dataclass
 class TemplateResponse:
@@ -283,6 +393,54 @@ class ContributionResponse:
         )
 
 
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how EHRBaseClient retries failed requests.
+
+    Retries are opt-in: set a policy as ``EHRBaseConfig.retry``.
+
+    A request is retried after a network error or a response with one of
+    ``statuses`` if its method is idempotent (one of ``methods``, or a POST
+    AQL query) and it carries no ``If-Match`` precondition: the version an
+    update or delete names is stale once the first attempt has gone
+    through, so a retry would report a spurious 409 or 412. Requests that
+    never reached the server (connect errors and timeouts) are retried
+    whatever their method. Request bodies that cannot be replayed
+    (streamed uploads) are never retried.
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    statuses: frozenset[int] = frozenset({429, 502, 503, 504})
+    methods: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before retry number ``attempt`` (1-based).
+
+        Uses "full jitter": a random delay up to the exponential backoff,
+        which spreads out retries from many clients hitting the same outage.
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+
+@dataclass(frozen=True)
+class CircuitBreakerPolicy:
+    """When EHRBaseClient stops sending requests to a failing CDR.
+
+    After ``failure_threshold`` consecutive failures (network errors or
+    ``statuses`` responses) the circuit opens and requests fail fast with
+    CircuitOpenError. After ``reset_timeout`` seconds one probe request is
+    let through; its success closes the circuit, its failure re-opens it.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    statuses: frozenset[int] = frozenset({500, 502, 503, 504})
+
+
 @dataclass
 class EHRBaseConfig:
     """Configuration for EHRBase client."""
@@ -295,6 +453,28 @@ class EHRBaseConfig:
     admin_password: str | None = None
     timeout: float = 30.0
     verify_ssl: bool = True
+    # Connection pool settings (see create_transport); defaults match httpx
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry: float | None = 5.0
+    max_connections_per_host: int | None = None
+    http2: bool = False
+    # Share one in-flight request between concurrent identical reads
+    coalesce_requests: bool = True
+    # Resilience (see create_transport); None disables, the default
+    retry: RetryPolicy | None = None
+    circuit_breaker: CircuitBreakerPolicy | None = None
+    # Per-operation-class rate and concurrency limits (see oehrpy.client.limits)
+    request_limits: dict[OperationClass, RequestLimit] = field(default_factory=dict)
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """Get the httpx pool limits for this configuration."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
 
     @property
     def auth(self) -> tuple[str, str] | None:
@@ -311,38 +491,457 @@ class EHRBaseConfig:
         return None
 
 
-class EHRBaseClient:
-    """Async HTTP client for EHRBase.
+class _HostLimitTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper limiting concurrent requests per host.
 
-    This client implements the openEHR REST API for EHRBase CDR.
+    A slot is held from sending the request until the response is closed,
+    which with HTTP/1.1 bounds the connections open to each host.
+    """
 
-    Web Templates fetched via :meth:`get_web_template` are cached in memory
-    for the lifetime of the client instance to avoid repeated CDR round-trips
-    (see ADR-0005).
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int) -> None:
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: dict[tuple[str, str, int | None], asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        origin = (request.url.scheme, request.url.host, request.url.port)
+        semaphore = self._semaphores.get(origin)
+        if semaphore is None:
+            semaphore = self._semaphores[origin] = asyncio.Semaphore(self._max_per_host)
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        if isinstance(response.stream, httpx.ByteStream):
+            # Body is already in memory (e.g. from a mock transport)
+            semaphore.release()
+        else:
+            stream = cast(httpx.AsyncByteStream, response.stream)
+            response.stream = _ReleasingStream(stream, semaphore.release)
+        return response
 
-    Example:
-        >>> config = EHRBaseConfig(
-        ...     base_url="http://localhost:8080/ehrbase",
-        ...     username="admin",
-        ...     password="admin",
-        ... )
-        >>> async with EHRBaseClient(config=config) as client:
-        ...     ehr = await client.create_ehr()
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+# Errors after which a request may or may not have reached the server
+_RETRYABLE_ERRORS = (httpx.NetworkError, httpx.TimeoutException, httpx.RemoteProtocolError)
+# Errors raised before the request was sent
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Return the Retry-After delay of a response in seconds, if any."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _RetryDecisions:
+    """Retry decisions of a RetryPolicy, shared by the async and sync transports."""
+
+    def __init__(self, policy: RetryPolicy) -> None:
+        self._policy = policy
+
+    def _classify(self, request: httpx.Request) -> tuple[bool, bool]:
+        """Return whether a request can be replayed and whether it is idempotent."""
+        replayable = isinstance(request.stream, httpx.ByteStream)
+        if not replayable:
+            return False, False
+        if request.method in self._policy.methods and "If-Match" not in request.headers:
+            return True, True
+        return True, request.method == "POST" and request.url.path.endswith("/query/aql")
+
+    def _error_delay(
+        self, exc: Exception, replayable: bool, idempotent: bool, attempt: int
+    ) -> float | None:
+        """Return the delay before retrying after ``exc``, or None to raise it."""
+        retryable = idempotent or (replayable and isinstance(exc, _NOT_SENT_ERRORS))
+        if not retryable or attempt >= self._policy.max_attempts:
+            return None
+        return self._policy.backoff(attempt)
+
+    def _response_delay(
+        self, response: httpx.Response, idempotent: bool, attempt: int
+    ) -> float | None:
+        """Return the delay before retrying after ``response``, or None to return it."""
+        policy = self._policy
+        if (
+            response.status_code not in policy.statuses
+            or not idempotent
+            or attempt >= policy.max_attempts
+        ):
+            return None
+        delay = policy.backoff(attempt)
+        retry_after = _retry_after(response) if policy.respect_retry_after else None
+        if retry_after is not None:
+            if retry_after > policy.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+
+class _RetryTransport(_RetryDecisions, httpx.AsyncBaseTransport):
+    """Transport wrapper retrying transient failures with jittered backoff."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, policy: RetryPolicy) -> None:
+        super().__init__(policy)
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        replayable, idempotent = self._classify(request)
+        attempt = 1
+        while True:
+            request.extensions[ATTEMPTS_EXTENSION] = attempt
+            try:
+                response = await self._transport.handle_async_request(request)
+            except _RETRYABLE_ERRORS as exc:
+                delay = self._error_delay(exc, replayable, idempotent, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._response_delay(response, idempotent, attempt)
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class _CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper failing fast while the CDR is known to be down."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        policy: CircuitBreakerPolicy,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._transport = transport
+        self._policy = policy
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """``"closed"``, ``"open"`` or ``"half_open"`` (probe allowed or in flight)."""
+        if self._opened_at is None:
+            return "closed"
+        if self._probing or self._clock() - self._opened_at >= self._policy.reset_timeout:
+            return "half_open"
+        return "open"
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        probe = False
+        if self._opened_at is not None:
+            if self._probing or self._clock() - self._opened_at < self._policy.reset_timeout:
+                raise CircuitOpenError(
+                    f"Circuit breaker open after {self._failures} consecutive failures; "
+                    f"not sending {request.method} {request.url.path}"
+                )
+            self._probing = probe = True
+        try:
+            response = await self._transport.handle_async_request(request)
+        except _RETRYABLE_ERRORS:
+            self._record(success=False)
+            raise
+        finally:
+            if probe:
+                self._probing = False
+        self._record(success=response.status_code not in self._policy.statuses)
+        return response
+
+    def _record(self, success: bool) -> None:
+        if success:
+            self._failures = 0
+            self._opened_at = None
+            return
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self._policy.failure_threshold:
+            self._opened_at = self._clock()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that leaves closing to the transport's owner."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class _SingleFlight:
+    """Deduplicates concurrent calls that share a key.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it is in flight await the same task. Each caller awaits it through
+    :func:`asyncio.shield`, so cancelling one caller does not cancel the
+    call for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of ``call()``, sharing it with concurrent callers of ``key``."""
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._calls[key] = future
+            future.add_done_callback(functools.partial(self._done, key))
+        result: T = await asyncio.shield(future)
+        return result
+
+    def _done(self, key: Hashable, future: asyncio.Future[Any]) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not future.cancelled():
+            future.exception()
+
+
+def _check_http2(config: EHRBaseConfig) -> None:
+    # httpx only checks for h2 when it builds its own transport
+    if config.http2 and importlib.util.find_spec("h2") is None:
+        raise ImportError(
+            "Using http2=True, but the 'h2' package is not installed. "
+            "Install it with `pip install oehrpy[http2]`."
+        )
+
+
+def create_transport(config: EHRBaseConfig | None = None) -> httpx.AsyncBaseTransport:
+    """Create an HTTP transport from the pool settings of a configuration.
+
+    Every EHRBaseClient creates its own transport on connect. Create one
+    explicitly to share a connection pool between several clients (e.g.
+    with different credentials against the same CDR); the clients do not
+    close a transport passed to them, so close it once they are done:
+
+        transport = create_transport(EHRBaseConfig(max_connections=200, http2=True))
+        async with (
+            EHRBaseClient(config=reader_config, transport=transport) as reader,
+            EHRBaseClient(config=writer_config, transport=transport) as writer,
+        ):
+            ...
+        await transport.aclose()
+
+    The transport also applies the config's retry policy, circuit breaker
+    and request limits, so a shared transport shares one circuit breaker
+    and one set of limits between its clients. As with a plain
+    ``httpx.AsyncClient``, requests go through the proxy that the
+    ``HTTP_PROXY``, ``HTTPS_PROXY``, ``ALL_PROXY`` and ``NO_PROXY``
+    environment variables select, here for the config's ``base_url``.
+
+    Args:
+        config: Pool, HTTP/2, TLS and resilience settings. Defaults to
+            EHRBaseConfig().
+
+    Returns:
+        An httpx transport, wrapped to enforce ``max_connections_per_host``,
+        ``circuit_breaker``, ``request_limits`` and ``retry`` when set.
+
+    Raises:
+        ImportError: If ``http2`` is enabled but the ``h2`` package is not
+            installed (``pip install oehrpy[http2]``).
+    """
+    config = config or EHRBaseConfig()
+    _check_http2(config)
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+        verify=config.verify_ssl,
+        http2=config.http2,
+        limits=config.limits,
+        proxy=_environment_proxy(config.base_url),
+    )
+    return _wrap_transport(transport, config)
+
+
+def _environment_proxy(url: str) -> str | None:
+    """Return the proxy the environment selects for a URL, or None to connect directly.
+
+    httpx only reads proxy variables when it creates the transport itself,
+    so clients that pass their own transport resolve them here.
+    """
+    target = httpx.URL(url)
+    proxies = urllib.request.getproxies()
+    proxy = proxies.get(target.scheme) or proxies.get("all")
+    if not proxy or urllib.request.proxy_bypass(target.netloc.decode()):
+        return None
+    return proxy if "://" in proxy else f"http://{proxy}"
+
+
+def _wrap_transport(
+    transport: httpx.AsyncBaseTransport, config: EHRBaseConfig
+) -> httpx.AsyncBaseTransport:
+    """Wrap a transport with the per-host limit and resilience layers of a config."""
+    if config.max_connections_per_host is not None:
+        transport = _HostLimitTransport(transport, config.max_connections_per_host)
+    if config.circuit_breaker is not None:
+        transport = _CircuitBreakerTransport(transport, config.circuit_breaker)
+    if config.request_limits:
+        transport = _LimitTransport(transport, config.request_limits)
+    # Retries go outermost so that backoff does not hold a per-host slot
+    if config.retry is not None:
+        transport = _RetryTransport(transport, config.retry)
+    return transport
+
+
+def _aql_body(
+    aql: str,
+    query_parameters: dict[str, Any] | None,
+    offset: int | None,
+    fetch: int | None,
+) -> dict[str, Any]:
+    """Build the JSON body of a POST AQL query."""
+    body: dict[str, Any] = {"q": aql}
+    if query_parameters:
+        body["query_parameters"] = query_parameters
+    if offset is not None:
+        body["offset"] = offset
+    if fetch is not None:
+        body["fetch"] = fetch
+    return body
+
+
+def _aql_pages(
+    aql: str | AQLQuery, query_parameters: dict[str, Any] | None
+) -> tuple[
+    Callable[[int, int], tuple[str, dict[str, Any] | None, int | None, int | None]],
+    int,
+    int | None,
+]:
+    """Plan the paging of an AQL query.
+
+    Returns:
+        A function mapping ``(offset, fetch)`` to the ``(aql,
+        query_parameters, offset, fetch)`` arguments of the page's query,
+        the offset of the first row, and the maximum number of rows (or None).
+    """
+    if isinstance(aql, str):
+        query_string = aql
+
+        def page_string(
+            offset: int, fetch: int
+        ) -> tuple[str, dict[str, Any] | None, int | None, int | None]:
+            return query_string, query_parameters, offset, fetch
+
+        return page_string, 0, None
+
+    query = aql
+    parameters = {**query.parameters, **(query_parameters or {})}
+
+    def page_query(
+        offset: int, fetch: int
+    ) -> tuple[str, dict[str, Any] | None, int | None, int | None]:
+        page = replace(query, limit_value=fetch, offset_value=offset)
+        return page.to_string(), parameters or None, None, None
+
+    return page_query, query.offset_value or 0, query.limit_value
+
+
+def _page_full(rows: list[Any], requested: int) -> bool:
+    """Return whether a page of ``requested`` rows was full, so more may follow.
+
+    Raises:
+        EHRBaseError: If the page has more rows than requested, i.e. the
+            server ignored the paging and iterating on would repeat rows.
+    """
+    if len(rows) > requested:
+        msg = (
+            f"AQL page has {len(rows)} rows but {requested} were requested; "
+            "the server does not support paging this query"
+        )
+        raise EHRBaseError(msg)
+    return len(rows) == requested
+
+
+@dataclass(frozen=True)
+class _Request:
+    """An HTTP request made by a client operation."""
+
+    method: str
+    url: str
+    params: dict[str, Any] | None = None
+    headers: dict[str, str] | None = None
+    json: Any = None
+    content: str | bytes | None = None
+    auth: tuple[str, str] | None = None
+
+    def options(self) -> dict[str, Any]:
+        """Keyword arguments of the request for httpx's ``get``/``post``/... methods."""
+        options = {
+            "params": self.params,
+            "headers": self.headers,
+            "json": self.json,
+            "content": self.content,
+            "auth": self.auth,
+        }
+        return {name: value for name, value in options.items() if value is not None}
+
+
+# A client operation yields the requests to send and receives their responses
+_Operation = Generator[_Request, httpx.Response, T]
+
+
+def _aql_request(
+    aql: str,
+    query_parameters: dict[str, Any] | None,
+    ehr_id: str | None,
+    offset: int | None,
+    fetch: int | None,
+) -> _Request:
+    """Build the POST request of an AQL query."""
+    return _Request(
+        "POST",
+        "/rest/openehr/v1/query/aql",
+        params={"ehr_id": ehr_id} if ehr_id else None,
+        json=_aql_body(aql, query_parameters, offset, fetch),
+    )
+
+
+class _ClientOperations:
+    """Request building and response handling shared by the async and sync clients.
+
+    Each operation is a generator that yields the requests to send and is
+    sent their responses, so it performs no I/O itself: EHRBaseClient drives
+    it with an ``httpx.AsyncClient`` and SyncEHRBaseClient with an
+    ``httpx.Client``.
     """
 
     def __init__(
         self,
-        base_url: str | None = None,
-        config: EHRBaseConfig | None = None,
+        base_url: str | None,
+        config: EHRBaseConfig | None,
+        web_template_cache: WebTemplateCache | None,
+        hooks: Sequence[ClientHooks],
         **kwargs: Any,
-    ):
-        """Initialize the client.
-
-        Args:
-            base_url: EHRBase server URL (shortcut for config.base_url).
-            config: Full configuration object.
-            **kwargs: Additional arguments passed to EHRBaseConfig.
-        """
+    ) -> None:
         if config:
             self.config = config
         else:
@@ -350,82 +949,30 @@ class EHRBaseClient:
                 base_url=base_url or "http://localhost:8080/ehrbase",
                 **kwargs,
             )
-        self._client: httpx.AsyncClient | None = None
-        self._web_template_cache: dict[str, dict[str, Any]] = {}
-
-    async def __aenter__(self) -> EHRBaseClient:
-        """Enter async context."""
-        await self.connect()
-        return self
-
-    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        """Exit async context."""
-        await self.close()
-
-    async def connect(self) -> None:
-        """Create the HTTP client connection."""
-        self._client = httpx.AsyncClient(
-            base_url=self.config.base_url,
-            auth=self.config.auth,
-            timeout=self.config.timeout,
-            verify=self.config.verify_ssl,
-            headers={
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-            },
-        )
+        if web_template_cache is None:
+            from .template_cache import MemoryWebTemplateCache
 
-    async def close(self) -> None:
-        """Close the HTTP client connection."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
-
-    @property
-    def client(self) -> httpx.AsyncClient:
-        """Get the HTTP client, raising if not connected."""
-        if not self._client:
-            raise RuntimeError("Client not connected. Use 'async with' or call connect() first.")
-        return self._client
+            web_template_cache = MemoryWebTemplateCache()
+        self.web_template_cache = web_template_cache
+        self.hooks = list(hooks)
 
     def _handle_response(self, response: httpx.Response) -> dict[str, Any]:
         """Handle response and raise appropriate errors."""
-        if response.status_code == 401:
-            raise AuthenticationError(
-                "Authentication failed",
-                status_code=response.status_code,
-            )
-        if response.status_code == 404:
-            raise NotFoundError(
-                "Resource not found",
-                status_code=response.status_code,
-            )
-        if response.status_code == 412:
-            raise PreconditionFailedError(
-                "Version conflict: the preceding version UID does not match the latest version",
-                status_code=response.status_code,
-            )
-        if response.status_code == 409:
-            try:
-                error_data = response.json()
-            except Exception:
-                error_data = {"message": response.text}
-            raise ValidationError(
-                error_data.get("message", "Conflict: resource cannot be modified"),
-                status_code=response.status_code,
-                response=error_data,
-            )
-        if response.status_code == 400 or response.status_code == 422:
+        status_code = response.status_code
+        if status_code in _STATUS_ERRORS:
+            error_cls, message = _STATUS_ERRORS[status_code]
+            if error_cls is not ValidationError:
+                raise error_cls(message, status_code=status_code)
             try:
                 error_data = response.json()
             except Exception:
                 error_data = {"message": response.text}
             raise ValidationError(
-                error_data.get("message", "Validation error"),
-                status_code=response.status_code,
+                error_data.get("message", message),
+                status_code=status_code,
                 response=error_data,
             )
-        if response.status_code >= 400:
+        if status_code >= 400:
             try:
                 # Truncate response to avoid logging sensitive data (PII/PHI)
                 error_text = response.text[:200] if response.text else ""
@@ -434,8 +981,8 @@ class EHRBaseClient:
             except Exception:
                 error_body = ""
             raise EHRBaseError(
-                f"Request failed: {response.status_code}{error_body}",
-                status_code=response.status_code,
+                f"Request failed: {status_code}{error_body}",
+                status_code=status_code,
             )
 
         if response.status_code == 204:
@@ -449,28 +996,15 @@ class EHRBaseClient:
 
     # EHR Operations
 
-    async def create_ehr(
+    def _create_ehr(
         self,
         ehr_id: str | None = None,
         subject_id: str | None = None,
         subject_namespace: str | None = None,
-    ) -> EHRResponse:
-        """Create a new EHR.
-
-        Args:
-            ehr_id: Optional specific EHR ID to use.
-            subject_id: Optional subject external ID.
-            subject_namespace: Namespace for subject ID.
-
-        Returns:
-            EHRResponse with the created EHR details.
-        """
+    ) -> _Operation[EHRResponse]:
         headers: dict[str, str] = {"Prefer": "return=representation"}
         if ehr_id:
-            response = await self.client.put(
-                f"/rest/openehr/v1/ehr/{ehr_id}",
-                headers=headers,
-            )
+            request = _Request("PUT", f"/rest/openehr/v1/ehr/{ehr_id}", headers=headers)
         else:
             body = None
             if subject_id and subject_namespace:
@@ -492,43 +1026,24 @@ class EHRBaseClient:
                     "is_modifiable": True,
                     "is_queryable": True,
                 }
-            response = await self.client.post(
-                "/rest/openehr/v1/ehr",
-                headers=headers,
-                json=body,
-            )
+            request = _Request("POST", "/rest/openehr/v1/ehr", headers=headers, json=body)
 
+        response = yield request
         data = self._handle_response(response)
         return EHRResponse.from_response(data)
 
-    async def get_ehr(self, ehr_id: str) -> EHRResponse:
-        """Get an EHR by ID.
-
-        Args:
-            ehr_id: The EHR ID.
-
-        Returns:
-            EHRResponse with EHR details.
-        """
-        response = await self.client.get(f"/rest/openehr/v1/ehr/{ehr_id}")
+    def _get_ehr(self, ehr_id: str) -> _Operation[EHRResponse]:
+        response = yield _Request("GET", f"/rest/openehr/v1/ehr/{ehr_id}")
         data = self._handle_response(response)
         return EHRResponse.from_response(data)
 
-    async def get_ehr_by_subject(
+    def _get_ehr_by_subject(
         self,
         subject_id: str,
         subject_namespace: str,
-    ) -> EHRResponse:
-        """Get an EHR by subject ID.
-
-        Args:
-            subject_id: The subject external ID.
-            subject_namespace: The namespace for the subject ID.
-
-        Returns:
-            EHRResponse with EHR details.
-        """
-        response = await self.client.get(
+    ) -> _Operation[EHRResponse]:
+        response = yield _Request(
+            "GET",
             "/rest/openehr/v1/ehr",
             params={
                 "subject_id": subject_id,
@@ -540,24 +1055,13 @@ class EHRBaseClient:
 
     # Composition Operations
 
-    async def create_composition(
+    def _create_composition(
         self,
         ehr_id: str,
         composition: dict[str, Any],
         template_id: str | None = None,
         format: str | CompositionFormat = CompositionFormat.FLAT,
-    ) -> CompositionResponse:
-        """Create a new composition.
-
-        Args:
-            ehr_id: The EHR ID.
-            composition: The composition data.
-            template_id: Template ID (required for FLAT format).
-            format: Composition format (FLAT, CANONICAL, STRUCTURED).
-
-        Returns:
-            CompositionResponse with composition details.
-        """
+    ) -> _Operation[CompositionResponse]:
         format_str = format.value if isinstance(format, CompositionFormat) else format
 
         headers = {
@@ -571,7 +1075,8 @@ class EHRBaseClient:
         if format_str:
             params["format"] = format_str
 
-        response = await self.client.post(
+        response = yield _Request(
+            "POST",
             f"/rest/openehr/v1/ehr/{ehr_id}/composition",
             json=composition,
             headers=headers,
@@ -581,22 +1086,12 @@ class EHRBaseClient:
         data = self._handle_response(response)
         return CompositionResponse.from_response(data, ehr_id)
 
-    async def get_composition(
+    def _get_composition(
         self,
         ehr_id: str,
         composition_uid: str,
         format: str | CompositionFormat = CompositionFormat.CANONICAL,
-    ) -> CompositionResponse:
-        """Get a composition by UID.
-
-        Args:
-            ehr_id: The EHR ID.
-            composition_uid: The composition UID (can be versioned object UID or full version UID).
-            format: Desired response format.
-
-        Returns:
-            CompositionResponse with composition data.
-        """
+    ) -> _Operation[CompositionResponse]:
         format_str = format.value if isinstance(format, CompositionFormat) else format
 
         # Use the full UID as provided - EHRBase accepts both formats:
@@ -607,7 +1102,8 @@ class EHRBaseClient:
         if format_str:
             params["format"] = format_str
 
-        response = await self.client.get(
+        response = yield _Request(
+            "GET",
             f"/rest/openehr/v1/ehr/{ehr_id}/composition/{composition_uid}",
             params=params if params else None,
         )
@@ -615,7 +1111,7 @@ class EHRBaseClient:
         data = self._handle_response(response)
         return CompositionResponse.from_response(data, ehr_id)
 
-    async def update_composition(
+    def _update_composition(
         self,
         ehr_id: str,
         versioned_object_uid: str,
@@ -623,33 +1119,14 @@ class EHRBaseClient:
         composition: dict[str, Any],
         template_id: str | None = None,
         format: str | CompositionFormat = CompositionFormat.FLAT,
-    ) -> CompositionResponse:
-        """Update an existing composition.
-
-        Args:
-            ehr_id: The EHR ID.
-            versioned_object_uid: The composition's UUID (used in the request path).
-            preceding_version_uid: Full version string (e.g. ``uuid::domain::1``),
-                sent as the ``If-Match`` header for optimistic concurrency.
-            composition: The updated composition data.
-            template_id: Template ID.
-            format: Composition format.
+    ) -> _Operation[CompositionResponse]:
+        format_str = format.value if isinstance(format, CompositionFormat) else format
 
-        Returns:
-            CompositionResponse with updated composition.
-
-        Raises:
-            PreconditionFailedError: If the preceding version UID does not match
-                the latest version (HTTP 412).
-            NotFoundError: If the composition has been deleted (HTTP 404).
-        """
-        format_str = format.value if isinstance(format, CompositionFormat) else format
-
-        headers = {
-            "Prefer": "return=representation",
-            "Content-Type": "application/json",
-            "If-Match": preceding_version_uid,
-        }
+        headers = {
+            "Prefer": "return=representation",
+            "Content-Type": "application/json",
+            "If-Match": preceding_version_uid,
+        }
 
         params = {}
         if template_id:
@@ -657,7 +1134,8 @@ class EHRBaseClient:
         if format_str:
             params["format"] = format_str
 
-        response = await self.client.put(
+        response = yield _Request(
+            "PUT",
             f"/rest/openehr/v1/ehr/{ehr_id}/composition/{versioned_object_uid}",
             json=composition,
             headers=headers,
@@ -667,53 +1145,38 @@ class EHRBaseClient:
         data = self._handle_response(response)
         return CompositionResponse.from_response(data, ehr_id)
 
-    async def delete_composition(
+    def _delete_composition(
         self,
         ehr_id: str,
         composition_uid: str,
-    ) -> None:
-        """Delete a composition.
-
-        Args:
-            ehr_id: The EHR ID.
-            composition_uid: The composition UID.
-        """
+    ) -> _Operation[None]:
         # Extract versioned object UID (uuid::system::version -> uuid::system)
         uid_parts = composition_uid.split("::")
         versioned_object_uid = "::".join(uid_parts[:2]) if len(uid_parts) >= 2 else composition_uid
 
-        response = await self.client.delete(
+        response = yield _Request(
+            "DELETE",
             f"/rest/openehr/v1/ehr/{ehr_id}/composition/{versioned_object_uid}",
         )
         self._handle_response(response)
 
     # Composition Versioning Operations
 
-    async def get_composition_at_time(
+    def _get_composition_at_time(
         self,
         ehr_id: str,
         versioned_object_uid: str,
         version_at_time: str,
         format: str | CompositionFormat = CompositionFormat.CANONICAL,
-    ) -> CompositionResponse:
-        """Get a composition as it existed at a specific point in time.
-
-        Args:
-            ehr_id: The EHR ID.
-            versioned_object_uid: The composition's UUID.
-            version_at_time: ISO 8601 timestamp.
-            format: Desired response format.
-
-        Returns:
-            CompositionResponse with the composition at that time.
-        """
+    ) -> _Operation[CompositionResponse]:
         format_str = format.value if isinstance(format, CompositionFormat) else format
 
         params: dict[str, str] = {"version_at_time": version_at_time}
         if format_str:
             params["format"] = format_str
 
-        response = await self.client.get(
+        response = yield _Request(
+            "GET",
             f"/rest/openehr/v1/ehr/{ehr_id}/composition/{versioned_object_uid}",
             params=params,
         )
@@ -721,65 +1184,40 @@ class EHRBaseClient:
         data = self._handle_response(response)
         return CompositionResponse.from_response(data, ehr_id)
 
-    async def get_versioned_composition(
+    def _get_versioned_composition(
         self,
         ehr_id: str,
         versioned_object_uid: str,
-    ) -> VersionedCompositionResponse:
-        """Get versioned composition metadata.
-
-        Args:
-            ehr_id: The EHR ID.
-            versioned_object_uid: The composition's UUID.
-
-        Returns:
-            VersionedCompositionResponse with metadata (UID, owner ID, time created).
-        """
-        response = await self.client.get(
+    ) -> _Operation[VersionedCompositionResponse]:
+        response = yield _Request(
+            "GET",
             f"/rest/openehr/v1/ehr/{ehr_id}/versioned_composition/{versioned_object_uid}",
         )
 
         data = self._handle_response(response)
         return VersionedCompositionResponse.from_response(data)
 
-    async def get_composition_version(
+    def _get_composition_version(
         self,
         ehr_id: str,
         versioned_object_uid: str,
         version_uid: str,
-    ) -> CompositionVersionResponse:
-        """Get a specific version of a composition.
-
-        Args:
-            ehr_id: The EHR ID.
-            versioned_object_uid: The composition's UUID.
-            version_uid: The specific version UID (e.g. ``uuid::domain::1``).
-
-        Returns:
-            CompositionVersionResponse with full version and audit metadata.
-        """
-        response = await self.client.get(
+    ) -> _Operation[CompositionVersionResponse]:
+        response = yield _Request(
+            "GET",
             f"/rest/openehr/v1/ehr/{ehr_id}/versioned_composition/{versioned_object_uid}/version/{version_uid}",
         )
 
         data = self._handle_response(response)
         return CompositionVersionResponse.from_response(data)
 
-    async def list_composition_versions(
+    def _list_composition_versions(
         self,
         ehr_id: str,
         versioned_object_uid: str,
-    ) -> list[CompositionVersionResponse]:
-        """List all versions of a composition.
-
-        Args:
-            ehr_id: The EHR ID.
-            versioned_object_uid: The composition's UUID.
-
-        Returns:
-            List of CompositionVersionResponse with version descriptors.
-        """
-        response = await self.client.get(
+    ) -> _Operation[list[CompositionVersionResponse]]:
+        response = yield _Request(
+            "GET",
             f"/rest/openehr/v1/ehr/{ehr_id}/versioned_composition/{versioned_object_uid}/version",
         )
 
@@ -794,64 +1232,32 @@ class EHRBaseClient:
 
     # Contribution Operations
 
-    async def create_contribution(
+    def _create_contribution(
         self,
         ehr_id: str,
-        contribution: dict[str, Any],
-    ) -> ContributionResponse:
-        """Commit a contribution (atomic changeset of one or more versions).
-
-        A contribution groups one or more versioned-object changes
-        (compositions) into a single atomic commit with shared audit metadata.
-        Build the request body with :class:`~oehrpy.client.ContributionBuilder`.
-
-        Args:
-            ehr_id: The EHR ID.
-            contribution: CANONICAL contribution body (e.g. from
-                ``ContributionBuilder.build()``).
-
-        Returns:
-            ContributionResponse with the contribution UID and referenced
-            version UIDs.
-
-        Raises:
-            ValidationError: If the contribution is rejected by the server (422).
-            NotFoundError: If the EHR does not exist (404).
-            PreconditionFailedError: If an amendment's preceding version UID does
-                not match the latest version (412).
-        """
+        contribution: dict[str, Any] | bytes,
+    ) -> _Operation[ContributionResponse]:
         headers = {
             "Prefer": "return=representation",
             "Content-Type": "application/json",
         }
 
-        response = await self.client.post(
-            f"/rest/openehr/v1/ehr/{ehr_id}/contribution",
-            json=contribution,
-            headers=headers,
-        )
+        url = f"/rest/openehr/v1/ehr/{ehr_id}/contribution"
+        if isinstance(contribution, bytes):
+            response = yield _Request("POST", url, content=contribution, headers=headers)
+        else:
+            response = yield _Request("POST", url, json=contribution, headers=headers)
 
         data = self._handle_response(response)
         return ContributionResponse.from_response(data, ehr_id)
 
-    async def get_contribution(
+    def _get_contribution(
         self,
         ehr_id: str,
         contribution_uid: str,
-    ) -> ContributionResponse:
-        """Retrieve a contribution by UID.
-
-        Args:
-            ehr_id: The EHR ID.
-            contribution_uid: The contribution UID.
-
-        Returns:
-            ContributionResponse with audit metadata and referenced version UIDs.
-
-        Raises:
-            NotFoundError: If the contribution does not exist (404).
-        """
-        response = await self.client.get(
+    ) -> _Operation[ContributionResponse]:
+        response = yield _Request(
+            "GET",
             f"/rest/openehr/v1/ehr/{ehr_id}/contribution/{contribution_uid}",
         )
 
@@ -860,57 +1266,26 @@ class EHRBaseClient:
 
     # Query Operations
 
-    async def query(
+    def _query(
         self,
         aql: str,
         query_parameters: dict[str, Any] | None = None,
         ehr_id: str | None = None,
-    ) -> QueryResponse:
-        """Execute an AQL query.
-
-        Args:
-            aql: The AQL query string.
-            query_parameters: Optional query parameters.
-            ehr_id: Optional EHR ID to scope the query.
-
-        Returns:
-            QueryResponse with query results.
-        """
-        body: dict[str, Any] = {"q": aql}
-        if query_parameters:
-            body["query_parameters"] = query_parameters
-
-        params = {}
-        if ehr_id:
-            params["ehr_id"] = ehr_id
-
-        response = await self.client.post(
-            "/rest/openehr/v1/query/aql",
-            json=body,
-            params=params if params else None,
-        )
+        offset: int | None = None,
+        fetch: int | None = None,
+    ) -> _Operation[QueryResponse]:
+        response = yield _aql_request(aql, query_parameters, ehr_id, offset, fetch)
 
         data = self._handle_response(response)
         return QueryResponse.from_response(data)
 
-    async def query_get(
+    def _query_get(
         self,
         aql: str,
         ehr_id: str | None = None,
         offset: int | None = None,
         fetch: int | None = None,
-    ) -> QueryResponse:
-        """Execute an AQL query via GET.
-
-        Args:
-            aql: The AQL query string.
-            ehr_id: Optional EHR ID to scope the query.
-            offset: Result offset for pagination.
-            fetch: Number of results to fetch.
-
-        Returns:
-            QueryResponse with query results.
-        """
+    ) -> _Operation[QueryResponse]:
         params: dict[str, Any] = {"q": aql}
         if ehr_id:
             params["ehr_id"] = ehr_id
@@ -919,73 +1294,95 @@ class EHRBaseClient:
         if fetch is not None:
             params["fetch"] = fetch
 
-        response = await self.client.get(
-            "/rest/openehr/v1/query/aql",
-            params=params,
-        )
+        response = yield _Request("GET", "/rest/openehr/v1/query/aql", params=params)
 
         data = self._handle_response(response)
         return QueryResponse.from_response(data)
 
     # Template Operations
 
-    async def list_templates(self) -> list[TemplateResponse]:
-        """List all available templates.
-
-        Returns:
-            List of TemplateResponse objects.
-        """
-        response = await self.client.get("/rest/openehr/v1/definition/template/adl1.4")
+    def _list_templates(self) -> _Operation[list[TemplateResponse]]:
+        response = yield _Request("GET", "/rest/openehr/v1/definition/template/adl1.4")
         data = self._handle_response(response)
 
         if isinstance(data, list):
             return [TemplateResponse.from_response(t) for t in data]
         return []
 
-    async def get_template(self, template_id: str) -> dict[str, Any]:
-        """Get a template definition.
-
-        Args:
-            template_id: The template ID.
-
-        Returns:
-            Template definition as dictionary.
-        """
-        response = await self.client.get(
-            f"/rest/openehr/v1/definition/template/adl1.4/{template_id}"
+    def _get_template(self, template_id: str) -> _Operation[dict[str, Any]]:
+        response = yield _Request(
+            "GET", f"/rest/openehr/v1/definition/template/adl1.4/{template_id}"
         )
         return self._handle_response(response)
 
-    async def get_web_template(
+    def _get_web_template(
         self,
         template_id: str,
         *,
         use_cache: bool = True,
-    ) -> dict[str, Any]:
-        """Fetch the Web Template JSON for a given template.
-
-        The Web Template is the sole authoritative source for FLAT path
-        derivation (see ADR-0005). Results are cached in memory for the
-        lifetime of the client instance.
+    ) -> _Operation[dict[str, Any]]:
+        entry = yield from self._web_template_entry(template_id, use_cache)
+        return entry.web_template
 
-        Args:
-            template_id: The template ID.
-            use_cache: If True (default), return a cached copy when available.
-                Pass False to force a fresh fetch from the CDR.
+    def _get_parsed_web_template(
+        self,
+        template_id: str,
+        *,
+        use_cache: bool = True,
+    ) -> _Operation[ParsedWebTemplate]:
+        entry = yield from self._web_template_entry(template_id, use_cache)
+        return entry.parsed
+
+    def _web_template_entry(
+        self, template_id: str, use_cache: bool
+    ) -> _Operation[CachedWebTemplate]:
+        """Return a fresh cache entry for a template, fetching or revalidating it."""
+        cached = None
+        if use_cache:
+            cached, fresh = self._cached_web_template(template_id)
+            if cached is not None and fresh:
+                return cached
+        return (yield from self._fetch_web_template_entry(template_id, cached))
+
+    def _cached_web_template(self, template_id: str) -> tuple[CachedWebTemplate | None, bool]:
+        """Look a template up in the cache, reporting the lookup to the hooks.
 
         Returns:
-            Web Template JSON dict (contains a ``tree`` key).
+            The cached entry or None, and whether the entry is fresh.
         """
-        if use_cache and template_id in self._web_template_cache:
-            return self._web_template_cache[template_id]
-
-        response = await self.client.get(
+        cache = self.web_template_cache
+        cached = cache.get(template_id)
+        if cached is not None and cached.is_fresh(cache.ttl):
+            self._cache_lookup(template_id, "hit")
+            return cached, True
+        self._cache_lookup(template_id, "miss" if cached is None else "stale")
+        return cached, False
+
+    def _cache_lookup(self, template_id: str, result: str) -> None:
+        for hook in self.hooks:
+            hook.cache_lookup("web_template", template_id, result)
+
+    def _fetch_web_template_entry(
+        self, template_id: str, cached: CachedWebTemplate | None
+    ) -> _Operation[CachedWebTemplate]:
+        """Fetch a template, or revalidate the stale ``cached`` entry, and cache it."""
+        from .template_cache import CachedWebTemplate
+
+        headers = {"Accept": "application/openehr.wt+json"}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        response = yield _Request(
+            "GET",
             f"/rest/openehr/v1/definition/template/adl1.4/{template_id}",
-            headers={"Accept": "application/openehr.wt+json"},
+            headers=headers,
         )
-        wt: dict[str, Any] = self._handle_response(response)
-        self._web_template_cache[template_id] = wt
-        return wt
+        if response.status_code == 304 and cached is not None:
+            entry = replace(cached, stored_at=time.time())
+        else:
+            wt: dict[str, Any] = self._handle_response(response)
+            entry = CachedWebTemplate(wt, etag=response.headers.get("ETag"))
+        self.web_template_cache.set(template_id, entry)
+        return entry
 
     def clear_web_template_cache(self, template_id: str | None = None) -> None:
         """Clear cached Web Templates.
@@ -995,20 +1392,13 @@ class EHRBaseClient:
                 If None, clear the entire cache.
         """
         if template_id is not None:
-            self._web_template_cache.pop(template_id, None)
+            self.web_template_cache.delete(template_id)
         else:
-            self._web_template_cache.clear()
-
-    async def upload_template(self, template_xml: str) -> TemplateResponse:
-        """Upload a new template.
-
-        Args:
-            template_xml: The OPT XML content.
+            self.web_template_cache.clear()
 
-        Returns:
-            TemplateResponse with template details.
-        """
-        response = await self.client.post(
+    def _upload_template(self, template_xml: str) -> _Operation[TemplateResponse]:
+        response = yield _Request(
+            "POST",
             "/rest/openehr/v1/definition/template/adl1.4",
             content=template_xml,
             headers={
@@ -1049,29 +1439,16 @@ class EHRBaseClient:
         data = self._handle_response(response)
         return TemplateResponse.from_response(data)
 
-    async def get_template_opt(self, template_id: str) -> str:
-        """Download the raw OPT 1.4 XML for a template.
-
-        On EHRBase, uses the standard openEHR REST endpoint with
-        ``Accept: application/xml``. On Better, uses the openEHR REST
-        endpoint which returns canonical OPT XML directly.
-
-        Args:
-            template_id: The template ID.
-
-        Returns:
-            The OPT XML content as a string.
-
-        Raises:
-            NotFoundError: If the template does not exist.
-        """
+    def _get_template_opt(self, template_id: str) -> _Operation[str]:
         if self.config.cdr_type == CDRType.BETTER:
-            response = await self.client.get(
+            response = yield _Request(
+                "GET",
                 f"/rest/openehr/v1/definition/template/adl1.4/{template_id}",
                 headers={"Accept": "application/xml"},
             )
         else:
-            response = await self.client.get(
+            response = yield _Request(
+                "GET",
                 f"/rest/openehr/v1/definition/template/adl1.4/{template_id}",
                 headers={"Accept": "application/xml"},
             )
@@ -1086,36 +1463,11 @@ class EHRBaseClient:
 
         return response.text
 
-    async def update_template(
+    def _update_template(
         self,
         template_id: str,
         template_xml: str,
-    ) -> TemplateResponse:
-        """Update an existing template.
-
-        Attempts a standard PUT. If the CDR does not support PUT
-        (neither EHRBase nor Better do today), falls back to
-        delete-and-re-upload.
-
-        Warning:
-            The delete-and-re-upload fallback is not atomic. If the
-            delete succeeds but the re-upload fails, the template will
-            be missing from the CDR. The error message will indicate
-            this so the caller can re-upload manually.
-
-        Args:
-            template_id: The template ID to update.
-            template_xml: The updated OPT 1.4 XML content.
-
-        Returns:
-            TemplateResponse with the updated template details.
-
-        Raises:
-            NotFoundError: If the template does not exist.
-            ValidationError: If the XML is invalid, or if the template
-                cannot be deleted because compositions reference it
-                (EHRBase, HTTP 409).
-        """
+    ) -> _Operation[TemplateResponse]:
         # Validate that the XML's embedded template ID matches the argument
         # to prevent deleting template A and uploading template B.
         try:
@@ -1137,7 +1489,8 @@ class EHRBaseClient:
             ) from e
 
         # Try standard PUT first (future-proofing)
-        response = await self.client.put(
+        response = yield _Request(
+            "PUT",
             f"/rest/openehr/v1/definition/template/adl1.4/{template_id}",
             content=template_xml,
             headers={
@@ -1156,11 +1509,11 @@ class EHRBaseClient:
         # PUT not supported — fall back to delete + re-upload
         if response.status_code in (405, 501):
             # Delete the existing template (may raise NotFoundError or ValidationError)
-            await self.delete_template(template_id)
+            yield from self._delete_template(template_id)
 
             # Re-upload
             try:
-                result = await self.upload_template(template_xml)
+                result = yield from self._upload_template(template_xml)
                 self.clear_web_template_cache(template_id)
                 return result
             except (ValidationError, EHRBaseError) as upload_err:
@@ -1176,56 +1529,34 @@ class EHRBaseClient:
         # Should not reach here, but satisfy type checker
         return TemplateResponse(template_id=template_id)  # pragma: no cover
 
-    async def delete_template(
+    def _delete_template(
         self,
         template_id: str,
         *,
         permanent: bool = False,
-    ) -> None:
-        """Delete a template from the CDR.
-
-        On EHRBase 2.x the standard openEHR REST endpoint does not
-        support ``DELETE`` (returns 405).  When admin credentials are
-        configured the client automatically falls back to the EHRBase
-        admin API (``/rest/admin/template/{id}``).
-
-        On Better, the default behavior retires the template
-        (soft-delete, reversible via the Admin API's unretire
-        endpoint). Pass ``permanent=True`` to permanently delete
-        via the Admin API (requires admin credentials). Note: the
-        Admin API permanently deletes **all active and inactive**
-        versions of the template.
-
-        Args:
-            template_id: The template ID to delete.
-            permanent: If True, permanently delete on Better
-                (uses Admin API). Ignored on EHRBase.
-
-        Raises:
-            NotFoundError: If the template does not exist.
-            ValidationError: If the template cannot be deleted because
-                compositions reference it (HTTP 409, EHRBase).
-            EHRBaseError: If the server does not support template deletion
-                and no admin credentials are configured.
-        """
+    ) -> _Operation[None]:
         if self.config.cdr_type == CDRType.BETTER:
             if permanent:
-                response = await self.client.delete(
+                response = yield _Request(
+                    "DELETE",
                     f"/admin/rest/v1/templates/{template_id}",
                 )
             else:
-                response = await self.client.delete(
+                response = yield _Request(
+                    "DELETE",
                     f"/rest/v1/template/{template_id}",
                 )
         else:
-            response = await self.client.delete(
+            response = yield _Request(
+                "DELETE",
                 f"/rest/openehr/v1/definition/template/adl1.4/{template_id}",
             )
 
             # EHRBase 2.x does not support DELETE on the standard endpoint.
             # Fall back to the admin API when admin credentials are available.
             if response.status_code == 405 and self.config.admin_auth:
-                response = await self.client.delete(
+                response = yield _Request(
+                    "DELETE",
                     f"/rest/admin/template/{template_id}",
                     auth=self.config.admin_auth,
                 )
@@ -1241,14 +1572,828 @@ class EHRBaseClient:
 
     # Health Check
 
-    async def health_check(self) -> bool:
+    def _health_check(self) -> _Operation[bool]:
+        try:
+            response = yield _Request("GET", "/rest/status")
+        except Exception:
+            return False
+        return response.status_code == 200
+
+
+class EHRBaseClient(_ClientOperations):
+    """Async HTTP client for EHRBase.
+
+    This client implements the openEHR REST API for EHRBase CDR.
+
+    Web Templates fetched via :meth:`get_web_template` are cached to avoid
+    repeated CDR round-trips (see ADR-0005): in memory for the lifetime of
+    the client by default, or in any backend passed as ``web_template_cache``
+    (see :mod:`oehrpy.client.template_cache`).
+
+    Example:
+        >>> config = EHRBaseConfig(
+        ...     base_url="http://localhost:8080/ehrbase",
+        ...     username="admin",
+        ...     password="admin",
+        ... )
+        >>> async with EHRBaseClient(config=config) as client:
+        ...     ehr = await client.create_ehr()
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        config: EHRBaseConfig | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        web_template_cache: WebTemplateCache | None = None,
+        hooks: Sequence[ClientHooks] = (),
+        **kwargs: Any,
+    ):
+        """Initialize the client.
+
+        Args:
+            base_url: EHRBase server URL (shortcut for config.base_url).
+            config: Full configuration object.
+            transport: Shared transport from :func:`create_transport`. Its
+                pool settings apply instead of the config's, and it is not
+                closed with the client.
+            web_template_cache: Cache backend for Web Templates. Defaults to
+                a MemoryWebTemplateCache owned by this client.
+            hooks: Event hooks notified of every request and cache lookup
+                (see :mod:`oehrpy.client.metrics`).
+            **kwargs: Additional arguments passed to EHRBaseConfig.
+        """
+        super().__init__(base_url, config, web_template_cache, hooks, **kwargs)
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._in_flight = _SingleFlight()
+
+    async def __aenter__(self) -> EHRBaseClient:
+        """Enter async context."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Exit async context."""
+        await self.close()
+
+    async def connect(self) -> None:
+        """Create the HTTP client connection."""
+        transport: httpx.AsyncBaseTransport
+        if self._transport is not None:
+            transport = _SharedTransport(self._transport)
+        else:
+            transport = create_transport(self.config)
+        if self.hooks:
+            transport = _InstrumentedTransport(transport, self.hooks, _status_error)
+        self._client = httpx.AsyncClient(
+            base_url=self.config.base_url,
+            auth=self.config.auth,
+            timeout=self.config.timeout,
+            transport=transport,
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+        )
+
+    async def close(self) -> None:
+        """Close the HTTP client connection."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the HTTP client, raising if not connected."""
+        if not self._client:
+            raise RuntimeError("Client not connected. Use 'async with' or call connect() first.")
+        return self._client
+
+    async def _perform(self, operation: _Operation[T]) -> T:
+        """Run an operation, sending its requests with the HTTP client."""
+        try:
+            request = next(operation)
+            while True:
+                try:
+                    send = getattr(self.client, request.method.lower())
+                    response = await send(request.url, **request.options())
+                except Exception as exc:
+                    request = operation.throw(exc)
+                else:
+                    request = operation.send(response)
+        except StopIteration as stop:
+            result: T = stop.value
+            return result
+
+    async def _coalesce(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Await ``call()``, sharing it with concurrent calls for the same key.
+
+        Concurrent callers receive the same result object. Disabled by
+        ``EHRBaseConfig.coalesce_requests = False``.
+        """
+        if not self.config.coalesce_requests:
+            return await call()
+        return await self._in_flight.do(key, call)
+
+    # EHR Operations
+
+    async def create_ehr(
+        self,
+        ehr_id: str | None = None,
+        subject_id: str | None = None,
+        subject_namespace: str | None = None,
+    ) -> EHRResponse:
+        """Create a new EHR.
+
+        Args:
+            ehr_id: Optional specific EHR ID to use.
+            subject_id: Optional subject external ID.
+            subject_namespace: Namespace for subject ID.
+
+        Returns:
+            EHRResponse with the created EHR details.
+        """
+        return await self._perform(self._create_ehr(ehr_id, subject_id, subject_namespace))
+
+    async def get_ehr(self, ehr_id: str) -> EHRResponse:
+        """Get an EHR by ID.
+
+        Concurrent calls for the same EHR share one request.
+
+        Args:
+            ehr_id: The EHR ID.
+
+        Returns:
+            EHRResponse with EHR details.
+        """
+        return await self._coalesce(("ehr", ehr_id), lambda: self._perform(self._get_ehr(ehr_id)))
+
+    async def get_ehr_by_subject(
+        self,
+        subject_id: str,
+        subject_namespace: str,
+    ) -> EHRResponse:
+        """Get an EHR by subject ID.
+
+        Concurrent calls for the same subject share one request.
+
+        Args:
+            subject_id: The subject external ID.
+            subject_namespace: The namespace for the subject ID.
+
+        Returns:
+            EHRResponse with EHR details.
+        """
+        return await self._coalesce(
+            ("ehr_by_subject", subject_id, subject_namespace),
+            lambda: self._perform(self._get_ehr_by_subject(subject_id, subject_namespace)),
+        )
+
+    # Composition Operations
+
+    async def create_composition(
+        self,
+        ehr_id: str,
+        composition: dict[str, Any],
+        template_id: str | None = None,
+        format: str | CompositionFormat = CompositionFormat.FLAT,
+    ) -> CompositionResponse:
+        """Create a new composition.
+
+        Args:
+            ehr_id: The EHR ID.
+            composition: The composition data.
+            template_id: Template ID (required for FLAT format).
+            format: Composition format (FLAT, CANONICAL, STRUCTURED).
+
+        Returns:
+            CompositionResponse with composition details.
+        """
+        return await self._perform(
+            self._create_composition(ehr_id, composition, template_id, format)
+        )
+
+    def create_compositions_bulk(
+        self,
+        items: Iterable[BulkCompositionItem | tuple[Any, ...]]
+        | AsyncIterable[BulkCompositionItem | tuple[Any, ...]],
+        *,
+        max_concurrency: int = 10,
+    ) -> BulkCompositionUpload:
+        """Create many compositions concurrently.
+
+        Items are pulled from ``items`` only when fewer than
+        ``max_concurrency`` requests are in flight, so large (async)
+        generators are never loaded into memory. Iterate the returned
+        object to start the upload; results are yielded in completion order.
+        Requests rejected by the server (e.g. ``ValidationError``,
+        ``PreconditionFailedError``) and transport errors are returned as
+        failed results instead of aborting the batch.
+
+        Args:
+            items: BulkCompositionItem objects or
+                ``(ehr_id, composition, template_id, format)`` tuples.
+            max_concurrency: Maximum number of requests in flight.
+
+        Returns:
+            BulkCompositionUpload yielding a BulkCompositionResult per item,
+            with running totals and throughput in its ``stats``.
+
+        Raises:
+            ValueError: If max_concurrency is less than 1.
+        """
+        from .bulk import BulkCompositionUpload
+
+        return BulkCompositionUpload(self.create_composition, items, max_concurrency)
+
+    async def get_composition(
+        self,
+        ehr_id: str,
+        composition_uid: str,
+        format: str | CompositionFormat = CompositionFormat.CANONICAL,
+    ) -> CompositionResponse:
+        """Get a composition by UID.
+
+        Args:
+            ehr_id: The EHR ID.
+            composition_uid: The composition UID (can be versioned object UID or full version UID).
+            format: Desired response format.
+
+        Returns:
+            CompositionResponse with composition data.
+        """
+        return await self._perform(self._get_composition(ehr_id, composition_uid, format))
+
+    async def update_composition(
+        self,
+        ehr_id: str,
+        versioned_object_uid: str,
+        preceding_version_uid: str,
+        composition: dict[str, Any],
+        template_id: str | None = None,
+        format: str | CompositionFormat = CompositionFormat.FLAT,
+    ) -> CompositionResponse:
+        """Update an existing composition.
+
+        Args:
+            ehr_id: The EHR ID.
+            versioned_object_uid: The composition's UUID (used in the request path).
+            preceding_version_uid: Full version string (e.g. ``uuid::domain::1``),
+                sent as the ``If-Match`` header for optimistic concurrency.
+            composition: The updated composition data.
+            template_id: Template ID.
+            format: Composition format.
+
+        Returns:
+            CompositionResponse with updated composition.
+
+        Raises:
+            PreconditionFailedError: If the preceding version UID does not match
+                the latest version (HTTP 412).
+            NotFoundError: If the composition has been deleted (HTTP 404).
+        """
+        return await self._perform(
+            self._update_composition(
+                ehr_id,
+                versioned_object_uid,
+                preceding_version_uid,
+                composition,
+                template_id,
+                format,
+            )
+        )
+
+    async def delete_composition(
+        self,
+        ehr_id: str,
+        composition_uid: str,
+    ) -> None:
+        """Delete a composition.
+
+        Args:
+            ehr_id: The EHR ID.
+            composition_uid: The composition UID.
+        """
+        await self._perform(self._delete_composition(ehr_id, composition_uid))
+
+    # Composition Versioning Operations
+
+    async def get_composition_at_time(
+        self,
+        ehr_id: str,
+        versioned_object_uid: str,
+        version_at_time: str,
+        format: str | CompositionFormat = CompositionFormat.CANONICAL,
+    ) -> CompositionResponse:
+        """Get a composition as it existed at a specific point in time.
+
+        Args:
+            ehr_id: The EHR ID.
+            versioned_object_uid: The composition's UUID.
+            version_at_time: ISO 8601 timestamp.
+            format: Desired response format.
+
+        Returns:
+            CompositionResponse with the composition at that time.
+        """
+        return await self._perform(
+            self._get_composition_at_time(ehr_id, versioned_object_uid, version_at_time, format)
+        )
+
+    async def get_versioned_composition(
+        self,
+        ehr_id: str,
+        versioned_object_uid: str,
+    ) -> VersionedCompositionResponse:
+        """Get versioned composition metadata.
+
+        Args:
+            ehr_id: The EHR ID.
+            versioned_object_uid: The composition's UUID.
+
+        Returns:
+            VersionedCompositionResponse with metadata (UID, owner ID, time created).
+        """
+        return await self._perform(self._get_versioned_composition(ehr_id, versioned_object_uid))
+
+    async def get_composition_version(
+        self,
+        ehr_id: str,
+        versioned_object_uid: str,
+        version_uid: str,
+    ) -> CompositionVersionResponse:
+        """Get a specific version of a composition.
+
+        Args:
+            ehr_id: The EHR ID.
+            versioned_object_uid: The composition's UUID.
+            version_uid: The specific version UID (e.g. ``uuid::domain::1``).
+
+        Returns:
+            CompositionVersionResponse with full version and audit metadata.
+        """
+        return await self._perform(
+            self._get_composition_version(ehr_id, versioned_object_uid, version_uid)
+        )
+
+    async def list_composition_versions(
+        self,
+        ehr_id: str,
+        versioned_object_uid: str,
+    ) -> list[CompositionVersionResponse]:
+        """List all versions of a composition.
+
+        Args:
+            ehr_id: The EHR ID.
+            versioned_object_uid: The composition's UUID.
+
+        Returns:
+            List of CompositionVersionResponse with version descriptors.
+        """
+        return await self._perform(self._list_composition_versions(ehr_id, versioned_object_uid))
+
+    # Contribution Operations
+
+    async def create_contribution(
+        self,
+        ehr_id: str,
+        contribution: dict[str, Any] | bytes,
+    ) -> ContributionResponse:
+        """Commit a contribution (atomic changeset of one or more versions).
+
+        A contribution groups one or more versioned-object changes
+        (compositions) into a single atomic commit with shared audit metadata.
+        Build the request body with :class:`~oehrpy.client.ContributionBuilder`.
+
+        Args:
+            ehr_id: The EHR ID.
+            contribution: CANONICAL contribution body (e.g. from
+                ``ContributionBuilder.build()``), or the already-encoded JSON
+                bytes from ``ContributionBuilder.build_json()``.
+
+        Returns:
+            ContributionResponse with the contribution UID and referenced
+            version UIDs.
+
+        Raises:
+            ValidationError: If the contribution is rejected by the server (422).
+            NotFoundError: If the EHR does not exist (404).
+            PreconditionFailedError: If an amendment's preceding version UID does
+                not match the latest version (412).
+        """
+        return await self._perform(self._create_contribution(ehr_id, contribution))
+
+    def create_contributions_batched(
+        self,
+        changes: Iterable[ContributionChange] | AsyncIterable[ContributionChange],
+        *,
+        max_versions: int = 100,
+        max_bytes: int | None = None,
+        max_concurrency: int = 4,
+        system_id: str | None = None,
+        committer: str | None = None,
+        description: str | None = None,
+    ) -> ContributionBatchUpload:
+        """Commit a stream of version changes as contributions of bounded size.
+
+        The changes of each EHR are grouped into contributions of at most
+        ``max_versions`` versions (and ``max_bytes`` estimated bytes), so a
+        rejected version only rolls back its own chunk. Chunks of different
+        EHRs are committed concurrently; chunks of one EHR in input order, and
+        after a failed chunk the EHR's remaining chunks are skipped.
+
+        Args:
+            changes: ContributionChange objects, possibly for many EHRs.
+            max_versions: Maximum number of versions per contribution.
+            max_bytes: Maximum estimated request body size, or None.
+            max_concurrency: Maximum number of contributions in flight.
+            system_id: ``system_id`` of the audits (see ContributionBuilder).
+            committer: Committer of each contribution's audit.
+            description: Description of each contribution's audit.
+
+        Returns:
+            ContributionBatchUpload yielding a ContributionChunkResult per
+            chunk in completion order, with running totals in its ``stats``.
+
+        Raises:
+            ValueError: If max_versions or max_concurrency is less than 1.
+        """
+        from .bulk import ContributionBatchUpload, ContributionChunker
+
+        return ContributionBatchUpload(
+            self.create_contribution,
+            changes,
+            ContributionChunker(max_versions, max_bytes),
+            max_concurrency,
+            system_id=system_id,
+            committer=committer,
+            description=description,
+        )
+
+    async def get_contribution(
+        self,
+        ehr_id: str,
+        contribution_uid: str,
+    ) -> ContributionResponse:
+        """Retrieve a contribution by UID.
+
+        Args:
+            ehr_id: The EHR ID.
+            contribution_uid: The contribution UID.
+
+        Returns:
+            ContributionResponse with audit metadata and referenced version UIDs.
+
+        Raises:
+            NotFoundError: If the contribution does not exist (404).
+        """
+        return await self._perform(self._get_contribution(ehr_id, contribution_uid))
+
+    # Query Operations
+
+    async def query(
+        self,
+        aql: str,
+        query_parameters: dict[str, Any] | None = None,
+        ehr_id: str | None = None,
+        offset: int | None = None,
+        fetch: int | None = None,
+    ) -> QueryResponse:
+        """Execute an AQL query.
+
+        Args:
+            aql: The AQL query string.
+            query_parameters: Optional query parameters.
+            ehr_id: Optional EHR ID to scope the query.
+            offset: Result offset for pagination.
+            fetch: Number of results to fetch.
+
+        Returns:
+            QueryResponse with query results.
+        """
+        return await self._perform(self._query(aql, query_parameters, ehr_id, offset, fetch))
+
+    def stream_query(
+        self,
+        aql: str,
+        query_parameters: dict[str, Any] | None = None,
+        ehr_id: str | None = None,
+        offset: int | None = None,
+        fetch: int | None = None,
+    ) -> QueryStream:
+        """Execute an AQL query, decoding result rows as they arrive.
+
+        Unlike :meth:`query`, the response body is never held in memory as a
+        whole: rows are decoded incrementally from the network stream, so
+        peak memory is proportional to one row rather than the result.
+
+        Example:
+            >>> async with client.stream_query(aql) as result:
+            ...     async for row in result:
+            ...         process(row)
+
+        Args:
+            aql: The AQL query string.
+            query_parameters: Optional query parameters.
+            ehr_id: Optional EHR ID to scope the query.
+            offset: Result offset for pagination.
+            fetch: Number of results to fetch.
+
+        Returns:
+            QueryStream to use with ``async with``; iterate it for the rows.
+            Its ``columns`` are available once the first row is yielded.
+
+        Raises:
+            EHRBaseError: On entering the context if the server rejects the
+                query, or while iterating if the response is not valid JSON.
+        """
+        from .streaming import QueryStream
+
+        request = _aql_request(aql, query_parameters, ehr_id, offset, fetch)
+        stream = self.client.stream(request.method, request.url, **request.options())
+        return QueryStream(stream, self._handle_response)
+
+    async def query_get(
+        self,
+        aql: str,
+        ehr_id: str | None = None,
+        offset: int | None = None,
+        fetch: int | None = None,
+    ) -> QueryResponse:
+        """Execute an AQL query via GET.
+
+        Args:
+            aql: The AQL query string.
+            ehr_id: Optional EHR ID to scope the query.
+            offset: Result offset for pagination.
+            fetch: Number of results to fetch.
+
+        Returns:
+            QueryResponse with query results.
+        """
+        return await self._perform(self._query_get(aql, ehr_id, offset, fetch))
+
+    async def iter_query(
+        self,
+        aql: str | AQLQuery,
+        query_parameters: dict[str, Any] | None = None,
+        ehr_id: str | None = None,
+        *,
+        page_size: int = 1000,
+        prefetch: bool = True,
+    ) -> AsyncIterator[list[Any]]:
+        """Iterate over the rows of an AQL query, one page at a time.
+
+        Only one page (two while prefetching) is held in memory. A query
+        string is paged with the ``offset``/``fetch`` request fields, so it
+        must not contain its own LIMIT. An AQLQuery is paged by rewriting its
+        LIMIT/OFFSET; an existing limit caps the total number of rows and an
+        existing offset is where paging starts.
+
+        Example:
+            >>> async for row in client.iter_query(aql, page_size=500):
+            ...     process(row)
+
+        Args:
+            aql: The AQL query string or a built AQLQuery.
+            query_parameters: Optional query parameters, merged over the
+                AQLQuery's own parameters.
+            ehr_id: Optional EHR ID to scope the query.
+            page_size: Number of rows requested per page.
+            prefetch: Request the next page while the current one is consumed.
+
+        Yields:
+            Result rows, in query order.
+
+        Raises:
+            ValueError: If page_size is less than 1.
+            EHRBaseError: If the server returns more rows than requested
+                for a page, i.e. it does not support paging the query.
+        """
+        if page_size < 1:
+            msg = f"page_size must be at least 1, got {page_size}"
+            raise ValueError(msg)
+
+        page_query, offset, remaining = _aql_pages(aql, query_parameters)
+
+        def fetch_page(offset: int, fetch: int) -> Awaitable[QueryResponse]:
+            page_aql, parameters, page_offset, page_fetch = page_query(offset, fetch)
+            return self.query(page_aql, parameters, ehr_id, page_offset, page_fetch)
+
+        def request_next() -> asyncio.Future[QueryResponse] | None:
+            size = page_size if remaining is None else min(page_size, remaining)
+            if size <= 0:
+                return None
+            return asyncio.ensure_future(fetch_page(offset, size))
+
+        pending = request_next()
+        try:
+            while pending is not None:
+                requested = page_size if remaining is None else min(page_size, remaining)
+                rows = (await pending).rows
+                pending = None
+                offset += len(rows)
+                if remaining is not None:
+                    remaining -= len(rows)
+                more = _page_full(rows, requested)
+                if more and prefetch:
+                    pending = request_next()
+                for row in rows:
+                    yield row
+                if more and not prefetch:
+                    pending = request_next()
+        finally:
+            if pending is not None:
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+
+    # Template Operations
+
+    async def list_templates(self) -> list[TemplateResponse]:
+        """List all available templates.
+
+        Returns:
+            List of TemplateResponse objects.
+        """
+        return await self._perform(self._list_templates())
+
+    async def get_template(self, template_id: str) -> dict[str, Any]:
+        """Get a template definition.
+
+        Args:
+            template_id: The template ID.
+
+        Returns:
+            Template definition as dictionary.
+        """
+        return await self._perform(self._get_template(template_id))
+
+    async def get_web_template(
+        self,
+        template_id: str,
+        *,
+        use_cache: bool = True,
+    ) -> dict[str, Any]:
+        """Fetch the Web Template JSON for a given template.
+
+        The Web Template is the sole authoritative source for FLAT path
+        derivation (see ADR-0005). Results are stored in
+        ``web_template_cache``; entries older than the cache's ``ttl`` are
+        revalidated with their ETag and only downloaded again if changed.
+        Concurrent cache misses for the same template share one request.
+
+        Args:
+            template_id: The template ID.
+            use_cache: If True (default), return a cached copy when available.
+                Pass False to force a fresh fetch from the CDR.
+
+        Returns:
+            Web Template JSON dict (contains a ``tree`` key).
+        """
+        entry = await self._get_web_template_entry(template_id, use_cache)
+        return entry.web_template
+
+    async def get_parsed_web_template(
+        self,
+        template_id: str,
+        *,
+        use_cache: bool = True,
+    ) -> ParsedWebTemplate:
+        """Fetch and parse the Web Template for a given template.
+
+        Cached like :meth:`get_web_template`; the parsed template is stored
+        with the JSON, so it is parsed once per cache entry.
+
+        Args:
+            template_id: The template ID.
+            use_cache: If True (default), return a cached copy when available.
+                Pass False to force a fresh fetch from the CDR.
+
+        Returns:
+            The parsed Web Template.
+        """
+        entry = await self._get_web_template_entry(template_id, use_cache)
+        return entry.parsed
+
+    async def _get_web_template_entry(self, template_id: str, use_cache: bool) -> CachedWebTemplate:
+        """Return a fresh cache entry for a template, fetching or revalidating it."""
+        if not use_cache:
+            return await self._perform(self._fetch_web_template_entry(template_id, None))
+        cached, fresh = self._cached_web_template(template_id)
+        if cached is not None and fresh:
+            return cached
+        return await self._coalesce(
+            ("web_template", template_id),
+            lambda: self._perform(self._fetch_web_template_entry(template_id, cached)),
+        )
+
+    async def upload_template(self, template_xml: str) -> TemplateResponse:
+        """Upload a new template.
+
+        Args:
+            template_xml: The OPT XML content.
+
+        Returns:
+            TemplateResponse with template details.
+        """
+        return await self._perform(self._upload_template(template_xml))
+
+    async def get_template_opt(self, template_id: str) -> str:
+        """Download the raw OPT 1.4 XML for a template.
+
+        On EHRBase, uses the standard openEHR REST endpoint with
+        ``Accept: application/xml``. On Better, uses the openEHR REST
+        endpoint which returns canonical OPT XML directly.
+
+        Concurrent calls for the same template share one request.
+
+        Args:
+            template_id: The template ID.
+
+        Returns:
+            The OPT XML content as a string.
+
+        Raises:
+            NotFoundError: If the template does not exist.
+        """
+        return await self._coalesce(
+            ("template_opt", template_id),
+            lambda: self._perform(self._get_template_opt(template_id)),
+        )
+
+    async def update_template(
+        self,
+        template_id: str,
+        template_xml: str,
+    ) -> TemplateResponse:
+        """Update an existing template.
+
+        Attempts a standard PUT. If the CDR does not support PUT
+        (neither EHRBase nor Better do today), falls back to
+        delete-and-re-upload.
+
+        Warning:
+            The delete-and-re-upload fallback is not atomic. If the
+            delete succeeds but the re-upload fails, the template will
+            be missing from the CDR. The error message will indicate
+            this so the caller can re-upload manually.
+
+        Args:
+            template_id: The template ID to update.
+            template_xml: The updated OPT 1.4 XML content.
+
+        Returns:
+            TemplateResponse with the updated template details.
+
+        Raises:
+            NotFoundError: If the template does not exist.
+            ValidationError: If the XML is invalid, or if the template
+                cannot be deleted because compositions reference it
+                (EHRBase, HTTP 409).
+        """
+        return await self._perform(self._update_template(template_id, template_xml))
+
+    async def delete_template(
+        self,
+        template_id: str,
+        *,
+        permanent: bool = False,
+    ) -> None:
+        """Delete a template from the CDR.
+
+        On EHRBase 2.x the standard openEHR REST endpoint does not
+        support ``DELETE`` (returns 405).  When admin credentials are
+        configured the client automatically falls back to the EHRBase
+        admin API (``/rest/admin/template/{id}``).
+
+        On Better, the default behavior retires the template
+        (soft-delete, reversible via the Admin API's unretire
+        endpoint). Pass ``permanent=True`` to permanently delete
+        via the Admin API (requires admin credentials). Note: the
+        Admin API permanently deletes **all active and inactive**
+        versions of the template.
+
+        Args:
+            template_id: The template ID to delete.
+            permanent: If True, permanently delete on Better
+                (uses Admin API). Ignored on EHRBase.
+
+        Raises:
+            NotFoundError: If the template does not exist.
+            ValidationError: If the template cannot be deleted because
+                compositions reference it (HTTP 409, EHRBase).
+            EHRBaseError: If the server does not support template deletion
+                and no admin credentials are configured.
+        """
+        await self._perform(self._delete_template(template_id, permanent=permanent))
+
+    # Health Check
+
+    async def health_check(self) -> bool:
         """Check if the server is healthy.
 
         Returns:
             True if server is healthy.
         """
-        try:
-            response = await self.client.get("/rest/status")
-            return response.status_code == 200
-        except Exception:
-            return False
+        return await self._perform(self._health_check())
@@ -0,0 +1,263 @@
+"""Client-side rate and concurrency limits.
+
+:func:`~oehrpy.client.ehrbase.create_transport` can throttle the requests of
+an :class:`~oehrpy.client.ehrbase.EHRBaseClient` per operation class, so a
+backfill does not overload a shared CDR. Each class can have:
+
+* a token-bucket rate limit (``rate`` requests per second, with bursts of up
+  to ``burst`` requests), and
+* an adaptive concurrency limit, which grows by one request per round-trip
+  while the CDR keeps up and is cut multiplicatively (AIMD) when responses
+  are slow or the CDR answers 429/503.
+
+Example::
+
+    config = EHRBaseConfig(
+        request_limits={
+            OperationClass.WRITE: RequestLimit(rate=50, concurrency=AdaptiveConcurrency()),
+            OperationClass.AQL: RequestLimit(rate=5),
+        }
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from enum import Enum
+from typing import cast
+
+import httpx
+
+from ._transport import _ReleasingStream
+
+
+class OperationClass(str, Enum):
+    """Classes of requests that are limited separately."""
+
+    WRITE = "write"  # POST, PUT and DELETE other than AQL queries
+    AQL = "aql"
+    TEMPLATE = "template"  # Template definitions, incl. uploads
+    READ = "read"  # Everything else
+
+
+def operation_class(request: httpx.Request) -> OperationClass:
+    """Return the operation class of a request."""
+    path = request.url.path
+    if "/query/" in path:
+        return OperationClass.AQL
+    if "/definition/template" in path:
+        return OperationClass.TEMPLATE
+    if request.method in ("POST", "PUT", "PATCH", "DELETE"):
+        return OperationClass.WRITE
+    return OperationClass.READ
+
+
+@dataclass(frozen=True)
+class AdaptiveConcurrency:
+    """AIMD settings for an adaptive concurrency limit.
+
+    The limit starts at ``initial_limit``. Each successful response raises
+    it by ``1 / limit``, i.e. by about one request per round-trip. A 429 or
+    503 response, a timeout, or (if ``latency_threshold`` is set) a response
+    slower than ``latency_threshold`` seconds multiplies it by
+    ``decrease_factor``, at most once per round-trip.
+    """
+
+    initial_limit: int = 8
+    min_limit: int = 1
+    max_limit: int = 64
+    latency_threshold: float | None = None
+    decrease_factor: float = 0.5
+    overload_statuses: frozenset[int] = frozenset({429, 503})
+
+
+@dataclass(frozen=True)
+class RequestLimit:
+    """Limits for one operation class; None disables the limit."""
+
+    rate: float | None = None
+    burst: int | None = None  # Defaults to max(1, rate)
+    concurrency: AdaptiveConcurrency | None = None
+
+
+class TokenBucket:
+    """Token-bucket rate limiter for asyncio tasks.
+
+    Waiters are served in arrival order.
+
+    Args:
+        rate: Tokens added per second.
+        burst: Bucket capacity, i.e. the largest burst allowed.
+        clock: Monotonic clock, in seconds.
+    """
+
+    def __init__(
+        self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if rate <= 0 or burst < 1:
+            msg = f"rate must be positive and burst at least 1, got {rate} and {burst}"
+            raise ValueError(msg)
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class AdaptiveLimiter:
+    """Concurrency limiter whose limit follows AIMD on response feedback.
+
+    Args:
+        policy: AIMD settings.
+        clock: Monotonic clock, in seconds.
+    """
+
+    def __init__(
+        self, policy: AdaptiveConcurrency, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.policy = policy
+        self.limit = float(policy.initial_limit)
+        self.in_flight = 0
+        self.clock = clock
+        self._decreased_at = float("-inf")
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    async def acquire(self) -> float:
+        """Wait for a free slot and take it.
+
+        Returns:
+            The time the slot was taken, to pass to :meth:`release`.
+        """
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return self.clock()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as we were cancelled; pass it on
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        return self.clock()
+
+    def release(self, started: float, overloaded: bool | None) -> None:
+        """Free a slot and adjust the limit.
+
+        Args:
+            started: Value returned by :meth:`acquire`.
+            overloaded: Whether the request showed the CDR is overloaded;
+                None leaves the limit unchanged (e.g. unrelated errors).
+        """
+        self.in_flight -= 1
+        policy = self.policy
+        if overloaded:
+            # Requests sent before the last cut reflect the old limit
+            if started >= self._decreased_at:
+                self.limit = max(policy.min_limit, self.limit * policy.decrease_factor)
+                self._decreased_at = self.clock()
+        elif overloaded is not None:
+            self.limit = min(policy.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class _RequestLimiter:
+    """Rate and concurrency limiters of one operation class."""
+
+    def __init__(self, limit: RequestLimit) -> None:
+        self.bucket: TokenBucket | None = None
+        if limit.rate is not None:
+            burst = limit.burst if limit.burst is not None else max(1, int(limit.rate))
+            self.bucket = TokenBucket(limit.rate, burst)
+        self.concurrency: AdaptiveLimiter | None = None
+        if limit.concurrency is not None:
+            self.concurrency = AdaptiveLimiter(limit.concurrency)
+
+
+class _LimitTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper applying per-operation-class request limits.
+
+    A concurrency slot is held from sending the request until the response
+    is closed; latency is measured up to the response headers.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        limits: Mapping[OperationClass, RequestLimit],
+    ) -> None:
+        self._transport = transport
+        self._limiters = {OperationClass(op): _RequestLimiter(lim) for op, lim in limits.items()}
+
+    def limiter(self, op: OperationClass) -> _RequestLimiter | None:
+        """Return the limiters of an operation class, if it is limited."""
+        return self._limiters.get(op)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = self._limiters.get(operation_class(request))
+        if limiter is None:
+            return await self._transport.handle_async_request(request)
+        if limiter.bucket is not None:
+            await limiter.bucket.acquire()
+        concurrency = limiter.concurrency
+        if concurrency is None:
+            return await self._transport.handle_async_request(request)
+
+        started = await concurrency.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TimeoutException:
+            concurrency.release(started, overloaded=True)
+            raise
+        except BaseException:
+            concurrency.release(started, overloaded=None)
+            raise
+        policy = concurrency.policy
+        latency = concurrency.clock() - started
+        overloaded = response.status_code in policy.overload_statuses or (
+            policy.latency_threshold is not None and latency > policy.latency_threshold
+        )
+
+        def release() -> None:
+            concurrency.release(started, overloaded)
+
+        if isinstance(response.stream, httpx.ByteStream):
+            # Body is already in memory (e.g. from a mock transport)
+            release()
+        else:
+            stream = cast(httpx.AsyncByteStream, response.stream)
+            response.stream = _ReleasingStream(stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,444 @@
+"""Request instrumentation for EHRBaseClient and SyncEHRBaseClient.
+
+Pass one or more :class:`ClientHooks` to :class:`~oehrpy.client.ehrbase.EHRBaseClient`
+or :class:`~oehrpy.client.sync.SyncEHRBaseClient` to observe every HTTP
+request it sends (endpoint, status, latency, bytes sent and received,
+retries, error class) and every Web Template cache lookup.
+:class:`MetricsCollector` is a ready-made hook that aggregates these events
+into in-memory histograms and exports them in the Prometheus text format.
+
+Endpoints are reported as path templates such as
+``/rest/openehr/v1/ehr/{id}/composition/{id}``, so identifiers do not
+create a metric per EHR.
+
+Example::
+
+    metrics = MetricsCollector()
+    async with EHRBaseClient(config=config, hooks=[metrics]) as client:
+        ...
+    print(metrics.to_prometheus())
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import cast
+
+import httpx
+
+from .limits import OperationClass, operation_class
+
+# Path segments followed by an identifier
+_ID_PARENTS = frozenset(
+    {
+        "ehr",
+        "composition",
+        "versioned_composition",
+        "version",
+        "contribution",
+        "ehr_status",
+        "versioned_ehr_status",
+        "directory",
+        "adl1.4",
+        "adl2",
+        "template",
+    }
+)
+
+# Extension key under which the retry layer records the attempt number
+ATTEMPTS_EXTENSION = "oehrpy.attempts"
+
+
+def endpoint_template(path: str) -> str:
+    """Replace the identifiers in a request path with ``{id}``."""
+    segments = path.split("/")
+    for i in range(1, len(segments)):
+        if segments[i - 1] in _ID_PARENTS and segments[i] not in _ID_PARENTS and segments[i]:
+            segments[i] = "{id}"
+    return "/".join(segments)
+
+
+@dataclass
+class RequestEvent:
+    """One HTTP request sent by the client.
+
+    ``duration`` covers sending the request up to closing the response, and
+    ``time_to_headers`` up to receiving the response headers. ``error`` is
+    the class name of the transport exception, or of the EHRBaseError the
+    client raises for an error status.
+    """
+
+    method: str
+    endpoint: str
+    operation: OperationClass
+    request_bytes: int | None
+    started: float = field(default_factory=time.perf_counter)
+    status_code: int | None = None
+    time_to_headers: float | None = None
+    duration: float | None = None
+    response_bytes: int = 0
+    attempts: int = 1
+    error: str | None = None
+
+    @property
+    def retries(self) -> int:
+        """Number of retries after the first attempt."""
+        return self.attempts - 1
+
+
+class ClientHooks:
+    """Base class for client event hooks; override the events of interest.
+
+    Hooks run inline in the request path, so they should be fast and must
+    not raise.
+    """
+
+    def request_started(self, event: RequestEvent) -> None:
+        """Called before a request is sent."""
+
+    def request_finished(self, event: RequestEvent) -> None:
+        """Called once the response is closed or the request failed."""
+
+    def cache_lookup(self, cache: str, key: str, result: str) -> None:
+        """Called on a cache lookup; ``result`` is "hit", "miss" or "stale"."""
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket upper bounds.
+
+    Args:
+        buckets: Sorted upper bounds of the buckets; +Inf is implied.
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket.
+
+        Values in the +Inf bucket are reported as the largest finite bound.
+        """
+        if not self.count:
+            return float("nan")
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if n and cumulative + n >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / n
+            cumulative += n
+        return self.buckets[-1]
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = tuple(float(4**i) for i in range(3, 14))  # 64 B to 64 MiB
+
+_Labels = tuple[tuple[str, str], ...]
+
+
+class MetricsCollector(ClientHooks):
+    """Hook aggregating request and cache events into in-memory metrics.
+
+    Args:
+        latency_buckets: Bucket bounds of latency histograms, in seconds.
+        size_buckets: Bucket bounds of size histograms, in bytes.
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+    ) -> None:
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.durations: dict[_Labels, Histogram] = {}
+        self.response_sizes: dict[_Labels, Histogram] = {}
+        self.requests: dict[_Labels, int] = {}
+        self.retries: dict[_Labels, int] = {}
+        self.errors: dict[_Labels, int] = {}
+        self.cache_lookups: dict[_Labels, int] = {}
+
+    def request_finished(self, event: RequestEvent) -> None:
+        labels: _Labels = (
+            ("operation", event.operation.value),
+            ("method", event.method),
+            ("endpoint", event.endpoint),
+        )
+        if event.duration is not None:
+            _histogram(self.durations, labels, self.latency_buckets).observe(event.duration)
+        _histogram(self.response_sizes, labels, self.size_buckets).observe(event.response_bytes)
+        status = str(event.status_code) if event.status_code is not None else "none"
+        _increment(self.requests, (*labels, ("status", status)))
+        if event.retries:
+            _increment(self.retries, labels, event.retries)
+        if event.error is not None:
+            _increment(self.errors, (*labels, ("error", event.error)))
+
+    def cache_lookup(self, cache: str, key: str, result: str) -> None:
+        _increment(self.cache_lookups, (("cache", cache), ("result", result)))
+
+    def latency_budget(self) -> list[tuple[str, str, float, int]]:
+        """Total request time per endpoint, largest first.
+
+        Returns:
+            ``(method, endpoint, total_seconds, count)`` tuples.
+        """
+        rows = [
+            (dict(labels)["method"], dict(labels)["endpoint"], h.sum, h.count)
+            for labels, h in self.durations.items()
+        ]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def to_prometheus(self, prefix: str = "oehrpy") -> str:
+        """Export all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        _export_histograms(
+            lines,
+            f"{prefix}_request_duration_seconds",
+            "Time from sending a request to closing its response.",
+            self.durations,
+        )
+        _export_histograms(
+            lines,
+            f"{prefix}_response_size_bytes",
+            "Response body size as received.",
+            self.response_sizes,
+        )
+        _export_counters(
+            lines, f"{prefix}_requests_total", "Requests by response status.", self.requests
+        )
+        _export_counters(
+            lines, f"{prefix}_request_retries_total", "Retried request attempts.", self.retries
+        )
+        _export_counters(
+            lines, f"{prefix}_request_errors_total", "Failed requests by error.", self.errors
+        )
+        _export_counters(
+            lines, f"{prefix}_cache_lookups_total", "Cache lookups by result.", self.cache_lookups
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _histogram(
+    histograms: dict[_Labels, Histogram], labels: _Labels, buckets: Sequence[float]
+) -> Histogram:
+    histogram = histograms.get(labels)
+    if histogram is None:
+        histogram = histograms[labels] = Histogram(buckets)
+    return histogram
+
+
+def _increment(counters: dict[_Labels, int], labels: _Labels, by: int = 1) -> None:
+    counters[labels] = counters.get(labels, 0) + by
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _export_counters(
+    lines: list[str], name: str, help_text: str, counters: dict[_Labels, int]
+) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    for labels, value in sorted(counters.items()):
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+
+def _export_histograms(
+    lines: list[str], name: str, help_text: str, histograms: dict[_Labels, Histogram]
+) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in sorted(histograms.items()):
+        cumulative = 0
+        bounds = [*histogram.buckets, float("inf")]
+        for bound, count in zip(bounds, histogram.counts, strict=True):
+            cumulative += count
+            bucket_labels = (*labels, ("le", _format_number(bound)))
+            lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(histogram.sum)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+
+class _CountingStream(httpx.AsyncByteStream):
+    """Response stream that counts bytes and reports the event when closed."""
+
+    def __init__(
+        self, stream: httpx.AsyncByteStream, event: RequestEvent, hooks: Sequence[ClientHooks]
+    ) -> None:
+        self._stream = stream
+        self._event = event
+        self._hooks = hooks
+        self._finished = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._event.response_bytes += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._finished:
+                self._finished = True
+                _finish(self._event, self._hooks)
+
+
+class _SyncCountingStream(httpx.SyncByteStream):
+    """Blocking counterpart of :class:`_CountingStream`."""
+
+    def __init__(
+        self, stream: httpx.SyncByteStream, event: RequestEvent, hooks: Sequence[ClientHooks]
+    ) -> None:
+        self._stream = stream
+        self._event = event
+        self._hooks = hooks
+        self._finished = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._event.response_bytes += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if not self._finished:
+                self._finished = True
+                _finish(self._event, self._hooks)
+
+
+def _start(request: httpx.Request, hooks: Sequence[ClientHooks]) -> RequestEvent:
+    length = request.headers.get("Content-Length")
+    event = RequestEvent(
+        method=request.method,
+        endpoint=endpoint_template(request.url.path),
+        operation=operation_class(request),
+        request_bytes=int(length) if length is not None else None,
+    )
+    for hook in hooks:
+        hook.request_started(event)
+    return event
+
+
+def _failed(
+    event: RequestEvent, request: httpx.Request, exc: Exception, hooks: Sequence[ClientHooks]
+) -> None:
+    event.attempts = request.extensions.get(ATTEMPTS_EXTENSION, 1)
+    event.error = type(exc).__name__
+    _finish(event, hooks)
+
+
+def _received(
+    event: RequestEvent,
+    request: httpx.Request,
+    response: httpx.Response,
+    status_error: Callable[[int], type[Exception]],
+) -> None:
+    event.time_to_headers = time.perf_counter() - event.started
+    event.attempts = request.extensions.get(ATTEMPTS_EXTENSION, 1)
+    event.status_code = response.status_code
+    if response.status_code >= 400:
+        event.error = status_error(response.status_code).__name__
+
+
+def _finish(event: RequestEvent, hooks: Sequence[ClientHooks]) -> None:
+    event.duration = time.perf_counter() - event.started
+    for hook in hooks:
+        hook.request_finished(event)
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper reporting every request to client hooks.
+
+    ``status_error`` returns the exception class the client raises for an
+    error status, whose name is reported as the request's error.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        hooks: Sequence[ClientHooks],
+        status_error: Callable[[int], type[Exception]],
+    ) -> None:
+        self._transport = transport
+        self._hooks = hooks
+        self._status_error = status_error
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        event = _start(request, self._hooks)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception as exc:
+            _failed(event, request, exc, self._hooks)
+            raise
+        _received(event, request, response, self._status_error)
+        if isinstance(response.stream, httpx.ByteStream):
+            # Body is already in memory (e.g. from a mock transport)
+            event.response_bytes = len(response.content)
+            _finish(event, self._hooks)
+        else:
+            stream = cast(httpx.AsyncByteStream, response.stream)
+            response.stream = _CountingStream(stream, event, self._hooks)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class _SyncInstrumentedTransport(httpx.BaseTransport):
+    """Blocking counterpart of :class:`_InstrumentedTransport`."""
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        hooks: Sequence[ClientHooks],
+        status_error: Callable[[int], type[Exception]],
+    ) -> None:
+        self._transport = transport
+        self._hooks = hooks
+        self._status_error = status_error
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        event = _start(request, self._hooks)
+        try:
+            response = self._transport.handle_request(request)
+        except Exception as exc:
+            _failed(event, request, exc, self._hooks)
+            raise
+        _received(event, request, response, self._status_error)
+        if isinstance(response.stream, httpx.ByteStream):
+            # Body is already in memory (e.g. from a mock transport)
+            event.response_bytes = len(response.content)
+            _finish(event, self._hooks)
+        else:
+            stream = cast(httpx.SyncByteStream, response.stream)
+            response.stream = _SyncCountingStream(stream, event, self._hooks)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
@@ -0,0 +1,237 @@
+"""Streaming decoding of AQL result sets.
+
+:meth:`EHRBaseClient.stream_query` reads the AQL response body as it arrives
+and decodes the ``rows`` array one row at a time, so memory use is bounded by
+the network chunk size plus the largest row rather than by the result size.
+The other members of the result (``q``, ``name``, ``columns``, ...) are
+small and decoded whole.
+
+Example::
+
+    async with client.stream_query(aql) as result:
+        async for row in result:
+            ...
+        print(result.column_names)
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator, Iterator
+from contextlib import AbstractAsyncContextManager
+from typing import Any
+
+import httpx
+
+from .._json_stream import JSONStreamBuffer
+from .ehrbase import EHRBaseError
+
+
+def _decode_rows(fields: dict[str, Any]) -> Generator[list[Any] | None, bytes | None, None]:
+    """Decode the rows of an AQL result set, without doing any I/O.
+
+    The decoder yields ``None`` when it needs more data, and the caller sends
+    the next chunk (``None`` at end of stream); otherwise it yields the next
+    row. :func:`iter_result_rows` and :func:`iter_result_rows_sync` drive it
+    from async and blocking streams.
+    """
+    stream = JSONStreamBuffer()
+    decode_bytes = codecs.getincrementaldecoder("utf-8")().decode
+    eof = False
+
+    def error(message: str, at: int | None = None) -> EHRBaseError:
+        where = stream.offset if at is None else at
+        return EHRBaseError(f"Invalid AQL result JSON at offset {where}: {message}")
+
+    def fill() -> Generator[None, bytes | None, bool]:
+        """Read the next chunk into the buffer; return False at end of stream."""
+        nonlocal eof
+        if eof:
+            return False
+        chunk = yield None
+        if chunk is None:
+            chunk = b""
+            eof = True
+        stream.feed(decode_bytes(chunk, final=eof))
+        return not eof
+
+    def next_char() -> Generator[None, bytes | None, str]:
+        """Skip whitespace and return the next character ("" at end of stream)."""
+        while not (char := stream.peek()) and (yield from fill()):
+            pass
+        return char
+
+    def expect(chars: str) -> Generator[None, bytes | None, str]:
+        """Consume the next character, which must be one of ``chars``."""
+        char = yield from next_char()
+        if not char or char not in chars:
+            raise error("expecting " + " or ".join(repr(c) for c in chars))
+        stream.advance()
+        return char
+
+    def decode_value() -> Generator[None, bytes | None, Any]:
+        """Decode one complete JSON value, reading more data as needed."""
+        if not (yield from next_char()):
+            raise error("expecting value")
+        while not stream.value_complete() and (yield from fill()):
+            pass
+        try:
+            return stream.decode()
+        except json.JSONDecodeError as exc:
+            raise error(exc.msg, exc.pos) from exc
+
+    yield from expect("{")
+    if (yield from next_char()) == "}":
+        stream.advance()
+        return
+    while True:
+        if (yield from next_char()) != '"':
+            raise error("expecting property name")
+        key = yield from decode_value()
+        yield from expect(":")
+        if key == "rows" and (yield from next_char()) == "[":
+            stream.advance()
+            if (yield from next_char()) == "]":
+                stream.advance()
+            else:
+                while True:
+                    yield (yield from decode_value())
+                    if (yield from expect(",]")) == "]":
+                        break
+        else:
+            fields[key] = yield from decode_value()
+        if (yield from expect(",}")) == "}":
+            break
+    if (yield from next_char()):
+        raise error("unexpected data after result")
+
+
+async def iter_result_rows(
+    chunks: AsyncIterator[bytes], fields: dict[str, Any]
+) -> AsyncGenerator[list[Any], None]:
+    """Decode the rows of an AQL result set from a stream of byte chunks.
+
+    Members of the result object other than ``rows`` are decoded whole and
+    stored in ``fields`` as they are reached; EHRBase sends ``columns``
+    before ``rows``, so they are available by the time the first row is
+    yielded.
+
+    Args:
+        chunks: UTF-8 encoded JSON, in arbitrary chunks.
+        fields: Dict to store the non-row members of the result in.
+
+    Yields:
+        Result rows, in order.
+
+    Raises:
+        EHRBaseError: If the stream is not a JSON object.
+    """
+    decoder = _decode_rows(fields)
+    try:
+        row = next(decoder)
+        while True:
+            if row is None:
+                row = decoder.send(await anext(chunks, None))
+            else:
+                yield row
+                row = next(decoder)
+    except StopIteration:
+        return
+
+
+def iter_result_rows_sync(
+    chunks: Iterator[bytes], fields: dict[str, Any]
+) -> Generator[list[Any], None, None]:
+    """Blocking variant of :func:`iter_result_rows`."""
+    decoder = _decode_rows(fields)
+    try:
+        row = next(decoder)
+        while True:
+            if row is None:
+                row = decoder.send(next(chunks, None))
+            else:
+                yield row
+                row = next(decoder)
+    except StopIteration:
+        return
+
+
+class _StreamedResult:
+    """Result-set members shared by the async and sync streamed results."""
+
+    fields: dict[str, Any]
+
+    @property
+    def name(self) -> str | None:
+        """Name of the stored query, if any."""
+        return self.fields.get("name")
+
+    @property
+    def query(self) -> str | None:
+        """The executed AQL query."""
+        return self.fields.get("q")
+
+    @property
+    def columns(self) -> list[dict[str, Any]]:
+        """Column definitions of the result set."""
+        columns: list[dict[str, Any]] = self.fields.get("columns", [])
+        return columns
+
+    @property
+    def column_names(self) -> list[str]:
+        """Column names, in column order (``col_<i>`` for unnamed columns)."""
+        return [col.get("name", f"col_{i}") for i, col in enumerate(self.columns)]
+
+
+class QueryStream(_StreamedResult):
+    """A streamed AQL result set, used as an async context manager.
+
+    Entering the context sends the query and checks the response status;
+    iterating yields rows as they are decoded. ``name``, ``query`` and
+    ``columns`` are filled in as the corresponding members of the response
+    are reached, which for EHRBase is before the first row.
+    """
+
+    def __init__(
+        self,
+        request: AbstractAsyncContextManager[httpx.Response],
+        handle_error: Callable[[httpx.Response], Any],
+    ) -> None:
+        self._request = request
+        self._handle_error = handle_error
+        self._response: httpx.Response | None = None
+        self._rows: AsyncGenerator[list[Any], None] | None = None
+        self.fields: dict[str, Any] = {}
+
+    async def __aenter__(self) -> QueryStream:
+        response = await self._request.__aenter__()
+        self._response = response
+        if response.status_code >= 400:
+            try:
+                await response.aread()
+                self._handle_error(response)
+            finally:
+                await self._request.__aexit__(None, None, None)
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if self._rows is not None:
+            await self._rows.aclose()
+        await self._request.__aexit__(exc_type, exc_val, exc_tb)
+
+    def __aiter__(self) -> AsyncIterator[list[Any]]:
+        if self._response is None:
+            raise RuntimeError("QueryStream must be entered with 'async with' before iterating")
+        if self._rows is not None:
+            raise RuntimeError("A streamed result set can only be iterated once")
+        if self._response.status_code == 204:
+            self._rows = _no_rows()
+        else:
+            self._rows = iter_result_rows(self._response.aiter_bytes(), self.fields)
+        return self._rows
+
+
+async def _no_rows() -> AsyncGenerator[list[Any], None]:
+    return
+    yield
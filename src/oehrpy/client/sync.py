@@ -0,0 +1,755 @@
+"""Synchronous EHRBase client for threaded workloads.
+
+:class:`SyncEHRBaseClient` mirrors :class:`~oehrpy.client.ehrbase.EHRBaseClient`
+method for method, but blocks instead of returning coroutines and keeps one
+``httpx.Client`` connection pool for its lifetime, so thread-pool and Celery
+workers get connection reuse without ``asyncio.run`` per call. It is safe to
+share one client between threads.
+
+Both clients build their requests and handle the responses with the same
+operations, so they return the same response models and raise the same
+errors; this client only sends the requests with a blocking HTTP client.
+
+Example::
+
+    with SyncEHRBaseClient(config=config) as client:
+        ehr = client.create_ehr()
+        result = client.query("SELECT e/ehr_id/value FROM EHR e")
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import AbstractContextManager
+from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, TypeVar
+
+import httpx
+
+from .bulk import (
+    BulkCompositionItem,
+    BulkCompositionResult,
+    BulkUploadStats,
+    ContributionBatchStats,
+    ContributionChange,
+    ContributionChunk,
+    ContributionChunker,
+    ContributionChunkResult,
+    _count,
+)
+from .contribution import ContributionTemplate
+from .ehrbase import (
+    _RETRYABLE_ERRORS,
+    CompositionResponse,
+    ContributionResponse,
+    EHRBaseClient,
+    EHRBaseConfig,
+    EHRBaseError,
+    QueryResponse,
+    RetryPolicy,
+    _aql_pages,
+    _aql_request,
+    _check_http2,
+    _ClientOperations,
+    _environment_proxy,
+    _Operation,
+    _page_full,
+    _RetryDecisions,
+    _status_error,
+)
+from .metrics import ATTEMPTS_EXTENSION, ClientHooks, _SyncInstrumentedTransport
+from .streaming import _StreamedResult, iter_result_rows_sync
+
+if TYPE_CHECKING:
+    from ..aql import AQLQuery
+    from .template_cache import WebTemplateCache
+
+P = ParamSpec("P")
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _SyncRetryTransport(_RetryDecisions, httpx.BaseTransport):
+    """Blocking counterpart of the async client's retry transport."""
+
+    def __init__(self, transport: httpx.BaseTransport, policy: RetryPolicy) -> None:
+        super().__init__(policy)
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        replayable, idempotent = self._classify(request)
+        attempt = 1
+        while True:
+            request.extensions[ATTEMPTS_EXTENSION] = attempt
+            try:
+                response = self._transport.handle_request(request)
+            except _RETRYABLE_ERRORS as exc:
+                delay = self._error_delay(exc, replayable, idempotent, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._response_delay(response, idempotent, attempt)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class _SharedSyncTransport(httpx.BaseTransport):
+    """Transport wrapper that does not close a transport owned by the caller."""
+
+    def __init__(self, transport: httpx.BaseTransport) -> None:
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._transport.handle_request(request)
+
+    def close(self) -> None:
+        pass
+
+
+def _check_sync_config(config: EHRBaseConfig) -> None:
+    """Reject the settings that only the async client's transport implements."""
+    unsupported = [
+        name
+        for name, is_set in (
+            ("max_connections_per_host", config.max_connections_per_host is not None),
+            ("circuit_breaker", config.circuit_breaker is not None),
+            ("request_limits", bool(config.request_limits)),
+        )
+        if is_set
+    ]
+    if unsupported:
+        msg = f"Not supported by the sync client: {', '.join(unsupported)}"
+        raise ValueError(msg)
+
+
+def create_sync_transport(config: EHRBaseConfig | None = None) -> httpx.BaseTransport:
+    """Create a blocking HTTP transport from a client configuration.
+
+    The blocking counterpart of :func:`~oehrpy.client.ehrbase.create_transport`:
+    pool limits, HTTP/2, TLS verification and the retry policy are applied.
+    Proxy environment variables apply to the config's ``base_url`` as they
+    do there.
+
+    Args:
+        config: Pool, HTTP/2, TLS and retry settings. Defaults to
+            EHRBaseConfig().
+
+    Returns:
+        An httpx transport for :class:`SyncEHRBaseClient` or ``httpx.Client``.
+
+    Raises:
+        ValueError: If the config sets ``max_connections_per_host``,
+            ``circuit_breaker`` or ``request_limits``, which only the async
+            client supports.
+    """
+    config = config or EHRBaseConfig()
+    _check_sync_config(config)
+    _check_http2(config)
+    transport: httpx.BaseTransport = httpx.HTTPTransport(
+        verify=config.verify_ssl,
+        http2=config.http2,
+        limits=config.limits,
+        proxy=_environment_proxy(config.base_url),
+    )
+    if config.retry is not None:
+        transport = _SyncRetryTransport(transport, config.retry)
+    return transport
+
+
+class SyncQueryStream(_StreamedResult):
+    """A streamed AQL result set of the synchronous client.
+
+    The blocking counterpart of :class:`~oehrpy.client.streaming.QueryStream`,
+    used as a context manager; rows are decoded by the same incremental parser.
+    """
+
+    def __init__(
+        self,
+        request: AbstractContextManager[httpx.Response],
+        handle_error: Callable[[httpx.Response], Any],
+    ) -> None:
+        self._request = request
+        self._handle_error = handle_error
+        self._response: httpx.Response | None = None
+        self._rows: Generator[list[Any], None, None] | None = None
+        self.fields: dict[str, Any] = {}
+
+    def __enter__(self) -> SyncQueryStream:
+        response = self._request.__enter__()
+        self._response = response
+        if response.status_code >= 400:
+            try:
+                response.read()
+                self._handle_error(response)
+            finally:
+                self._request.__exit__(None, None, None)
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if self._rows is not None:
+            self._rows.close()
+        self._request.__exit__(exc_type, exc_val, exc_tb)
+
+    def __iter__(self) -> Iterator[list[Any]]:
+        if self._response is None:
+            raise RuntimeError("SyncQueryStream must be entered with 'with' before iterating")
+        if self._rows is not None:
+            raise RuntimeError("A streamed result set can only be iterated once")
+        if self._response.status_code == 204:
+            self._rows = _no_rows()
+        else:
+            self._rows = iter_result_rows_sync(self._response.iter_bytes(), self.fields)
+        return self._rows
+
+
+def _no_rows() -> Generator[list[Any], None, None]:
+    yield from ()
+
+
+def _bounded_thread_map(
+    items: Iterable[T], worker: Callable[[int, T], R], max_concurrency: int
+) -> Generator[R, None, None]:
+    """Run ``worker(index, item)`` on a thread pool, yielding results as they complete.
+
+    The blocking counterpart of the async uploads' bounded map: at most
+    ``max_concurrency`` workers run at once, and the next item is only
+    pulled from ``items`` when a worker slot is free. Workers that have not
+    started are cancelled if the caller stops iterating early.
+    """
+    iterator = enumerate(items)
+    running: set[Future[R]] = set()
+    with ThreadPoolExecutor(max_concurrency, "oehrpy-bulk") as pool:
+        try:
+            while True:
+                for index, item in iterator:
+                    running.add(pool.submit(worker, index, item))
+                    if len(running) >= max_concurrency:
+                        break
+                if not running:
+                    return
+                done, pending = wait(running, return_when=FIRST_COMPLETED)
+                running = set(pending)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in running:
+                future.cancel()
+
+
+class SyncBulkCompositionUpload:
+    """Iterable of the results of a bulk upload by the synchronous client.
+
+    Created by :meth:`SyncEHRBaseClient.create_compositions_bulk`; requests
+    run on a thread pool and start when iteration starts. Call
+    :meth:`close` after leaving the loop early to wait for the requests
+    still in flight.
+    """
+
+    def __init__(
+        self,
+        create: Callable[..., CompositionResponse],
+        items: Iterable[BulkCompositionItem | tuple[Any, ...]],
+        max_concurrency: int,
+    ) -> None:
+        if max_concurrency < 1:
+            msg = f"max_concurrency must be at least 1, got {max_concurrency}"
+            raise ValueError(msg)
+        self._create = create
+        self._items = items
+        self._max_concurrency = max_concurrency
+        self._results: Generator[BulkCompositionResult, None, None] | None = None
+        self.stats = BulkUploadStats()
+
+    def __iter__(self) -> Iterator[BulkCompositionResult]:
+        if self._results is not None:
+            raise RuntimeError("A bulk upload can only be iterated once")
+        self._results = self._run()
+        return self._results
+
+    def close(self) -> None:
+        """Stop the upload, waiting for requests that are already in flight."""
+        if self._results is not None:
+            self._results.close()
+
+    def _run(self) -> Generator[BulkCompositionResult, None, None]:
+        start = time.perf_counter()
+        results = _bounded_thread_map(self._items, self._upload, self._max_concurrency)
+        try:
+            for result in results:
+                if result.ok:
+                    self.stats.succeeded += 1
+                else:
+                    self.stats.failed += 1
+                self.stats.elapsed = time.perf_counter() - start
+                yield result
+        finally:
+            results.close()
+            self.stats.elapsed = time.perf_counter() - start
+
+    def _upload(
+        self, index: int, item: BulkCompositionItem | tuple[Any, ...]
+    ) -> BulkCompositionResult:
+        item = BulkCompositionItem.coerce(item)
+        self.stats.submitted += 1
+        start = time.perf_counter()
+        try:
+            response = self._create(
+                ehr_id=item.ehr_id,
+                composition=item.composition,
+                template_id=item.template_id,
+                format=item.format,
+            )
+        except (EHRBaseError, httpx.HTTPError) as exc:
+            return BulkCompositionResult(
+                index, item, error=exc, duration=time.perf_counter() - start
+            )
+        return BulkCompositionResult(
+            index, item, response=response, duration=time.perf_counter() - start
+        )
+
+
+class _SyncEHRTurn:
+    """Per-EHR commit order of a blocking batched contribution upload."""
+
+    def __init__(self) -> None:
+        self.next = 0
+        self.error: Exception | None = None
+        self.condition = threading.Condition()
+
+
+class SyncContributionBatchUpload:
+    """Iterable of the per-chunk outcomes of a blocking batched contribution upload.
+
+    Created by :meth:`SyncEHRBaseClient.create_contributions_batched`; the
+    blocking counterpart of
+    :class:`~oehrpy.client.bulk.ContributionBatchUpload`, committing chunks
+    on a thread pool.
+    """
+
+    def __init__(
+        self,
+        create: Callable[[str, bytes], ContributionResponse],
+        changes: Iterable[ContributionChange],
+        chunker: ContributionChunker,
+        max_concurrency: int,
+        *,
+        system_id: str | None = None,
+        committer: str | None = None,
+        description: str | None = None,
+    ) -> None:
+        if max_concurrency < 1:
+            msg = f"max_concurrency must be at least 1, got {max_concurrency}"
+            raise ValueError(msg)
+        self._create = create
+        self._changes = changes
+        self._chunker = chunker
+        self._max_concurrency = max_concurrency
+        self._template = ContributionTemplate(
+            system_id, committer=committer, description=description
+        )
+        self._turns: dict[str, _SyncEHRTurn] = {}
+        self._lock = threading.Lock()
+        self._results: Generator[ContributionChunkResult, None, None] | None = None
+        self.stats = ContributionBatchStats()
+
+    def __iter__(self) -> Iterator[ContributionChunkResult]:
+        if self._results is not None:
+            raise RuntimeError("A batched upload can only be iterated once")
+        self._results = self._run()
+        return self._results
+
+    def close(self) -> None:
+        """Stop the upload, waiting for requests that are already in flight."""
+        if self._results is not None:
+            self._results.close()
+
+    def _chunks(self) -> Iterator[ContributionChunk]:
+        for change in self._changes:
+            yield from self._chunker.add(change)
+        yield from self._chunker.flush()
+
+    def _run(self) -> Generator[ContributionChunkResult, None, None]:
+        start = time.perf_counter()
+        results = _bounded_thread_map(self._chunks(), self._commit, self._max_concurrency)
+        try:
+            for result in results:
+                _count(self.stats, result)
+                self.stats.elapsed = time.perf_counter() - start
+                yield result
+        finally:
+            results.close()
+            self.stats.elapsed = time.perf_counter() - start
+
+    def _commit(self, index: int, chunk: ContributionChunk) -> ContributionChunkResult:
+        with self._lock:
+            self.stats.submitted += 1
+            turn = self._turns.get(chunk.ehr_id)
+            if turn is None:
+                turn = self._turns[chunk.ehr_id] = _SyncEHRTurn()
+        with turn.condition:
+            turn.condition.wait_for(lambda: turn.next == chunk.sequence)
+        try:
+            if turn.error is not None:
+                return ContributionChunkResult(index, chunk, error=turn.error, skipped=True)
+            start = time.perf_counter()
+            try:
+                response = self._create(chunk.ehr_id, chunk.build_json(self._template))
+            except (EHRBaseError, httpx.HTTPError, ValueError) as exc:
+                turn.error = exc
+                return ContributionChunkResult(
+                    index, chunk, error=exc, duration=time.perf_counter() - start
+                )
+            return ContributionChunkResult(
+                index, chunk, response=response, duration=time.perf_counter() - start
+            )
+        finally:
+            with turn.condition:
+                turn.next += 1
+                turn.condition.notify_all()
+
+
+def _blocking(
+    operation: Callable[Concatenate[_ClientOperations, P], _Operation[T]],
+) -> Callable[Concatenate[SyncEHRBaseClient, P], T]:
+    """Make a blocking SyncEHRBaseClient method that performs a client operation.
+
+    The method is named and documented like the EHRBaseClient method
+    performing the same operation.
+    """
+
+    def wrapper(self: SyncEHRBaseClient, *args: P.args, **kwargs: P.kwargs) -> T:
+        return self._perform(operation(self, *args, **kwargs))
+
+    method = getattr(EHRBaseClient, operation.__name__.removeprefix("_"))
+    return functools.update_wrapper(wrapper, method)  # type: ignore[return-value]
+
+
+class SyncEHRBaseClient(_ClientOperations):
+    """Synchronous client for EHRBase REST API.
+
+    Has the methods of :class:`~oehrpy.client.ehrbase.EHRBaseClient`,
+    blocking until the response arrives. Use as a context manager, or call
+    :meth:`connect` and :meth:`close`.
+
+    Concurrent identical reads are not coalesced; ``coalesce_requests`` is
+    ignored. ``max_connections_per_host``, ``circuit_breaker`` and
+    ``request_limits`` are only supported by the async client and rejected.
+
+    Example:
+        >>> with SyncEHRBaseClient(config=config) as client:
+        ...     ehr = client.get_ehr(ehr_id)
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        config: EHRBaseConfig | None = None,
+        transport: httpx.BaseTransport | None = None,
+        web_template_cache: WebTemplateCache | None = None,
+        hooks: Sequence[ClientHooks] = (),
+        **kwargs: Any,
+    ):
+        """Initialize the client.
+
+        Args:
+            base_url: EHRBase server URL (shortcut for config.base_url).
+            config: Full configuration object.
+            transport: Shared transport from :func:`create_sync_transport`.
+                Its pool settings apply instead of the config's, and it is
+                not closed with the client.
+            web_template_cache: Cache backend for Web Templates. Defaults to
+                a MemoryWebTemplateCache owned by this client.
+            hooks: Event hooks notified of every request and cache lookup
+                (see :mod:`oehrpy.client.metrics`).
+            **kwargs: Additional arguments passed to EHRBaseConfig.
+
+        Raises:
+            ValueError: If the config sets an option only the async client
+                supports.
+        """
+        super().__init__(base_url, config, web_template_cache, hooks, **kwargs)
+        _check_sync_config(self.config)
+        self._transport = transport
+        self._client: httpx.Client | None = None
+
+    def __enter__(self) -> SyncEHRBaseClient:
+        """Enter context."""
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Exit context."""
+        self.close()
+
+    def connect(self) -> None:
+        """Create the HTTP client connection."""
+        transport: httpx.BaseTransport
+        if self._transport is not None:
+            transport = _SharedSyncTransport(self._transport)
+        else:
+            transport = create_sync_transport(self.config)
+        if self.hooks:
+            transport = _SyncInstrumentedTransport(transport, self.hooks, _status_error)
+        self._client = httpx.Client(
+            base_url=self.config.base_url,
+            auth=self.config.auth,
+            timeout=self.config.timeout,
+            transport=transport,
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+        )
+
+    def close(self) -> None:
+        """Close the HTTP client connection."""
+        if self._client:
+            self._client.close()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.Client:
+        """Get the HTTP client, raising if not connected."""
+        if not self._client:
+            raise RuntimeError("Client not connected. Use 'with' or call connect() first.")
+        return self._client
+
+    def _perform(self, operation: _Operation[T]) -> T:
+        """Run an operation, sending its requests with the HTTP client."""
+        try:
+            request = next(operation)
+            while True:
+                try:
+                    send = getattr(self.client, request.method.lower())
+                    response = send(request.url, **request.options())
+                except Exception as exc:
+                    request = operation.throw(exc)
+                else:
+                    request = operation.send(response)
+        except StopIteration as stop:
+            result: T = stop.value
+            return result
+
+    # EHR Operations
+
+    create_ehr = _blocking(_ClientOperations._create_ehr)
+    get_ehr = _blocking(_ClientOperations._get_ehr)
+    get_ehr_by_subject = _blocking(_ClientOperations._get_ehr_by_subject)
+
+    # Composition Operations
+
+    create_composition = _blocking(_ClientOperations._create_composition)
+    get_composition = _blocking(_ClientOperations._get_composition)
+    update_composition = _blocking(_ClientOperations._update_composition)
+    delete_composition = _blocking(_ClientOperations._delete_composition)
+    get_composition_at_time = _blocking(_ClientOperations._get_composition_at_time)
+    get_versioned_composition = _blocking(_ClientOperations._get_versioned_composition)
+    get_composition_version = _blocking(_ClientOperations._get_composition_version)
+    list_composition_versions = _blocking(_ClientOperations._list_composition_versions)
+
+    def create_compositions_bulk(
+        self,
+        items: Iterable[BulkCompositionItem | tuple[Any, ...]],
+        *,
+        max_concurrency: int = 10,
+    ) -> SyncBulkCompositionUpload:
+        """Create many compositions concurrently on a thread pool.
+
+        Items are pulled from ``items`` only when fewer than
+        ``max_concurrency`` requests are in flight. Iterate the returned
+        object to start the upload; results are yielded in completion order,
+        with failures returned as results like in the async client.
+
+        Args:
+            items: BulkCompositionItem objects or
+                ``(ehr_id, composition, template_id, format)`` tuples.
+            max_concurrency: Maximum number of requests in flight.
+
+        Returns:
+            SyncBulkCompositionUpload yielding a BulkCompositionResult per
+            item, with running totals and throughput in its ``stats``.
+
+        Raises:
+            ValueError: If max_concurrency is less than 1.
+        """
+        return SyncBulkCompositionUpload(self.create_composition, items, max_concurrency)
+
+    # Contribution Operations
+
+    create_contribution = _blocking(_ClientOperations._create_contribution)
+    get_contribution = _blocking(_ClientOperations._get_contribution)
+
+    def create_contributions_batched(
+        self,
+        changes: Iterable[ContributionChange],
+        *,
+        max_versions: int = 100,
+        max_bytes: int | None = None,
+        max_concurrency: int = 4,
+        system_id: str | None = None,
+        committer: str | None = None,
+        description: str | None = None,
+    ) -> SyncContributionBatchUpload:
+        """Commit a stream of version changes as contributions of bounded size.
+
+        Chunks are formed and committed like by
+        :meth:`EHRBaseClient.create_contributions_batched`, on a thread pool.
+
+        Args:
+            changes: ContributionChange objects, possibly for many EHRs.
+            max_versions: Maximum number of versions per contribution.
+            max_bytes: Maximum estimated request body size, or None.
+            max_concurrency: Maximum number of contributions in flight.
+            system_id: ``system_id`` of the audits (see ContributionBuilder).
+            committer: Committer of each contribution's audit.
+            description: Description of each contribution's audit.
+
+        Returns:
+            SyncContributionBatchUpload yielding a ContributionChunkResult per
+            chunk in completion order, with running totals in its ``stats``.
+
+        Raises:
+            ValueError: If max_versions or max_concurrency is less than 1.
+        """
+        return SyncContributionBatchUpload(
+            self.create_contribution,
+            changes,
+            ContributionChunker(max_versions, max_bytes),
+            max_concurrency,
+            system_id=system_id,
+            committer=committer,
+            description=description,
+        )
+
+    # Query Operations
+
+    query = _blocking(_ClientOperations._query)
+    query_get = _blocking(_ClientOperations._query_get)
+
+    def stream_query(
+        self,
+        aql: str,
+        query_parameters: dict[str, Any] | None = None,
+        ehr_id: str | None = None,
+        offset: int | None = None,
+        fetch: int | None = None,
+    ) -> SyncQueryStream:
+        """Execute an AQL query, decoding result rows as they arrive.
+
+        Example:
+            >>> with client.stream_query(aql) as result:
+            ...     for row in result:
+            ...         process(row)
+
+        Args:
+            aql: The AQL query string.
+            query_parameters: Optional query parameters.
+            ehr_id: Optional EHR ID to scope the query.
+            offset: Result offset for pagination.
+            fetch: Number of results to fetch.
+
+        Returns:
+            SyncQueryStream to use with ``with``; iterate it for the rows.
+
+        Raises:
+            EHRBaseError: On entering the context if the server rejects the
+                query, or while iterating if the response is not valid JSON.
+        """
+        request = _aql_request(aql, query_parameters, ehr_id, offset, fetch)
+        stream = self.client.stream(request.method, request.url, **request.options())
+        return SyncQueryStream(stream, self._handle_response)
+
+    def iter_query(
+        self,
+        aql: str | AQLQuery,
+        query_parameters: dict[str, Any] | None = None,
+        ehr_id: str | None = None,
+        *,
+        page_size: int = 1000,
+        prefetch: bool = True,
+    ) -> Iterator[list[Any]]:
+        """Iterate over the rows of an AQL query, one page at a time.
+
+        Pages are requested like by :meth:`EHRBaseClient.iter_query`; with
+        ``prefetch`` the next page is requested on a background thread while
+        the current one is consumed.
+
+        Args:
+            aql: The AQL query string or a built AQLQuery.
+            query_parameters: Optional query parameters, merged over the
+                AQLQuery's own parameters.
+            ehr_id: Optional EHR ID to scope the query.
+            page_size: Number of rows requested per page.
+            prefetch: Request the next page while the current one is consumed.
+
+        Yields:
+            Result rows, in query order.
+
+        Raises:
+            ValueError: If page_size is less than 1.
+            EHRBaseError: If the server returns more rows than requested
+                for a page, i.e. it does not support paging the query.
+        """
+        if page_size < 1:
+            msg = f"page_size must be at least 1, got {page_size}"
+            raise ValueError(msg)
+        page_query, offset, remaining = _aql_pages(aql, query_parameters)
+
+        def fetch_page(offset: int, fetch: int) -> QueryResponse:
+            page_aql, parameters, page_offset, page_fetch = page_query(offset, fetch)
+            return self.query(page_aql, parameters, ehr_id, page_offset, page_fetch)
+
+        with ThreadPoolExecutor(1, "oehrpy-prefetch") as pool:
+
+            def request_next() -> Future[QueryResponse] | None:
+                size = page_size if remaining is None else min(page_size, remaining)
+                if size <= 0:
+                    return None
+                if prefetch:
+                    return pool.submit(fetch_page, offset, size)
+                future: Future[QueryResponse] = Future()
+                future.set_result(fetch_page(offset, size))
+                return future
+
+            pending = request_next()
+            try:
+                while pending is not None:
+                    requested = page_size if remaining is None else min(page_size, remaining)
+                    rows = pending.result().rows
+                    pending = None
+                    offset += len(rows)
+                    if remaining is not None:
+                        remaining -= len(rows)
+                    more = _page_full(rows, requested)
+                    if more and prefetch:
+                        pending = request_next()
+                    yield from rows
+                    if more and not prefetch:
+                        pending = request_next()
+            finally:
+                if pending is not None:
+                    pending.cancel()
+
+    # Template Operations
+
+    list_templates = _blocking(_ClientOperations._list_templates)
+    get_template = _blocking(_ClientOperations._get_template)
+    get_web_template = _blocking(_ClientOperations._get_web_template)
+    get_parsed_web_template = _blocking(_ClientOperations._get_parsed_web_template)
+    upload_template = _blocking(_ClientOperations._upload_template)
+    get_template_opt = _blocking(_ClientOperations._get_template_opt)
+    update_template = _blocking(_ClientOperations._update_template)
+    delete_template = _blocking(_ClientOperations._delete_template)
+
+    # Health Check
+
+    health_check = _blocking(_ClientOperations._health_check)
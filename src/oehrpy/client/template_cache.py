@@ -0,0 +1,216 @@
+"""Cache backends for Web Templates.
+
+:meth:`EHRBaseClient.get_web_template` stores every fetched Web Template in a
+cache backend together with its ``ETag`` and, once needed, its parsed
+:class:`~oehrpy.validation.web_template.ParsedWebTemplate`. Entries older
+than the backend's ``ttl`` are revalidated with ``If-None-Match``, so an
+unchanged template costs a ``304 Not Modified`` round-trip instead of a
+download and re-parse.
+
+Two backends are provided:
+
+* :class:`MemoryWebTemplateCache` — per-process LRU cache (the default).
+  Pass one instance to several clients to share it between them.
+* :class:`DiskWebTemplateCache` — directory of pickled entries, shared by
+  every process that uses the same directory (e.g. worker pools).
+
+Any object with the methods of :class:`WebTemplateCache` can be used as a
+backend.
+
+Example::
+
+    cache = DiskWebTemplateCache("/var/cache/oehrpy", ttl=3600)
+    async with EHRBaseClient(config=config, web_template_cache=cache) as client:
+        parsed = await client.get_parsed_web_template("IDCR - Vital Signs Encounter.v1")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from oehrpy.validation.web_template import ParsedWebTemplate
+
+
+@dataclass
+class CachedWebTemplate:
+    """A cached Web Template with its revalidation metadata."""
+
+    web_template: dict[str, Any]
+    etag: str | None = None
+    stored_at: float = field(default_factory=time.time)
+    _parsed: ParsedWebTemplate | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def parsed(self) -> ParsedWebTemplate:
+        """The parsed Web Template, parsed on first access."""
+        if self._parsed is None:
+            from oehrpy.validation.web_template import parse_web_template
+
+            self._parsed = parse_web_template(self.web_template)
+        return self._parsed
+
+    def is_fresh(self, ttl: float | None) -> bool:
+        """Whether the entry is younger than ``ttl`` seconds (always, if None)."""
+        return ttl is None or time.time() - self.stored_at < ttl
+
+
+class WebTemplateCache(Protocol):
+    """Interface of Web Template cache backends.
+
+    ``ttl`` is the number of seconds after which entries are revalidated
+    with the CDR, or None to use them until they are evicted or cleared.
+    """
+
+    ttl: float | None
+
+    def get(self, template_id: str) -> CachedWebTemplate | None:
+        """Return the entry for a template, fresh or stale, or None."""
+        ...
+
+    def set(self, template_id: str, entry: CachedWebTemplate) -> None:
+        """Store the entry for a template."""
+        ...
+
+    def delete(self, template_id: str) -> None:
+        """Remove the entry for a template, if any."""
+        ...
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        ...
+
+
+class MemoryWebTemplateCache:
+    """In-memory LRU cache of Web Templates, safe to share between threads.
+
+    Args:
+        max_size: Maximum number of templates kept; the least recently
+            used one is evicted first.
+        ttl: Seconds after which entries are revalidated, or None.
+    """
+
+    def __init__(self, max_size: int = 128, ttl: float | None = None) -> None:
+        if max_size < 1:
+            msg = f"max_size must be at least 1, got {max_size}"
+            raise ValueError(msg)
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, CachedWebTemplate] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, template_id: object) -> bool:
+        return template_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, template_id: str) -> CachedWebTemplate | None:
+        """Return the entry for a template and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(template_id)
+            if entry is not None:
+                self._entries.move_to_end(template_id)
+            return entry
+
+    def set(self, template_id: str, entry: CachedWebTemplate) -> None:
+        """Store the entry for a template, evicting the oldest if full."""
+        with self._lock:
+            self._entries[template_id] = entry
+            self._entries.move_to_end(template_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, template_id: str) -> None:
+        """Remove the entry for a template, if any."""
+        with self._lock:
+            self._entries.pop(template_id, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskWebTemplateCache:
+    """Directory cache of Web Templates, shared between processes.
+
+    Each template is stored as one pickle file holding the raw JSON, its
+    ETag and the parsed template, written atomically so concurrent readers
+    never see partial files. Entries are also kept in memory and only
+    re-read when their file changes. Only use a directory that is writable
+    by trusted users: the files are unpickled when read.
+
+    Args:
+        directory: Cache directory; created if missing.
+        ttl: Seconds after which entries are revalidated, or None.
+    """
+
+    _SUFFIX = ".wt.pickle"
+
+    def __init__(self, directory: str | os.PathLike[str], ttl: float | None = None) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._loaded: dict[str, tuple[int, CachedWebTemplate]] = {}
+
+    def _path(self, template_id: str) -> Path:
+        digest = hashlib.sha256(template_id.encode()).hexdigest()
+        return self.directory / f"{digest}{self._SUFFIX}"
+
+    def get(self, template_id: str) -> CachedWebTemplate | None:
+        """Return the entry for a template, reading its file if it changed."""
+        path = self._path(template_id)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._loaded.pop(template_id, None)
+            return None
+        loaded = self._loaded.get(template_id)
+        if loaded is not None and loaded[0] == mtime:
+            return loaded[1]
+        try:
+            with path.open("rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if not isinstance(entry, CachedWebTemplate):
+            return None
+        self._loaded[template_id] = (mtime, entry)
+        return entry
+
+    def set(self, template_id: str, entry: CachedWebTemplate) -> None:
+        """Parse and store the entry for a template."""
+        entry.parsed  # noqa: B018 - stored with the entry so readers skip parsing
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            path = self._path(template_id)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+        self._loaded[template_id] = (path.stat().st_mtime_ns, entry)
+
+    def delete(self, template_id: str) -> None:
+        """Remove the entry for a template, if any."""
+        self._loaded.pop(template_id, None)
+        self._path(template_id).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._loaded.clear()
+        for path in self.directory.glob(f"*{self._SUFFIX}"):
+            path.unlink(missing_ok=True)
@@ -3,15 +3,184 @@ openEHR Reference Model (RM) 1.1.0 type definitions.
 
 This module contains Pydantic models for all openEHR Reference Model classes,
 generated from the official JSON Schema specifications.
+
+The generated models live in :mod:`oehrpy.rm.rm_types` and are loaded lazily
+on first attribute access, so importing :mod:`oehrpy` (or this package) does
+not pay for defining all RM classes up front.
 """
 
-# Import all generated classes
-from .rm_types import *  # noqa: F403, F401
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    from .rm_types import *  # noqa: F403
 
-# Re-export for convenience
+# Names of all generated RM classes in rm_types (kept in sync by tests)
 __all__ = [
-    # Export all uppercase names (classes) from rm_types
-    name
-    for name in dir()
-    if not name.startswith("_") and name[0].isupper()
+    "ACCESS_GROUP_REF",
+    "ACTION",
+    "ACTIVITY",
+    "ADDRESS",
+    "ADDRESSED_MESSAGE",
+    "ADMIN_ENTRY",
+    "AGENT",
+    "ARCHETYPED",
+    "ARCHETYPE_HRID",
+    "ARCHETYPE_ID",
+    "ARRAY",
+    "ATTESTATION",
+    "AUDIT_DETAILS",
+    "CAPABILITY",
+    "CLUSTER",
+    "CODE_PHRASE",
+    "COMPOSITION",
+    "CONTACT",
+    "CONTRIBUTION",
+    "DATE",
+    "DATE_TIME",
+    "DURATION",
+    "DV_BOOLEAN",
+    "DV_CODED_TEXT",
+    "DV_COUNT",
+    "DV_DATE",
+    "DV_DATE_TIME",
+    "DV_DURATION",
+    "DV_EHR_URI",
+    "DV_GENERAL_TIME_SPECIFICATION",
+    "DV_IDENTIFIER",
+    "DV_INTERVAL",
+    "DV_MULTIMEDIA",
+    "DV_ORDINAL",
+    "DV_PARAGRAPH",
+    "DV_PARSABLE",
+    "DV_PERIODIC_TIME_SPECIFICATION",
+    "DV_PROPORTION",
+    "DV_QUANTITY",
+    "DV_SCALE",
+    "DV_STATE",
+    "DV_TEXT",
+    "DV_TIME",
+    "DV_URI",
+    "EHR",
+    "EHR_ACCESS",
+    "EHR_STATUS",
+    "ELEMENT",
+    "EVALUATION",
+    "EVENT_CONTEXT",
+    "EXTRACT",
+    "EXTRACT_ACTION_REQUEST",
+    "EXTRACT_CHAPTER",
+    "EXTRACT_ENTITY_CHAPTER",
+    "EXTRACT_ENTITY_MANIFEST",
+    "EXTRACT_FOLDER",
+    "EXTRACT_MANIFEST",
+    "EXTRACT_PARTICIPATION",
+    "EXTRACT_REQUEST",
+    "EXTRACT_SPEC",
+    "EXTRACT_UPDATE_SPEC",
+    "EXTRACT_VERSION_SPEC",
+    "FEEDER_AUDIT",
+    "FEEDER_AUDIT_DETAILS",
+    "FOLDER",
+    "GENERIC_CONTENT_ITEM",
+    "GENERIC_ENTRY",
+    "GENERIC_ID",
+    "GROUP",
+    "HIER_OBJECT_ID",
+    "HISTORY",
+    "IMPORTED_VERSION",
+    "INSTRUCTION",
+    "INSTRUCTION_DETAILS",
+    "INTERNET_ID",
+    "INTERVAL",
+    "INTERVAL_EVENT",
+    "ISM_TRANSITION",
+    "ISO8601_TYPE",
+    "ISO_OID",
+    "ITEM_LIST",
+    "ITEM_SINGLE",
+    "ITEM_TABLE",
+    "ITEM_TREE",
+    "LINK",
+    "LIST",
+    "LOCATABLE_REF",
+    "MESSAGE",
+    "OBJECT_REF",
+    "OBJECT_VERSION_ID",
+    "OBSERVATION",
+    "OPENEHR_CONTENT_ITEM",
+    "ORGANISATION",
+    "ORIGINAL_VERSION",
+    "PARTICIPATION",
+    "PARTY_IDENTIFIED",
+    "PARTY_IDENTITY",
+    "PARTY_REF",
+    "PARTY_RELATED",
+    "PARTY_RELATIONSHIP",
+    "PARTY_SELF",
+    "PERSON",
+    "POINT_EVENT",
+    "REFERENCE_RANGE",
+    "RESOURCE_DESCRIPTION",
+    "RESOURCE_DESCRIPTION_ITEM",
+    "REVISION_HISTORY",
+    "REVISION_HISTORY_ITEM",
+    "ROLE",
+    "SECTION",
+    "SET",
+    "SYNC_EXTRACT",
+    "SYNC_EXTRACT_REQUEST",
+    "SYNC_EXTRACT_SPEC",
+    "TEMPLATE_ID",
+    "TERMINOLOGY_CODE",
+    "TERMINOLOGY_ID",
+    "TERMINOLOGY_TERM",
+    "TERM_MAPPING",
+    "TIME",
+    "TRANSLATION_DETAILS",
+    "URI",
+    "UUID",
+    "VALIDITY_KIND",
+    "VERSIONED_OBJECT",
+    "VERSION_STATUS",
+    "VERSION_TREE_ID",
+    "X_CONTRIBUTION",
+    "X_VERSIONED_COMPOSITION",
+    "X_VERSIONED_EHR_ACCESS",
+    "X_VERSIONED_EHR_STATUS",
+    "X_VERSIONED_FOLDER",
+    "X_VERSIONED_OBJECT",
+    "X_VERSIONED_PARTY",
 ]
+
+_RM_TYPE_NAMES: frozenset[str] = frozenset(__all__)
+
+
+def __getattr__(name: str) -> Any:
+    """Load RM classes from the generated module on first access."""
+    if name in _RM_TYPE_NAMES:
+        from . import rm_types
+
+        value = getattr(rm_types, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def rm_type(name: str) -> type[BaseModel] | None:
+    """Return the RM class named ``name``, or None if there is no such RM type.
+
+    Like attribute access, this loads the generated RM classes on first use.
+    """
+    if name not in _RM_TYPE_NAMES:
+        return None
+    cls: type[BaseModel] = globals().get(name) or __getattr__(name)
+    return cls
+
+
+def __dir__() -> list[str]:
+    """Include the lazily loaded RM classes in dir()."""
+    return sorted(set(globals()) | _RM_TYPE_NAMES)
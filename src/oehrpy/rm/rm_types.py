@@ -21,7 +21,7 @@ class ACCESS_GROUP_REF(BaseModel):
     id: Any | None
     namespace: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ACTION(BaseModel):
@@ -47,7 +47,7 @@ class ACTION(BaseModel):
     ism_transition: ISM_TRANSITION | None
     instruction_details: INSTRUCTION_DETAILS | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ACTIVITY(BaseModel):
@@ -64,7 +64,7 @@ class ACTIVITY(BaseModel):
     timing: DV_PARSABLE | None = None
     action_archetype_id: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ADDRESS(BaseModel):
@@ -79,7 +79,7 @@ class ADDRESS(BaseModel):
     links: list[LINK] | None = None
     details: Any | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ADDRESSED_MESSAGE(BaseModel):
@@ -92,7 +92,7 @@ class ADDRESSED_MESSAGE(BaseModel):
     urgency: int | None = None
     message: MESSAGE | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ADMIN_ENTRY(BaseModel):
@@ -113,7 +113,7 @@ class ADMIN_ENTRY(BaseModel):
     workflow_id: Any | None = None
     data: Any | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class AGENT(BaseModel):
@@ -134,7 +134,7 @@ class AGENT(BaseModel):
     roles: list[PARTY_REF] | None = None
     languages: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ARCHETYPED(BaseModel):
@@ -145,7 +145,7 @@ class ARCHETYPED(BaseModel):
     template_id: TEMPLATE_ID | None = None
     rm_version: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ARCHETYPE_HRID(BaseModel):
@@ -161,7 +161,7 @@ class ARCHETYPE_HRID(BaseModel):
     version_status: VERSION_STATUS | None
     build_count: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ARCHETYPE_ID(BaseModel):
@@ -170,7 +170,7 @@ class ARCHETYPE_ID(BaseModel):
     type: str = Field(default="ARCHETYPE_ID", alias="_type")
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ARRAY(BaseModel):
@@ -178,7 +178,7 @@ class ARRAY(BaseModel):
 
     type: str = Field(default="ARRAY", alias="_type")
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ATTESTATION(BaseModel):
@@ -196,7 +196,7 @@ class ATTESTATION(BaseModel):
     reason: Any | None
     is_pending: bool
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class AUDIT_DETAILS(BaseModel):
@@ -209,7 +209,7 @@ class AUDIT_DETAILS(BaseModel):
     description: Any | None = None
     committer: Any | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class CAPABILITY(BaseModel):
@@ -225,7 +225,7 @@ class CAPABILITY(BaseModel):
     credentials: Any | None
     time_validity: DV_INTERVAL | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class CLUSTER(BaseModel):
@@ -240,7 +240,7 @@ class CLUSTER(BaseModel):
     links: list[LINK] | None = None
     items: list
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class CODE_PHRASE(BaseModel):
@@ -251,7 +251,7 @@ class CODE_PHRASE(BaseModel):
     code_string: str
     preferred_term: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class COMPOSITION(BaseModel):
@@ -271,7 +271,7 @@ class COMPOSITION(BaseModel):
     context: EVENT_CONTEXT | None = None
     content: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class CONTACT(BaseModel):
@@ -287,7 +287,7 @@ class CONTACT(BaseModel):
     time_validity: DV_INTERVAL | None = None
     addresses: list[ADDRESS] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class CONTRIBUTION(BaseModel):
@@ -298,7 +298,7 @@ class CONTRIBUTION(BaseModel):
     audit: Any | None
     versions: list
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DATE(BaseModel):
@@ -307,7 +307,7 @@ class DATE(BaseModel):
     type: str = Field(default="DATE", alias="_type")
     value: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DATE_TIME(BaseModel):
@@ -316,7 +316,7 @@ class DATE_TIME(BaseModel):
     type: str = Field(default="DATE_TIME", alias="_type")
     value: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DURATION(BaseModel):
@@ -325,7 +325,7 @@ class DURATION(BaseModel):
     type: str = Field(default="DURATION", alias="_type")
     value: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_BOOLEAN(BaseModel):
@@ -334,7 +334,7 @@ class DV_BOOLEAN(BaseModel):
     type: str = Field(default="DV_BOOLEAN", alias="_type")
     value: bool
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_CODED_TEXT(BaseModel):
@@ -349,7 +349,7 @@ class DV_CODED_TEXT(BaseModel):
     mappings: list[TERM_MAPPING] | None = None
     defining_code: CODE_PHRASE | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_COUNT(BaseModel):
@@ -364,7 +364,7 @@ class DV_COUNT(BaseModel):
     accuracy_is_percent: bool | None = None
     magnitude: int
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_DATE(BaseModel):
@@ -378,7 +378,7 @@ class DV_DATE(BaseModel):
     accuracy: DV_DURATION | None = None
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_DATE_TIME(BaseModel):
@@ -392,7 +392,7 @@ class DV_DATE_TIME(BaseModel):
     accuracy: DV_DURATION | None = None
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_DURATION(BaseModel):
@@ -407,7 +407,7 @@ class DV_DURATION(BaseModel):
     accuracy_is_percent: bool | None = None
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_EHR_URI(BaseModel):
@@ -416,7 +416,7 @@ class DV_EHR_URI(BaseModel):
     type: str = Field(default="DV_EHR_URI", alias="_type")
     value: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_GENERAL_TIME_SPECIFICATION(BaseModel):
@@ -425,7 +425,7 @@ class DV_GENERAL_TIME_SPECIFICATION(BaseModel):
     type: str = Field(default="DV_GENERAL_TIME_SPECIFICATION", alias="_type")
     value: DV_PARSABLE | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_IDENTIFIER(BaseModel):
@@ -436,7 +436,7 @@ class DV_IDENTIFIER(BaseModel):
     id: str
     assigner: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_INTERVAL(BaseModel):
@@ -448,7 +448,7 @@ class DV_INTERVAL(BaseModel):
     lower_included: bool
     upper_included: bool
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_MULTIMEDIA(BaseModel):
@@ -467,7 +467,7 @@ class DV_MULTIMEDIA(BaseModel):
     thumbnail: DV_MULTIMEDIA | None = None
     size: int
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_ORDINAL(BaseModel):
@@ -480,7 +480,7 @@ class DV_ORDINAL(BaseModel):
     value: int
     symbol: DV_CODED_TEXT | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_PARAGRAPH(BaseModel):
@@ -489,7 +489,7 @@ class DV_PARAGRAPH(BaseModel):
     type: str = Field(default="DV_PARAGRAPH", alias="_type")
     items: list
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_PARSABLE(BaseModel):
@@ -501,7 +501,7 @@ class DV_PARSABLE(BaseModel):
     value: str
     formalism: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_PERIODIC_TIME_SPECIFICATION(BaseModel):
@@ -510,7 +510,7 @@ class DV_PERIODIC_TIME_SPECIFICATION(BaseModel):
     type: str = Field(default="DV_PERIODIC_TIME_SPECIFICATION", alias="_type")
     value: DV_PARSABLE | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_PROPORTION(BaseModel):
@@ -527,7 +527,7 @@ class DV_PROPORTION(BaseModel):
     denominator: float
     precision: int | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_QUANTITY(BaseModel):
@@ -547,7 +547,7 @@ class DV_QUANTITY(BaseModel):
     units_display_name: str | None = None
     precision: int | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_SCALE(BaseModel):
@@ -564,7 +564,7 @@ class DV_SCALE(BaseModel):
     value: float
     symbol: DV_CODED_TEXT | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_STATE(BaseModel):
@@ -574,7 +574,7 @@ class DV_STATE(BaseModel):
     value: DV_CODED_TEXT | None
     is_terminal: bool
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_TEXT(BaseModel):
@@ -588,7 +588,7 @@ class DV_TEXT(BaseModel):
     formatting: str | None = None
     mappings: list[TERM_MAPPING] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_TIME(BaseModel):
@@ -602,7 +602,7 @@ class DV_TIME(BaseModel):
     accuracy: DV_DURATION | None = None
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class DV_URI(BaseModel):
@@ -611,7 +611,7 @@ class DV_URI(BaseModel):
     type: str = Field(default="DV_URI", alias="_type")
     value: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EHR(BaseModel):
@@ -628,7 +628,7 @@ class EHR(BaseModel):
     compositions: list | None = None
     contributions: list
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EHR_ACCESS(BaseModel):
@@ -642,7 +642,7 @@ class EHR_ACCESS(BaseModel):
     feeder_audit: FEEDER_AUDIT | None = None
     links: list[LINK] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EHR_STATUS(BaseModel):
@@ -660,7 +660,7 @@ class EHR_STATUS(BaseModel):
     is_modifiable: bool
     other_details: Any | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ELEMENT(BaseModel):
@@ -677,7 +677,7 @@ class ELEMENT(BaseModel):
     value: Any | None = None
     null_reason: Any | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EVALUATION(BaseModel):
@@ -700,7 +700,7 @@ class EVALUATION(BaseModel):
     guideline_id: Any | None = None
     data: Any | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EVENT_CONTEXT(BaseModel):
@@ -715,7 +715,7 @@ class EVENT_CONTEXT(BaseModel):
     setting: DV_CODED_TEXT | None
     other_context: Any | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT(BaseModel):
@@ -736,7 +736,7 @@ class EXTRACT(BaseModel):
     chapters: list | None = None
     participations: list[EXTRACT_PARTICIPATION] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT_ACTION_REQUEST(BaseModel):
@@ -752,7 +752,7 @@ class EXTRACT_ACTION_REQUEST(BaseModel):
     request_id: Any | None
     action: DV_CODED_TEXT | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT_CHAPTER(BaseModel):
@@ -767,7 +767,7 @@ class EXTRACT_CHAPTER(BaseModel):
     links: list[LINK] | None = None
     items: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT_ENTITY_CHAPTER(BaseModel):
@@ -783,7 +783,7 @@ class EXTRACT_ENTITY_CHAPTER(BaseModel):
     items: list | None = None
     extract_id_key: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT_ENTITY_MANIFEST(BaseModel):
@@ -796,7 +796,7 @@ class EXTRACT_ENTITY_MANIFEST(BaseModel):
     other_ids: list | None = None
     item_list: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT_FOLDER(BaseModel):
@@ -811,7 +811,7 @@ class EXTRACT_FOLDER(BaseModel):
     links: list[LINK] | None = None
     items: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT_MANIFEST(BaseModel):
@@ -820,7 +820,7 @@ class EXTRACT_MANIFEST(BaseModel):
     type: str = Field(default="EXTRACT_MANIFEST", alias="_type")
     entities: list[EXTRACT_ENTITY_MANIFEST] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT_PARTICIPATION(BaseModel):
@@ -832,7 +832,7 @@ class EXTRACT_PARTICIPATION(BaseModel):
     mode: DV_CODED_TEXT | None = None
     time: DV_INTERVAL | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT_REQUEST(BaseModel):
@@ -848,7 +848,7 @@ class EXTRACT_REQUEST(BaseModel):
     extract_spec: EXTRACT_SPEC | None
     update_spec: EXTRACT_UPDATE_SPEC | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT_SPEC(BaseModel):
@@ -864,7 +864,7 @@ class EXTRACT_SPEC(BaseModel):
     version_spec: EXTRACT_VERSION_SPEC | None = None
     other_details: Any | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT_UPDATE_SPEC(BaseModel):
@@ -876,7 +876,7 @@ class EXTRACT_UPDATE_SPEC(BaseModel):
     repeat_period: DV_DURATION | None = None
     update_method: CODE_PHRASE | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class EXTRACT_VERSION_SPEC(BaseModel):
@@ -888,7 +888,7 @@ class EXTRACT_VERSION_SPEC(BaseModel):
     include_revision_history: bool
     include_data: bool
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class FEEDER_AUDIT(BaseModel):
@@ -901,7 +901,7 @@ class FEEDER_AUDIT(BaseModel):
     originating_system_audit: FEEDER_AUDIT_DETAILS | None
     feeder_system_audit: FEEDER_AUDIT_DETAILS | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class FEEDER_AUDIT_DETAILS(BaseModel):
@@ -916,7 +916,7 @@ class FEEDER_AUDIT_DETAILS(BaseModel):
     version_id: str | None = None
     other_details: Any | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class FOLDER(BaseModel):
@@ -933,7 +933,7 @@ class FOLDER(BaseModel):
     items: list | None = None
     details: Any | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class GENERIC_CONTENT_ITEM(BaseModel):
@@ -962,7 +962,7 @@ class GENERIC_CONTENT_ITEM(BaseModel):
     system_id: str | None = None
     other_details: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class GENERIC_ENTRY(BaseModel):
@@ -977,7 +977,7 @@ class GENERIC_ENTRY(BaseModel):
     links: list[LINK] | None = None
     data: ITEM_TREE | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class GENERIC_ID(BaseModel):
@@ -987,7 +987,7 @@ class GENERIC_ID(BaseModel):
     value: str
     scheme: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class GROUP(BaseModel):
@@ -1008,7 +1008,7 @@ class GROUP(BaseModel):
     roles: list[PARTY_REF] | None = None
     languages: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class HIER_OBJECT_ID(BaseModel):
@@ -1017,7 +1017,7 @@ class HIER_OBJECT_ID(BaseModel):
     type: str = Field(default="HIER_OBJECT_ID", alias="_type")
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class HISTORY(BaseModel):
@@ -1036,7 +1036,7 @@ class HISTORY(BaseModel):
     summary: Any | None = None
     events: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class IMPORTED_VERSION(BaseModel):
@@ -1048,7 +1048,7 @@ class IMPORTED_VERSION(BaseModel):
     signature: str | None = None
     item: ORIGINAL_VERSION | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class INSTRUCTION(BaseModel):
@@ -1074,7 +1074,7 @@ class INSTRUCTION(BaseModel):
     wf_definition: DV_PARSABLE | None = None
     activities: list[ACTIVITY] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class INSTRUCTION_DETAILS(BaseModel):
@@ -1085,7 +1085,7 @@ class INSTRUCTION_DETAILS(BaseModel):
     wf_details: Any | None = None
     activity_id: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class INTERNET_ID(BaseModel):
@@ -1094,7 +1094,7 @@ class INTERNET_ID(BaseModel):
     type: str = Field(default="INTERNET_ID", alias="_type")
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class INTERVAL(BaseModel):
@@ -1106,7 +1106,7 @@ class INTERVAL(BaseModel):
     lower_included: bool
     upper_included: bool
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class INTERVAL_EVENT(BaseModel):
@@ -1126,7 +1126,7 @@ class INTERVAL_EVENT(BaseModel):
     sample_count: int | None = None
     math_function: DV_CODED_TEXT | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ISM_TRANSITION(BaseModel):
@@ -1138,7 +1138,7 @@ class ISM_TRANSITION(BaseModel):
     careflow_step: DV_CODED_TEXT | None = None
     reason: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ISO8601_TYPE(BaseModel):
@@ -1147,7 +1147,7 @@ class ISO8601_TYPE(BaseModel):
     type: str = Field(default="ISO8601_TYPE", alias="_type")
     value: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ISO_OID(BaseModel):
@@ -1156,7 +1156,7 @@ class ISO_OID(BaseModel):
     type: str = Field(default="ISO_OID", alias="_type")
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ITEM_LIST(BaseModel):
@@ -1171,7 +1171,7 @@ class ITEM_LIST(BaseModel):
     links: list[LINK] | None = None
     items: list[ELEMENT] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ITEM_SINGLE(BaseModel):
@@ -1186,7 +1186,7 @@ class ITEM_SINGLE(BaseModel):
     links: list[LINK] | None = None
     item: ELEMENT | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ITEM_TABLE(BaseModel):
@@ -1201,7 +1201,7 @@ class ITEM_TABLE(BaseModel):
     links: list[LINK] | None = None
     rows: list[CLUSTER] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ITEM_TREE(BaseModel):
@@ -1216,7 +1216,7 @@ class ITEM_TREE(BaseModel):
     links: list[LINK] | None = None
     items: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class LINK(BaseModel):
@@ -1226,7 +1226,7 @@ class LINK(BaseModel):
     meaning: Any | None
     target: DV_EHR_URI | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class LIST(BaseModel):
@@ -1234,7 +1234,7 @@ class LIST(BaseModel):
 
     type: str = Field(default="LIST", alias="_type")
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class LOCATABLE_REF(BaseModel):
@@ -1245,7 +1245,7 @@ class LOCATABLE_REF(BaseModel):
     namespace: str
     path: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class MESSAGE(BaseModel):
@@ -1257,7 +1257,7 @@ class MESSAGE(BaseModel):
     content: Any | None
     signature: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class OBJECT_REF(BaseModel):
@@ -1267,7 +1267,7 @@ class OBJECT_REF(BaseModel):
     id: Any | None
     namespace: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class OBJECT_VERSION_ID(BaseModel):
@@ -1276,7 +1276,7 @@ class OBJECT_VERSION_ID(BaseModel):
     type: str = Field(default="OBJECT_VERSION_ID", alias="_type")
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class OBSERVATION(BaseModel):
@@ -1300,7 +1300,7 @@ class OBSERVATION(BaseModel):
     data: HISTORY | None
     state: HISTORY | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class OPENEHR_CONTENT_ITEM(BaseModel):
@@ -1318,7 +1318,7 @@ class OPENEHR_CONTENT_ITEM(BaseModel):
     is_masked: bool | None = None
     item: Any | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ORGANISATION(BaseModel):
@@ -1339,7 +1339,7 @@ class ORGANISATION(BaseModel):
     roles: list[PARTY_REF] | None = None
     languages: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ORIGINAL_VERSION(BaseModel):
@@ -1355,7 +1355,7 @@ class ORIGINAL_VERSION(BaseModel):
     attestations: list[ATTESTATION] | None = None
     lifecycle_state: DV_CODED_TEXT | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class PARTICIPATION(BaseModel):
@@ -1367,7 +1367,7 @@ class PARTICIPATION(BaseModel):
     mode: DV_CODED_TEXT | None = None
     performer: Any | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class PARTY_IDENTIFIED(BaseModel):
@@ -1378,7 +1378,7 @@ class PARTY_IDENTIFIED(BaseModel):
     name: str | None = None
     identifiers: list[DV_IDENTIFIER] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class PARTY_IDENTITY(BaseModel):
@@ -1393,7 +1393,7 @@ class PARTY_IDENTITY(BaseModel):
     links: list[LINK] | None = None
     details: Any | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class PARTY_REF(BaseModel):
@@ -1403,7 +1403,7 @@ class PARTY_REF(BaseModel):
     id: Any | None
     namespace: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class PARTY_RELATED(BaseModel):
@@ -1415,7 +1415,7 @@ class PARTY_RELATED(BaseModel):
     identifiers: list[DV_IDENTIFIER] | None = None
     relationship: DV_CODED_TEXT | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class PARTY_RELATIONSHIP(BaseModel):
@@ -1433,7 +1433,7 @@ class PARTY_RELATIONSHIP(BaseModel):
     details: Any | None = None
     time_validity: DV_INTERVAL | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class PARTY_SELF(BaseModel):
@@ -1442,7 +1442,7 @@ class PARTY_SELF(BaseModel):
     type: str = Field(default="PARTY_SELF", alias="_type")
     external_ref: PARTY_REF | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class PERSON(BaseModel):
@@ -1463,7 +1463,7 @@ class PERSON(BaseModel):
     roles: list[PARTY_REF] | None = None
     languages: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class POINT_EVENT(BaseModel):
@@ -1480,7 +1480,7 @@ class POINT_EVENT(BaseModel):
     state: Any | None = None
     data: Any | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class REFERENCE_RANGE(BaseModel):
@@ -1490,7 +1490,7 @@ class REFERENCE_RANGE(BaseModel):
     range: DV_INTERVAL | None
     meaning: Any | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class RESOURCE_DESCRIPTION(BaseModel):
@@ -1502,7 +1502,7 @@ class RESOURCE_DESCRIPTION(BaseModel):
     resource_package_uri: str | None = None
     details: list[RESOURCE_DESCRIPTION_ITEM] | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class RESOURCE_DESCRIPTION_ITEM(BaseModel):
@@ -1517,7 +1517,7 @@ class RESOURCE_DESCRIPTION_ITEM(BaseModel):
     copyright: str | None = None
     original_resource_uri: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class REVISION_HISTORY(BaseModel):
@@ -1526,7 +1526,7 @@ class REVISION_HISTORY(BaseModel):
     type: str = Field(default="REVISION_HISTORY", alias="_type")
     items: list[REVISION_HISTORY_ITEM] | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class REVISION_HISTORY_ITEM(BaseModel):
@@ -1536,7 +1536,7 @@ class REVISION_HISTORY_ITEM(BaseModel):
     version_id: OBJECT_VERSION_ID | None
     audits: list
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class ROLE(BaseModel):
@@ -1558,7 +1558,7 @@ class ROLE(BaseModel):
     capabilities: list[CAPABILITY] | None = None
     time_validity: DV_INTERVAL | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class SECTION(BaseModel):
@@ -1573,7 +1573,7 @@ class SECTION(BaseModel):
     links: list[LINK] | None = None
     items: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class SET(BaseModel):
@@ -1581,7 +1581,7 @@ class SET(BaseModel):
 
     type: str = Field(default="SET", alias="_type")
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class SYNC_EXTRACT(BaseModel):
@@ -1597,7 +1597,7 @@ class SYNC_EXTRACT(BaseModel):
     specification: SYNC_EXTRACT_SPEC | None
     items: list[X_CONTRIBUTION] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class SYNC_EXTRACT_REQUEST(BaseModel):
@@ -1612,7 +1612,7 @@ class SYNC_EXTRACT_REQUEST(BaseModel):
     links: list[LINK] | None = None
     specification: SYNC_EXTRACT_SPEC | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class SYNC_EXTRACT_SPEC(BaseModel):
@@ -1624,7 +1624,7 @@ class SYNC_EXTRACT_SPEC(BaseModel):
     contributions_since: DV_DATE_TIME | None = None
     all_contributions: bool | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class TEMPLATE_ID(BaseModel):
@@ -1633,7 +1633,7 @@ class TEMPLATE_ID(BaseModel):
     type: str = Field(default="TEMPLATE_ID", alias="_type")
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class TERMINOLOGY_CODE(BaseModel):
@@ -1645,7 +1645,7 @@ class TERMINOLOGY_CODE(BaseModel):
     code_string: str
     uri: URI | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class TERMINOLOGY_ID(BaseModel):
@@ -1654,7 +1654,7 @@ class TERMINOLOGY_ID(BaseModel):
     type: str = Field(default="TERMINOLOGY_ID", alias="_type")
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class TERMINOLOGY_TERM(BaseModel):
@@ -1664,7 +1664,7 @@ class TERMINOLOGY_TERM(BaseModel):
     text: str
     concept: TERMINOLOGY_CODE | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class TERM_MAPPING(BaseModel):
@@ -1675,7 +1675,7 @@ class TERM_MAPPING(BaseModel):
     purpose: DV_CODED_TEXT | None = None
     target: CODE_PHRASE | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class TIME(BaseModel):
@@ -1684,7 +1684,7 @@ class TIME(BaseModel):
     type: str = Field(default="TIME", alias="_type")
     value: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class TRANSLATION_DETAILS(BaseModel):
@@ -1694,7 +1694,7 @@ class TRANSLATION_DETAILS(BaseModel):
     language: TERMINOLOGY_CODE | None
     accreditation: str | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class URI(BaseModel):
@@ -1702,7 +1702,7 @@ class URI(BaseModel):
 
     type: str = Field(default="URI", alias="_type")
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class UUID(BaseModel):
@@ -1711,7 +1711,7 @@ class UUID(BaseModel):
     type: str = Field(default="UUID", alias="_type")
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class VALIDITY_KIND(BaseModel):
@@ -1719,7 +1719,7 @@ class VALIDITY_KIND(BaseModel):
 
     type: str = Field(default="VALIDITY_KIND", alias="_type")
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class VERSIONED_OBJECT(BaseModel):
@@ -1730,7 +1730,7 @@ class VERSIONED_OBJECT(BaseModel):
     owner_id: Any | None
     time_created: DV_DATE_TIME | None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class VERSION_STATUS(BaseModel):
@@ -1738,7 +1738,7 @@ class VERSION_STATUS(BaseModel):
 
     type: str = Field(default="VERSION_STATUS", alias="_type")
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class VERSION_TREE_ID(BaseModel):
@@ -1747,7 +1747,7 @@ class VERSION_TREE_ID(BaseModel):
     type: str = Field(default="VERSION_TREE_ID", alias="_type")
     value: str
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class X_CONTRIBUTION(BaseModel):
@@ -1758,7 +1758,7 @@ class X_CONTRIBUTION(BaseModel):
     audit: Any | None
     versions: list | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class X_VERSIONED_COMPOSITION(BaseModel):
@@ -1773,7 +1773,7 @@ class X_VERSIONED_COMPOSITION(BaseModel):
     revision_history: REVISION_HISTORY | None = None
     versions: list[ORIGINAL_VERSION] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class X_VERSIONED_EHR_ACCESS(BaseModel):
@@ -1788,7 +1788,7 @@ class X_VERSIONED_EHR_ACCESS(BaseModel):
     revision_history: REVISION_HISTORY | None = None
     versions: list[ORIGINAL_VERSION] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class X_VERSIONED_EHR_STATUS(BaseModel):
@@ -1803,7 +1803,7 @@ class X_VERSIONED_EHR_STATUS(BaseModel):
     revision_history: REVISION_HISTORY | None = None
     versions: list[ORIGINAL_VERSION] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class X_VERSIONED_FOLDER(BaseModel):
@@ -1818,7 +1818,7 @@ class X_VERSIONED_FOLDER(BaseModel):
     revision_history: REVISION_HISTORY | None = None
     versions: list[ORIGINAL_VERSION] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class X_VERSIONED_OBJECT(BaseModel):
@@ -1833,7 +1833,7 @@ class X_VERSIONED_OBJECT(BaseModel):
     revision_history: REVISION_HISTORY | None = None
     versions: list[ORIGINAL_VERSION] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class X_VERSIONED_PARTY(BaseModel):
@@ -1848,17 +1848,4 @@ class X_VERSIONED_PARTY(BaseModel):
     revision_history: REVISION_HISTORY | None = None
     versions: list[ORIGINAL_VERSION] | None = None
 
-    model_config = ConfigDict(populate_by_name=True)
-
-
-# Rebuild all models to resolve forward references
-import sys as _sys
-
-_module = _sys.modules[__name__]
-for _name in dir(_module):
-    _obj = getattr(_module, _name)
-    if isinstance(_obj, type) and issubclass(_obj, BaseModel) and _obj is not BaseModel:
-        try:
-            _obj.model_rebuild()
-        except Exception:
-            pass  # Skip if rebuild fails
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
@@ -6,6 +6,7 @@ openEHR RM objects to/from various formats:
 
 - Canonical JSON: Standard openEHR JSON with _type discriminator
 - FLAT format: Simplified format used by EHRBase
+- Template-aware conversion between FLAT and canonical JSON
 """
 
 from .canonical import (
@@ -14,11 +15,17 @@ from .canonical import (
     register_type,
     to_canonical,
 )
+from .converter import (
+    FlatConverter,
+    clear_converter_cache,
+    get_converter,
+)
 from .flat import (
     FlatBuilder,
     FlatContext,
     FlatPath,
     flatten_dict,
+    iter_flat,
     unflatten_dict,
 )
 
@@ -33,5 +40,10 @@ __all__ = [
     "FlatContext",
     "FlatPath",
     "flatten_dict",
+    "iter_flat",
     "unflatten_dict",
+    # FLAT <-> canonical conversion
+    "FlatConverter",
+    "get_converter",
+    "clear_converter_cache",
 ]
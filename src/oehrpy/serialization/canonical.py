@@ -27,7 +27,9 @@ Example:
 
 from __future__ import annotations
 
-from typing import Any, TypeVar
+from collections.abc import Callable
+from types import UnionType
+from typing import Any, TypeVar, Union, get_args, get_origin
 
 from pydantic import BaseModel
 
@@ -52,23 +54,35 @@ def register_type(cls: type[T]) -> type[T]:
 
 
 def get_type_registry() -> dict[str, type[BaseModel]]:
-    """Get a copy of the type registry."""
+    """Get a copy of the type registry, including all RM classes."""
+    _build_registry()
     return _TYPE_REGISTRY.copy()
 
 
 def _build_registry() -> None:
-    """Build the type registry from all RM classes."""
-    if _TYPE_REGISTRY:
-        return  # Already built
-
-    # Import all RM types and register them
+    """Register all RM classes that have not been looked up yet."""
     from oehrpy import rm
 
-    for name in dir(rm):
-        cls = getattr(rm, name)
-        if isinstance(cls, type) and issubclass(cls, BaseModel) and cls is not BaseModel:
-            type_name = getattr(cls, "_type_", name)
+    for name in rm.__all__:
+        if name not in _TYPE_REGISTRY:
+            _lookup_type(name)
+
+
+def _lookup_type(type_name: str) -> type[BaseModel] | None:
+    """Look up the class for a `_type`, registering RM classes on demand.
+
+    Explicitly registered types take precedence over RM classes. Only the
+    RM classes actually encountered are resolved, so deserializing does not
+    require building the registry for all RM types up front.
+    """
+    cls = _TYPE_REGISTRY.get(type_name)
+    if cls is None:
+        from oehrpy import rm
+
+        cls = rm.rm_type(type_name)
+        if cls is not None:
             _TYPE_REGISTRY[type_name] = cls
+    return cls
 
 
 def to_canonical(
@@ -82,6 +96,10 @@ def to_canonical(
     The canonical format includes a `_type` field at the root level and
     recursively in any nested objects that have a _type_ class attribute.
 
+    Serialization runs in a single pass using a per-class serializer that is
+    compiled on first use and cached (see :func:`_get_serializer`), so `_type`
+    is emitted inline rather than spliced in by a second walk.
+
     Args:
         obj: The Pydantic model to serialize.
         exclude_none: Whether to exclude None values from output.
@@ -90,6 +108,110 @@ def to_canonical(
     Returns:
         A dictionary suitable for JSON serialization.
     """
+    return _get_serializer(type(obj))(obj, exclude_none, by_alias)
+
+
+# Compiled serializers: maps model class to its single-pass serializer
+_Serializer = Callable[[BaseModel, bool, bool], dict[str, Any]]
+_SERIALIZERS: dict[type[BaseModel], _Serializer] = {}
+
+# Annotations whose values never contain nested models and can be copied as-is
+_SCALAR_TYPES: frozenset[Any] = frozenset({str, int, float, bool, type(None)})
+
+
+def _get_serializer(cls: type[BaseModel]) -> _Serializer:
+    """Get the compiled serializer for a model class, compiling it on first use."""
+    serializer = _SERIALIZERS.get(cls)
+    if serializer is None:
+        serializer = _compile_serializer(cls)
+        _SERIALIZERS[cls] = serializer
+    return serializer
+
+
+def _is_scalar_annotation(annotation: Any) -> bool:
+    """Check whether a field annotation only admits scalar values."""
+    if annotation in _SCALAR_TYPES:
+        return True
+    args = get_args(annotation)
+    return (
+        bool(args)
+        and get_origin(annotation) in (Union, UnionType)
+        and all(arg in _SCALAR_TYPES for arg in args)
+    )
+
+
+def _has_custom_serialization(cls: type[BaseModel]) -> bool:
+    """Check whether a model customizes model_dump beyond plain field output."""
+    decorators = cls.__pydantic_decorators__
+    if decorators.field_serializers or decorators.model_serializers:
+        return True
+    if cls.model_computed_fields or cls.model_config.get("extra") == "allow":
+        return True
+    return any(info.exclude for info in cls.model_fields.values())
+
+
+def _compile_serializer(cls: type[BaseModel]) -> _Serializer:
+    """Compile a single-pass canonical JSON serializer for a model class.
+
+    The field plan (attribute name, output key, whether the value can contain
+    nested models) is computed once per class. Models that customize their
+    serialization fall back to :func:`_to_canonical_via_model_dump`.
+    """
+    if _has_custom_serialization(cls):
+        return _to_canonical_via_model_dump
+
+    type_name = getattr(cls, "_type_", cls.__name__)
+    name_plan: list[tuple[str, str, bool]] = []
+    alias_plan: list[tuple[str, str, bool]] = []
+    for name, info in cls.model_fields.items():
+        scalar = _is_scalar_annotation(info.annotation)
+        name_plan.append((name, name, scalar))
+        alias_plan.append((name, info.serialization_alias or info.alias or name, scalar))
+    plans = (tuple(name_plan), tuple(alias_plan))
+
+    def serialize(obj: BaseModel, exclude_none: bool, by_alias: bool) -> dict[str, Any]:
+        result: dict[str, Any] = {"_type": type_name}
+        values = obj.__dict__
+        for name, key, scalar in plans[by_alias]:
+            value = values[name]
+            if value is None:
+                if exclude_none:
+                    continue
+            elif not scalar:
+                value = _serialize_value(value, exclude_none, by_alias)
+            result[key] = value
+        return result
+
+    return serialize
+
+
+def _serialize_value(value: Any, exclude_none: bool, by_alias: bool) -> Any:
+    """Serialize a field value that may contain nested models.
+
+    Containers are copied so the output never aliases the model's own state.
+    Unlike ``model_dump``, models nested inside plain dicts also get a `_type`.
+    """
+    if isinstance(value, BaseModel):
+        return _get_serializer(type(value))(value, exclude_none, by_alias)
+    if isinstance(value, list):
+        return [_serialize_value(item, exclude_none, by_alias) for item in value]
+    if isinstance(value, dict):
+        return {k: _serialize_value(v, exclude_none, by_alias) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return tuple(_serialize_value(item, exclude_none, by_alias) for item in value)
+    return value
+
+
+def _to_canonical_via_model_dump(
+    obj: BaseModel,
+    exclude_none: bool = True,
+    by_alias: bool = False,
+) -> dict[str, Any]:
+    """Serialize via ``model_dump`` and a second pass that adds `_type` fields.
+
+    Used for models with custom serializers, which the compiled serializers
+    cannot reproduce.
+    """
     data = obj.model_dump(exclude_none=exclude_none, by_alias=by_alias)
 
     # Add _type field
@@ -147,7 +269,12 @@ def from_canonical(
     """Deserialize canonical JSON to a Pydantic model.
 
     Uses the `_type` field to determine the correct class for polymorphic
-    deserialization.
+    deserialization. Nested nodes in untyped (``Any``) fields, such as the
+    ITEM_TREE/CLUSTER/ELEMENT hierarchy and DV_* values, are resolved to
+    their RM classes as well instead of being left as plain dicts.
+
+    The input is never mutated; subtrees without typed nodes are shared
+    with the input rather than copied.
 
     Args:
         data: The canonical JSON data.
@@ -160,17 +287,15 @@ def from_canonical(
     Raises:
         ValueError: If the _type is not recognized or doesn't match expected_type.
     """
-    _build_registry()
-
     # Get the type from the data
     type_name = data.get("_type")
     if not type_name:
         if expected_type:
-            return expected_type.model_validate(data)
+            return _validate_node(data, expected_type)
         raise ValueError("Missing _type field in canonical JSON data")
 
     # Look up the class
-    cls = _TYPE_REGISTRY.get(type_name)
+    cls = _lookup_type(type_name)
     if not cls:
         raise ValueError(f"Unknown type: {type_name}")
 
@@ -178,26 +303,116 @@ def from_canonical(
     if expected_type and not issubclass(cls, expected_type):
         raise ValueError(f"Type mismatch: expected {expected_type.__name__}, got {type_name}")
 
-    # Remove _type field from data before validation
-    clean_data = {k: v for k, v in data.items() if k != "_type"}
-
-    # Recursively process nested objects
-    _process_nested_types(clean_data)
-
-    return cls.model_validate(clean_data)
-
-
-def _process_nested_types(data: dict[str, Any]) -> None:
-    """Recursively remove _type fields from nested data."""
-    for _key, value in data.items():
-        if isinstance(value, dict):
-            # Remove _type and recurse
-            if "_type" in value:
-                value.pop("_type")
-            _process_nested_types(value)
-        elif isinstance(value, list):
-            for item in value:
-                if isinstance(item, dict):
-                    if "_type" in item:
-                        item.pop("_type")
-                    _process_nested_types(item)
+    return _validate_node(data, cls)
+
+
+# Compiled field resolvers: maps model class to {input key: resolver} for
+# fields whose values can hold nested canonical nodes
+_Resolver = Callable[[Any], Any]
+_FIELD_RESOLVERS: dict[type[BaseModel], dict[str, _Resolver]] = {}
+
+
+def _get_field_resolvers(cls: type[BaseModel]) -> dict[str, _Resolver]:
+    """Get the field resolvers for a model class, compiling them on first use."""
+    resolvers = _FIELD_RESOLVERS.get(cls)
+    if resolvers is None:
+        if not cls.__pydantic_complete__:
+            # RM models defer schema building; resolve forward references now
+            cls.model_rebuild()
+        resolvers = {}
+        for name, info in cls.model_fields.items():
+            resolver = _compile_resolver(info.annotation)
+            if resolver is not None:
+                resolvers[name] = resolver
+                if info.alias:
+                    resolvers[info.alias] = resolver
+        _FIELD_RESOLVERS[cls] = resolvers
+    return resolvers
+
+
+def _compile_resolver(annotation: Any) -> _Resolver | None:
+    """Build the resolver for a field annotation, or None for scalar fields."""
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return _resolve_any
+        annotation = args[0]
+
+    if annotation in _SCALAR_TYPES:
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        declared = annotation
+        return lambda value: _resolve_model(value, declared)
+    if annotation is list or get_origin(annotation) is list:
+        item_args = get_args(annotation)
+        if item_args and item_args[0] in _SCALAR_TYPES:
+            return None
+        if item_args and isinstance(item_args[0], type) and issubclass(item_args[0], BaseModel):
+            item_cls = item_args[0]
+            return lambda value: (
+                [_resolve_model(item, item_cls) for item in value]
+                if isinstance(value, list)
+                else value
+            )
+    return _resolve_any
+
+
+def _resolve_model(value: Any, declared: type[BaseModel]) -> Any:
+    """Resolve a value for a field declared with a concrete model class.
+
+    A `_type` naming a subclass of the declared class takes precedence.
+    """
+    if not isinstance(value, dict):
+        return value
+    type_name = value.get("_type")
+    cls = (_lookup_type(type_name) if type_name else None) or declared
+    if cls is not declared and not issubclass(cls, declared):
+        cls = declared
+    return _validate_node(value, cls)
+
+
+def _resolve_any(value: Any) -> Any:
+    """Resolve a value for an untyped field via the `_type` dispatch table.
+
+    Dicts with a registered `_type` become model instances. Other containers
+    are only copied when something inside them was resolved.
+    """
+    if isinstance(value, dict):
+        type_name = value.get("_type")
+        cls = _lookup_type(type_name) if type_name else None
+        if cls is not None:
+            return _validate_node(value, cls)
+        resolved_dict: dict[str, Any] | None = None
+        for key, item in value.items():
+            resolved = _resolve_any(item)
+            if resolved is not item:
+                if resolved_dict is None:
+                    resolved_dict = dict(value)
+                resolved_dict[key] = resolved
+        return value if resolved_dict is None else resolved_dict
+    if isinstance(value, list):
+        resolved_list: list[Any] | None = None
+        for i, item in enumerate(value):
+            resolved = _resolve_any(item)
+            if resolved is not item:
+                if resolved_list is None:
+                    resolved_list = list(value)
+                resolved_list[i] = resolved
+        return value if resolved_list is None else resolved_list
+    return value
+
+
+def _validate_node(data: dict[str, Any], cls: type[T]) -> T:
+    """Validate a canonical JSON node as ``cls`` after resolving nested nodes.
+
+    Nested nodes are validated bottom-up in the same walk, so pydantic only
+    sees already-built instances for them.
+    """
+    resolvers = _get_field_resolvers(cls)
+    values: dict[str, Any] = {}
+    for key, value in data.items():
+        if key == "_type":
+            continue
+        resolver = resolvers.get(key)
+        values[key] = value if resolver is None or value is None else resolver(value)
+    return cls.model_validate(values)
@@ -0,0 +1,627 @@
+"""
+Template-aware conversion between FLAT and canonical JSON.
+
+A FlatConverter compiles a parsed Web Template into a conversion plan once
+and then converts compositions in-process, without a round-trip through
+the CDR. Plans are cached per template ID by :func:`get_converter`.
+
+Example:
+    >>> from oehrpy.serialization import get_converter
+    >>> from oehrpy.validation import parse_web_template
+    >>>
+    >>> converter = get_converter(parse_web_template(wt_json))
+    >>> canonical = converter.to_canonical(flat_composition)
+    >>> flat = converter.to_flat(canonical)
+
+The plan follows each node's ``aqlPath``, so RM structures the Web
+Template collapses (e.g. HISTORY, ITEM_TREE and the ELEMENT around a
+single-typed value) are recreated in canonical JSON. The conversion is
+structural: apart from mandatory PARTY_PROXY nodes (such as an entry's
+``subject``), which default to PARTY_SELF, values a CDR derives from
+defaults (such as an entry's ``encoding``) are not added.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .flat import FlatPath
+
+if TYPE_CHECKING:
+    from oehrpy.client.ehrbase import EHRBaseClient
+    from oehrpy.validation.web_template import ParsedWebTemplate, WebTemplateNode
+
+# RM version recorded in archetype_details of archetype roots
+_RM_VERSION = "1.1.0"
+
+# One step of an AQL path, e.g. "/items[at0004]" or "/events[at0006 and name/value='Any']"
+_AQL_STEP_RE = re.compile(r"/(\w+)(?:\[([^\s,\]]+)([^\]]*)\])?")
+
+# Name predicate of an AQL step, e.g. " and name/value='Any'"
+_AQL_NAME_RE = re.compile(r"name/value\s*=\s*'([^']*)'")
+
+# Attributes of the ELEMENT the Web Template collapses into its value node
+_ELEMENT_ATTRIBUTES = ("value", "null_flavour")
+
+# RM attributes that hold a list of objects
+_LIST_ATTRIBUTES = frozenset(
+    {"activities", "content", "events", "items", "other_participations", "participations", "rows"}
+)
+
+# Concrete RM types to create for abstract Web Template types
+_CONCRETE_RM_TYPES = {
+    "EVENT": "POINT_EVENT",
+    "ITEM_STRUCTURE": "ITEM_TREE",
+    "PARTY_PROXY": "PARTY_SELF",
+}
+
+# RM types of structures the Web Template omits, by (parent RM type, attribute)
+_IMPLIED_RM_TYPES = {
+    ("OBSERVATION", "data"): "HISTORY",
+    ("HISTORY", "events"): "POINT_EVENT",
+    ("INSTRUCTION", "activities"): "ACTIVITY",
+    ("ACTION", "ism_transition"): "ISM_TRANSITION",
+    ("ACTION", "instruction_details"): "INSTRUCTION_DETAILS",
+}
+
+# Default names of omitted structures the template does not name
+_IMPLIED_NAMES = {"HISTORY": "History", "ITEM_TREE": "Tree", "POINT_EVENT": "Any event"}
+
+# FLAT attribute ("" for the bare path) -> field path in the canonical object
+_FLAT_ATTRIBUTES: dict[str, dict[str, tuple[str, ...]]] = {
+    "DV_QUANTITY": {
+        "magnitude": ("magnitude",),
+        "unit": ("units",),
+        "precision": ("precision",),
+    },
+    "DV_COUNT": {"magnitude": ("magnitude",)},
+    "DV_TEXT": {"value": ("value",)},
+    "DV_CODED_TEXT": {
+        "value": ("value",),
+        "code": ("defining_code", "code_string"),
+        "terminology": ("defining_code", "terminology_id", "value"),
+    },
+    "DV_ORDINAL": {
+        "ordinal": ("value",),
+        "value": ("symbol", "value"),
+        "code": ("symbol", "defining_code", "code_string"),
+        "terminology": ("symbol", "defining_code", "terminology_id", "value"),
+    },
+    "DV_PROPORTION": {
+        "numerator": ("numerator",),
+        "denominator": ("denominator",),
+        "type": ("type",),
+        "precision": ("precision",),
+    },
+    "DV_IDENTIFIER": {
+        "id": ("id",),
+        "type": ("type",),
+        "issuer": ("issuer",),
+        "assigner": ("assigner",),
+    },
+    "DV_PARSABLE": {"value": ("value",), "formalism": ("formalism",)},
+    "DV_MULTIMEDIA": {
+        "mediatype": ("media_type", "code_string"),
+        "alternatetext": ("alternate_text",),
+        "uri": ("uri", "value"),
+        "size": ("size",),
+    },
+    "DV_DATE_TIME": {"": ("value",)},
+    "DV_DATE": {"": ("value",)},
+    "DV_TIME": {"": ("value",)},
+    "DV_DURATION": {"": ("value",)},
+    "DV_BOOLEAN": {"": ("value",)},
+    "DV_URI": {"": ("value",)},
+    "DV_EHR_URI": {"": ("value",)},
+    "CODE_PHRASE": {
+        "code": ("code_string",),
+        "terminology": ("terminology_id", "value"),
+    },
+    "PARTY_IDENTIFIED": {
+        "name": ("name",),
+        "id": ("external_ref", "id", "value"),
+    },
+    "PARTY_RELATED": {
+        "name": ("name",),
+        "id": ("external_ref", "id", "value"),
+        "relationship": ("relationship", "value"),
+    },
+}
+_FLAT_ATTRIBUTES["PARTY_PROXY"] = _FLAT_ATTRIBUTES["PARTY_IDENTIFIED"]
+
+# RM types of nested objects created while setting a field path
+_NESTED_RM_TYPES = {
+    ("DV_CODED_TEXT", "defining_code"): "CODE_PHRASE",
+    ("DV_ORDINAL", "symbol"): "DV_CODED_TEXT",
+    ("DV_MULTIMEDIA", "media_type"): "CODE_PHRASE",
+    ("DV_MULTIMEDIA", "uri"): "DV_URI",
+    ("CODE_PHRASE", "terminology_id"): "TERMINOLOGY_ID",
+    ("PARTY_IDENTIFIED", "external_ref"): "PARTY_REF",
+    ("PARTY_RELATED", "external_ref"): "PARTY_REF",
+    ("PARTY_RELATED", "relationship"): "DV_CODED_TEXT",
+    ("PARTY_REF", "id"): "GENERIC_ID",
+}
+
+_MISSING = object()
+
+# Objects created during one to_canonical() call: node instances, shared
+# implied structures, and the sort keys of list items
+_ConversionState = tuple[
+    dict[tuple[int, int, int], dict[str, Any]],
+    dict[tuple[int, str, str | None], dict[str, Any]],
+    dict[int, list[tuple[int, int]]],
+]
+
+
+@dataclass(frozen=True)
+class _Hop:
+    """One RM object created on the way from a node's parent to the node."""
+
+    attribute: str
+    rm_type: str
+    archetype_node_id: str | None = None
+    name: str | None = None
+    is_list: bool = False
+    match_name: bool = False
+
+    def new(self) -> dict[str, Any]:
+        """Create the canonical object for this hop."""
+        obj: dict[str, Any] = {"_type": self.rm_type}
+        if self.archetype_node_id is not None:
+            obj["name"] = {"_type": "DV_TEXT", "value": self.name}
+            obj["archetype_node_id"] = self.archetype_node_id
+            if self.archetype_node_id.startswith("openEHR-"):
+                obj["archetype_details"] = _archetype_details(self.archetype_node_id)
+        return obj
+
+    def matches(self, obj: Any) -> bool:
+        """Whether a canonical object was created for this hop."""
+        if not isinstance(obj, dict):
+            return False
+        if self.archetype_node_id is not None:
+            if obj.get("archetype_node_id") != self.archetype_node_id:
+                return False
+            if self.match_name and (obj.get("name") or {}).get("value") != self.name:
+                return False
+        return True
+
+
+@dataclass
+class _PlanNode:
+    """Compiled conversion plan for one Web Template node."""
+
+    flat_id: str
+    rm_type: str
+    order: int
+    multiple: bool = False
+    # Objects before ``occurrence`` are shared by all instances of the node
+    hops: tuple[_Hop, ...] = ()
+    occurrence: int = 0
+    attributes: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    emits_fields: bool = False
+    children: dict[str, _PlanNode] = field(default_factory=dict)
+    # Children created with every instance (mandatory PARTY_PROXY nodes)
+    defaults: list[_PlanNode] = field(default_factory=list)
+
+
+def _archetype_details(archetype_id: str, template_id: str | None = None) -> dict[str, Any]:
+    details: dict[str, Any] = {
+        "_type": "ARCHETYPED",
+        "archetype_id": {"_type": "ARCHETYPE_ID", "value": archetype_id},
+        "rm_version": _RM_VERSION,
+    }
+    if template_id is not None:
+        details["template_id"] = {"_type": "TEMPLATE_ID", "value": template_id}
+    return details
+
+
+class _Step(NamedTuple):
+    """One step of a node's AQL path below its parent."""
+
+    attribute: str
+    archetype_node_id: str | None
+    # AQL path up to and including this step
+    aql_path: str
+    # Name from the step's name/value predicate
+    name: str | None = None
+
+
+def _aql_steps(node: WebTemplateNode, parent_aql_path: str) -> list[_Step]:
+    """Return the steps from the parent to a node."""
+    aql_path = node.aql_path.rstrip("/")
+    if aql_path.startswith(parent_aql_path):
+        steps = []
+        for match in _AQL_STEP_RE.finditer(aql_path, len(parent_aql_path)):
+            name = _AQL_NAME_RE.search(match.group(3) or "")
+            steps.append(
+                _Step(
+                    match.group(1),
+                    match.group(2),
+                    aql_path[: match.end()],
+                    name.group(1) if name else None,
+                )
+            )
+        if steps:
+            return steps
+    # No usable aqlPath: the node ID doubles as the RM attribute name
+    return [_Step(node.id, node.node_id or None, aql_path)]
+
+
+def _implied_rm_type(parent_rm_type: str, attribute: str, next_attribute: str) -> str:
+    if attribute == "items":
+        return "ELEMENT" if next_attribute in _ELEMENT_ATTRIBUTES else "CLUSTER"
+    return _IMPLIED_RM_TYPES.get((parent_rm_type, attribute), "ITEM_TREE")
+
+
+def _compile_hops(
+    node: WebTemplateNode, parent_rm_type: str, parent_aql_path: str, names: dict[str, str]
+) -> tuple[tuple[_Hop, ...], int]:
+    """Compile the hops for a node and the index of its occurrence hop.
+
+    The occurrence hop is the object the node stands for: the last step, or
+    the ELEMENT around a collapsed value. Hops before it are shared by all
+    nodes below the same AQL path prefix, e.g. the event shared by an
+    observation's elements and its ``time``, so they are named by the path
+    (its name predicate, or the template node at that path), never by the
+    node that happens to create them.
+
+    Args:
+        node: The Web Template node.
+        parent_rm_type: RM type of the parent node.
+        parent_aql_path: AQL path of the parent node.
+        names: Names of the template's nodes by AQL path.
+    """
+    steps = _aql_steps(node, parent_aql_path)
+    occurrence = len(steps) - 1
+    if (
+        occurrence > 0
+        and steps[-1].attribute in _ELEMENT_ATTRIBUTES
+        and steps[-1].archetype_node_id is None
+        and steps[-2].archetype_node_id is not None
+    ):
+        occurrence -= 1
+
+    hops: list[_Hop] = []
+    rm_type = parent_rm_type
+    for i, step in enumerate(steps):
+        if i == len(steps) - 1:
+            rm_type = _CONCRETE_RM_TYPES.get(node.rm_type, node.rm_type)
+        else:
+            rm_type = _implied_rm_type(rm_type, step.attribute, steps[i + 1].attribute)
+        name: str | None = node.name
+        if i != occurrence:
+            name = (
+                step.name
+                or names.get(step.aql_path)
+                or _IMPLIED_NAMES.get(rm_type)
+                or step.archetype_node_id
+            )
+        hops.append(
+            _Hop(
+                attribute=step.attribute,
+                rm_type=rm_type,
+                archetype_node_id=step.archetype_node_id,
+                name=name,
+                is_list=step.attribute in _LIST_ATTRIBUTES
+                or (i == occurrence and node.is_multi_occurrence),
+            )
+        )
+    return tuple(hops), occurrence
+
+
+class FlatConverter:
+    """Converts compositions between FLAT and canonical JSON for one template.
+
+    The Web Template is compiled into a conversion plan when the converter
+    is created, so converting a composition only walks its data. Use
+    :func:`get_converter` to share converters per template ID.
+
+        converter = FlatConverter.from_web_template(wt_json)
+        canonical = converter.to_canonical(flat_composition)
+    """
+
+    def __init__(self, parsed: ParsedWebTemplate) -> None:
+        from oehrpy.validation.required_fields import STRUCTURAL_RM_TYPES
+
+        self._template_id = parsed.template_id
+        self._tree_id = parsed.tree_id
+        self._structural = STRUCTURAL_RM_TYPES
+        self._order = 0
+        self._names = {
+            node.aql_path.rstrip("/"): node.name for node in parsed.nodes.values() if node.aql_path
+        }
+
+        root = parsed.get_node(parsed.tree_id)
+        if root is None:
+            msg = f"Web Template '{parsed.template_id}' has no root node"
+            raise ValueError(msg)
+        self._root_node = root
+        self._root = self._compile(root)
+
+    @classmethod
+    def from_web_template(cls, web_template: dict[str, Any]) -> FlatConverter:
+        """Create a converter from a Web Template JSON dict.
+
+        Args:
+            web_template: The Web Template JSON (must contain a "tree" key).
+        """
+        from oehrpy.validation.web_template import parse_web_template
+
+        return cls(parse_web_template(web_template))
+
+    @classmethod
+    async def from_ehrbase(cls, client: EHRBaseClient, template_id: str) -> FlatConverter:
+        """Create a converter by fetching a Web Template from EHRBase.
+
+        Args:
+            client: An EHRBaseClient instance.
+            template_id: The template ID to fetch.
+        """
+        return cls(await client.get_parsed_web_template(template_id))
+
+    @property
+    def template_id(self) -> str:
+        """The template ID from the Web Template."""
+        return self._template_id
+
+    @property
+    def tree_id(self) -> str:
+        """The tree root ID (composition prefix)."""
+        return self._tree_id
+
+    def _compile(self, node: WebTemplateNode) -> _PlanNode:
+        is_leaf = node.rm_type not in self._structural
+        plan = _PlanNode(
+            flat_id=node.id,
+            rm_type=node.rm_type,
+            order=self._order,
+            multiple=node.is_multi_occurrence,
+            attributes=_FLAT_ATTRIBUTES.get(node.rm_type, {}),
+            emits_fields=is_leaf and node.rm_type not in _FLAT_ATTRIBUTES,
+        )
+        self._order += 1
+
+        child_aql_path = node.aql_path.rstrip("/")
+        for child in node.children:
+            hops, occurrence = _compile_hops(child, node.rm_type, child_aql_path, self._names)
+            child_plan = self._compile(child)
+            child_plan.hops = hops
+            child_plan.occurrence = occurrence
+            plan.children[child.id] = child_plan
+            if child.rm_type == "PARTY_PROXY" and child.min >= 1:
+                plan.defaults.append(child_plan)
+
+        # Siblings created at the same place are told apart by name
+        signatures: dict[tuple[tuple[str, str | None], ...], list[_PlanNode]] = {}
+        for child_plan in plan.children.values():
+            key = tuple((hop.attribute, hop.archetype_node_id) for hop in child_plan.hops)
+            signatures.setdefault(key, []).append(child_plan)
+        for same in signatures.values():
+            if len(same) > 1:
+                for child_plan in same:
+                    updated = list(child_plan.hops)
+                    updated[child_plan.occurrence] = replace(
+                        updated[child_plan.occurrence], match_name=True
+                    )
+                    child_plan.hops = tuple(updated)
+        return plan
+
+    # ── FLAT → canonical ────────────────────────────────────────────
+
+    def to_canonical(self, flat_composition: dict[str, Any]) -> dict[str, Any]:
+        """Convert a FLAT composition to canonical JSON.
+
+        Args:
+            flat_composition: A dict mapping FLAT paths to values. Paths must
+                use the template's tree ID as prefix (not legacy ``ctx/``).
+
+        Returns:
+            The canonical COMPOSITION as a JSON-compatible dict.
+
+        Raises:
+            ValueError: If a path does not match the Web Template.
+        """
+        root = self._root_node
+        composition: dict[str, Any] = {
+            "_type": "COMPOSITION",
+            "name": {"_type": "DV_TEXT", "value": root.name},
+        }
+        if root.node_id:
+            composition["archetype_node_id"] = root.node_id
+            composition["archetype_details"] = _archetype_details(root.node_id, self._template_id)
+
+        # Objects created so far, keyed by the id() of the object they belong to
+        instances: dict[tuple[int, int, int], dict[str, Any]] = {}
+        shared: dict[tuple[int, str, str | None], dict[str, Any]] = {}
+        list_orders: dict[int, list[tuple[int, int]]] = {}
+        state = (instances, shared, list_orders)
+        self._add_defaults(composition, self._root, state)
+
+        for key, value in flat_composition.items():
+            path = FlatPath.parse(key)
+            if path.segments[0] != self._tree_id:
+                msg = f"FLAT path '{key}' does not start with '{self._tree_id}'"
+                raise ValueError(msg)
+
+            plan = self._root
+            obj = composition
+            for segment, index in zip(path.segments[1:], path.indices[1:], strict=True):
+                child = plan.children.get(segment)
+                if child is None:
+                    msg = f"FLAT path '{key}' not found in template '{self._template_id}'"
+                    raise ValueError(msg)
+                instance = instances.get((id(obj), child.order, index or 0))
+                if instance is None:
+                    instance = self._new_instance(obj, child, index or 0, state)
+                obj, plan = instance, child
+
+            self._set_value(obj, plan, path.attribute or "", value)
+
+        return composition
+
+    def to_canonical_many(
+        self, flat_compositions: Iterable[dict[str, Any]]
+    ) -> Iterator[dict[str, Any]]:
+        """Convert FLAT compositions to canonical JSON one at a time."""
+        for flat_composition in flat_compositions:
+            yield self.to_canonical(flat_composition)
+
+    def _new_instance(
+        self, parent: dict[str, Any], plan: _PlanNode, index: int, state: _ConversionState
+    ) -> dict[str, Any]:
+        instances, shared, list_orders = state
+        target = parent
+        for i, hop in enumerate(plan.hops):
+            if i < plan.occurrence:
+                key = (id(target), hop.attribute, hop.archetype_node_id)
+                obj = shared.get(key)
+                if obj is None:
+                    obj = shared[key] = hop.new()
+                    _attach(target, hop, obj, (plan.order, -1), list_orders)
+            else:
+                obj = hop.new()
+                _attach(target, hop, obj, (plan.order, index), list_orders)
+            target = obj
+        instances[(id(parent), plan.order, index)] = target
+        self._add_defaults(target, plan, state)
+        return target
+
+    def _add_defaults(self, obj: dict[str, Any], plan: _PlanNode, state: _ConversionState) -> None:
+        for child in plan.defaults:
+            self._new_instance(obj, child, 0, state)
+
+    @staticmethod
+    def _set_value(obj: dict[str, Any], plan: _PlanNode, attribute: str, value: Any) -> None:
+        fields = plan.attributes.get(attribute)
+        if fields is None:
+            fields = (attribute or "value",)
+        if plan.rm_type == "PARTY_PROXY":
+            obj["_type"] = "PARTY_IDENTIFIED"
+
+        target = obj
+        for name in fields[:-1]:
+            nested = target.get(name)
+            if nested is None:
+                rm_type = _NESTED_RM_TYPES.get((target.get("_type", ""), name))
+                nested = target[name] = {"_type": rm_type} if rm_type else {}
+            target = nested
+        target[fields[-1]] = value
+
+    # ── canonical → FLAT ────────────────────────────────────────────
+
+    def to_flat(self, canonical: dict[str, Any]) -> dict[str, Any]:
+        """Convert a canonical COMPOSITION to FLAT format.
+
+        Only content described by the Web Template is converted; multi-
+        occurrence nodes are indexed from 0 in canonical list order.
+
+        Args:
+            canonical: The canonical COMPOSITION as a JSON-compatible dict.
+
+        Returns:
+            A dict mapping FLAT paths to values.
+        """
+        result: dict[str, Any] = {}
+        self._emit(canonical, self._root, self._tree_id, result)
+        return result
+
+    def to_flat_many(self, compositions: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Convert canonical compositions to FLAT format one at a time."""
+        for canonical in compositions:
+            yield self.to_flat(canonical)
+
+    def _emit(
+        self, obj: dict[str, Any], plan: _PlanNode, path: str, result: dict[str, Any]
+    ) -> None:
+        for attribute, fields in plan.attributes.items():
+            value: Any = obj
+            for name in fields:
+                value = value.get(name, _MISSING) if isinstance(value, dict) else _MISSING
+            if value is not _MISSING:
+                result[f"{path}|{attribute}" if attribute else path] = value
+
+        if plan.emits_fields:
+            for name, value in obj.items():
+                if name != "_type" and not isinstance(value, (dict, list)):
+                    result[path if name == "value" else f"{path}|{name}"] = value
+
+        for child in plan.children.values():
+            for index, instance in enumerate(_find_instances(obj, child)):
+                if child.multiple:
+                    self._emit(instance, child, f"{path}/{child.flat_id}:{index}", result)
+                else:
+                    self._emit(instance, child, f"{path}/{child.flat_id}", result)
+                    break
+
+
+def _attach(
+    target: dict[str, Any],
+    hop: _Hop,
+    obj: dict[str, Any],
+    order: tuple[int, int],
+    list_orders: dict[int, list[tuple[int, int]]],
+) -> None:
+    """Attach a new object, keeping lists in template order and then by index."""
+    if not hop.is_list:
+        target[hop.attribute] = obj
+        return
+    items = target.setdefault(hop.attribute, [])
+    orders = list_orders.setdefault(id(items), [])
+    position = bisect.bisect_right(orders, order)
+    orders.insert(position, order)
+    items.insert(position, obj)
+
+
+def _find_instances(obj: dict[str, Any], plan: _PlanNode) -> list[dict[str, Any]]:
+    """Find the canonical objects for a plan node below its parent's object."""
+    candidates = [obj]
+    for hop in plan.hops:
+        found: list[dict[str, Any]] = []
+        for candidate in candidates:
+            value = candidate.get(hop.attribute)
+            if isinstance(value, list):
+                found.extend(item for item in value if hop.matches(item))
+            elif isinstance(value, dict) and hop.matches(value):
+                found.append(value)
+        candidates = found
+    return candidates
+
+
+_CONVERTERS: dict[str, FlatConverter] = {}
+
+
+def get_converter(parsed: ParsedWebTemplate, *, use_cache: bool = True) -> FlatConverter:
+    """Return a FlatConverter for a parsed Web Template, compiling it once.
+
+    Converters are cached per template ID. Clear the cache with
+    :func:`clear_converter_cache` when a template is replaced.
+
+    Args:
+        parsed: A parsed Web Template.
+        use_cache: If True (default), reuse a cached converter when available.
+
+    Returns:
+        The converter for the template.
+    """
+    if use_cache and parsed.template_id in _CONVERTERS:
+        return _CONVERTERS[parsed.template_id]
+    converter = FlatConverter(parsed)
+    _CONVERTERS[parsed.template_id] = converter
+    return converter
+
+
+def clear_converter_cache(template_id: str | None = None) -> None:
+    """Clear cached converters.
+
+    Args:
+        template_id: If given, only clear the converter for this template.
+            If None, clear the entire cache.
+    """
+    if template_id is not None:
+        _CONVERTERS.pop(template_id, None)
+    else:
+        _CONVERTERS.clear()
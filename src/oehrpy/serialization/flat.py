@@ -20,65 +20,124 @@ This module provides utilities for working with FLAT format data.
 
 from __future__ import annotations
 
-import re
-from dataclasses import dataclass, field
-from typing import Any
+import codecs
+import functools
+import json
+import sys
+import warnings
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import IO, Any, cast
 
+from .._json_stream import JSONStreamBuffer
 
-@dataclass
+
+@dataclass(frozen=True, slots=True, init=False)
 class FlatPath:
-    """Represents a parsed FLAT format path."""
+    """Represents a parsed FLAT format path.
+
+    FlatPath objects are immutable and hashable. Each segment keeps its own
+    index (``None`` for unindexed segments), so ``str(FlatPath.parse(p))``
+    round-trips to ``p``.
+
+    The single ``index`` of earlier versions, which applied to the last
+    segment, is still accepted in place of ``indices`` but deprecated.
+    """
+
+    segments: tuple[str, ...]
+    indices: tuple[int | None, ...]
+    attribute: str | None
 
-    segments: list[str] = field(default_factory=list)
-    index: int | None = None
-    attribute: str | None = None
+    def __init__(
+        self,
+        segments: Iterable[str] = (),
+        indices: Iterable[int | None] | int | None = (),
+        attribute: str | None = None,
+        *,
+        index: int | None = None,
+    ) -> None:
+        segments = tuple(sys.intern(segment) for segment in segments)
+        if index is not None or indices is None or isinstance(indices, int):
+            if index is not None and indices not in ((), None):
+                raise TypeError("FlatPath takes either indices or index, not both")
+            if index is None:
+                index = cast("int | None", indices)
+            warnings.warn(
+                "FlatPath(segments, index) is deprecated; pass one index per segment "
+                "as indices, or use FlatPath.parse()",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            indices = (None,) * (len(segments) - 1) + (index,) if segments else ()
+        indices = tuple(indices) or (None,) * len(segments)
+        if len(indices) != len(segments):
+            raise ValueError(f"FlatPath has {len(segments)} segments but {len(indices)} indices")
+        # Frozen dataclass: set fields through object.__setattr__
+        object.__setattr__(self, "segments", segments)
+        object.__setattr__(self, "indices", indices)
+        object.__setattr__(
+            self, "attribute", sys.intern(attribute) if attribute is not None else None
+        )
+
+    @property
+    def index(self) -> int | None:
+        """The index of the last indexed segment, if any."""
+        for index in reversed(self.indices):
+            if index is not None:
+                return index
+        return None
 
     @classmethod
     def parse(cls, path: str) -> FlatPath:
         """Parse a FLAT format path string.
 
+        Results are cached per path string, so parsing a recurring path
+        returns the same FlatPath instance.
+
         Examples:
-            - "ctx/language" -> FlatPath(["ctx", "language"])
+            - "ctx/language" -> FlatPath(("ctx", "language"))
             - "vital_signs/bp:0/systolic|magnitude" ->
-              FlatPath(["vital_signs", "bp", "systolic"], 0, "magnitude")
+              FlatPath(("vital_signs", "bp", "systolic"), (None, 0, None), "magnitude")
         """
-        result = cls()
-
-        # Split by attribute separator first
-        if "|" in path:
-            path_part, result.attribute = path.rsplit("|", 1)
-        else:
-            path_part = path
-
-        # Split by path separator
-        parts = path_part.split("/")
-
-        for part in parts:
-            # Check for index notation (e.g., "bp:0")
-            match = re.match(r"^(.+):(\d+)$", part)
-            if match:
-                result.segments.append(match.group(1))
-                result.index = int(match.group(2))
-            else:
-                result.segments.append(part)
-
-        return result
+        return _parse_flat_path(path)
 
     def __str__(self) -> str:
         """Convert back to FLAT path string."""
-        path = "/".join(self.segments)
-        if self.index is not None:
-            # Add index to the last segment
-            parts = path.rsplit("/", 1)
-            if len(parts) == 2:
-                path = f"{parts[0]}/{parts[1]}:{self.index}"
-            else:
-                path = f"{parts[0]}:{self.index}"
+        path = "/".join(
+            segment if index is None else f"{segment}:{index}"
+            for segment, index in zip(self.segments, self.indices, strict=True)
+        )
         if self.attribute:
             path = f"{path}|{self.attribute}"
         return path
 
 
+def _split_index(part: str) -> tuple[str, int | None]:
+    """Split a path segment like "bp:0" into its name and index."""
+    name, sep, index = part.rpartition(":")
+    if sep and name and index.isdecimal():
+        return name, int(index)
+    return part, None
+
+
+@functools.lru_cache(maxsize=16384)
+def _parse_flat_path(path: str) -> FlatPath:
+    """Parse a FLAT path; see FlatPath.parse."""
+    # Split by attribute separator first
+    path_part, sep, attribute = path.rpartition("|")
+    if not sep:
+        path_part, attribute = path, ""
+
+    segments = []
+    indices = []
+    for part in path_part.split("/"):
+        name, index = _split_index(part)
+        segments.append(name)
+        indices.append(index)
+
+    return FlatPath(tuple(segments), tuple(indices), attribute if sep else None)
+
+
 @dataclass
 class FlatContext:
     """Context fields for FLAT format compositions."""
@@ -196,9 +255,22 @@ def flatten_dict(data: dict[str, Any], prefix: str = "") -> dict[str, Any]:
     return result
 
 
+class _IndexedItems(dict[int, Any]):
+    """Items of a FLAT list, collected by index until its length is known."""
+
+    nested = False
+
+
 def unflatten_dict(data: dict[str, Any]) -> dict[str, Any]:
     """Unflatten FLAT format paths to nested dictionary.
 
+    Attributes (``|magnitude``) become keys of their node, and indexed
+    segments (``bp:0``) become lists. Runs in time linear in the number of
+    keys: each distinct path prefix is parsed once and keys sharing it reuse
+    its node, and lists are allocated at their final length once all keys
+    are seen. Unaddressed list slots are filled with ``{}`` in lists of
+    nodes and ``None`` in lists of values.
+
     Args:
         data: Flattened dictionary with path keys.
 
@@ -206,42 +278,148 @@ def unflatten_dict(data: dict[str, Any]) -> dict[str, Any]:
         Nested dictionary.
     """
     result: dict[str, Any] = {}
+    # Node (dict) created for each path prefix, e.g. "vital_signs/bp:0"
+    nodes: dict[str, dict[str, Any]] = {}
+    pending_lists: list[tuple[dict[str, Any], str, _IndexedItems]] = []
+
+    def indexed_items(parent: dict[str, Any], name: str) -> _IndexedItems:
+        items = parent.get(name)
+        if not isinstance(items, _IndexedItems):
+            items = parent[name] = _IndexedItems()
+            pending_lists.append((parent, name, items))
+        return items
+
+    def node(prefix: str) -> dict[str, Any]:
+        current = nodes.get(prefix)
+        if current is None:
+            parent_prefix, sep, part = prefix.rpartition("/")
+            parent = node(parent_prefix) if sep else result
+            name, index = _split_index(part)
+            if index is None:
+                current = parent.setdefault(name, {})
+            else:
+                items = indexed_items(parent, name)
+                items.nested = True
+                current = items.setdefault(index, {})
+            nodes[prefix] = current
+        return current
 
     for path, value in data.items():
-        parts = path.replace("|", "/").split("/")
-        current = result
-
-        for _i, part in enumerate(parts[:-1]):
-            # Check for index notation
-            match = re.match(r"^(.+):(\d+)$", part)
-            if match:
-                name, idx = match.group(1), int(match.group(2))
-                if name not in current:
-                    current[name] = []
-                while len(current[name]) <= idx:
-                    current[name].append({})
-                current = current[name][idx]
-            else:
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
-
-        # Set the final value
-        final_key = parts[-1]
-        match = re.match(r"^(.+):(\d+)$", final_key)
-        if match:
-            name, idx = match.group(1), int(match.group(2))
-            if name not in current:
-                current[name] = []
-            while len(current[name]) <= idx:
-                current[name].append(None)
-            current[name][idx] = value
+        prefix, sep, leaf = path.replace("|", "/").rpartition("/")
+        parent = node(prefix) if sep else result
+        name, index = _split_index(leaf)
+        if index is None:
+            parent[name] = value
+        else:
+            indexed_items(parent, name)[index] = value
+
+    # Item nodes are already in place, so lists can be built in any order
+    for parent, name, items in pending_lists:
+        length = max(items) + 1
+        if items.nested and len(items) < length:
+            values: list[Any] = [{} for _ in range(length)]
         else:
-            current[final_key] = value
+            values = [None] * length
+        for index, item in items.items():
+            values[index] = item
+        parent[name] = values
 
     return result
 
 
+_DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_flat(
+    source: IO[bytes] | IO[str],
+    *,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[int, FlatPath, Any]]:
+    """Stream ``(composition_index, path, value)`` entries from FLAT JSON.
+
+    Reads ``source`` incrementally, so memory use is bounded by ``chunk_size``
+    plus the largest single value rather than by the size of a composition.
+    The stream may hold a single FLAT composition or several concatenated
+    ones (e.g. newline-delimited JSON); ``composition_index`` counts them
+    from 0. Recurring paths are parsed once and share a FlatPath instance.
+
+    Example:
+        >>> from itertools import groupby
+        >>> with open("export.ndjson", "rb") as f:
+        ...     for index, entries in groupby(iter_flat(f), key=lambda e: e[0]):
+        ...         for _, path, value in entries:
+        ...             ...
+
+    Args:
+        source: A binary (UTF-8) or text file-like object.
+        chunk_size: Number of bytes or characters to read at a time.
+
+    Yields:
+        Tuples of composition index, parsed FLAT path and value.
+
+    Raises:
+        ValueError: If the stream is not a sequence of JSON objects.
+    """
+    stream = JSONStreamBuffer()
+    decode_bytes = codecs.getincrementaldecoder("utf-8")().decode
+    eof = False
+
+    def fill() -> bool:
+        """Read the next chunk into the buffer; return False at end of stream."""
+        nonlocal eof
+        if eof:
+            return False
+        chunk = source.read(chunk_size)
+        stream.feed(decode_bytes(chunk, final=not chunk) if isinstance(chunk, bytes) else chunk)
+        eof = not chunk
+        return not eof
+
+    def next_char() -> str:
+        """Skip whitespace and return the next character ("" at end of stream)."""
+        while not (char := stream.peek()) and fill():
+            pass
+        return char
+
+    def expect(chars: str) -> str:
+        """Consume the next character, which must be one of ``chars``."""
+        char = next_char()
+        if not char or char not in chars:
+            expected = " or ".join(repr(c) for c in chars)
+            raise ValueError(f"Invalid FLAT JSON at offset {stream.offset}: expecting {expected}")
+        stream.advance()
+        return char
+
+    def decode_value() -> Any:
+        """Decode one complete JSON value, reading more data as needed."""
+        if not next_char():
+            raise ValueError(f"Invalid FLAT JSON at offset {stream.offset}: expecting value")
+        while not stream.value_complete() and fill():
+            pass
+        try:
+            return stream.decode()
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid FLAT JSON at offset {exc.pos}: {exc.msg}") from exc
+
+    index = 0
+    while next_char():
+        expect("{")
+        if next_char() == "}":
+            stream.advance()
+        else:
+            while True:
+                if next_char() != '"':
+                    raise ValueError(
+                        f"Invalid FLAT JSON at offset {stream.offset}: expecting property name"
+                    )
+                key = decode_value()
+                expect(":")
+                value = decode_value()
+                yield index, FlatPath.parse(key), value
+                if expect(",}") == "}":
+                    break
+        index += 1
+
+
 class FlatBuilder:
     """Builder for creating FLAT format compositions.
 
@@ -368,5 +546,6 @@ __all__ = [
     "FlatContext",
     "FlatBuilder",
     "flatten_dict",
+    "iter_flat",
     "unflatten_dict",
 ]
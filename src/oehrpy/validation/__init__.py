@@ -26,8 +26,12 @@ Example (OPT validation):
 
 from __future__ import annotations
 
+import os
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, Any
 
+from oehrpy.validation.batch import BatchValidation, ValidationStats
+from oehrpy.validation.index import ValidationIndex, compile_index
 from oehrpy.validation.opt import (
     OPTValidationError,
     OPTValidationIssue,
@@ -39,8 +43,10 @@ from oehrpy.validation.path_checker import (
     ValidationInfo,
     ValidationResult,
     validate_composition,
+    validate_with_index,
 )
 from oehrpy.validation.platforms import PlatformType
+from oehrpy.validation.session import ValidationDiff, ValidationSession
 from oehrpy.validation.web_template import (
     ParsedWebTemplate,
     WebTemplateNode,
@@ -59,16 +65,25 @@ class FlatValidator:
 
         validator = FlatValidator.from_web_template(wt_json, platform="ehrbase")
         result = validator.validate(flat_composition)
+
+    The template is compiled once into a :class:`ValidationIndex` that is
+    reused by every validation; :meth:`save` and :meth:`load` persist it.
     """
 
     def __init__(
         self,
-        parsed: ParsedWebTemplate,
+        parsed: ParsedWebTemplate | None = None,
         platform: PlatformType = "ehrbase",
+        *,
+        index: ValidationIndex | None = None,
     ) -> None:
+        if index is None:
+            if parsed is None:
+                msg = "FlatValidator needs a parsed Web Template or a ValidationIndex"
+                raise ValueError(msg)
+            index = compile_index(parsed, platform)
         self._parsed = parsed
-        self._platform = platform
-        self._valid_paths = enumerate_valid_paths(parsed, platform)
+        self._index = index
 
     @classmethod
     def from_web_template(
@@ -94,37 +109,54 @@ class FlatValidator:
     ) -> FlatValidator:
         """Create a validator by fetching a Web Template from EHRBase.
 
-        Uses :meth:`EHRBaseClient.get_web_template` which requests the Web
-        Template JSON format (``Accept: application/openehr.wt+json``) and
-        caches the result (see ADR-0005).
+        Uses :meth:`EHRBaseClient.get_parsed_web_template` which requests
+        the Web Template JSON format (``Accept: application/openehr.wt+json``)
+        and caches the parsed result (see ADR-0005).
 
         Args:
             client: An EHRBaseClient instance.
             template_id: The template ID to fetch.
             platform: CDR platform dialect.
         """
-        web_template = await client.get_web_template(template_id)
-        return cls.from_web_template(web_template, platform=platform)
+        parsed = await client.get_parsed_web_template(template_id)
+        return cls(parsed=parsed, platform=platform)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> FlatValidator:
+        """Create a validator from an index saved with :meth:`save`.
+
+        Only load files from trusted sources: unpickling can run arbitrary code.
+        """
+        return cls(index=ValidationIndex.load(path))
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Pickle the compiled validation index to a file."""
+        self._index.save(path)
+
+    @property
+    def index(self) -> ValidationIndex:
+        """The compiled validation index."""
+        return self._index
 
     @property
     def template_id(self) -> str:
         """The template ID from the Web Template."""
-        return self._parsed.template_id
+        return self._index.template_id
 
     @property
     def tree_id(self) -> str:
         """The tree root ID (composition prefix)."""
-        return self._parsed.tree_id
+        return self._index.tree_id
 
     @property
     def platform(self) -> PlatformType:
         """The CDR platform dialect."""
-        return self._platform
+        return self._index.platform
 
     @property
     def valid_paths(self) -> list[str]:
         """All valid FLAT paths for this template and platform."""
-        return list(self._valid_paths)
+        return list(self._index.valid_paths)
 
     def validate(self, flat_composition: dict[str, object]) -> ValidationResult:
         """Validate a FLAT composition dict.
@@ -135,7 +167,48 @@ class FlatValidator:
         Returns:
             A ValidationResult with errors and warnings.
         """
-        return validate_composition(flat_composition, self._parsed, self._platform)
+        return validate_with_index(flat_composition, self._index)
+
+    def validate_many(
+        self,
+        flat_compositions: Iterable[dict[str, object]],
+        workers: int = 1,
+        chunksize: int = 64,
+    ) -> BatchValidation:
+        """Validate many FLAT compositions, optionally on a process pool.
+
+        The compiled index is shared with each worker once, not per
+        composition. Compositions are pulled from ``flat_compositions`` as
+        workers free up, so the input may be a lazy stream.
+
+        Args:
+            flat_compositions: FLAT composition dicts.
+            workers: Number of worker processes; 1 validates in this process.
+            chunksize: Number of compositions sent to a worker at a time.
+
+        Returns:
+            A BatchValidation yielding a ValidationResult per composition in
+            input order, with per-path error counts in its ``stats``.
+
+        Raises:
+            ValueError: If workers or chunksize is less than 1.
+        """
+        return BatchValidation(self._index, flat_compositions, workers, chunksize)
+
+    def session(self, flat_composition: Iterable[str] = ()) -> ValidationSession:
+        """Start an incremental validation of a composition that is being edited.
+
+        The session re-diagnoses only the paths each edit touches; see
+        :class:`~oehrpy.validation.session.ValidationSession`.
+
+        Args:
+            flat_composition: The FLAT composition dict, or its paths.
+
+        Returns:
+            A ValidationSession whose ``result`` is the validation result of
+            ``flat_composition``.
+        """
+        return ValidationSession(self._index, flat_composition)
 
 
 __all__ = [
@@ -145,12 +218,20 @@ __all__ = [
     "OPTValidationResult",
     "OPTValidator",
     # FLAT validation
+    "BatchValidation",
     "FlatValidator",
     "ParsedWebTemplate",
+    "ValidationDiff",
     "ValidationError",
+    "ValidationIndex",
     "ValidationInfo",
     "ValidationResult",
+    "ValidationSession",
+    "ValidationStats",
     "WebTemplateNode",
+    "compile_index",
     "enumerate_valid_paths",
     "parse_web_template",
+    "validate_composition",
+    "validate_with_index",
 ]
@@ -0,0 +1,146 @@
+"""Batch validation of FLAT compositions across worker processes.
+
+:meth:`~oehrpy.validation.FlatValidator.validate_many` validates a stream of
+FLAT compositions, optionally on a process pool. Each worker receives the
+compiled :class:`~oehrpy.validation.index.ValidationIndex` once when it
+starts (inherited without copying under the ``fork`` start method, pickled
+once per worker otherwise), and compositions are sent in chunks. Results are
+yielded in input order while a bounded number of chunks is in flight, and
+error counts are aggregated per path.
+
+Example::
+
+    validator = FlatValidator.from_web_template(wt_json)
+    batch = validator.validate_many(load_compositions(), workers=8)
+    for result in batch:
+        if not result.is_valid:
+            ...
+    for path, count in batch.stats.errors.most_common(10):
+        print(f"{count:>8}  {path}")
+"""
+
+from __future__ import annotations
+
+import itertools
+import re
+from collections import Counter, deque
+from collections.abc import Generator, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from oehrpy.validation.index import ValidationIndex
+from oehrpy.validation.path_checker import ValidationResult, validate_with_index
+
+_INDEX = re.compile(r":\d+")
+
+
+@dataclass
+class ValidationStats:
+    """Running totals of a batch validation.
+
+    ``errors`` and ``warnings`` count occurrences per path, with ``:N``
+    indices normalized to ``:*`` so repeated entries aggregate;
+    ``error_types`` counts errors per error type.
+    """
+
+    validated: int = 0
+    invalid: int = 0
+    errors: Counter[str] = field(default_factory=Counter)
+    warnings: Counter[str] = field(default_factory=Counter)
+    error_types: Counter[str] = field(default_factory=Counter)
+
+    def add(self, result: ValidationResult) -> None:
+        """Add one validation result to the totals."""
+        self.validated += 1
+        if not result.is_valid:
+            self.invalid += 1
+        for error in result.errors:
+            self.errors[_INDEX.sub(":*", error.path)] += 1
+            self.error_types[error.error_type] += 1
+        for warning in result.warnings:
+            self.warnings[_INDEX.sub(":*", warning.path)] += 1
+
+
+# Index of the current worker process, set by _init_worker
+_worker_index: ValidationIndex | None = None
+
+
+def _init_worker(index: ValidationIndex) -> None:
+    global _worker_index
+    _worker_index = index
+
+
+def _validate_chunk(chunk: list[dict[str, object]]) -> list[ValidationResult]:
+    if _worker_index is None:
+        raise RuntimeError("Validation worker was not initialized")
+    return [validate_with_index(composition, _worker_index) for composition in chunk]
+
+
+class BatchValidation:
+    """Iterable of the results of a batch validation, in input order.
+
+    Created by :meth:`~oehrpy.validation.FlatValidator.validate_many`;
+    validation starts when iteration starts, and running totals are kept in
+    ``stats``.
+
+    Args:
+        index: The compiled validation index.
+        compositions: FLAT compositions to validate.
+        workers: Number of worker processes; 1 validates in this process.
+        chunksize: Number of compositions sent to a worker at a time.
+    """
+
+    def __init__(
+        self,
+        index: ValidationIndex,
+        compositions: Iterable[dict[str, object]],
+        workers: int = 1,
+        chunksize: int = 64,
+    ) -> None:
+        if workers < 1 or chunksize < 1:
+            msg = f"workers and chunksize must be at least 1, got {workers} and {chunksize}"
+            raise ValueError(msg)
+        self._index = index
+        self._compositions = compositions
+        self._workers = workers
+        self._chunksize = chunksize
+        self._results: Generator[ValidationResult, None, None] | None = None
+        self.stats = ValidationStats()
+
+    def __iter__(self) -> Iterator[ValidationResult]:
+        if self._results is not None:
+            raise RuntimeError("A batch validation can only be iterated once")
+        self._results = self._run()
+        return self._results
+
+    def close(self) -> None:
+        """Stop validating, cancelling chunks that have not started."""
+        if self._results is not None:
+            self._results.close()
+
+    def _run(self) -> Generator[ValidationResult, None, None]:
+        if self._workers == 1:
+            for composition in self._compositions:
+                result = validate_with_index(composition, self._index)
+                self.stats.add(result)
+                yield result
+            return
+
+        iterator = iter(self._compositions)
+        pool = ProcessPoolExecutor(self._workers, initializer=_init_worker, initargs=(self._index,))
+        pending: deque[Future[list[ValidationResult]]] = deque()
+        try:
+            # Keep every worker busy with one chunk queued behind it
+            while chunk := list(itertools.islice(iterator, self._chunksize)):
+                pending.append(pool.submit(_validate_chunk, chunk))
+                if len(pending) >= 2 * self._workers:
+                    yield from self._collect(pending.popleft())
+            while pending:
+                yield from self._collect(pending.popleft())
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def _collect(self, future: Future[list[ValidationResult]]) -> Iterator[ValidationResult]:
+        for result in future.result():
+            self.stats.add(result)
+            yield result
@@ -0,0 +1,253 @@
+"""Compiled validation index for FLAT path checking.
+
+Validating a FLAT composition needs the set of valid paths for a template
+and platform dialect, the node tree as a trie of path segments, the suffix
+table and the renamed nodes. :func:`compile_index` derives all of these from
+a parsed Web Template once, as a frozen :class:`ValidationIndex`, and caches
+it on the ParsedWebTemplate per platform, so repeated validations do not
+re-enumerate and re-sort the paths.
+
+An index does not reference the parsed template, so it can be pickled to
+disk and loaded by a :class:`~oehrpy.validation.FlatValidator` without the
+Web Template. Unknown keys are diagnosed with one descent of the segment
+trie (:meth:`ValidationIndex.match`), which finds the deepest matching
+prefix and the first failing segment in O(depth)::
+
+    index = compile_index(parse_web_template(wt_json), "ehrbase")
+    index.save("vitals.ehrbase.idx")
+    validator = FlatValidator.load("vitals.ehrbase.idx")
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import re
+from dataclasses import dataclass, field
+from functools import cached_property
+
+from oehrpy.validation.platforms import PlatformType
+from oehrpy.validation.required_fields import VALID_SUFFIXES
+from oehrpy.validation.suggestions import PathSuggester
+from oehrpy.validation.web_template import ParsedWebTemplate, _slugify, enumerate_valid_paths
+
+# Bumped whenever the pickled layout of ValidationIndex changes
+INDEX_FORMAT = 2
+
+
+@dataclass(frozen=True)
+class RenamedNode:
+    """A node whose id differs from its original archetype name."""
+
+    node_id: str
+    original_name: str
+    slug: str
+    words: tuple[str, ...]
+
+
+@dataclass
+class SegmentNode:
+    """A node of the segment trie, keyed by its ID under its parent."""
+
+    id: str
+    path: str
+    rm_type: str
+    children: dict[str, SegmentNode] = field(default_factory=dict)
+
+
+@dataclass
+class PathMatch:
+    """Result of descending the segment trie along a FLAT path.
+
+    Attributes:
+        base: The path before the first ``|``.
+        suffix: The attribute suffix including the ``|``, or "".
+        segments: The segments of ``base`` with ``:N`` indices removed.
+        indexed: Whether any segment or the suffix carries a ``:N`` index.
+        nodes: Trie nodes of the deepest matching prefix of ``segments``.
+    """
+
+    base: str
+    suffix: str
+    segments: list[str]
+    indexed: bool
+    nodes: list[SegmentNode]
+
+    @property
+    def node(self) -> SegmentNode | None:
+        """The node of the whole path, or None if a segment failed."""
+        if len(self.nodes) == len(self.segments):
+            return self.nodes[-1]
+        return None
+
+    @property
+    def failing_segment(self) -> int | None:
+        """Position of the first segment not in the trie, or None."""
+        if len(self.nodes) < len(self.segments):
+            return len(self.nodes)
+        return None
+
+    @property
+    def parent(self) -> SegmentNode | None:
+        """The node of the path's parent, or None if it is not in the trie."""
+        depth = len(self.segments) - 1
+        if depth >= 1 and len(self.nodes) >= depth:
+            return self.nodes[depth - 1]
+        return None
+
+    @property
+    def stripped(self) -> str:
+        """The path with all ``:N`` indices removed."""
+        suffix, colon, occurrence = self.suffix.rpartition(":")
+        if not (colon and occurrence.isdigit()):
+            suffix = self.suffix
+        return "/".join(self.segments) + suffix
+
+
+@dataclass(frozen=True)
+class ValidationIndex:
+    """Everything FLAT validation needs for one template and platform.
+
+    Create with :func:`compile_index`; treat as read-only.
+
+    Attributes:
+        template_id: The template ID from the Web Template.
+        tree_id: The tree root ID (composition prefix).
+        platform: The CDR platform dialect the paths were enumerated for.
+        valid_paths: All valid FLAT paths, sorted.
+        path_set: ``valid_paths`` as a set for membership tests.
+        root: Root of the segment trie (the composition node).
+        suffixes: Valid suffixes per RM type (empty: bare path only).
+        renamed: Renamed nodes, in template order.
+        rename_slugs: Position in ``renamed`` of the first node each slug or
+            word of an original name belongs to.
+    """
+
+    template_id: str
+    tree_id: str
+    platform: PlatformType
+    valid_paths: tuple[str, ...]
+    path_set: frozenset[str]
+    root: SegmentNode
+    suffixes: dict[str, tuple[str, ...]]
+    renamed: tuple[RenamedNode, ...]
+    rename_slugs: dict[str, int]
+    format_version: int = INDEX_FORMAT
+
+    @cached_property
+    def suggester(self) -> PathSuggester:
+        """Index of ``valid_paths`` for "did you mean?" suggestions, built on first use."""
+        return PathSuggester(self.valid_paths)
+
+    def __getstate__(self) -> dict[str, object]:
+        # The suggester is rebuilt on demand, so saved indexes and the
+        # copies sent to worker processes do not carry it
+        state = self.__dict__.copy()
+        state.pop("suggester", None)
+        return state
+
+    def find(self, path: str) -> SegmentNode | None:
+        """Return the trie node of a node path, or None if it is not in the template."""
+        return self.match(path).node
+
+    def match(self, path: str) -> PathMatch:
+        """Descend the segment trie along a FLAT path as far as it matches."""
+        base, pipe, suffix = path.partition("|")
+        segments = base.split("/")
+        indexed = False
+        for i, segment in enumerate(segments):
+            name, colon, occurrence = segment.rpartition(":")
+            if colon and occurrence.isdigit():
+                segments[i] = name
+                indexed = True
+        name, colon, occurrence = suffix.rpartition(":")
+        if colon and occurrence.isdigit():
+            indexed = True
+
+        nodes: list[SegmentNode] = []
+        if segments[0] == self.root.id:
+            node = self.root
+            nodes.append(node)
+            for segment in segments[1:]:
+                child = node.children.get(segment)
+                if child is None:
+                    break
+                nodes.append(child)
+                node = child
+        return PathMatch(base, pipe + suffix, segments, indexed, nodes)
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Pickle the index to a file."""
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> ValidationIndex:
+        """Load an index saved with :meth:`save`.
+
+        Only load files from trusted sources: unpickling can run arbitrary code.
+
+        Raises:
+            ValueError: If the file does not hold an index of the current format.
+        """
+        with open(path, "rb") as f:
+            index = pickle.load(f)
+        if not isinstance(index, cls) or index.format_version != INDEX_FORMAT:
+            msg = f"{os.fspath(path)!r} does not contain a format {INDEX_FORMAT} ValidationIndex"
+            raise ValueError(msg)
+        return index
+
+
+def compile_index(parsed: ParsedWebTemplate, platform: PlatformType = "ehrbase") -> ValidationIndex:
+    """Return the validation index of a parsed Web Template for a platform.
+
+    The index is compiled on first use and cached on ``parsed``.
+
+    Args:
+        parsed: A parsed Web Template.
+        platform: The CDR platform dialect ("ehrbase" or "better").
+    """
+    index = parsed._indexes.get(platform)
+    if index is None:
+        index = parsed._indexes.setdefault(platform, _compile(parsed, platform))
+    return index
+
+
+def _compile(parsed: ParsedWebTemplate, platform: PlatformType) -> ValidationIndex:
+    valid_paths = tuple(enumerate_valid_paths(parsed, platform))
+
+    # parsed.nodes is in pre-order, so each parent precedes its children
+    trie: dict[str, SegmentNode] = {}
+    for path, node in parsed.nodes.items():
+        segment = trie[path] = SegmentNode(node.id, path, node.rm_type)
+        parent = trie.get(path.rpartition("/")[0])
+        if parent is not None:
+            parent.children[node.id] = segment
+    root = trie.get(parsed.tree_id) or SegmentNode(parsed.tree_id, parsed.tree_id, "COMPOSITION")
+
+    renamed = tuple(
+        RenamedNode(
+            node_id=node.id,
+            original_name=node.original_name,
+            slug=_slugify(node.original_name),
+            words=tuple(_slugify(w) for w in re.split(r"[\s/]+", node.original_name) if w),
+        )
+        for node in parsed.nodes.values()
+        if node.original_name is not None
+    )
+    rename_slugs: dict[str, int] = {}
+    for position, renamed_node in enumerate(renamed):
+        for slug in (renamed_node.slug, *renamed_node.words):
+            rename_slugs.setdefault(slug, position)
+
+    return ValidationIndex(
+        template_id=parsed.template_id,
+        tree_id=parsed.tree_id,
+        platform=platform,
+        valid_paths=valid_paths,
+        path_set=frozenset(valid_paths),
+        root=root,
+        suffixes={rm_type: tuple(suffixes) for rm_type, suffixes in VALID_SUFFIXES.items()},
+        renamed=renamed,
+        rename_slugs=rename_slugs,
+    )
@@ -1,31 +1,20 @@
 """Known RM type registry for OPT validation.
 
-Dynamically imports the RM type set from oehrpy.rm to stay in sync.
+Reads the RM type names from oehrpy.rm to stay in sync.
 """
 
 from __future__ import annotations
 
-import inspect
-
 
 def get_known_rm_types() -> frozenset[str]:
     """Return the set of all known openEHR RM 1.1.0 type names.
 
-    Imports from the generated RM module to stay in sync automatically.
+    Reads the names exported by :mod:`oehrpy.rm` to stay in sync
+    automatically, without loading the generated model classes.
     """
-    from pydantic import BaseModel
-
-    import oehrpy.rm.rm_types as rm_module
-
-    return frozenset(
-        name
-        for name in dir(rm_module)
-        if not name.startswith("_")
-        and name[0].isupper()
-        and inspect.isclass(getattr(rm_module, name))
-        and issubclass(getattr(rm_module, name), BaseModel)
-        and name not in ("BaseModel",)
-    )
+    from oehrpy import rm
+
+    return frozenset(rm.__all__)
 
 
 # Cache the set at module level for performance
@@ -2,20 +2,21 @@
 
 from __future__ import annotations
 
-import re
+from collections.abc import Collection
 from dataclasses import dataclass, field
 from typing import Literal
 
+from oehrpy.validation.index import PathMatch, SegmentNode, ValidationIndex, compile_index
 from oehrpy.validation.platforms import PlatformType
-from oehrpy.validation.required_fields import (
-    REQUIRED_FIELD_GROUPS,
-    VALID_SUFFIXES,
-)
-from oehrpy.validation.suggestions import suggest_path, suggest_segment
-from oehrpy.validation.web_template import ParsedWebTemplate, enumerate_valid_paths
+from oehrpy.validation.required_fields import REQUIRED_FIELD_GROUPS
+from oehrpy.validation.suggestions import suggest_segment
+from oehrpy.validation.web_template import ParsedWebTemplate
 
 ErrorType = Literal["unknown_path", "wrong_suffix", "missing_required", "index_mismatch"]
 
+# Number of "did you mean?" alternatives offered for an unknown path
+_MAX_SUGGESTIONS = 3
+
 _SIMSDT_SPEC_URL = (
     "https://specifications.openehr.org/releases/ITS-REST/latest/simplified_data_template.html"
 )
@@ -81,21 +82,16 @@ class ValidationResult:
     checked_path_count: int
 
 
-def _strip_indices(path: str) -> str:
-    """Remove all :N index notations from a path."""
-    return re.sub(r":\d+", "", path)
-
-
 def _check_index_issues(
     path: str,
-    platform: PlatformType,
-    valid_path_set: set[str],
+    match: PathMatch,
+    index: ValidationIndex,
 ) -> ValidationError | None:
     """Check if the error is due to index notation mismatch."""
-    if platform == "ehrbase" and re.search(r":\d+", path):
+    if index.platform == "ehrbase" and match.indexed:
         # Try removing indices
-        stripped = _strip_indices(path)
-        if stripped in valid_path_set:
+        stripped = match.stripped
+        if stripped in index.path_set:
             return ValidationError(
                 path=path,
                 error_type="index_mismatch",
@@ -106,24 +102,16 @@ def _check_index_issues(
                 suggestion=stripped,
             )
 
-    if platform == "better" and not re.search(r":\d+", path):
-        # Try adding :0 to segments
-        # This is a heuristic — try the last segment
-        parts = path.split("|")
-        base = parts[0]
-        suffix = "|" + parts[1] if len(parts) > 1 else ""
-        segments = base.split("/")
-        for i in range(len(segments) - 1, 0, -1):
-            indexed = segments.copy()
-            indexed[i] = indexed[i] + ":0"
-            candidate = "/".join(indexed) + suffix
-            if candidate in valid_path_set:
-                return ValidationError(
-                    path=path,
-                    error_type="index_mismatch",
-                    message="Better platform requires :0 index notation on array paths.",
-                    suggestion=candidate,
-                )
+    if index.platform == "better" and not match.indexed and match.node is not None:
+        # Better paths carry :0 on the last segment of the node path
+        candidate = f"{match.base}:0{match.suffix}"
+        if candidate in index.path_set:
+            return ValidationError(
+                path=path,
+                error_type="index_mismatch",
+                message="Better platform requires :0 index notation on array paths.",
+                suggestion=candidate,
+            )
 
     return None
 
@@ -137,29 +125,19 @@ def _check_any_event_issue(path: str, platform: PlatformType) -> str | None:
 
 def _check_suffix_issue(
     path: str,
-    parsed: ParsedWebTemplate,
+    match: PathMatch,
+    index: ValidationIndex,
 ) -> ValidationError | None:
     """Check if the path has a wrong suffix for its RM data type."""
-    if "|" not in path:
+    node = match.node
+    if not match.suffix or node is None:
         return None
 
-    base_path, suffix = path.rsplit("|", 1)
-    suffix_with_pipe = "|" + suffix
-
-    # Strip indices from base path for node lookup
-    lookup_path = _strip_indices(base_path)
-
-    node = parsed.get_node(lookup_path)
-    if node is None:
-        # Also try the raw base_path
-        node = parsed.get_node(base_path)
-    if node is None:
-        return None
-
-    valid = VALID_SUFFIXES.get(node.rm_type)
+    valid = index.suffixes.get(node.rm_type)
     if valid is None:
         return None
 
+    base_path = match.base
     if not valid:
         # This type takes no suffix
         return ValidationError(
@@ -170,14 +148,15 @@ def _check_suffix_issue(
             valid_alternatives=[base_path],
         )
 
-    if suffix_with_pipe not in valid:
+    if match.suffix not in valid:
         alternatives = [base_path + s for s in valid]
         valid_suffix_str = ", ".join(valid)
         return ValidationError(
             path=path,
             error_type="wrong_suffix",
             message=(
-                f"Invalid suffix '|{suffix}' for {node.rm_type}. Valid suffixes: {valid_suffix_str}"
+                f"Invalid suffix '{match.suffix}' for {node.rm_type}. "
+                f"Valid suffixes: {valid_suffix_str}"
             ),
             suggestion=alternatives[0] if alternatives else None,
             valid_alternatives=alternatives,
@@ -187,41 +166,74 @@ def _check_suffix_issue(
 
 
 def _check_renamed_segment(
-    path: str,
-    parsed: ParsedWebTemplate,
+    match: PathMatch,
+    index: ValidationIndex,
 ) -> tuple[str | None, str | None]:
     """Check if a path segment matches a renamed node's original name.
 
     Returns:
         A tuple of (message, suggested_fix_path) or (None, None).
     """
-    # Strip suffix for segment analysis
-    base_path = path.split("|")[0]
-    base_path_clean = _strip_indices(base_path)
-    segments = base_path_clean.split("/")
-    suffix_part = "|" + path.split("|")[1] if "|" in path else ""
+    # The first renamed node in template order wins, at its first matching segment
+    found: tuple[int, int] | None = None
+    for i, segment in enumerate(match.segments):
+        position = index.rename_slugs.get(segment)
+        if position is not None and (found is None or position < found[0]):
+            found = (position, i)
+    if found is None:
+        return None, None
+
+    position, i = found
+    node = index.renamed[position]
+    message = (
+        f"Node was renamed in this template. "
+        f'Original name "{node.original_name}" is now "{node.node_id}".'
+    )
+    # Build the corrected path by replacing the renamed segment
+    fixed_segments = match.segments.copy()
+    fixed_segments[i] = node.node_id
+    return message, "/".join(fixed_segments) + match.suffix
 
-    from oehrpy.validation.web_template import _slugify
 
-    for node in parsed.nodes.values():
-        if node.original_name is None:
-            continue
-        original_slug = _slugify(node.original_name)
-        # Also check individual words from the original name
-        original_words = [_slugify(w) for w in re.split(r"[\s/]+", node.original_name) if w]
-        for i, segment in enumerate(segments):
-            if segment == original_slug or segment in original_words:
-                message = (
-                    f"Node was renamed in this template. "
-                    f'Original name "{node.original_name}" is now "{node.id}".'
-                )
-                # Build the corrected path by replacing the renamed segment
-                fixed_segments = segments.copy()
-                fixed_segments[i] = node.id
-                fixed_path = "/".join(fixed_segments) + suffix_part
-                return message, fixed_path
+def _suggest_segments(match: PathMatch, index: ValidationIndex) -> list[str]:
+    """Suggest paths that replace the failing segment with a similar sibling.
 
-    return None, None
+    A wrong last segment is compared against its siblings. A wrong inner
+    segment is compared against the children of the deepest matching node,
+    keeping only candidates under which the rest of the path exists.
+    """
+    segments = match.segments
+    parent = match.parent
+    if parent is not None:
+        prefix = "/".join(segments[:-1])
+        return [
+            f"{prefix}/{s}{match.suffix}"
+            for s in suggest_segment(segments[-1], list(parent.children))
+        ]
+
+    depth = match.failing_segment
+    if not depth:
+        return []
+    parent = match.nodes[depth - 1]
+    rest = segments[depth + 1 :]
+    raw_segments = match.base.split("/")
+    suggestions = []
+    for candidate in suggest_segment(segments[depth], list(parent.children)):
+        node: SegmentNode | None = parent.children[candidate]
+        for segment in rest:
+            node = node.children.get(segment) if node is not None else None
+        if node is None:
+            continue
+        # Keep the caller's indices where the dialect accepts them
+        raw_segments[depth] = candidate
+        for fixed in (
+            "/".join(raw_segments) + match.suffix,
+            "/".join([*segments[:depth], candidate, *rest]) + match.suffix,
+        ):
+            if fixed in index.path_set:
+                suggestions.append(fixed)
+                break
+    return suggestions
 
 
 def validate_composition(
@@ -239,107 +251,139 @@ def validate_composition(
     Returns:
         A ValidationResult with errors and warnings.
     """
-    valid_paths = enumerate_valid_paths(parsed, platform)
-    valid_path_set = set(valid_paths)
+    return validate_with_index(flat_composition, compile_index(parsed, platform))
+
+
+def validate_with_index(
+    flat_composition: dict[str, object],
+    index: ValidationIndex,
+) -> ValidationResult:
+    """Validate a FLAT composition against a compiled validation index.
 
+    Args:
+        flat_composition: The FLAT format composition dict (path -> value).
+        index: The template's index for the target platform.
+
+    Returns:
+        A ValidationResult with errors and warnings.
+    """
     errors: list[ValidationError] = []
     warnings: list[ValidationError] = []
-    info: list[ValidationInfo] = []
-    checked_count = 0
     has_ctx_keys = False
 
     for path in flat_composition:
-        checked_count += 1
-
-        # Handle ctx/ shorthand paths (not in the Web Template tree)
-        if path.startswith("ctx/"):
-            has_ctx_keys = True
-            if not _is_valid_ctx_path(path):
-                warnings.append(
-                    ValidationError(
-                        path=path,
-                        error_type="unknown_path",
-                        message="Unknown ctx/ shorthand",
-                    )
-                )
-            continue
+        is_ctx = path.startswith("ctx/")
+        has_ctx_keys = has_ctx_keys or is_ctx
+        diagnosis = diagnose_path(path, index)
+        if diagnosis is not None:
+            (warnings if is_ctx else errors).append(diagnosis)
 
-        if path in valid_path_set:
-            continue
+    warnings.extend(check_required_fields(flat_composition.keys(), index))
+
+    return ValidationResult(
+        is_valid=len(errors) == 0,
+        errors=errors,
+        warnings=warnings,
+        info=[ctx_info()] if has_ctx_keys else [],
+        platform=index.platform,
+        template_id=index.template_id,
+        valid_path_count=len(index.valid_paths),
+        checked_path_count=len(flat_composition),
+    )
 
-        # Try to diagnose WHY it's invalid, in order of specificity
 
-        # 1. Check for index notation mismatch
-        index_error = _check_index_issues(path, platform, valid_path_set)
-        if index_error is not None:
-            errors.append(index_error)
-            continue
+def diagnose_path(path: str, index: ValidationIndex) -> ValidationError | None:
+    """Diagnose a single FLAT path.
 
-        # 2. Check for /any_event/ usage on EHRBase
-        any_event_msg = _check_any_event_issue(path, platform)
-        if any_event_msg is not None:
-            suggestion_paths = suggest_path(path, valid_paths)
-            errors.append(
-                ValidationError(
-                    path=path,
-                    error_type="unknown_path",
-                    message=any_event_msg,
-                    suggestion=suggestion_paths[0] if suggestion_paths else None,
-                )
-            )
-            continue
+    Unknown ``ctx/`` shorthands are diagnosed with a warning, every other
+    invalid path with an error.
 
-        # 3. Check for wrong data type suffix
-        suffix_error = _check_suffix_issue(path, parsed)
-        if suffix_error is not None:
-            errors.append(suffix_error)
-            continue
+    Args:
+        path: The FLAT path.
+        index: The template's index for the target platform.
 
-        # 4. Check if this is a renamed node
-        rename_msg, rename_fix = _check_renamed_segment(path, parsed)
-        message = rename_msg or "Path not found in Web Template."
-
-        # 5. Find suggestions — prefer rename-derived fix, then segment-level,
-        # then full-path fuzzy matching.
-        suggestions: list[str] = []
-
-        if rename_fix:
-            suggestions = [rename_fix]
-        else:
-            base = path.split("|")[0]
-            base = _strip_indices(base)
-            segments = base.split("/")
-            suffix_part = "|" + path.split("|")[1] if "|" in path else ""
-
-            if len(segments) > 1:
-                parent_path = "/".join(segments[:-1])
-                valid_children = parsed.get_children_ids(parent_path)
-                if valid_children:
-                    seg_suggestions = suggest_segment(segments[-1], valid_children)
-                    if seg_suggestions:
-                        suggestions = [
-                            "/".join(segments[:-1]) + "/" + s + suffix_part for s in seg_suggestions
-                        ]
-
-            if not suggestions:
-                suggestions = suggest_path(path, valid_paths)
-
-        errors.append(
-            ValidationError(
-                path=path,
-                error_type="unknown_path",
-                message=message,
-                suggestion=suggestions[0] if suggestions else None,
-                valid_alternatives=suggestions,
-            )
+    Returns:
+        The diagnosis, or None if the path is valid.
+    """
+    # Handle ctx/ shorthand paths (not in the Web Template tree)
+    if path.startswith("ctx/"):
+        if _is_valid_ctx_path(path):
+            return None
+        return ValidationError(
+            path=path,
+            error_type="unknown_path",
+            message="Unknown ctx/ shorthand",
+        )
+
+    if path in index.path_set:
+        return None
+
+    # Try to diagnose WHY it's invalid, in order of specificity, from a
+    # single descent of the segment trie
+    match = index.match(path)
+
+    # 1. Check for index notation mismatch
+    index_error = _check_index_issues(path, match, index)
+    if index_error is not None:
+        return index_error
+
+    # 2. Check for /any_event/ usage on EHRBase
+    any_event_msg = _check_any_event_issue(path, index.platform)
+    if any_event_msg is not None:
+        suggestion_paths = index.suggester.suggest(path)
+        return ValidationError(
+            path=path,
+            error_type="unknown_path",
+            message=any_event_msg,
+            suggestion=suggestion_paths[0] if suggestion_paths else None,
         )
 
-    # Check required fields
-    flat_keys = set(flat_composition.keys())
+    # 3. Check for wrong data type suffix
+    suffix_error = _check_suffix_issue(path, match, index)
+    if suffix_error is not None:
+        return suffix_error
+
+    # 4. Check if this is a renamed node
+    rename_msg, rename_fix = _check_renamed_segment(match, index)
+    message = rename_msg or "Path not found in Web Template."
+
+    # 5. Find suggestions — prefer rename-derived fix, then segment-level,
+    # then full-path fuzzy matching.
+    if rename_fix:
+        suggestions = [rename_fix]
+    elif match.parent is not None:
+        suggestions = _suggest_segments(match, index) or index.suggester.suggest(path)
+    else:
+        # The best repair of a wrong inner segment comes first, full-path
+        # fuzzy matches fill up the rest
+        suggestions = _suggest_segments(match, index)[:1]
+        for fuzzy in index.suggester.suggest(path, _MAX_SUGGESTIONS):
+            if len(suggestions) == _MAX_SUGGESTIONS:
+                break
+            if fuzzy not in suggestions:
+                suggestions.append(fuzzy)
+
+    return ValidationError(
+        path=path,
+        error_type="unknown_path",
+        message=message,
+        suggestion=suggestions[0] if suggestions else None,
+        valid_alternatives=suggestions,
+    )
+
+
+def check_required_fields(paths: Collection[str], index: ValidationIndex) -> list[ValidationError]:
+    """Return a warning for each required composition field group with no path present.
+
+    Args:
+        paths: The FLAT paths of the composition; a set or dict view for fast lookups.
+        index: The template's index for the target platform.
+    """
+    warnings: list[ValidationError] = []
     for group in REQUIRED_FIELD_GROUPS:
-        found = any(f"{parsed.tree_id}/{f}" in flat_keys for f in group)
+        found = any(f"{index.tree_id}/{f}" in paths for f in group)
         if not found:
-            full_path = f"{parsed.tree_id}/{group[0]}"
+            full_path = f"{index.tree_id}/{group[0]}"
             warnings.append(
                 ValidationError(
                     path=full_path,
@@ -347,26 +391,14 @@ def validate_composition(
                     message="Required composition field is missing.",
                 )
             )
+    return warnings
 
-    if has_ctx_keys:
-        info.append(
-            ValidationInfo(
-                message=(
-                    "Composition contains ctx/ shorthand keys defined by the openEHR "
-                    f"simSDT specification: {_SIMSDT_SPEC_URL}"
-                )
-            )
-        )
-
-    is_valid = len(errors) == 0
 
-    return ValidationResult(
-        is_valid=is_valid,
-        errors=errors,
-        warnings=warnings,
-        info=info,
-        platform=platform,
-        template_id=parsed.template_id,
-        valid_path_count=len(valid_paths),
-        checked_path_count=checked_count,
+def ctx_info() -> ValidationInfo:
+    """Return the note added to results of compositions with ctx/ shorthand keys."""
+    return ValidationInfo(
+        message=(
+            "Composition contains ctx/ shorthand keys defined by the openEHR "
+            f"simSDT specification: {_SIMSDT_SPEC_URL}"
+        )
     )
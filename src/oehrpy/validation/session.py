@@ -0,0 +1,160 @@
+"""Incremental validation of a FLAT composition that is being edited.
+
+Validation diagnoses each path on its own, except for the required-field
+checks, which only depend on which paths are present. A
+:class:`ValidationSession` keeps the diagnosis of every path of a document
+and, on each edit, diagnoses only the paths it adds and re-runs the
+required-field checks; a changed value keeps the diagnosis of its path. It
+returns the diagnostics that appeared and disappeared, which is what an
+editor needs to update its problem markers::
+
+    session = validator.session(flat_composition)
+    publish(session.result.errors)
+    ...
+    diff = session.update(added=["vitals/pulse/rate|magnitude"], removed=["vitals/pulse/rat"])
+    for error in diff.added_errors:
+        ...
+
+The full result stays available as :attr:`ValidationSession.result` and
+equals what :func:`~oehrpy.validation.validate_with_index` returns for the
+current paths.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from oehrpy.validation.index import ValidationIndex
+from oehrpy.validation.path_checker import (
+    ValidationError,
+    ValidationResult,
+    check_required_fields,
+    ctx_info,
+    diagnose_path,
+)
+
+
+@dataclass
+class ValidationDiff:
+    """Diagnostics that appeared or disappeared with an edit."""
+
+    added_errors: list[ValidationError] = field(default_factory=list)
+    removed_errors: list[ValidationError] = field(default_factory=list)
+    added_warnings: list[ValidationError] = field(default_factory=list)
+    removed_warnings: list[ValidationError] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the edit left the diagnostics unchanged."""
+        return not (
+            self.added_errors or self.removed_errors or self.added_warnings or self.removed_warnings
+        )
+
+
+class ValidationSession:
+    """Validation state of one FLAT composition, updated edit by edit.
+
+    Paths are kept in the order they were added, so :attr:`result` lists
+    diagnostics in the same order as validating a dict built by the same
+    edits would.
+
+    Args:
+        index: The template's index for the target platform.
+        paths: The paths of the composition when the session starts.
+    """
+
+    def __init__(self, index: ValidationIndex, paths: Iterable[str] = ()) -> None:
+        self._index = index
+        self._diagnoses: dict[str, ValidationError | None] = {}
+        self._ctx_count = 0
+        self._required: list[ValidationError] = []
+        self._result: ValidationResult | None = None
+        self.update(added=paths)
+
+    @property
+    def paths(self) -> list[str]:
+        """The paths of the composition, in the order they were added."""
+        return list(self._diagnoses)
+
+    @property
+    def result(self) -> ValidationResult:
+        """The validation result of the current paths."""
+        if self._result is None:
+            errors: list[ValidationError] = []
+            warnings: list[ValidationError] = []
+            for path, diagnosis in self._diagnoses.items():
+                if diagnosis is not None:
+                    (warnings if path.startswith("ctx/") else errors).append(diagnosis)
+            warnings.extend(self._required)
+            self._result = ValidationResult(
+                is_valid=len(errors) == 0,
+                errors=errors,
+                warnings=warnings,
+                info=[ctx_info()] if self._ctx_count else [],
+                platform=self._index.platform,
+                template_id=self._index.template_id,
+                valid_path_count=len(self._index.valid_paths),
+                checked_path_count=len(self._diagnoses),
+            )
+        return self._result
+
+    def update(
+        self,
+        added: Iterable[str] = (),
+        removed: Iterable[str] = (),
+        changed: Iterable[str] = (),
+    ) -> ValidationDiff:
+        """Apply an edit and re-diagnose the paths it touched.
+
+        Renaming a path is removing the old path and adding the new one.
+        Changing a path that is not present adds it; adding a path that is
+        already present or removing one that is not does nothing.
+
+        Args:
+            added: Paths added to the composition.
+            removed: Paths removed from the composition.
+            changed: Paths whose value changed.
+
+        Returns:
+            The diagnostics that appeared and disappeared.
+        """
+        diff = ValidationDiff()
+        for path in removed:
+            if path not in self._diagnoses:
+                continue
+            self._record(diff, path, self._diagnoses.pop(path), None)
+            if path.startswith("ctx/"):
+                self._ctx_count -= 1
+
+        # A diagnosis depends only on the path, not on its value, so paths
+        # that are already present keep theirs
+        for paths in (changed, added):
+            for path in paths:
+                if path in self._diagnoses:
+                    continue
+                if path.startswith("ctx/"):
+                    self._ctx_count += 1
+                diagnosis = self._diagnoses[path] = diagnose_path(path, self._index)
+                self._record(diff, path, None, diagnosis)
+
+        required = check_required_fields(self._diagnoses.keys(), self._index)
+        diff.removed_warnings.extend(w for w in self._required if w not in required)
+        diff.added_warnings.extend(w for w in required if w not in self._required)
+        self._required = required
+
+        self._result = None
+        return diff
+
+    @staticmethod
+    def _record(
+        diff: ValidationDiff,
+        path: str,
+        removed: ValidationError | None,
+        added: ValidationError | None,
+    ) -> None:
+        is_ctx = path.startswith("ctx/")
+        if removed is not None:
+            (diff.removed_warnings if is_ctx else diff.removed_errors).append(removed)
+        if added is not None:
+            (diff.added_warnings if is_ctx else diff.added_errors).append(added)
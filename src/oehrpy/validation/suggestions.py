@@ -3,14 +3,20 @@
 from __future__ import annotations
 
 import difflib
+import heapq
+from collections import Counter
+from collections.abc import Iterable, Sequence
 
 
-def suggest_path(invalid_path: str, valid_paths: list[str], max_suggestions: int = 3) -> list[str]:
+def suggest_path(
+    invalid_path: str, valid_paths: Sequence[str], max_suggestions: int = 3
+) -> list[str]:
     """Find the closest matching valid paths for an invalid path.
 
     Uses difflib.get_close_matches which is based on SequenceMatcher
     (Ratcliff/Obershelp pattern matching). This is in the stdlib so
-    we need no extra dependencies.
+    we need no extra dependencies. It compares against every valid path;
+    use a :class:`PathSuggester` for repeated lookups in large templates.
 
     Args:
         invalid_path: The path that failed validation.
@@ -40,3 +46,138 @@ def suggest_segment(
         List of suggested valid segments, ordered by similarity.
     """
     return difflib.get_close_matches(invalid_segment, valid_segments, n=max_suggestions, cutoff=0.3)
+
+
+def _trigrams(text: str) -> list[str]:
+    padded = f"  {text} "
+    return [padded[i : i + 3] for i in range(len(padded) - 2)]
+
+
+# Slack for comparing similarity bounds with ratios computed another way
+_EPSILON = 1e-9
+
+
+class PathSuggester:
+    """Trigram index over valid paths for fast "did you mean?" lookups.
+
+    :func:`suggest_path` compares an invalid path with every valid path,
+    which takes seconds per key for templates with tens of thousands of
+    paths. This index returns exactly the same suggestions, in the same
+    order, while computing difflib's similarity ratio for few paths.
+
+    By the q-gram lemma, every edit turns at most three trigrams of a path
+    into ones the other path lacks, so the trigrams two paths share bound
+    their edit distance from below and their similarity ratio from above.
+    Paths are ranked in order of that bound, from counts in an inverted
+    trigram index, and ranking stops once no unranked path can beat the
+    current last suggestion. Results are cached, since the same misspelled
+    key tends to recur.
+
+    Args:
+        valid_paths: All valid paths to match against.
+        max_frequency: Trigrams found in more than this fraction of the
+            paths (such as those of the template root) are not indexed and
+            are assumed to be shared with every path.
+        cache_size: Maximum number of cached lookups.
+    """
+
+    def __init__(
+        self,
+        valid_paths: Sequence[str],
+        max_frequency: float = 0.1,
+        cache_size: int = 4096,
+    ) -> None:
+        self.paths = tuple(valid_paths)
+        self.cache_size = cache_size
+        postings: dict[str, set[int]] = {}
+        by_length: dict[int, list[int]] = {}
+        for i, path in enumerate(self.paths):
+            for gram in _trigrams(path):
+                postings.setdefault(gram, set()).add(i)
+            by_length.setdefault(len(path), []).append(i)
+        limit = max(1, int(max_frequency * len(self.paths)))
+        self._postings = {g: tuple(ids) for g, ids in postings.items() if len(ids) <= limit}
+        self._frequent = frozenset(g for g, ids in postings.items() if len(ids) > limit)
+        self._by_length = by_length
+        self._lengths = [len(path) for path in self.paths]
+        self._cache: dict[tuple[str, int, float], list[str]] = {}
+
+    def suggest(
+        self, invalid_path: str, max_suggestions: int = 3, cutoff: float = 0.4
+    ) -> list[str]:
+        """Find the closest matching valid paths for an invalid path.
+
+        Args:
+            invalid_path: The path that failed validation.
+            max_suggestions: Maximum number of suggestions to return.
+            cutoff: Minimum similarity ratio of a suggestion.
+
+        Returns:
+            List of suggested valid paths, ordered by similarity.
+        """
+        key = (invalid_path, max_suggestions, cutoff)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._suggest(invalid_path, max_suggestions, cutoff)
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[key] = cached
+        return list(cached)
+
+    def _suggest(self, invalid_path: str, max_suggestions: int, cutoff: float) -> list[str]:
+        # Upper bound of the number of trigram occurrences each path shares
+        # with the invalid path: unindexed trigrams may be shared by any path
+        shared_by_all = 0
+        shared: Counter[int] = Counter()
+        for gram, count in Counter(_trigrams(invalid_path)).items():
+            if gram in self._frequent:
+                shared_by_all += count
+            else:
+                for i in self._postings.get(gram, ()):
+                    shared[i] += count
+
+        # By the q-gram lemma, a path of length n sharing at most c trigrams
+        # is at least (max(length, n) + 1 - c) / 3 edits away, and each edit
+        # lowers the ratio by at least 1 / (length + n)
+        length = len(invalid_path)
+        lengths = self._lengths
+
+        def bound(n: int, common: int) -> float:
+            edits = (max(length, n) + 1 - shared_by_all - common) / 3
+            if edits <= 0 or not length + n:
+                return 1.0
+            return 1.0 - edits / (length + n)
+
+        # Paths sharing indexed trigrams, and groups of same-length paths
+        # sharing none (encoded as -1 - length)
+        order = [(bound(lengths[i], common), i) for i, common in shared.items()]
+        order.extend((bound(n, 0), -1 - n) for n in self._by_length)
+        order.sort(reverse=True)
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(invalid_path)
+        best: list[tuple[float, str]] = []
+        threshold = cutoff
+        for upper, key in order:
+            if upper < threshold - _EPSILON:
+                break
+            if key >= 0:
+                indices: Iterable[int] = (key,)
+            else:
+                indices = (i for i in self._by_length[-1 - key] if i not in shared)
+            for i in indices:
+                path = self.paths[i]
+                matcher.set_seq1(path)
+                if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                    continue
+                score = matcher.ratio()
+                if score < threshold:
+                    continue
+                # Ties are ranked by path, as difflib.get_close_matches does
+                if len(best) < max_suggestions:
+                    heapq.heappush(best, (score, path))
+                elif (score, path) > best[0]:
+                    heapq.heapreplace(best, (score, path))
+                if len(best) == max_suggestions:
+                    threshold = max(cutoff, best[0][0])
+        return [path for _, path in sorted(best, reverse=True)]
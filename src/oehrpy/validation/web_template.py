@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from oehrpy.validation.platforms import get_dialect
 from oehrpy.validation.required_fields import STRUCTURAL_RM_TYPES, VALID_SUFFIXES
 
+if TYPE_CHECKING:
+    from oehrpy.validation.index import ValidationIndex
+
 
 @dataclass
 class WebTemplateNode:
@@ -19,6 +22,7 @@ class WebTemplateNode:
     rm_type: str
     path: str
     aql_path: str = ""
+    node_id: str = ""
     min: int = 0
     max: int = 1
     original_name: str | None = None
@@ -44,6 +48,10 @@ class ParsedWebTemplate:
     template_id: str
     nodes: dict[str, WebTemplateNode] = field(default_factory=dict)
     children_map: dict[str, list[str]] = field(default_factory=dict)
+    # Compiled validation indexes by platform (see oehrpy.validation.index)
+    _indexes: dict[str, ValidationIndex] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def get_node(self, path: str) -> WebTemplateNode | None:
         """Get a node by its full FLAT path."""
@@ -125,6 +133,7 @@ def parse_web_template(web_template: dict[str, Any]) -> ParsedWebTemplate:
             rm_type=rm_type,
             path=current_path,
             aql_path=node_data.get("aqlPath", ""),
+            node_id=node_data.get("nodeId", ""),
             min=node_data.get("min", 0),
             max=node_data.get("max", 1),
             original_name=original_name,
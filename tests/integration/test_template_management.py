@@ -114,7 +114,7 @@ class TestDeleteTemplate:
         except Exception:
             pytest.skip("Could not fetch web template")
 
-        assert vital_signs_template in ehrbase_client._web_template_cache
+        assert vital_signs_template in ehrbase_client.web_template_cache
 
         # Delete (may fail with 409)
         try:
@@ -124,7 +124,7 @@ class TestDeleteTemplate:
                 pytest.skip("Cannot delete: compositions reference this template")
             raise
 
-        assert vital_signs_template not in ehrbase_client._web_template_cache
+        assert vital_signs_template not in ehrbase_client.web_template_cache
 
 
 @pytest.mark.integration
@@ -161,7 +161,7 @@ class TestUpdateTemplate:
         except Exception:
             pytest.skip("Could not fetch web template")
 
-        assert vital_signs_template in ehrbase_client._web_template_cache
+        assert vital_signs_template in ehrbase_client.web_template_cache
 
         # Update
         try:
@@ -172,4 +172,4 @@ class TestUpdateTemplate:
             raise
 
         # Cache should be cleared (the delete step in fallback clears it)
-        assert vital_signs_template not in ehrbase_client._web_template_cache
+        assert vital_signs_template not in ehrbase_client.web_template_cache
@@ -0,0 +1,399 @@
+"""Unit tests for bulk composition upload."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from oehrpy.client import (
+    BulkCompositionItem,
+    BulkCompositionResult,
+    CompositionFormat,
+    ContributionBuilder,
+    ContributionChange,
+    ContributionChunk,
+    ContributionChunker,
+    ContributionTemplate,
+    EHRBaseClient,
+    PreconditionFailedError,
+    ValidationError,
+)
+
+EHR_ID = "7d44b88c-4199-4bad-97dc-d78268e01398"
+TEMPLATE_ID = "IDCR - Vital Signs Encounter.v1"
+
+
+def _mock_response(status_code: int, json_data: dict | list | None = None) -> httpx.Response:
+    """Build a fake httpx.Response."""
+    resp = MagicMock(spec=httpx.Response)
+    resp.status_code = status_code
+    resp.text = ""
+    if json_data is not None:
+        resp.json.return_value = json_data
+    else:
+        resp.json.side_effect = Exception("no body")
+    return resp
+
+
+@pytest.fixture
+async def client() -> EHRBaseClient:
+    c = EHRBaseClient(base_url="http://localhost:8080/ehrbase")
+    c._client = AsyncMock(spec=httpx.AsyncClient)
+    return c
+
+
+def _items(n: int) -> list[tuple[str, dict[str, Any], str, str]]:
+    return [(EHR_ID, {"n": i}, TEMPLATE_ID, "FLAT") for i in range(n)]
+
+
+async def _collect(upload: Any) -> list[BulkCompositionResult]:
+    return [result async for result in upload]
+
+
+class TestItems:
+    def test_coerce_tuple(self) -> None:
+        """Tuples are converted, with trailing fields defaulted."""
+        item = BulkCompositionItem.coerce((EHR_ID, {"a": 1}))
+        assert item == BulkCompositionItem(EHR_ID, {"a": 1}, None, CompositionFormat.FLAT)
+
+    def test_coerce_item_unchanged(self) -> None:
+        item = BulkCompositionItem(EHR_ID, {}, TEMPLATE_ID)
+        assert BulkCompositionItem.coerce(item) is item
+
+
+class TestBulkUpload:
+    async def test_creates_all_items(self, client: EHRBaseClient) -> None:
+        """Every item is posted with its template and format."""
+
+        async def post(url: str, **kwargs: Any) -> httpx.Response:
+            n = kwargs["json"]["n"]
+            return _mock_response(201, {"uid": {"value": f"uid-{n}::local::1"}})
+
+        client._client.post = AsyncMock(side_effect=post)
+
+        results = await _collect(client.create_compositions_bulk(_items(5)))
+
+        assert sorted(r.index for r in results) == [0, 1, 2, 3, 4]
+        assert all(r.ok for r in results)
+        for result in results:
+            assert result.response is not None
+            assert result.response.uid == f"uid-{result.index}::local::1"
+            assert result.response.ehr_id == EHR_ID
+        _, kwargs = client._client.post.call_args
+        assert kwargs["params"] == {"templateId": TEMPLATE_ID, "format": "FLAT"}
+
+    async def test_accepts_async_iterable(self, client: EHRBaseClient) -> None:
+        client._client.post = AsyncMock(return_value=_mock_response(201, {"uid": "x::l::1"}))
+
+        async def source() -> AsyncIterator[BulkCompositionItem]:
+            for i in range(3):
+                yield BulkCompositionItem(EHR_ID, {"n": i}, TEMPLATE_ID)
+
+        results = await _collect(client.create_compositions_bulk(source()))
+        assert len(results) == 3
+
+    async def test_respects_max_concurrency(self, client: EHRBaseClient) -> None:
+        """No more than max_concurrency requests are in flight at once."""
+        in_flight = 0
+        peak = 0
+
+        async def post(url: str, **kwargs: Any) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return _mock_response(201, {"uid": "x::l::1"})
+
+        client._client.post = AsyncMock(side_effect=post)
+
+        results = await _collect(client.create_compositions_bulk(_items(20), max_concurrency=4))
+
+        assert len(results) == 20
+        assert peak == 4
+
+    async def test_yields_in_completion_order(self, client: EHRBaseClient) -> None:
+        delays = {0: 0.03, 1: 0.0, 2: 0.015}
+
+        async def post(url: str, **kwargs: Any) -> httpx.Response:
+            await asyncio.sleep(delays[kwargs["json"]["n"]])
+            return _mock_response(201, {"uid": "x::l::1"})
+
+        client._client.post = AsyncMock(side_effect=post)
+
+        results = await _collect(client.create_compositions_bulk(_items(3), max_concurrency=3))
+        assert [r.index for r in results] == [1, 2, 0]
+
+    async def test_errors_returned_as_results(self, client: EHRBaseClient) -> None:
+        """Server rejections do not abort the batch."""
+        responses = {
+            0: _mock_response(201, {"uid": "ok::l::1"}),
+            1: _mock_response(422, {"message": "invalid"}),
+            2: _mock_response(412, {"message": "conflict"}),
+        }
+
+        async def post(url: str, **kwargs: Any) -> httpx.Response:
+            n = kwargs["json"]["n"]
+            if n == 3:
+                raise httpx.ConnectError("refused")
+            return responses[n]
+
+        client._client.post = AsyncMock(side_effect=post)
+
+        upload = client.create_compositions_bulk(_items(4))
+        results = {r.index: r for r in await _collect(upload)}
+
+        assert results[0].ok
+        assert isinstance(results[1].error, ValidationError)
+        assert isinstance(results[2].error, PreconditionFailedError)
+        assert isinstance(results[3].error, httpx.ConnectError)
+        assert results[1].response is None
+        assert upload.stats.succeeded == 1
+        assert upload.stats.failed == 3
+
+    async def test_stats(self, client: EHRBaseClient) -> None:
+        client._client.post = AsyncMock(return_value=_mock_response(201, {"uid": "x::l::1"}))
+
+        upload = client.create_compositions_bulk(_items(10))
+        await _collect(upload)
+
+        assert upload.stats.submitted == 10
+        assert upload.stats.completed == 10
+        assert upload.stats.elapsed > 0
+        assert upload.stats.throughput == pytest.approx(10 / upload.stats.elapsed)
+
+    async def test_pulls_items_lazily(self, client: EHRBaseClient) -> None:
+        """Items are only pulled from the source when a request slot is free."""
+        pulled = 0
+        client._client.post = AsyncMock(return_value=_mock_response(201, {"uid": "x::l::1"}))
+
+        async def source() -> AsyncIterator[tuple[str, dict[str, Any]]]:
+            nonlocal pulled
+            for i in range(1000):
+                pulled += 1
+                yield (EHR_ID, {"n": i})
+
+        upload = client.create_compositions_bulk(source(), max_concurrency=2)
+        async for _ in upload:
+            break
+
+        assert pulled <= 3
+
+    async def test_aclose_cancels_pending(self, client: EHRBaseClient) -> None:
+        """Requests still in flight are cancelled when the upload is closed early."""
+        started = 0
+        cancelled = 0
+
+        async def post(url: str, **kwargs: Any) -> httpx.Response:
+            nonlocal started, cancelled
+            if kwargs["json"]["n"] == 0:
+                await asyncio.sleep(0.01)
+                return _mock_response(201, {"uid": "x::l::1"})
+            started += 1
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled += 1
+                raise
+            return _mock_response(201, {"uid": "x::l::1"})
+
+        client._client.post = AsyncMock(side_effect=post)
+
+        upload = client.create_compositions_bulk(_items(3), max_concurrency=3)
+        async for _ in upload:
+            break
+        await upload.aclose()
+
+        assert started == 2
+        assert cancelled == 2
+
+    async def test_single_iteration(self, client: EHRBaseClient) -> None:
+        client._client.post = AsyncMock(return_value=_mock_response(201, {"uid": "x::l::1"}))
+        upload = client.create_compositions_bulk(_items(1))
+        await _collect(upload)
+        with pytest.raises(RuntimeError):
+            await _collect(upload)
+
+    def test_invalid_concurrency(self, client: EHRBaseClient) -> None:
+        with pytest.raises(ValueError, match="max_concurrency"):
+            client.create_compositions_bulk(_items(1), max_concurrency=0)
+
+
+def _change(ehr_id: str, n: int, **kwargs: Any) -> ContributionChange:
+    return ContributionChange(ehr_id, composition={"n": n}, **kwargs)
+
+
+class _ContributionServer:
+    """Mock transport handler recording committed contributions per EHR."""
+
+    def __init__(self, fail: set[tuple[str, int]] | None = None) -> None:
+        self.fail = fail or set()
+        self.committed: dict[str, list[list[int]]] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        ehr_id = request.url.path.split("/")[-2]
+        body = json.loads(request.content)
+        numbers = [v["data"]["n"] for v in body["versions"]]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        if (ehr_id, len(self.committed.get(ehr_id, []))) in self.fail:
+            self.fail.discard((ehr_id, len(self.committed.get(ehr_id, []))))
+            return httpx.Response(422, json={"message": "invalid version"})
+        self.committed.setdefault(ehr_id, []).append(numbers)
+        return httpx.Response(201, json={"uid": {"value": f"c-{ehr_id}-{numbers[0]}"}})
+
+
+class TestContributionChunker:
+    def test_chunks_by_count_per_ehr(self) -> None:
+        chunker = ContributionChunker(max_versions=2)
+        ready = []
+        for i in range(5):
+            ready += chunker.add(_change("a", i))
+            ready += chunker.add(_change("b", i))
+        ready += chunker.flush()
+
+        by_ehr = {
+            ehr: [
+                [c.composition["n"] for c in chunk.changes]
+                for chunk in ready
+                if chunk.ehr_id == ehr
+            ]  # type: ignore[index]
+            for ehr in "ab"
+        }
+        assert by_ehr == {"a": [[0, 1], [2, 3], [4]], "b": [[0, 1], [2, 3], [4]]}
+        assert [c.sequence for c in ready if c.ehr_id == "a"] == [0, 1, 2]
+
+    def test_chunks_by_bytes(self) -> None:
+        change = _change("a", 0)
+        chunker = ContributionChunker(max_versions=100, max_bytes=change.estimated_size() * 2)
+        ready = []
+        for i in range(5):
+            ready += chunker.add(_change("a", i))
+        ready += chunker.flush()
+        assert [len(c.changes) for c in ready] == [2, 2, 1]
+        assert all(c.size <= change.estimated_size() * 2 for c in ready)
+
+    def test_oversized_change_sent_alone(self) -> None:
+        chunker = ContributionChunker(max_bytes=10)
+        assert [len(c.changes) for c in chunker.add(_change("a", 0))] == []
+        assert [len(c.changes) for c in chunker.add(_change("a", 1))] == [1]
+        assert [len(c.changes) for c in chunker.flush()] == [1]
+
+    def test_max_open_ehrs_evicts_least_recent(self) -> None:
+        chunker = ContributionChunker(max_versions=10, max_open_ehrs=2)
+        assert chunker.add(_change("a", 0)) == []
+        assert chunker.add(_change("b", 0)) == []
+        assert chunker.add(_change("a", 1)) == []
+        (evicted,) = chunker.add(_change("c", 0))
+        assert evicted.ehr_id == "b"
+        assert sorted(c.ehr_id for c in chunker.flush()) == ["a", "c"]
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError, match="max_versions"):
+            ContributionChunker(max_versions=0)
+
+
+class TestContributionChange:
+    def test_build_chunk(self) -> None:
+        chunk = ContributionChunk(
+            "a",
+            0,
+            [
+                _change("a", 0),
+                _change("a", 1, change_type="modification", preceding_version_uid="v::s::1"),
+                ContributionChange("a", "deleted", preceding_version_uid="w::s::1"),
+            ],
+        )
+        body = chunk.build(committer="loader")
+        assert [v["commit_audit"]["change_type"]["value"] for v in body["versions"]] == [
+            "creation",
+            "modification",
+            "deleted",
+        ]
+        assert body["audit"]["committer"]["name"] == "loader"
+
+    def test_body_reuses_sizing_encoding(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        chunker = ContributionChunker(max_bytes=10_000)
+        for i in range(3):
+            chunker.add(
+                _change("a", i, change_type="amendment", preceding_version_uid=f"v::s::{i}")
+            )
+        (chunk,) = chunker.flush()
+        template = ContributionTemplate(committer="loader")
+        expected = ContributionBuilder(template=template)
+        for change in chunk.changes:
+            expected.add_amendment(change.preceding_version_uid, change.composition)  # type: ignore[arg-type]
+
+        dumps = MagicMock(side_effect=json.dumps)
+        monkeypatch.setattr(json, "dumps", dumps)
+        body = chunk.build_json(template)
+        compositions = [change.composition for change in chunk.changes]
+        assert not any(call.args[0] in compositions for call in dumps.call_args_list)
+        assert json.loads(body)["versions"][2]["data"] == {"n": 2}
+        assert len(body) == len(expected.build_json())
+
+    def test_missing_preceding_version(self) -> None:
+        with pytest.raises(ValueError, match="missing"):
+            ContributionChunk("a", 0, [ContributionChange("a", "amendment", {"n": 1})]).build()
+
+    def test_unknown_change_type(self) -> None:
+        with pytest.raises(ValueError, match="Unknown change_type"):
+            ContributionChunk("a", 0, [ContributionChange("a", "merge", {"n": 1})]).build()
+
+
+class TestContributionsBatched:
+    async def test_commits_in_order_per_ehr(self) -> None:
+        server = _ContributionServer()
+        changes = [_change(ehr, i) for i in range(7) for ehr in ("a", "b", "c")]
+        async with EHRBaseClient(transport=httpx.MockTransport(server)) as client:
+            upload = client.create_contributions_batched(changes, max_versions=3, max_concurrency=3)
+            results = [result async for result in upload]
+
+        assert all(r.ok for r in results)
+        assert server.committed == {ehr: [[0, 1, 2], [3, 4, 5], [6]] for ehr in "abc"}
+        assert server.max_in_flight > 1
+        assert upload.stats.succeeded == 9
+        assert upload.stats.versions_committed == 21
+        assert results[0].response is not None
+        assert results[0].response.contribution_uid.startswith("c-")
+
+    async def test_failed_chunk_skips_rest_of_ehr(self) -> None:
+        server = _ContributionServer(fail={("a", 1)})
+        changes = [_change(ehr, i) for ehr in ("a", "b") for i in range(6)]
+        async with EHRBaseClient(transport=httpx.MockTransport(server)) as client:
+            upload = client.create_contributions_batched(changes, max_versions=2)
+            results = sorted([r async for r in upload], key=lambda r: r.index)
+
+        a = [r for r in results if r.chunk.ehr_id == "a"]
+        assert [r.ok for r in a] == [True, False, False]
+        assert isinstance(a[1].error, ValidationError)
+        assert a[2].skipped and a[2].error is a[1].error
+        assert server.committed == {"a": [[0, 1]], "b": [[0, 1], [2, 3], [4, 5]]}
+        assert upload.stats.failed == 2
+        assert upload.stats.skipped == 1
+        assert upload.stats.versions_committed == 8
+
+    async def test_invalid_change_reported(self) -> None:
+        server = _ContributionServer()
+        changes = [ContributionChange("a", "amendment", {"n": 0})]
+        async with EHRBaseClient(transport=httpx.MockTransport(server)) as client:
+            (result,) = [r async for r in client.create_contributions_batched(changes)]
+        assert isinstance(result.error, ValueError)
+        assert server.committed == {}
+
+    async def test_iterated_once(self) -> None:
+        async with EHRBaseClient(transport=httpx.MockTransport(_ContributionServer())) as client:
+            upload = client.create_contributions_batched([])
+            assert [r async for r in upload] == []
+            with pytest.raises(RuntimeError, match="once"):
+                upload.__aiter__()
@@ -0,0 +1,290 @@
+"""Unit tests for client event hooks and the metrics collector."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import AsyncIterator, Iterator
+
+import httpx
+import pytest
+
+from oehrpy.client import (
+    ClientHooks,
+    EHRBaseClient,
+    EHRBaseConfig,
+    EHRBaseError,
+    Histogram,
+    MetricsCollector,
+    NotFoundError,
+    OperationClass,
+    RequestEvent,
+    RetryPolicy,
+    SyncEHRBaseClient,
+)
+from oehrpy.client.ehrbase import _wrap_transport
+from oehrpy.client.metrics import endpoint_template
+from oehrpy.client.sync import _SyncRetryTransport
+
+EHR_ID = "7d44b88c-4199-4bad-97dc-d78268e01398"
+WEB_TEMPLATE = {"templateId": "t", "tree": {"id": "t", "rmType": "COMPOSITION", "children": []}}
+
+
+class Recorder(ClientHooks):
+    def __init__(self) -> None:
+        self.started: list[RequestEvent] = []
+        self.finished: list[RequestEvent] = []
+        self.lookups: list[tuple[str, str, str]] = []
+
+    def request_started(self, event: RequestEvent) -> None:
+        self.started.append(event)
+
+    def request_finished(self, event: RequestEvent) -> None:
+        self.finished.append(event)
+
+    def cache_lookup(self, cache: str, key: str, result: str) -> None:
+        self.lookups.append((cache, key, result))
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path.endswith("/definition/template/adl1.4/t"):
+        return httpx.Response(200, json=WEB_TEMPLATE)
+    if path.endswith(f"/ehr/{EHR_ID}"):
+        return httpx.Response(200, json={"ehr_id": {"value": EHR_ID}})
+    return httpx.Response(404)
+
+
+class TestEndpointTemplate:
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            (f"/rest/openehr/v1/ehr/{EHR_ID}", "/rest/openehr/v1/ehr/{id}"),
+            (
+                f"/rest/openehr/v1/ehr/{EHR_ID}/composition/abc::local::1",
+                "/rest/openehr/v1/ehr/{id}/composition/{id}",
+            ),
+            ("/rest/openehr/v1/ehr", "/rest/openehr/v1/ehr"),
+            ("/rest/openehr/v1/query/aql", "/rest/openehr/v1/query/aql"),
+            (
+                "/rest/openehr/v1/definition/template/adl1.4/Vital Signs",
+                "/rest/openehr/v1/definition/template/adl1.4/{id}",
+            ),
+        ],
+    )
+    def test_identifiers_replaced(self, path: str, expected: str) -> None:
+        assert endpoint_template(path) == expected
+
+
+class TestHooks:
+    async def test_request_events(self) -> None:
+        recorder = Recorder()
+        async with EHRBaseClient(
+            transport=httpx.MockTransport(_handler), hooks=[recorder]
+        ) as client:
+            await client.get_ehr(EHR_ID)
+            with pytest.raises(NotFoundError):
+                await client.create_ehr()
+
+        assert len(recorder.started) == 2
+        ok, missing = recorder.finished
+        assert ok.method == "GET"
+        assert ok.endpoint == "/ehrbase/rest/openehr/v1/ehr/{id}"
+        assert ok.operation is OperationClass.READ
+        assert ok.status_code == 200
+        assert ok.response_bytes == len(b'{"ehr_id":{"value":"%s"}}' % EHR_ID.encode())
+        assert ok.duration is not None and ok.time_to_headers is not None
+        assert ok.duration >= ok.time_to_headers
+        assert ok.error is None
+
+        assert missing.operation is OperationClass.WRITE
+        assert missing.status_code == 404
+        assert missing.error == "NotFoundError"
+
+    @pytest.mark.parametrize("status_code", [400, 401, 404, 409, 412, 422, 500])
+    async def test_error_is_raised_exception(self, status_code: int) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(status_code, json={"message": "failed"})
+
+        recorder = Recorder()
+        async with EHRBaseClient(transport=httpx.MockTransport(handler), hooks=[recorder]) as c:
+            with pytest.raises(EHRBaseError) as raised:
+                await c.get_ehr(EHR_ID)
+
+        (event,) = recorder.finished
+        assert event.error == type(raised.value).__name__
+
+    async def test_transport_error(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        recorder = Recorder()
+        async with EHRBaseClient(transport=httpx.MockTransport(handler), hooks=[recorder]) as c:
+            with pytest.raises(httpx.ConnectError):
+                await c.get_ehr(EHR_ID)
+
+        (event,) = recorder.finished
+        assert event.error == "ConnectError"
+        assert event.status_code is None
+
+    async def test_retries_counted(self) -> None:
+        statuses = iter([503, 503, 200])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(next(statuses), json={"ehr_id": {"value": EHR_ID}})
+
+        retry = RetryPolicy(backoff_base=0.001, backoff_max=0.001)
+        transport = _wrap_transport(httpx.MockTransport(handler), EHRBaseConfig(retry=retry))
+        recorder = Recorder()
+        async with EHRBaseClient(transport=transport, hooks=[recorder]) as client:
+            await client.get_ehr(EHR_ID)
+
+        (event,) = recorder.finished
+        assert event.attempts == 3
+        assert event.retries == 2
+
+    async def test_streamed_response_reported_on_close(self) -> None:
+        async def body() -> AsyncIterator[bytes]:
+            yield b'{"rows": ['
+            yield b"[1], [2]]}"
+
+        recorder = Recorder()
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+        async with (
+            EHRBaseClient(transport=transport, hooks=[recorder]) as client,
+            client.stream_query("SELECT 1") as result,
+        ):
+            assert recorder.finished == []
+            assert [row async for row in result] == [[1], [2]]
+
+        (event,) = recorder.finished
+        assert event.operation is OperationClass.AQL
+        assert event.response_bytes == 20
+
+    async def test_web_template_cache_lookups(self) -> None:
+        recorder = Recorder()
+        async with EHRBaseClient(
+            transport=httpx.MockTransport(_handler), hooks=[recorder]
+        ) as client:
+            await client.get_web_template("t")
+            await client.get_web_template("t")
+            entry = client.web_template_cache.get("t")
+            assert entry is not None
+            entry.stored_at = 0
+            client.web_template_cache.ttl = 60  # type: ignore[misc]
+            await client.get_web_template("t")
+
+        assert [r for _, _, r in recorder.lookups] == ["miss", "hit", "stale"]
+        assert recorder.lookups[0][:2] == ("web_template", "t")
+
+    async def test_no_hooks_no_wrapper(self) -> None:
+        async with EHRBaseClient(transport=httpx.MockTransport(_handler)) as client:
+            assert type(client.client._transport).__name__ == "_SharedTransport"
+
+
+class TestSyncHooks:
+    def test_request_events(self) -> None:
+        recorder = Recorder()
+        with SyncEHRBaseClient(transport=httpx.MockTransport(_handler), hooks=[recorder]) as c:
+            c.get_ehr(EHR_ID)
+            with pytest.raises(NotFoundError):
+                c.create_ehr()
+
+        ok, missing = recorder.finished
+        assert ok.endpoint == "/ehrbase/rest/openehr/v1/ehr/{id}"
+        assert ok.status_code == 200
+        assert ok.duration is not None
+        assert missing.error == "NotFoundError"
+
+    def test_retries_counted(self) -> None:
+        statuses = iter([503, 200])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(next(statuses), json={"ehr_id": {"value": EHR_ID}})
+
+        retry = RetryPolicy(backoff_base=0.001, backoff_max=0.001)
+        transport = _SyncRetryTransport(httpx.MockTransport(handler), retry)
+        recorder = Recorder()
+        with SyncEHRBaseClient(transport=transport, hooks=[recorder]) as client:
+            client.get_ehr(EHR_ID)
+
+        (event,) = recorder.finished
+        assert event.retries == 1
+
+    def test_streamed_response_reported_on_close(self) -> None:
+        def body() -> Iterator[bytes]:
+            yield b'{"rows": ['
+            yield b"[1], [2]]}"
+
+        recorder = Recorder()
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+        with (
+            SyncEHRBaseClient(transport=transport, hooks=[recorder]) as client,
+            client.stream_query("SELECT 1") as result,
+        ):
+            assert recorder.finished == []
+            assert list(result) == [[1], [2]]
+
+        (event,) = recorder.finished
+        assert event.operation is OperationClass.AQL
+        assert event.response_bytes == 20
+
+    def test_web_template_cache_lookups(self) -> None:
+        recorder = Recorder()
+        with SyncEHRBaseClient(transport=httpx.MockTransport(_handler), hooks=[recorder]) as c:
+            c.get_web_template("t")
+            c.get_web_template("t")
+
+        assert [r for _, _, r in recorder.lookups] == ["miss", "hit"]
+
+
+class TestMetricsCollector:
+    async def test_collects_and_exports(self) -> None:
+        metrics = MetricsCollector()
+        async with EHRBaseClient(
+            transport=httpx.MockTransport(_handler), hooks=[metrics]
+        ) as client:
+            await client.get_ehr(EHR_ID)
+            await client.get_web_template("t")
+            await client.get_web_template("t")
+            with pytest.raises(NotFoundError):
+                await client.create_ehr()
+
+        text = metrics.to_prometheus()
+        assert "# TYPE oehrpy_request_duration_seconds histogram" in text
+        assert (
+            'oehrpy_request_duration_seconds_count{operation="read",method="GET",'
+            'endpoint="/ehrbase/rest/openehr/v1/ehr/{id}"} 1'
+        ) in text
+        assert 'le="+Inf"} 1' in text
+        assert (
+            'oehrpy_requests_total{operation="write",method="POST",'
+            'endpoint="/ehrbase/rest/openehr/v1/ehr",status="404"} 1'
+        ) in text
+        assert 'error="NotFoundError"} 1' in text
+        assert 'oehrpy_cache_lookups_total{cache="web_template",result="hit"} 1' in text
+        assert 'oehrpy_cache_lookups_total{cache="web_template",result="miss"} 1' in text
+        assert text.endswith("\n")
+
+        budget = metrics.latency_budget()
+        assert len(budget) == 3
+        assert budget == sorted(budget, key=lambda row: row[2], reverse=True)
+
+    def test_label_escaping(self) -> None:
+        metrics = MetricsCollector()
+        metrics.cache_lookup('we"ird\\', "k", "hit")
+        assert 'cache="we\\"ird\\\\"' in metrics.to_prometheus()
+
+
+class TestHistogram:
+    def test_buckets_and_quantile(self) -> None:
+        histogram = Histogram([1.0, 2.0, 4.0])
+        for value in [0.5, 1.0, 1.5, 3.0, 10.0]:
+            histogram.observe(value)
+
+        assert histogram.counts == [2, 1, 1, 1]
+        assert histogram.count == 5
+        assert histogram.sum == 16.0
+        assert histogram.quantile(0.4) == 1.0
+        assert histogram.quantile(0.5) == pytest.approx(1.5)
+        assert histogram.quantile(1.0) == 4.0
+        assert math.isnan(Histogram([1.0]).quantile(0.5))
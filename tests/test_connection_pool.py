@@ -0,0 +1,209 @@
+"""Tests for EHRBaseClient connection pool and transport settings."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from oehrpy.client import EHRBaseClient, EHRBaseConfig, create_transport
+
+
+class _Body(httpx.AsyncByteStream):
+    """Response body streamed from the transport, like a real connection."""
+
+    def __init__(self, content: bytes) -> None:
+        self._content = content
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._content
+
+
+def _counting_transport() -> tuple[httpx.MockTransport, dict[str, int]]:
+    """Mock transport that records the peak number of requests in flight."""
+    stats = {"active": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        stats["active"] += 1
+        stats["peak"] = max(stats["peak"], stats["active"])
+        await asyncio.sleep(0.01)
+        stats["active"] -= 1
+        body = json.dumps({"auth": request.headers.get("Authorization")}).encode()
+        return httpx.Response(200, stream=_Body(body))
+
+    return httpx.MockTransport(handler), stats
+
+
+class TestPoolConfig:
+    """Tests for pool settings on EHRBaseConfig."""
+
+    def test_defaults_match_httpx(self) -> None:
+        """Test that default limits are httpx's own defaults."""
+        assert EHRBaseConfig().limits == httpx.Limits(
+            max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0
+        )
+
+    def test_create_transport_applies_settings(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that pool, HTTP/2 and TLS settings reach the httpx transport."""
+        for name in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "http_proxy", "https_proxy"):
+            monkeypatch.delenv(name, raising=False)
+        config = EHRBaseConfig(
+            max_connections=200,
+            max_keepalive_connections=50,
+            keepalive_expiry=30.0,
+            http2=True,
+            verify_ssl=False,
+        )
+        with (
+            patch("oehrpy.client.ehrbase.importlib.util.find_spec"),
+            patch("oehrpy.client.ehrbase.httpx.AsyncHTTPTransport") as transport_cls,
+        ):
+            create_transport(config)
+
+        transport_cls.assert_called_once_with(
+            verify=False,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=200, max_keepalive_connections=50, keepalive_expiry=30.0
+            ),
+            proxy=None,
+        )
+
+    async def test_connect_uses_environment_proxy(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that HTTPS_PROXY applies although the client passes its own transport."""
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+        monkeypatch.setenv("NO_PROXY", "internal.example")
+        client = EHRBaseClient(base_url="https://ehr.example.org/ehrbase")
+        with patch("oehrpy.client.ehrbase.httpx.AsyncHTTPTransport") as transport_cls:
+            transport_cls.return_value = httpx.MockTransport(lambda r: httpx.Response(200))
+            await client.connect()
+        await client.close()
+
+        assert transport_cls.call_args.kwargs["proxy"] == "http://proxy.example:3128"
+
+    @pytest.mark.parametrize(
+        "base_url", ["https://cdr.internal.example/ehrbase", "http://ehr.example.org/ehrbase"]
+    )
+    def test_environment_proxy_not_applicable(
+        self, base_url: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that NO_PROXY and proxies for other schemes leave the transport direct."""
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+        monkeypatch.setenv("NO_PROXY", "internal.example")
+        for name in ("HTTP_PROXY", "ALL_PROXY", "http_proxy", "all_proxy"):
+            monkeypatch.delenv(name, raising=False)
+        with patch("oehrpy.client.ehrbase.httpx.AsyncHTTPTransport") as transport_cls:
+            create_transport(EHRBaseConfig(base_url=base_url))
+
+        assert transport_cls.call_args.kwargs["proxy"] is None
+
+    def test_http2_requires_h2(self) -> None:
+        """Test that enabling HTTP/2 without h2 installed fails early."""
+        with (
+            patch("oehrpy.client.ehrbase.importlib.util.find_spec", return_value=None),
+            pytest.raises(ImportError, match="oehrpy\\[http2\\]"),
+        ):
+            create_transport(EHRBaseConfig(http2=True))
+
+    async def test_connect_uses_config_transport(self) -> None:
+        """Test that connect() builds the client on a transport from the config."""
+        client = EHRBaseClient(config=EHRBaseConfig(max_connections=7))
+        with patch("oehrpy.client.ehrbase.create_transport") as create:
+            create.return_value = httpx.MockTransport(lambda r: httpx.Response(200))
+            await client.connect()
+        await client.close()
+
+        create.assert_called_once_with(client.config)
+
+
+class TestPerHostLimit:
+    """Tests for max_connections_per_host."""
+
+    async def test_limits_concurrent_requests_per_host(self) -> None:
+        """Test that requests to one host wait for a free slot."""
+        inner, stats = _counting_transport()
+        with patch("oehrpy.client.ehrbase.httpx.AsyncHTTPTransport", return_value=inner):
+            transport = create_transport(EHRBaseConfig(max_connections_per_host=2))
+
+        async with httpx.AsyncClient(transport=transport) as http:
+            responses = await asyncio.gather(
+                *(http.get("http://cdr.example/ehrbase/rest") for _ in range(6))
+            )
+
+        assert all(r.status_code == 200 for r in responses)
+        assert stats["peak"] == 2
+
+    async def test_hosts_are_limited_separately(self) -> None:
+        """Test that each host gets its own slots."""
+        inner, stats = _counting_transport()
+        with patch("oehrpy.client.ehrbase.httpx.AsyncHTTPTransport", return_value=inner):
+            transport = create_transport(EHRBaseConfig(max_connections_per_host=1))
+
+        async with httpx.AsyncClient(transport=transport) as http:
+            await asyncio.gather(
+                http.get("http://a.example/"),
+                http.get("http://b.example/"),
+            )
+
+        assert stats["peak"] == 2
+
+    async def test_slot_held_until_streamed_response_closes(self) -> None:
+        """Test that a streamed response keeps its slot until it is closed."""
+        inner, _ = _counting_transport()
+        with patch("oehrpy.client.ehrbase.httpx.AsyncHTTPTransport", return_value=inner):
+            transport = create_transport(EHRBaseConfig(max_connections_per_host=1))
+
+        async with httpx.AsyncClient(transport=transport) as http:
+            async with http.stream("GET", "http://a.example/") as response:
+                second = asyncio.ensure_future(http.get("http://a.example/"))
+                await asyncio.sleep(0.05)
+                assert not second.done()
+                await response.aread()
+            assert (await second).status_code == 200
+
+    async def test_preloaded_body_releases_slot(self) -> None:
+        """Test that responses with an in-memory body do not hold a slot."""
+        inner = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+        with patch("oehrpy.client.ehrbase.httpx.AsyncHTTPTransport", return_value=inner):
+            transport = create_transport(EHRBaseConfig(max_connections_per_host=1))
+
+        async with httpx.AsyncClient(transport=transport) as http:
+            for _ in range(3):
+                assert (await http.get("http://a.example/")).status_code == 200
+
+
+class TestSharedTransport:
+    """Tests for sharing one transport across clients."""
+
+    async def test_clients_share_transport_with_own_credentials(self) -> None:
+        """Test that clients keep their credentials on a shared transport."""
+        transport, _ = _counting_transport()
+        reader = EHRBaseClient(
+            base_url="http://cdr.example", username="reader", password="r", transport=transport
+        )
+        writer = EHRBaseClient(
+            base_url="http://cdr.example", username="writer", password="w", transport=transport
+        )
+
+        async with reader, writer:
+            read = await reader.client.get("/")
+            written = await writer.client.get("/")
+
+        assert read.json()["auth"] != written.json()["auth"]
+
+    async def test_closing_client_keeps_shared_transport_open(self) -> None:
+        """Test that a client does not close a transport passed to it."""
+        transport, _ = _counting_transport()
+        other = EHRBaseClient(base_url="http://cdr.example", transport=transport)
+
+        with patch.object(transport, "aclose") as aclose:
+            async with EHRBaseClient(base_url="http://cdr.example", transport=transport):
+                pass
+            async with other:
+                assert (await other.client.get("/")).status_code == 200
+
+        aclose.assert_not_called()
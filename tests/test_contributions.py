@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from unittest.mock import AsyncMock, MagicMock
 
 import httpx
@@ -10,10 +11,12 @@ import pytest
 from oehrpy.client import (
     ContributionBuilder,
     ContributionResponse,
+    ContributionTemplate,
     EHRBaseClient,
     NotFoundError,
     PreconditionFailedError,
     ValidationError,
+    contribution,
 )
 
 EHR_ID = "7d44b88c-4199-4bad-97dc-d78268e01398"
@@ -152,6 +155,71 @@ class TestContributionBuilder:
         assert body["audit"]["system_id"] == "oehrpy.example.org"
 
 
+class TestContributionTemplate:
+    def _builder(self, template: ContributionTemplate) -> ContributionBuilder:
+        return (
+            ContributionBuilder(template=template)
+            .add_creation(composition=_COMP)
+            .add_amendment(VERSION_UID_V1, {**_COMP, "note": "Grüße \u2028"}, description="fix")
+            .add_deletion(VERSION_UID_V1)
+            .add_creation(composition=_COMP, lifecycle_state="incomplete")
+        )
+
+    @pytest.mark.parametrize(
+        "template",
+        [
+            ContributionTemplate(),
+            ContributionTemplate("oehrpy.example.org"),
+            ContributionTemplate("oehrpy.example.org", committer='Dr. "Q"', description="batch"),
+        ],
+    )
+    def test_json_matches_dict_build(
+        self, template: ContributionTemplate, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(contribution, "_now", lambda: "2024-01-01T00:00:00+00:00")
+        builder = self._builder(template)
+        for _ in range(2):  # second round uses the cached fragments
+            assert json.loads(builder.build_json()) == builder.build()
+
+    def test_one_timestamp_per_contribution(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        clock = iter(["2024-01-01T00:00Z", "2024-01-01T00:01Z"])
+        monkeypatch.setattr(contribution, "_now", lambda: next(clock))
+        builder = self._builder(ContributionTemplate("oehrpy.example.org", committer="loader"))
+
+        for body, stamp in [
+            (builder.build(), "2024-01-01T00:00Z"),
+            (json.loads(builder.build_json()), "2024-01-01T00:01Z"),
+        ]:
+            stamps = {v["commit_audit"]["time_committed"]["value"] for v in body["versions"]}
+            assert stamps == {body["audit"]["time_committed"]["value"]} == {stamp}
+
+    def test_builds_do_not_share_objects(self) -> None:
+        template = ContributionTemplate("oehrpy.example.org")
+        first = ContributionBuilder(template=template).add_creation(_COMP).build()
+        first["versions"][0]["commit_audit"]["change_type"]["value"] = "changed"
+        second = ContributionBuilder(template=template).add_creation(_COMP).build()
+        assert second["versions"][0]["commit_audit"]["change_type"]["value"] == "creation"
+        assert (
+            b'"changed"'
+            not in ContributionBuilder(template=template).add_creation(_COMP).build_json()
+        )
+
+    def test_set_audit_keeps_shared_template(self) -> None:
+        template = ContributionTemplate("oehrpy.example.org")
+        body = (
+            ContributionBuilder(template=template)
+            .add_creation(_COMP)
+            .set_audit(change_type="modification")
+            .build()
+        )
+        assert body["audit"]["change_type"]["value"] == "modification"
+        assert "audit" not in ContributionBuilder(template=template).add_creation(_COMP).build()
+
+    def test_empty_build_json_raises(self) -> None:
+        with pytest.raises(ValueError, match="at least one version"):
+            ContributionBuilder().build_json()
+
+
 # ── FR-1: create_contribution ────────────────────────────────────────────────
 
 
@@ -174,6 +242,18 @@ class TestCreateContribution:
         assert result.contribution_uid == CONTRIBUTION_UID
         assert result.versions == [VERSION_UID_V1]
 
+    async def test_posts_prebuilt_json_bytes(self, client: EHRBaseClient) -> None:
+        client._client.post = AsyncMock(
+            return_value=_mock_response(201, {"uid": {"value": CONTRIBUTION_UID}})
+        )
+
+        body = ContributionBuilder().add_creation(composition=_COMP).build_json()
+        await client.create_contribution(EHR_ID, body)
+
+        call = client._client.post.call_args
+        assert call.kwargs["content"] == body
+        assert "json" not in call.kwargs
+
     async def test_validation_error_raises(self, client: EHRBaseClient) -> None:
         client._client.post = AsyncMock(return_value=_mock_response(422, {"message": "bad"}))
 
@@ -0,0 +1,408 @@
+"""Tests for template-aware FLAT <-> canonical conversion."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from oehrpy.rm import COMPOSITION
+from oehrpy.serialization import (
+    FlatConverter,
+    clear_converter_cache,
+    from_canonical,
+    get_converter,
+)
+from oehrpy.validation import parse_web_template
+
+BP = "/content[openEHR-EHR-OBSERVATION.blood_pressure.v2]"
+EVENT = f"{BP}/data[at0001]/events[at0006]"
+NOTE = "/content[openEHR-EHR-EVALUATION.clinical_synopsis.v1]"
+
+
+def _node(
+    node_id: str, rm_type: str, aql_path: str, name: str | None = None, **extra: Any
+) -> dict[str, Any]:
+    return {
+        "id": node_id,
+        "name": name or node_id,
+        "rmType": rm_type,
+        "aqlPath": aql_path,
+        "min": 0,
+        "max": 1,
+        "children": [],
+        **extra,
+    }
+
+
+def _make_web_template() -> dict[str, Any]:
+    """Build a Web Template shaped like EHRBase's output for a vital signs template."""
+    return {
+        "templateId": "Vital Signs Test.v1",
+        "tree": _node(
+            "vital_signs",
+            "COMPOSITION",
+            "/",
+            "Vital signs",
+            nodeId="openEHR-EHR-COMPOSITION.encounter.v1",
+            children=[
+                _node(
+                    "context",
+                    "EVENT_CONTEXT",
+                    "/context",
+                    children=[
+                        _node("start_time", "DV_DATE_TIME", "/context/start_time"),
+                        _node("setting", "DV_CODED_TEXT", "/context/setting"),
+                    ],
+                ),
+                _node(
+                    "blood_pressure",
+                    "OBSERVATION",
+                    BP,
+                    "Blood pressure",
+                    nodeId="openEHR-EHR-OBSERVATION.blood_pressure.v2",
+                    max=-1,
+                    children=[
+                        _node(
+                            "any_event",
+                            "EVENT",
+                            EVENT,
+                            "Any event",
+                            nodeId="at0006",
+                            max=-1,
+                            children=[
+                                _node(
+                                    "systolic",
+                                    "DV_QUANTITY",
+                                    f"{EVENT}/data[at0003]/items[at0004]/value",
+                                    "Systolic",
+                                    nodeId="at0004",
+                                ),
+                                _node(
+                                    "diastolic",
+                                    "DV_QUANTITY",
+                                    f"{EVENT}/data[at0003]/items[at0005]/value",
+                                    "Diastolic",
+                                    nodeId="at0005",
+                                ),
+                                _node(
+                                    "position",
+                                    "DV_CODED_TEXT",
+                                    f"{EVENT}/state[at0007]/items[at0008]/value",
+                                    "Position",
+                                    nodeId="at0008",
+                                ),
+                                _node("time", "DV_DATE_TIME", f"{EVENT}/time"),
+                            ],
+                        ),
+                        _node("language", "CODE_PHRASE", f"{BP}/language"),
+                        _node("encoding", "CODE_PHRASE", f"{BP}/encoding"),
+                        _node("subject", "PARTY_PROXY", f"{BP}/subject", min=1),
+                    ],
+                ),
+                _node(
+                    "clinical_synopsis",
+                    "EVALUATION",
+                    NOTE,
+                    "Clinical synopsis",
+                    nodeId="openEHR-EHR-EVALUATION.clinical_synopsis.v1",
+                    children=[
+                        _node(
+                            "synopsis",
+                            "DV_TEXT",
+                            f"{NOTE}/data[at0001]/items[at0002]/value",
+                            "Synopsis",
+                            nodeId="at0002",
+                            max=-1,
+                        ),
+                        _node("language", "CODE_PHRASE", f"{NOTE}/language"),
+                        _node("encoding", "CODE_PHRASE", f"{NOTE}/encoding"),
+                        _node("subject", "PARTY_PROXY", f"{NOTE}/subject", min=1),
+                    ],
+                ),
+                _node("category", "DV_CODED_TEXT", "/category"),
+                _node("language", "CODE_PHRASE", "/language"),
+                _node("territory", "CODE_PHRASE", "/territory"),
+                _node("composer", "PARTY_PROXY", "/composer"),
+            ],
+        ),
+    }
+
+
+def _make_flat() -> dict[str, Any]:
+    """Build a FLAT composition for the test Web Template."""
+    return {
+        "vital_signs/category|code": "433",
+        "vital_signs/category|value": "event",
+        "vital_signs/category|terminology": "openehr",
+        "vital_signs/language|code": "en",
+        "vital_signs/language|terminology": "ISO_639-1",
+        "vital_signs/territory|code": "CH",
+        "vital_signs/territory|terminology": "ISO_3166-1",
+        "vital_signs/composer|name": "Dr. Chregi",
+        "vital_signs/context/start_time": "2026-03-12T10:00:00Z",
+        "vital_signs/context/setting|code": "238",
+        "vital_signs/context/setting|value": "other care",
+        "vital_signs/context/setting|terminology": "openehr",
+        "vital_signs/blood_pressure:0/any_event:0/systolic|magnitude": 120.0,
+        "vital_signs/blood_pressure:0/any_event:0/systolic|unit": "mm[Hg]",
+        "vital_signs/blood_pressure:0/any_event:0/diastolic|magnitude": 80.0,
+        "vital_signs/blood_pressure:0/any_event:0/diastolic|unit": "mm[Hg]",
+        "vital_signs/blood_pressure:0/any_event:0/position|code": "at1001",
+        "vital_signs/blood_pressure:0/any_event:0/position|value": "Sitting",
+        "vital_signs/blood_pressure:0/any_event:0/position|terminology": "local",
+        "vital_signs/blood_pressure:0/any_event:0/time": "2026-03-12T10:00:00Z",
+        "vital_signs/blood_pressure:0/any_event:1/systolic|magnitude": 118.0,
+        "vital_signs/blood_pressure:0/any_event:1/systolic|unit": "mm[Hg]",
+        "vital_signs/blood_pressure:0/any_event:1/time": "2026-03-12T10:05:00Z",
+        "vital_signs/blood_pressure:0/language|code": "en",
+        "vital_signs/blood_pressure:0/language|terminology": "ISO_639-1",
+        "vital_signs/blood_pressure:0/encoding|code": "UTF-8",
+        "vital_signs/blood_pressure:0/encoding|terminology": "IANA_character-sets",
+        "vital_signs/clinical_synopsis/synopsis:0|value": "Stable.",
+        "vital_signs/clinical_synopsis/synopsis:1|value": "Follow up in 3 months.",
+        "vital_signs/clinical_synopsis/language|code": "en",
+        "vital_signs/clinical_synopsis/language|terminology": "ISO_639-1",
+        "vital_signs/clinical_synopsis/encoding|code": "UTF-8",
+        "vital_signs/clinical_synopsis/encoding|terminology": "IANA_character-sets",
+    }
+
+
+@pytest.fixture
+def converter() -> FlatConverter:
+    return FlatConverter.from_web_template(_make_web_template())
+
+
+class TestToCanonical:
+    """Tests for FLAT -> canonical conversion."""
+
+    def test_composition_header(self, converter: FlatConverter) -> None:
+        """Test the composition root and its context attributes."""
+        canonical = converter.to_canonical(_make_flat())
+
+        assert canonical["_type"] == "COMPOSITION"
+        assert canonical["name"] == {"_type": "DV_TEXT", "value": "Vital signs"}
+        assert canonical["archetype_node_id"] == "openEHR-EHR-COMPOSITION.encounter.v1"
+        details = canonical["archetype_details"]
+        assert details["template_id"]["value"] == "Vital Signs Test.v1"
+        assert canonical["territory"] == {
+            "_type": "CODE_PHRASE",
+            "terminology_id": {"_type": "TERMINOLOGY_ID", "value": "ISO_3166-1"},
+            "code_string": "CH",
+        }
+        assert canonical["category"]["defining_code"]["code_string"] == "433"
+        assert canonical["composer"] == {"_type": "PARTY_IDENTIFIED", "name": "Dr. Chregi"}
+        assert canonical["context"]["_type"] == "EVENT_CONTEXT"
+        assert canonical["context"]["start_time"]["value"] == "2026-03-12T10:00:00Z"
+
+    def test_collapsed_structures_are_recreated(self, converter: FlatConverter) -> None:
+        """Test that HISTORY, ITEM_TREE and ELEMENT are added around values."""
+        canonical = converter.to_canonical(_make_flat())
+
+        observation = canonical["content"][0]
+        assert observation["archetype_node_id"] == "openEHR-EHR-OBSERVATION.blood_pressure.v2"
+        history = observation["data"]
+        assert (history["_type"], history["archetype_node_id"]) == ("HISTORY", "at0001")
+
+        event = history["events"][0]
+        assert event["_type"] == "POINT_EVENT"
+        assert event["name"]["value"] == "Any event"
+        assert event["time"] == {"_type": "DV_DATE_TIME", "value": "2026-03-12T10:00:00Z"}
+
+        tree = event["data"]
+        assert (tree["_type"], tree["archetype_node_id"]) == ("ITEM_TREE", "at0003")
+        systolic, diastolic = tree["items"]
+        assert systolic["_type"] == "ELEMENT"
+        assert systolic["name"]["value"] == "Systolic"
+        assert systolic["value"] == {"_type": "DV_QUANTITY", "magnitude": 120.0, "units": "mm[Hg]"}
+        assert diastolic["archetype_node_id"] == "at0005"
+        assert event["state"]["items"][0]["value"]["value"] == "Sitting"
+
+    def test_multiple_occurrences(self, converter: FlatConverter) -> None:
+        """Test that indexed nodes become list items in index order."""
+        canonical = converter.to_canonical(_make_flat())
+
+        events = canonical["content"][0]["data"]["events"]
+        assert [e["data"]["items"][0]["value"]["magnitude"] for e in events] == [120.0, 118.0]
+        synopsis_items = canonical["content"][1]["data"]["items"]
+        assert [item["value"]["value"] for item in synopsis_items] == [
+            "Stable.",
+            "Follow up in 3 months.",
+        ]
+
+    def test_list_order_follows_template_then_index(self, converter: FlatConverter) -> None:
+        """Test that list order does not depend on FLAT key order."""
+        flat = dict(reversed(list(_make_flat().items())))
+
+        assert converter.to_canonical(flat) == converter.to_canonical(_make_flat())
+
+    def test_result_validates_as_rm_composition(self, converter: FlatConverter) -> None:
+        """Test that the canonical output can be loaded into RM models."""
+        composition = from_canonical(
+            converter.to_canonical(_make_flat()), expected_type=COMPOSITION
+        )
+
+        assert isinstance(composition, COMPOSITION)
+        assert composition.content is not None
+        assert len(composition.content) == 2
+
+    def test_mandatory_subject_defaults_to_party_self(self, converter: FlatConverter) -> None:
+        """Test that mandatory PARTY_PROXY nodes are created without FLAT values."""
+        canonical = converter.to_canonical(_make_flat())
+
+        assert canonical["content"][0]["subject"] == {"_type": "PARTY_SELF"}
+
+    def test_party_proxy_with_name_is_identified(self, converter: FlatConverter) -> None:
+        """Test that naming a PARTY_PROXY makes it a PARTY_IDENTIFIED."""
+        flat = {"vital_signs/clinical_synopsis/subject|name": "Jane Doe"}
+
+        canonical = converter.to_canonical(flat)
+
+        subject = canonical["content"][0]["subject"]
+        assert subject == {"_type": "PARTY_IDENTIFIED", "name": "Jane Doe"}
+
+    def test_nodes_without_aql_path_use_node_ids(self) -> None:
+        """Test that nodes without an aqlPath map to attributes named by their ID."""
+        wt = _make_web_template()
+        for node in wt["tree"]["children"]:
+            node["aqlPath"] = ""
+        converter = FlatConverter.from_web_template(wt)
+
+        canonical = converter.to_canonical({"vital_signs/territory|code": "CH"})
+
+        assert canonical["territory"]["code_string"] == "CH"
+
+    def test_unknown_path_raises(self, converter: FlatConverter) -> None:
+        """Test that paths outside the template are rejected."""
+        with pytest.raises(ValueError, match="not found in template"):
+            converter.to_canonical({"vital_signs/blood_pressure:0/pulse|magnitude": 1})
+
+    def test_wrong_prefix_raises(self, converter: FlatConverter) -> None:
+        """Test that legacy ctx/ paths are rejected."""
+        with pytest.raises(ValueError, match="does not start with 'vital_signs'"):
+            converter.to_canonical({"ctx/language": "en"})
+
+
+class TestToFlat:
+    """Tests for canonical -> FLAT conversion."""
+
+    def test_round_trip(self, converter: FlatConverter) -> None:
+        """Test that FLAT -> canonical -> FLAT restores the input."""
+        flat = _make_flat()
+
+        assert converter.to_flat(converter.to_canonical(flat)) == flat
+
+    def test_ignores_content_outside_template(self, converter: FlatConverter) -> None:
+        """Test that unknown archetypes in canonical content are skipped."""
+        canonical = converter.to_canonical(_make_flat())
+        canonical["content"].append(
+            {"_type": "OBSERVATION", "archetype_node_id": "openEHR-EHR-OBSERVATION.pulse.v2"}
+        )
+
+        assert converter.to_flat(canonical) == _make_flat()
+
+    def test_bulk_conversion(self, converter: FlatConverter) -> None:
+        """Test converting several compositions in one call."""
+        flats = [_make_flat(), {"vital_signs/composer|name": "Dr. Who"}]
+
+        canonicals = list(converter.to_canonical_many(flats))
+
+        assert list(converter.to_flat_many(canonicals)) == flats
+
+
+class TestRepositoryWebTemplate:
+    """Tests against the vital signs Web Template in the repository root."""
+
+    @pytest.fixture
+    def converter(self) -> FlatConverter:
+        path = Path(__file__).parent.parent / "web_template.json"
+        return FlatConverter.from_web_template(json.loads(path.read_text()))
+
+    def _flat(self) -> dict[str, Any]:
+        prefix = "vital_signs_observations"
+        bp = f"{prefix}/vital_signs/blood_pressure"
+        pulse = f"{prefix}/vital_signs/pulse_heart_beat"
+        return {
+            f"{prefix}/category|code": "433",
+            f"{prefix}/category|value": "event",
+            f"{prefix}/category|terminology": "openehr",
+            f"{prefix}/context/start_time": "2026-03-12T10:00:00Z",
+            f"{prefix}/context/setting|code": "238",
+            f"{prefix}/context/setting|value": "other care",
+            f"{prefix}/context/setting|terminology": "openehr",
+            f"{bp}/systolic|magnitude": 120.0,
+            f"{bp}/systolic|unit": "mm[Hg]",
+            f"{bp}/diastolic|magnitude": 80.0,
+            f"{bp}/diastolic|unit": "mm[Hg]",
+            f"{bp}/time": "2026-03-12T10:00:00Z",
+            f"{bp}/language|code": "en",
+            f"{bp}/language|terminology": "ISO_639-1",
+            f"{bp}/encoding|code": "UTF-8",
+            f"{bp}/encoding|terminology": "IANA_character-sets",
+            f"{pulse}/heart_rate|magnitude": 72.0,
+            f"{pulse}/heart_rate|unit": "/min",
+            f"{pulse}/time": "2026-03-12T10:00:00Z",
+            f"{pulse}/language|code": "en",
+            f"{pulse}/language|terminology": "ISO_639-1",
+            f"{pulse}/encoding|code": "UTF-8",
+            f"{pulse}/encoding|terminology": "IANA_character-sets",
+            f"{prefix}/composer|name": "Dr. Chregi",
+            f"{prefix}/language|code": "en",
+            f"{prefix}/language|terminology": "ISO_639-1",
+            f"{prefix}/territory|code": "CH",
+            f"{prefix}/territory|terminology": "ISO_3166-1",
+        }
+
+    def test_event_is_shared_by_elements_and_time(self, converter: FlatConverter) -> None:
+        """Test that an event the template collapses holds both its data and its time."""
+        canonical = converter.to_canonical(self._flat())
+
+        (blood_pressure,) = (
+            item
+            for item in canonical["content"][0]["items"]
+            if item["archetype_node_id"] == "openEHR-EHR-OBSERVATION.blood_pressure.v1"
+        )
+        (event,) = blood_pressure["data"]["events"]
+        assert event["_type"] == "POINT_EVENT"
+        assert event["archetype_node_id"] == "at0006"
+        assert event["name"]["value"] == "Any event"
+        assert event["time"]["value"] == "2026-03-12T10:00:00Z"
+        assert [item["name"]["value"] for item in event["data"]["items"]] == [
+            "Systolic",
+            "Diastolic",
+        ]
+
+    def test_round_trip(self, converter: FlatConverter) -> None:
+        """Test that FLAT -> canonical -> FLAT restores the input and loads as RM."""
+        canonical = converter.to_canonical(self._flat())
+
+        assert isinstance(from_canonical(canonical, expected_type=COMPOSITION), COMPOSITION)
+        assert converter.to_flat(canonical) == self._flat()
+
+
+class TestConverterCache:
+    """Tests for per-template converter caching."""
+
+    def setup_method(self) -> None:
+        clear_converter_cache()
+
+    def test_converter_is_cached_per_template(self) -> None:
+        parsed = parse_web_template(_make_web_template())
+
+        assert get_converter(parsed) is get_converter(parsed)
+
+    def test_use_cache_false_recompiles(self) -> None:
+        parsed = parse_web_template(_make_web_template())
+
+        assert get_converter(parsed) is not get_converter(parsed, use_cache=False)
+
+    def test_clear_single_template(self) -> None:
+        parsed = parse_web_template(_make_web_template())
+        cached = get_converter(parsed)
+
+        clear_converter_cache("Other.v1")
+        assert get_converter(parsed) is cached
+        clear_converter_cache("Vital Signs Test.v1")
+        assert get_converter(parsed) is not cached
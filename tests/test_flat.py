@@ -1,10 +1,16 @@
 """Tests for FLAT format serialization."""
 
+import io
+import json
+
+import pytest
+
 from oehrpy.serialization.flat import (
     FlatBuilder,
     FlatContext,
     FlatPath,
     flatten_dict,
+    iter_flat,
     unflatten_dict,
 )
 
@@ -15,7 +21,8 @@ class TestFlatPath:
     def test_simple_path(self) -> None:
         """Test parsing simple path."""
         path = FlatPath.parse("ctx/language")
-        assert path.segments == ["ctx", "language"]
+        assert path.segments == ("ctx", "language")
+        assert path.indices == (None, None)
         assert path.index is None
         assert path.attribute is None
 
@@ -30,6 +37,60 @@ class TestFlatPath:
         path = FlatPath.parse("vital_signs/bp:0/systolic|magnitude")
         assert path.attribute == "magnitude"
 
+    def test_per_segment_indices(self) -> None:
+        """Test that every segment keeps its own index."""
+        path = FlatPath.parse("vital_signs/bp:0/any_event:2/systolic|magnitude")
+        assert path.segments == ("vital_signs", "bp", "any_event", "systolic")
+        assert path.indices == (None, 0, 2, None)
+        assert path.index == 2
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "ctx/language",
+            "vital_signs/bp:0/any_event:12/systolic|magnitude",
+            "a:1",
+            "ctx/composer|name",
+            "weird:segment/name:x/:3",
+        ],
+    )
+    def test_round_trip(self, text: str) -> None:
+        """Test that str() restores the parsed path string."""
+        assert str(FlatPath.parse(text)) == text
+
+    def test_parse_is_cached(self) -> None:
+        """Test that recurring paths share one instance."""
+        text = "vital_signs/bp:0/systolic|magnitude"
+        assert FlatPath.parse(text) is FlatPath.parse("".join(text))
+
+    def test_segments_are_interned(self) -> None:
+        """Test that equal segments from different paths are the same object."""
+        first = FlatPath.parse("".join(["vital_signs/", "bp:0"]))
+        second = FlatPath.parse("".join(["vital_signs/", "bp:1"]))
+        assert first.segments[1] is second.segments[1]
+
+    def test_immutable_and_hashable(self) -> None:
+        """Test that paths cannot be modified and can be used as keys."""
+        path = FlatPath.parse("ctx/language")
+        with pytest.raises(AttributeError):
+            path.attribute = "code"  # type: ignore[misc]
+        assert {path: 1}[FlatPath(("ctx", "language"))] == 1
+
+    def test_mismatched_indices(self) -> None:
+        """Test that indices must match the segments."""
+        with pytest.raises(ValueError, match="2 segments but 1 indices"):
+            FlatPath(("a", "b"), (0,))
+
+    def test_deprecated_index(self) -> None:
+        """Test that the single index of earlier versions applies to the last segment."""
+        expected = FlatPath.parse("vital_signs/bp:0|magnitude")
+        with pytest.deprecated_call():
+            assert FlatPath(["vital_signs", "bp"], index=0, attribute="magnitude") == expected
+        with pytest.deprecated_call():
+            assert FlatPath(["vital_signs", "bp"], 0, "magnitude") == expected
+        with pytest.raises(TypeError, match="not both"):
+            FlatPath(("a", "b"), (None, 0), index=0)
+
 
 class TestFlatContext:
     """Tests for FlatContext."""
@@ -155,3 +216,151 @@ class TestFlattenUnflatten:
 
         assert nested["ctx"]["language"] == "en"
         assert nested["ctx"]["territory"] == "US"
+
+    def test_unflatten_nested_lists(self) -> None:
+        """Test unflattening indexed segments at several levels."""
+        flat = {
+            "vital_signs/bp:1/any_event:0/systolic|magnitude": 130,
+            "vital_signs/bp:0/any_event:1/systolic|magnitude": 110,
+            "vital_signs/bp:0/any_event:0/systolic|magnitude": 120,
+            "vital_signs/bp:0/any_event:0/systolic|unit": "mm[Hg]",
+        }
+
+        nested = unflatten_dict(flat)
+
+        events = nested["vital_signs"]["bp"][0]["any_event"]
+        assert events[0]["systolic"] == {"magnitude": 120, "unit": "mm[Hg]"}
+        assert events[1]["systolic"] == {"magnitude": 110}
+        assert nested["vital_signs"]["bp"][1]["any_event"][0]["systolic"]["magnitude"] == 130
+
+    def test_unflatten_value_list(self) -> None:
+        """Test that indexed leaf keys become lists of values."""
+        nested = unflatten_dict({"a/tags:1": "y", "a/tags:0": "x", "a/codes:2": "c"})
+
+        assert nested == {"a": {"tags": ["x", "y"], "codes": [None, None, "c"]}}
+
+    def test_unflatten_fills_node_list_gaps(self) -> None:
+        """Test that unaddressed slots in lists of nodes are distinct empty dicts."""
+        nested = unflatten_dict({"a:2/b": 1})
+
+        assert nested == {"a": [{}, {}, {"b": 1}]}
+        assert nested["a"][0] is not nested["a"][1]
+
+    def test_unflatten_preserves_key_order(self) -> None:
+        """Test that keys appear in the order they are first seen."""
+        nested = unflatten_dict({"z/b": 1, "a": 2, "z/a:0": 3})
+
+        assert list(nested) == ["z", "a"]
+        assert list(nested["z"]) == ["b", "a"]
+
+    def test_round_trip(self) -> None:
+        """Test that unflatten_dict reverses flatten_dict."""
+        data = {
+            "ctx": {"language": "en"},
+            "obs": [
+                {"events": [{"value": 1}, {"value": 2}], "name": "first"},
+                {"events": [{"value": 3}], "tags": ["a", "b"]},
+            ],
+        }
+
+        assert unflatten_dict(flatten_dict(data)) == data
+
+
+class _CountingReader(io.BytesIO):
+    """BytesIO that records how many bytes have been read."""
+
+    bytes_read = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+class TestIterFlat:
+    """Tests for streaming FLAT parsing."""
+
+    COMPOSITIONS = [
+        {
+            "ctx/language": "en",
+            "vital_signs/blood_pressure:0/any_event:0/systolic|magnitude": 120.5,
+            "vital_signs/blood_pressure:0/any_event:0/systolic|unit": "mm[Hg]",
+        },
+        {},
+        {
+            "vital_signs/body_temperature:0/any_event:0/temperature|magnitude": -1.5e-3,
+            "vital_signs/comment": "Zürich \u2713",
+            "vital_signs/flag": True,
+            "vital_signs/missing": None,
+        },
+    ]
+
+    def _ndjson(self) -> bytes:
+        return "\n".join(json.dumps(c, ensure_ascii=False) for c in self.COMPOSITIONS).encode()
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 64 * 1024])
+    def test_ndjson_entries(self, chunk_size: int) -> None:
+        """Test that entries match the parsed input for any chunk size."""
+        entries = list(iter_flat(io.BytesIO(self._ndjson()), chunk_size=chunk_size))
+
+        expected = [
+            (index, FlatPath.parse(path), value)
+            for index, composition in enumerate(self.COMPOSITIONS)
+            for path, value in composition.items()
+        ]
+        assert entries == expected
+
+    def test_large_value_is_decoded_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a value spanning many chunks is decoded once, not once per chunk."""
+        calls = 0
+        raw_decode = json.JSONDecoder.raw_decode
+
+        def counting_raw_decode(self: json.JSONDecoder, s: str, idx: int = 0) -> tuple[object, int]:
+            nonlocal calls
+            calls += 1
+            return raw_decode(self, s, idx)
+
+        monkeypatch.setattr(json.JSONDecoder, "raw_decode", counting_raw_decode)
+        text = 'a "b" \\ [c] {d} ' * 2000
+
+        entries = list(iter_flat(io.BytesIO(json.dumps({"k": text}).encode()), chunk_size=256))
+
+        assert [value for _, _, value in entries] == [text]
+        assert calls == 2
+
+    def test_text_stream(self) -> None:
+        """Test reading from a text stream."""
+        source = io.StringIO(json.dumps(self.COMPOSITIONS[0]))
+
+        entries = list(iter_flat(source, chunk_size=5))
+
+        assert [value for _, _, value in entries] == list(self.COMPOSITIONS[0].values())
+
+    def test_reads_incrementally(self) -> None:
+        """Test that the first entry is yielded before the stream is consumed."""
+        composition = {f"vital_signs/item:{i}/value|magnitude": i for i in range(10_000)}
+        source = _CountingReader(json.dumps(composition).encode())
+
+        entries = iter_flat(source, chunk_size=1024)
+        _, path, value = next(entries)
+
+        assert str(path) == "vital_signs/item:0/value|magnitude"
+        assert value == 0
+        assert source.bytes_read <= 2048
+
+    def test_path_objects_are_cached(self) -> None:
+        """Test that recurring paths are parsed once and shared."""
+        source = io.BytesIO(b'{"a/b:0|c": 1}\n{"a/b:0|c": 2}')
+
+        (_, first, _), (_, second, _) = iter_flat(source)
+
+        assert first is second
+
+    @pytest.mark.parametrize(
+        "data",
+        [b'{"a": 1', b"[1]", b'{"a" 1}', b'{"a": 1,}', b'{"a": tru}', b'{"a": 1} x'],
+    )
+    def test_invalid_json_raises(self, data: bytes) -> None:
+        """Test that malformed streams raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid FLAT JSON"):
+            list(iter_flat(io.BytesIO(data), chunk_size=2))
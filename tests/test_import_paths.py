@@ -1,5 +1,8 @@
 """Tests for import paths: verify all public submodules are importable via 'oehrpy'."""
 
+import subprocess
+import sys
+
 import pytest
 
 
@@ -52,3 +55,68 @@ class TestImportPaths:
         """Confirm openehr_sdk is no longer importable (breaking change)."""
         with pytest.raises(ModuleNotFoundError):
             import openehr_sdk  # noqa: F401
+
+
+def _imported_modules(statement: str) -> set[str]:
+    """Run a statement in a fresh interpreter and return the modules it imported."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+class TestLazyRMImport:
+    """Verify that the generated RM models are only loaded when used.
+
+    Import-time regressions are tracked with ``python -X importtime``; see
+    ``benchmarks/bench_import.py`` for the timings themselves.
+    """
+
+    @pytest.mark.parametrize(
+        "module",
+        ["oehrpy", "oehrpy.rm", "oehrpy.client", "oehrpy.validation", "oehrpy.templates"],
+    )
+    def test_import_does_not_load_rm_types(self, module):
+        modules = _imported_modules(f"import {module}")
+
+        assert module in modules
+        assert "oehrpy.rm.rm_types" not in modules
+
+    def test_rm_class_access_loads_rm_types(self):
+        modules = _imported_modules("from oehrpy.rm import DV_TEXT")
+
+        assert "oehrpy.rm.rm_types" in modules
+
+    def test_rm_all_matches_generated_classes(self):
+        from pydantic import BaseModel
+
+        from oehrpy import rm
+        from oehrpy.rm import rm_types
+
+        generated = {
+            name
+            for name, obj in vars(rm_types).items()
+            if isinstance(obj, type) and issubclass(obj, BaseModel) and obj is not BaseModel
+        }
+        assert set(rm.__all__) == generated
+
+    def test_rm_type_lookup(self):
+        from oehrpy import rm
+        from oehrpy.rm import rm_types
+
+        assert rm.rm_type("DV_TEXT") is rm_types.DV_TEXT
+        assert rm.rm_type("NOT_AN_RM_TYPE") is None
+        assert rm.rm_type("BaseModel") is None
+
+    def test_rm_unknown_attribute_raises(self):
+        from oehrpy import rm
+
+        with pytest.raises(AttributeError):
+            rm.NOT_AN_RM_TYPE  # noqa: B018
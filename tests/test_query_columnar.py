@@ -0,0 +1,118 @@
+"""Unit tests for columnar views of AQL query results."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from oehrpy.client import QueryResponse
+from oehrpy.client.columnar import rows_to_columns
+
+DV_QUANTITY = {"_type": "DV_QUANTITY", "magnitude": 120.0, "units": "mm[Hg]"}
+
+
+@pytest.fixture
+def response() -> QueryResponse:
+    return QueryResponse.from_response(
+        {
+            "q": "SELECT ...",
+            "columns": [
+                {"name": "uid", "path": "/uid/value"},
+                {"name": "systolic", "path": "/data/.../magnitude"},
+                {"name": "count"},
+                {"name": "flag"},
+                {"path": "/data/.../value"},
+            ],
+            "rows": [
+                ["a::1", 120.5, 1, True, DV_QUANTITY],
+                ["b::1", None, 2, False, DV_QUANTITY],
+                ["c::1", 80, 3, True, DV_QUANTITY],
+            ],
+        }
+    )
+
+
+class TestAsColumns:
+    def test_transposes_rows(self, response: QueryResponse) -> None:
+        columns = response.as_columns()
+        assert list(columns) == ["uid", "systolic", "count", "flag", "col_4"]
+        assert columns["uid"] == ["a::1", "b::1", "c::1"]
+        assert columns["systolic"] == [120.5, None, 80]
+        assert columns["col_4"] == [DV_QUANTITY] * 3
+
+    def test_empty_result_keeps_columns(self) -> None:
+        response = QueryResponse(columns=[{"name": "a"}, {"name": "b"}], rows=[])
+        assert response.as_columns() == {"a": [], "b": []}
+
+    def test_ragged_rows_rejected(self) -> None:
+        with pytest.raises(ValueError, match="2 columns"):
+            rows_to_columns(["a", "b"], [[1, 2], [3]])
+
+    def test_column_count_mismatch_rejected(self) -> None:
+        with pytest.raises(ValueError, match="2 columns"):
+            rows_to_columns(["a", "b"], [[1, 2, 3]])
+
+    def test_as_dicts_unchanged(self, response: QueryResponse) -> None:
+        assert response.as_dicts()[0]["col_4"] == DV_QUANTITY
+
+
+class TestAsArrays:
+    def test_numeric_columns_become_arrays(self, response: QueryResponse) -> None:
+        np = pytest.importorskip("numpy")
+        arrays = response.as_arrays()
+
+        assert arrays["count"].dtype == np.int64
+        assert arrays["count"].tolist() == [1, 2, 3]
+        assert arrays["systolic"].dtype == np.float64
+        assert np.isnan(arrays["systolic"][1])
+        assert arrays["flag"].dtype == np.bool_
+        assert arrays["uid"] == ["a::1", "b::1", "c::1"]
+        assert arrays["col_4"] == [DV_QUANTITY] * 3
+
+    def test_non_numeric_columns_stay_lists(self) -> None:
+        pytest.importorskip("numpy")
+        response = QueryResponse(
+            columns=[{"name": "nulls"}, {"name": "bools"}, {"name": "big"}, {"name": "mixed"}],
+            rows=[[None, True, 2**70, 1], [None, None, 1, "x"]],
+        )
+        arrays = response.as_arrays()
+        assert all(isinstance(values, list) for values in arrays.values())
+
+    def test_missing_numpy(self, response: QueryResponse, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setitem(sys.modules, "numpy", None)
+        with pytest.raises(ImportError, match=r"oehrpy\[numpy\]"):
+            response.as_arrays()
+
+
+class TestArrow:
+    def test_to_arrow(self, response: QueryResponse) -> None:
+        pa = pytest.importorskip("pyarrow")
+        table = response.to_arrow()
+
+        assert table.column_names == ["uid", "systolic", "count", "flag", "col_4"]
+        assert table.num_rows == 3
+        assert table.schema.field("count").type == pa.int64()
+        assert table.column("systolic").to_pylist() == [120.5, None, 80.0]
+        assert pa.types.is_struct(table.schema.field("col_4").type)
+
+    def test_mixed_column_stored_as_json(self) -> None:
+        pytest.importorskip("pyarrow")
+        response = QueryResponse(columns=[{"name": "v"}], rows=[[{"a": 1}], ["text"], [None]])
+        assert response.to_arrow().column("v").to_pylist() == ['{"a": 1}', '"text"', None]
+
+    def test_to_parquet(self, response: QueryResponse, tmp_path: Path) -> None:
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "result.parquet"
+        response.to_parquet(path)
+
+        table = pq.read_table(path)
+        assert table.column("uid").to_pylist() == ["a::1", "b::1", "c::1"]
+
+    def test_missing_pyarrow(
+        self, response: QueryResponse, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        with pytest.raises(ImportError, match=r"oehrpy\[arrow\]"):
+            response.to_arrow()
@@ -0,0 +1,176 @@
+"""Unit tests for paged AQL iteration (iter_query)."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from oehrpy.aql import AQLBuilder
+from oehrpy.client import EHRBaseClient, EHRBaseError, NotFoundError
+
+AQL = "SELECT c/uid/value FROM EHR e CONTAINS COMPOSITION c"
+
+
+def _mock_response(status_code: int, json_data: dict | list | None = None) -> httpx.Response:
+    """Build a fake httpx.Response."""
+    resp = MagicMock(spec=httpx.Response)
+    resp.status_code = status_code
+    resp.text = ""
+    if json_data is not None:
+        resp.json.return_value = json_data
+    else:
+        resp.json.side_effect = Exception("no body")
+    return resp
+
+
+@pytest.fixture
+async def client() -> EHRBaseClient:
+    c = EHRBaseClient(base_url="http://localhost:8080/ehrbase")
+    c._client = AsyncMock(spec=httpx.AsyncClient)
+    return c
+
+
+def _serve(total: int, calls: list[dict[str, Any]]) -> Any:
+    """Fake the AQL endpoint for ``total`` rows, paged by offset/fetch in the body."""
+
+    async def post(url: str, **kwargs: Any) -> httpx.Response:
+        body = kwargs["json"]
+        calls.append(body)
+        offset, fetch = body.get("offset", 0), body.get("fetch", total)
+        rows = [[i] for i in range(offset, min(offset + fetch, total))]
+        return _mock_response(200, {"q": body["q"], "columns": [{"name": "n"}], "rows": rows})
+
+    return post
+
+
+async def _collect(rows: Any) -> list[list[Any]]:
+    return [row async for row in rows]
+
+
+class TestIterQuery:
+    async def test_pages_with_offset_and_fetch(self, client: EHRBaseClient) -> None:
+        """A query string is paged with offset/fetch until a short page."""
+        calls: list[dict[str, Any]] = []
+        client._client.post = AsyncMock(side_effect=_serve(25, calls))
+
+        rows = await _collect(client.iter_query(AQL, page_size=10))
+
+        assert rows == [[i] for i in range(25)]
+        assert [(c["offset"], c["fetch"]) for c in calls] == [(0, 10), (10, 10), (20, 10)]
+        assert all(c["q"] == AQL for c in calls)
+
+    async def test_exact_multiple_requests_empty_page(self, client: EHRBaseClient) -> None:
+        calls: list[dict[str, Any]] = []
+        client._client.post = AsyncMock(side_effect=_serve(20, calls))
+
+        rows = await _collect(client.iter_query(AQL, page_size=10))
+
+        assert len(rows) == 20
+        assert len(calls) == 3
+
+    async def test_passes_parameters_and_ehr_id(self, client: EHRBaseClient) -> None:
+        calls: list[dict[str, Any]] = []
+        client._client.post = AsyncMock(side_effect=_serve(1, calls))
+
+        await _collect(client.iter_query(AQL, {"t": "x"}, ehr_id="ehr-1", page_size=5))
+
+        assert calls[0]["query_parameters"] == {"t": "x"}
+        _, kwargs = client._client.post.call_args
+        assert kwargs["params"] == {"ehr_id": "ehr-1"}
+
+    async def test_builder_query_pages_with_limit_offset(self, client: EHRBaseClient) -> None:
+        """An AQLQuery is paged by rewriting LIMIT/OFFSET, capped by its own limit."""
+        calls: list[dict[str, Any]] = []
+
+        async def post(url: str, **kwargs: Any) -> httpx.Response:
+            calls.append(kwargs["json"])
+            return _mock_response(200, {"rows": [[0]] * int(kwargs["json"]["q"].split()[-3])})
+
+        client._client.post = AsyncMock(side_effect=post)
+        query = (
+            AQLBuilder()
+            .select("c/uid/value")
+            .from_ehr()
+            .contains_composition()
+            .param("ehr_id", "e1")
+            .limit(25)
+            .offset(5)
+            .build()
+        )
+
+        rows = await _collect(client.iter_query(query, page_size=10))
+
+        assert len(rows) == 25
+        assert [c["q"].split()[-4:] for c in calls] == [
+            ["LIMIT", "10", "OFFSET", "5"],
+            ["LIMIT", "10", "OFFSET", "15"],
+            ["LIMIT", "5", "OFFSET", "25"],
+        ]
+        assert all(c["query_parameters"] == {"ehr_id": "e1"} for c in calls)
+        assert all("fetch" not in c for c in calls)
+
+    async def test_prefetches_next_page(self, client: EHRBaseClient) -> None:
+        """The next page is requested before the current page is consumed."""
+        calls: list[dict[str, Any]] = []
+        client._client.post = AsyncMock(side_effect=_serve(30, calls))
+
+        rows = client.iter_query(AQL, page_size=10)
+        await rows.__anext__()
+        await asyncio.sleep(0)
+
+        assert len(calls) == 2
+        await rows.aclose()
+
+    async def test_without_prefetch(self, client: EHRBaseClient) -> None:
+        calls: list[dict[str, Any]] = []
+        client._client.post = AsyncMock(side_effect=_serve(30, calls))
+
+        rows = client.iter_query(AQL, page_size=10, prefetch=False)
+        await rows.__anext__()
+        await asyncio.sleep(0)
+
+        assert len(calls) == 1
+        assert len(await _collect(rows)) == 29
+
+    async def test_aclose_cancels_prefetch(self, client: EHRBaseClient) -> None:
+        cancelled = asyncio.Event()
+
+        async def post(url: str, **kwargs: Any) -> httpx.Response:
+            if kwargs["json"]["offset"] == 0:
+                return _mock_response(200, {"rows": [[1], [2]]})
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return _mock_response(200, {"rows": []})
+
+        client._client.post = AsyncMock(side_effect=post)
+
+        rows = client.iter_query(AQL, page_size=2)
+        await rows.__anext__()
+        await asyncio.sleep(0)
+        await rows.aclose()
+
+        assert cancelled.is_set()
+
+    async def test_server_ignoring_paging_raises(self, client: EHRBaseClient) -> None:
+        """A server that returns every row for each page must not repeat rows."""
+        rows = [[i] for i in range(25)]
+        client._client.post = AsyncMock(return_value=_mock_response(200, {"rows": rows}))
+
+        with pytest.raises(EHRBaseError, match="25 rows but 10 were requested"):
+            await _collect(client.iter_query(AQL, page_size=10))
+
+    async def test_errors_propagate(self, client: EHRBaseClient) -> None:
+        client._client.post = AsyncMock(return_value=_mock_response(404, {"message": "nope"}))
+        with pytest.raises(NotFoundError):
+            await _collect(client.iter_query(AQL))
+
+    async def test_invalid_page_size(self, client: EHRBaseClient) -> None:
+        with pytest.raises(ValueError, match="page_size"):
+            await _collect(client.iter_query(AQL, page_size=0))
@@ -0,0 +1,165 @@
+"""Unit tests for streamed AQL results (stream_query)."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import httpx
+import pytest
+
+from oehrpy.client import EHRBaseClient, EHRBaseError, NotFoundError, ValidationError
+from oehrpy.client.streaming import iter_result_rows
+
+AQL = "SELECT c/uid/value, o/data FROM EHR e CONTAINS COMPOSITION c CONTAINS OBSERVATION o"
+
+RESULT = {
+    "meta": {"_type": "RESULTSET", "_executed_aql": AQL},
+    "q": AQL,
+    "columns": [{"name": "uid", "path": "c/uid/value"}, {"path": "o/data"}],
+    "rows": [
+        ["a::1", {"magnitude": 120, "units": "mm[Hg]", "text": "ä, ] } \\" + '"'}],
+        ["b::1", None],
+        ["c::1", [1.5, -2e3, True, False]],
+    ],
+}
+
+
+def _chunks(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+async def _aiter(chunks: list[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def _client(handler: Callable[[httpx.Request], httpx.Response]) -> EHRBaseClient:
+    c = EHRBaseClient(base_url="http://localhost:8080/ehrbase")
+    c._client = httpx.AsyncClient(
+        base_url="http://localhost:8080/ehrbase", transport=httpx.MockTransport(handler)
+    )
+    return c
+
+
+async def _rows(data: bytes, size: int) -> tuple[list[Any], dict[str, Any]]:
+    fields: dict[str, Any] = {}
+    rows = [row async for row in iter_result_rows(_aiter(_chunks(data, size)), fields)]
+    return rows, fields
+
+
+class TestIterResultRows:
+    @pytest.mark.parametrize("size", [1, 3, 17, 65536])
+    async def test_chunk_sizes(self, size: int) -> None:
+        """Rows decode identically whatever the chunk boundaries (incl. mid-UTF-8)."""
+        rows, fields = await _rows(json.dumps(RESULT, ensure_ascii=False).encode(), size)
+        assert rows == RESULT["rows"]
+        assert fields == {k: v for k, v in RESULT.items() if k != "rows"}
+
+    async def test_pretty_printed(self) -> None:
+        rows, _ = await _rows(json.dumps(RESULT, indent=2).encode(), 5)
+        assert rows == RESULT["rows"]
+
+    async def test_scalar_rows_and_empty(self) -> None:
+        assert (await _rows(b'{"rows": [1, 22, 333]}', 2))[0] == [1, 22, 333]
+        assert (await _rows(b'{"q": "x", "rows": []}', 2)) == ([], {"q": "x"})
+        assert (await _rows(b"{}", 2)) == ([], {})
+        assert (await _rows(b'{"rows": null}', 2)) == ([], {"rows": None})
+
+    async def test_yields_before_stream_ends(self) -> None:
+        """The first row is yielded before the rest of the body is read."""
+        read = 0
+        data = json.dumps({"columns": [], "rows": [[i] for i in range(1000)]}).encode()
+
+        async def chunks() -> AsyncIterator[bytes]:
+            nonlocal read
+            for chunk in _chunks(data, 64):
+                read += 1
+                yield chunk
+
+        rows = iter_result_rows(chunks(), {})
+        assert await rows.__anext__() == [0]
+        assert read <= 2
+        await rows.aclose()
+
+    async def test_large_row_is_decoded_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A row spanning many chunks is decoded once, not once per chunk."""
+        calls = 0
+        raw_decode = json.JSONDecoder.raw_decode
+
+        def counting_raw_decode(self: json.JSONDecoder, s: str, idx: int = 0) -> tuple[object, int]:
+            nonlocal calls
+            calls += 1
+            return raw_decode(self, s, idx)
+
+        monkeypatch.setattr(json.JSONDecoder, "raw_decode", counting_raw_decode)
+        row = [{"items": [{"text": 'a "[b]" \\ {c}', "n": i} for i in range(2000)]}]
+
+        rows, _ = await _rows(json.dumps({"rows": [row, row]}).encode(), 512)
+
+        assert rows == [row, row]
+        assert calls == 3  # "rows" key and two rows
+
+    @pytest.mark.parametrize(
+        "data",
+        [b"[]", b'{"rows": [[1], [2}', b'{"rows": [1] 2}', b'{"rows": [1]', b'{"a": 1} x', b""],
+    )
+    async def test_invalid_json(self, data: bytes) -> None:
+        with pytest.raises(EHRBaseError, match="Invalid AQL result JSON at offset"):
+            await _rows(data, 4)
+
+
+class TestStreamQuery:
+    async def test_streams_rows_and_columns(self) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            body = json.dumps(RESULT).encode()
+            return httpx.Response(200, content=_aiter(_chunks(body, 10)))
+
+        client = _client(handler)
+        async with client.stream_query(AQL, {"x": 1}, ehr_id="e1", fetch=10) as result:
+            rows = [row async for row in result]
+            assert result.column_names == ["uid", "col_1"]
+            assert result.query == AQL
+
+        assert rows == RESULT["rows"]
+        assert json.loads(requests[0].content) == {
+            "q": AQL,
+            "query_parameters": {"x": 1},
+            "fetch": 10,
+        }
+        assert requests[0].url.params["ehr_id"] == "e1"
+
+    async def test_error_status_raises_on_enter(self) -> None:
+        client = _client(lambda request: httpx.Response(400, json={"message": "bad AQL"}))
+        with pytest.raises(ValidationError, match="bad AQL"):
+            async with client.stream_query(AQL):
+                pass
+
+        client = _client(lambda request: httpx.Response(404))
+        with pytest.raises(NotFoundError):
+            async with client.stream_query(AQL):
+                pass
+
+    async def test_no_content(self) -> None:
+        client = _client(lambda request: httpx.Response(204))
+        async with client.stream_query(AQL) as result:
+            assert [row async for row in result] == []
+
+    async def test_iterate_requires_context(self) -> None:
+        client = _client(lambda request: httpx.Response(200, json=RESULT))
+        with pytest.raises(RuntimeError, match="async with"):
+            client.stream_query(AQL).__aiter__()
+
+    async def test_early_exit_closes_response(self) -> None:
+        body = b'{"rows": [[1], [2]]}'
+        client = _client(lambda request: httpx.Response(200, content=_aiter(_chunks(body, 8))))
+        async with client.stream_query(AQL) as result:
+            async for _ in result:
+                break
+
+        assert result._response is not None
+        assert result._response.is_closed
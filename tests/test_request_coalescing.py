@@ -0,0 +1,152 @@
+"""Unit tests for single-flight request coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from oehrpy.client import EHRBaseClient, EHRBaseConfig, NotFoundError
+
+EHR_ID = "7d44b88c-4199-4bad-97dc-d78268e01398"
+WEB_TEMPLATE = {"templateId": "t", "tree": {"id": "t", "rmType": "COMPOSITION", "children": []}}
+
+
+def _mock_response(status_code: int, json_data: Any = None, text: str = "") -> httpx.Response:
+    """Build a fake httpx.Response."""
+    resp = MagicMock(spec=httpx.Response)
+    resp.status_code = status_code
+    resp.text = text
+    resp.headers = httpx.Headers()
+    resp.json.return_value = json_data
+    return resp
+
+
+def _slow_get(response: httpx.Response, calls: list[Any]) -> AsyncMock:
+    """A GET that takes a moment, so concurrent callers overlap."""
+
+    async def get(url: str, **kwargs: Any) -> httpx.Response:
+        calls.append((url, kwargs))
+        await asyncio.sleep(0.01)
+        return response
+
+    return AsyncMock(side_effect=get)
+
+
+def _client(**config: Any) -> EHRBaseClient:
+    c = EHRBaseClient(config=EHRBaseConfig(**config))
+    c._client = AsyncMock(spec=httpx.AsyncClient)
+    return c
+
+
+class TestCoalescing:
+    async def test_web_template_fetched_once(self) -> None:
+        """200 concurrent cache misses share one GET."""
+        client = _client()
+        calls: list[Any] = []
+        client._client.get = _slow_get(_mock_response(200, WEB_TEMPLATE), calls)
+
+        results = await asyncio.gather(*(client.get_web_template("t") for _ in range(200)))
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert len(client._in_flight) == 0
+
+    async def test_get_ehr(self) -> None:
+        client = _client()
+        calls: list[Any] = []
+        client._client.get = _slow_get(_mock_response(200, {"ehr_id": {"value": EHR_ID}}), calls)
+
+        results = await asyncio.gather(*(client.get_ehr(EHR_ID) for _ in range(10)))
+
+        assert len(calls) == 1
+        assert {r.ehr_id for r in results} == {EHR_ID}
+
+    async def test_get_ehr_by_subject_keyed_by_subject(self) -> None:
+        client = _client()
+        calls: list[Any] = []
+        client._client.get = _slow_get(_mock_response(200, {"ehr_id": {"value": EHR_ID}}), calls)
+
+        await asyncio.gather(
+            client.get_ehr_by_subject("p1", "ns"),
+            client.get_ehr_by_subject("p1", "ns"),
+            client.get_ehr_by_subject("p2", "ns"),
+            client.get_ehr_by_subject("p1", "other"),
+        )
+
+        assert len(calls) == 3
+
+    async def test_get_template_opt(self) -> None:
+        client = _client()
+        calls: list[Any] = []
+        client._client.get = _slow_get(_mock_response(200, text="<template/>"), calls)
+
+        results = await asyncio.gather(*(client.get_template_opt("t") for _ in range(5)))
+
+        assert results == ["<template/>"] * 5
+        assert len(calls) == 1
+
+    async def test_sequential_calls_not_coalesced(self) -> None:
+        client = _client()
+        client._client.get = AsyncMock(
+            return_value=_mock_response(200, {"ehr_id": {"value": EHR_ID}})
+        )
+
+        await client.get_ehr(EHR_ID)
+        await client.get_ehr(EHR_ID)
+
+        assert client._client.get.call_count == 2
+
+    async def test_error_shared_then_retried(self) -> None:
+        """All waiters see the failure; the next call makes a new request."""
+        client = _client()
+        calls: list[Any] = []
+        client._client.get = _slow_get(_mock_response(404), calls)
+
+        results = await asyncio.gather(
+            *(client.get_ehr(EHR_ID) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, NotFoundError) for r in results)
+        assert len(calls) == 1
+        with pytest.raises(NotFoundError):
+            await client.get_ehr(EHR_ID)
+        assert len(calls) == 2
+
+    async def test_cancelled_waiter_does_not_cancel_others(self) -> None:
+        client = _client()
+        calls: list[Any] = []
+        client._client.get = _slow_get(_mock_response(200, {"ehr_id": {"value": EHR_ID}}), calls)
+
+        first = asyncio.ensure_future(client.get_ehr(EHR_ID))
+        second = asyncio.ensure_future(client.get_ehr(EHR_ID))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert (await second).ehr_id == EHR_ID
+        assert first.cancelled()
+        assert len(calls) == 1
+
+    async def test_bypassing_cache_not_coalesced(self) -> None:
+        client = _client()
+        calls: list[Any] = []
+        client._client.get = _slow_get(_mock_response(200, WEB_TEMPLATE), calls)
+
+        await asyncio.gather(
+            client.get_web_template("t", use_cache=False),
+            client.get_web_template("t", use_cache=False),
+        )
+
+        assert len(calls) == 2
+
+    async def test_disabled_by_config(self) -> None:
+        client = _client(coalesce_requests=False)
+        calls: list[Any] = []
+        client._client.get = _slow_get(_mock_response(200, {"ehr_id": {"value": EHR_ID}}), calls)
+
+        await asyncio.gather(*(client.get_ehr(EHR_ID) for _ in range(3)))
+
+        assert len(calls) == 3
@@ -0,0 +1,228 @@
+"""Unit tests for client-side rate and concurrency limits."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+
+from oehrpy.client import AdaptiveConcurrency, EHRBaseConfig, OperationClass, RequestLimit
+from oehrpy.client.ehrbase import _wrap_transport
+from oehrpy.client.limits import (
+    AdaptiveLimiter,
+    TokenBucket,
+    _LimitTransport,
+    operation_class,
+)
+
+BASE = "http://localhost:8080/ehrbase/rest/openehr/v1"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _request(method: str, path: str) -> httpx.Request:
+    return httpx.Request(method, f"{BASE}{path}")
+
+
+class TestOperationClass:
+    @pytest.mark.parametrize(
+        ("method", "path", "expected"),
+        [
+            ("POST", "/ehr/e1/composition", OperationClass.WRITE),
+            ("PUT", "/ehr/e1/composition/c1", OperationClass.WRITE),
+            ("DELETE", "/ehr/e1/composition/c1", OperationClass.WRITE),
+            ("POST", "/query/aql", OperationClass.AQL),
+            ("GET", "/query/aql", OperationClass.AQL),
+            ("GET", "/definition/template/adl1.4/t", OperationClass.TEMPLATE),
+            ("POST", "/definition/template/adl1.4", OperationClass.TEMPLATE),
+            ("GET", "/ehr/e1", OperationClass.READ),
+        ],
+    )
+    def test_classify(self, method: str, path: str, expected: OperationClass) -> None:
+        assert operation_class(_request(method, path)) is expected
+
+
+class TestTokenBucket:
+    async def test_burst_then_rate(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        clock = FakeClock()
+        slept: list[float] = []
+
+        async def sleep(delay: float) -> None:
+            slept.append(delay)
+            clock.now += delay
+
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+        bucket = TokenBucket(rate=10, burst=3, clock=clock)
+
+        for _ in range(5):
+            await bucket.acquire()
+
+        # Three from the burst, then one every 1/rate seconds
+        assert slept == pytest.approx([0.1, 0.1])
+        assert clock.now == pytest.approx(0.2)
+
+    async def test_refill_capped_at_burst(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=100, burst=2, clock=clock)
+        await bucket.acquire()
+        clock.now = 60.0
+        bucket._refill()
+        assert bucket._tokens == 2
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError, match="rate must be positive"):
+            TokenBucket(rate=0, burst=1)
+
+
+class TestAdaptiveLimiter:
+    def _limiter(self, **kwargs: object) -> tuple[AdaptiveLimiter, FakeClock]:
+        clock = FakeClock()
+        return AdaptiveLimiter(AdaptiveConcurrency(**kwargs), clock=clock), clock  # type: ignore[arg-type]
+
+    async def test_additive_increase(self) -> None:
+        limiter, _ = self._limiter(initial_limit=4, max_limit=5)
+        for _ in range(4):
+            limiter.release(await limiter.acquire(), overloaded=False)
+        assert limiter.limit == pytest.approx(5.0, abs=0.1)
+        for _ in range(100):
+            limiter.release(await limiter.acquire(), overloaded=False)
+        assert limiter.limit == 5
+
+    async def test_multiplicative_decrease_once_per_round_trip(self) -> None:
+        limiter, clock = self._limiter(initial_limit=8, min_limit=2)
+        started = [await limiter.acquire() for _ in range(4)]
+        clock.now = 1.0
+        for s in started:
+            limiter.release(s, overloaded=True)
+        assert limiter.limit == 4
+
+        clock.now = 2.0
+        limiter.release(await limiter.acquire(), overloaded=True)
+        limiter.release(await limiter.acquire(), overloaded=True)
+        assert limiter.limit == 2  # min_limit
+        assert limiter.in_flight == 0
+
+    async def test_unknown_outcome_keeps_limit(self) -> None:
+        limiter, _ = self._limiter(initial_limit=3)
+        limiter.release(await limiter.acquire(), overloaded=None)
+        assert limiter.limit == 3
+
+    async def test_waiters_woken_in_order(self) -> None:
+        limiter, _ = self._limiter(initial_limit=1)
+        first = await limiter.acquire()
+        order: list[int] = []
+
+        async def wait(i: int) -> None:
+            started = await limiter.acquire()
+            order.append(i)
+            limiter.release(started, overloaded=None)
+
+        tasks = [asyncio.ensure_future(wait(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        assert order == []
+        limiter.release(first, overloaded=None)
+        await asyncio.gather(*tasks)
+        assert order == [0, 1, 2]
+        assert limiter.in_flight == 0
+
+    async def test_cancelled_waiter(self) -> None:
+        limiter, _ = self._limiter(initial_limit=1)
+        first = await limiter.acquire()
+        cancelled = asyncio.ensure_future(limiter.acquire())
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+        limiter.release(first, overloaded=None)
+        limiter.release(await waiting, overloaded=None)
+        assert limiter.in_flight == 0
+
+
+class TestLimitTransport:
+    async def test_adaptive_limit_holds_slot_until_response_closed(self) -> None:
+        async def body() -> AsyncIterator[bytes]:
+            yield b"{}"
+
+        transport = _LimitTransport(
+            httpx.MockTransport(lambda request: httpx.Response(200, content=body())),
+            {OperationClass.WRITE: RequestLimit(concurrency=AdaptiveConcurrency())},
+        )
+        limiter = transport.limiter(OperationClass.WRITE)
+        assert limiter is not None
+        assert limiter.concurrency is not None
+        assert transport.limiter(OperationClass.READ) is None
+
+        async with (
+            httpx.AsyncClient(transport=transport) as client,
+            client.stream("POST", f"{BASE}/ehr") as response,
+        ):
+            assert limiter.concurrency.in_flight == 1
+            await response.aread()
+        assert limiter.concurrency.in_flight == 0
+        assert limiter.concurrency.limit > 8
+
+    async def test_overload_status_cuts_limit(self) -> None:
+        transport = _LimitTransport(
+            httpx.MockTransport(lambda request: httpx.Response(503)),
+            {OperationClass.AQL: RequestLimit(concurrency=AdaptiveConcurrency())},
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.post(f"{BASE}/query/aql", json={"q": "SELECT"})
+
+        limiter = transport.limiter(OperationClass.AQL)
+        assert limiter is not None
+        assert limiter.concurrency is not None
+        assert limiter.concurrency.limit == 4
+
+    async def test_timeout_cuts_limit(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ReadTimeout("slow", request=request)
+
+        transport = _LimitTransport(
+            httpx.MockTransport(handler),
+            {OperationClass.READ: RequestLimit(concurrency=AdaptiveConcurrency())},
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            with pytest.raises(httpx.ReadTimeout):
+                await client.get(f"{BASE}/ehr/e1")
+
+        limiter = transport.limiter(OperationClass.READ)
+        assert limiter is not None
+        assert limiter.concurrency is not None
+        assert limiter.concurrency.limit == 4
+        assert limiter.concurrency.in_flight == 0
+
+    async def test_rate_limit_only_applies_to_its_class(self) -> None:
+        config = EHRBaseConfig(
+            retry=None, request_limits={OperationClass.WRITE: RequestLimit(rate=1000, burst=1)}
+        )
+        transport = _wrap_transport(httpx.MockTransport(lambda r: httpx.Response(200)), config)
+        assert isinstance(transport, _LimitTransport)
+        limiter = transport.limiter(OperationClass.WRITE)
+        assert limiter is not None
+        assert limiter.bucket is not None
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.post(f"{BASE}/ehr")
+            assert limiter.bucket._tokens < 1
+            await client.get(f"{BASE}/ehr/e1")
+            await client.post(f"{BASE}/ehr")
+
+    def test_default_burst(self) -> None:
+        transport = _LimitTransport(
+            httpx.MockTransport(lambda r: httpx.Response(200)),
+            {"aql": RequestLimit(rate=20), OperationClass.WRITE: RequestLimit(rate=0.5)},  # type: ignore[dict-item]
+        )
+        aql = transport.limiter(OperationClass.AQL)
+        write = transport.limiter(OperationClass.WRITE)
+        assert aql is not None and aql.bucket is not None and aql.bucket.burst == 20
+        assert write is not None and write.bucket is not None and write.bucket.burst == 1
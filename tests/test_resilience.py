@@ -0,0 +1,264 @@
+"""Unit tests for request retries and the circuit breaker."""
+
+from __future__ import annotations
+
+import email.utils
+import time
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from oehrpy.client import (
+    CircuitBreakerPolicy,
+    CircuitOpenError,
+    EHRBaseConfig,
+    RetryPolicy,
+)
+from oehrpy.client.ehrbase import (
+    _CircuitBreakerTransport,
+    _retry_after,
+    _RetryTransport,
+    _wrap_transport,
+)
+
+BASE = "http://localhost:8080/ehrbase/rest/openehr/v1"
+FAST = RetryPolicy(backoff_base=0.001, backoff_max=0.001)
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+def _counting(responses: list[int | Exception]) -> tuple[httpx.MockTransport, list[httpx.Request]]:
+    """A transport returning the given statuses (or raising errors) in turn."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        outcome = responses[min(len(requests), len(responses)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome)
+
+    return httpx.MockTransport(handler), requests
+
+
+def _client(transport: httpx.AsyncBaseTransport) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=transport)
+
+
+class TestRetryTransport:
+    async def test_retries_idempotent_on_status(self) -> None:
+        transport, requests = _counting([503, 502, 200])
+        async with _client(_RetryTransport(transport, FAST)) as client:
+            response = await client.get(f"{BASE}/ehr/e1")
+
+        assert response.status_code == 200
+        assert len(requests) == 3
+
+    async def test_gives_up_after_max_attempts(self) -> None:
+        transport, requests = _counting([503])
+        async with _client(_RetryTransport(transport, FAST)) as client:
+            response = await client.get(f"{BASE}/ehr/e1")
+
+        assert response.status_code == 503
+        assert len(requests) == FAST.max_attempts
+
+    async def test_post_not_retried_on_status(self) -> None:
+        transport, requests = _counting([503, 200])
+        async with _client(_RetryTransport(transport, FAST)) as client:
+            response = await client.post(f"{BASE}/ehr/e1/composition", json={})
+
+        assert response.status_code == 503
+        assert len(requests) == 1
+
+    async def test_aql_post_retried(self) -> None:
+        transport, requests = _counting([504, 200])
+        async with _client(_RetryTransport(transport, FAST)) as client:
+            response = await client.post(f"{BASE}/query/aql", json={"q": "SELECT"})
+
+        assert response.status_code == 200
+        assert len(requests) == 2
+        assert requests[1].content == requests[0].content
+
+    async def test_connection_reset_retried_for_idempotent_only(self) -> None:
+        transport, requests = _counting([httpx.ReadError("reset"), 200])
+        async with _client(_RetryTransport(transport, FAST)) as client:
+            assert (await client.get(f"{BASE}/ehr/e1")).status_code == 200
+        assert len(requests) == 2
+
+        transport, requests = _counting([httpx.ReadError("reset"), 200])
+        async with _client(_RetryTransport(transport, FAST)) as client:
+            with pytest.raises(httpx.ReadError):
+                await client.post(f"{BASE}/ehr", json={})
+        assert len(requests) == 1
+
+    @pytest.mark.parametrize("method", ["PUT", "DELETE"])
+    async def test_conditional_request_not_retried_once_sent(self, method: str) -> None:
+        headers = {"If-Match": "v1::local.ehrbase.org::1"}
+        transport, requests = _counting([503, 204])
+        async with _client(_RetryTransport(transport, FAST)) as client:
+            response = await client.request(
+                method, f"{BASE}/ehr/e1/composition/c1", headers=headers
+            )
+        assert response.status_code == 503
+        assert len(requests) == 1
+
+        # Even when the method is configured as idempotent
+        policy = RetryPolicy(backoff_base=0.001, methods=frozenset({method}))
+        transport, requests = _counting([httpx.ReadError("reset"), 204])
+        async with _client(_RetryTransport(transport, policy)) as client:
+            with pytest.raises(httpx.ReadError):
+                await client.request(method, f"{BASE}/ehr/e1/composition/c1", headers=headers)
+        assert len(requests) == 1
+
+        transport, requests = _counting([httpx.ConnectError("refused"), 204])
+        async with _client(_RetryTransport(transport, FAST)) as client:
+            response = await client.request(
+                method, f"{BASE}/ehr/e1/composition/c1", headers=headers
+            )
+        assert response.status_code == 204
+        assert len(requests) == 2
+
+    async def test_connect_error_retried_for_any_method(self) -> None:
+        transport, requests = _counting([httpx.ConnectError("refused"), 201])
+        async with _client(_RetryTransport(transport, FAST)) as client:
+            response = await client.post(f"{BASE}/ehr", json={})
+
+        assert response.status_code == 201
+        assert len(requests) == 2
+
+    async def test_retry_after_too_long_returned(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503, headers={"Retry-After": "3600"})
+
+        transport = httpx.MockTransport(handler)
+        async with _client(_RetryTransport(transport, FAST)) as client:
+            response = await client.get(f"{BASE}/ehr/e1")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3600"
+
+    async def test_retry_after_honoured(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200)
+
+        async with _client(_RetryTransport(httpx.MockTransport(handler), FAST)) as client:
+            assert (await client.get(f"{BASE}/ehr/e1")).status_code == 200
+        assert calls == 2
+
+    def test_parse_retry_after(self) -> None:
+        def response(value: str) -> httpx.Response:
+            return httpx.Response(503, headers={"Retry-After": value})
+
+        assert _retry_after(response("120")) == 120.0
+        assert _retry_after(httpx.Response(503)) is None
+        assert _retry_after(response("soon")) is None
+        date = email.utils.formatdate(time.time() + 30, usegmt=True)
+        delay = _retry_after(response(date))
+        assert delay is not None
+        assert 25 < delay <= 30
+        assert _retry_after(response("Thu, 01 Jan 1970 00:00:00 GMT")) == 0.0
+
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+        delays = [policy.backoff(10) for _ in range(100)]
+        assert all(0 <= d <= 5.0 for d in delays)
+        assert len(set(delays)) > 1
+
+
+class TestCircuitBreaker:
+    def _breaker(
+        self, transport: httpx.AsyncBaseTransport, now: list[float]
+    ) -> _CircuitBreakerTransport:
+        policy = CircuitBreakerPolicy(failure_threshold=3, reset_timeout=10)
+        return _CircuitBreakerTransport(transport, policy, clock=lambda: now[0])
+
+    async def test_opens_after_threshold_and_sheds_load(self) -> None:
+        now = [0.0]
+        transport, requests = _counting([503])
+        breaker = self._breaker(transport, now)
+        async with _client(breaker) as client:
+            for _ in range(3):
+                await client.get(f"{BASE}/ehr/e1")
+            assert breaker.state == "open"
+
+            with pytest.raises(CircuitOpenError, match="3 consecutive failures"):
+                await client.get(f"{BASE}/ehr/e1")
+        assert len(requests) == 3
+
+    async def test_success_resets_count(self) -> None:
+        now = [0.0]
+        transport, requests = _counting([503, 503, 200, 503, 503])
+        breaker = self._breaker(transport, now)
+        async with _client(breaker) as client:
+            for _ in range(5):
+                await client.get(f"{BASE}/ehr/e1")
+        assert breaker.state == "closed"
+
+    async def test_client_errors_are_not_failures(self) -> None:
+        transport, _ = _counting([404])
+        breaker = self._breaker(transport, [0.0])
+        async with _client(breaker) as client:
+            for _ in range(5):
+                await client.get(f"{BASE}/ehr/e1")
+        assert breaker.state == "closed"
+
+    async def test_half_open_probe(self) -> None:
+        now = [0.0]
+        transport, requests = _counting([httpx.ConnectError("down")] * 4 + [200])
+        breaker = self._breaker(transport, now)
+        async with _client(breaker) as client:
+            for _ in range(3):
+                with pytest.raises(httpx.ConnectError):
+                    await client.get(f"{BASE}/ehr/e1")
+
+            # A failed probe re-opens the circuit for another reset_timeout
+            now[0] = 10.0
+            assert breaker.state == "half_open"
+            with pytest.raises(httpx.ConnectError):
+                await client.get(f"{BASE}/ehr/e1")
+            assert breaker.state == "open"
+            now[0] = 15.0
+            with pytest.raises(CircuitOpenError):
+                await client.get(f"{BASE}/ehr/e1")
+
+            # A successful probe closes it
+            now[0] = 20.0
+            assert (await client.get(f"{BASE}/ehr/e1")).status_code == 200
+            assert breaker.state == "closed"
+        assert len(requests) == 5
+
+
+class TestWrapTransport:
+    async def test_configured_policy_retries(self) -> None:
+        transport, requests = _counting([503, 200])
+        config = EHRBaseConfig(retry=FAST)
+        async with _client(_wrap_transport(transport, config)) as client:
+            assert (await client.get(f"{BASE}/ehr/e1")).status_code == 200
+        assert len(requests) == 2
+
+    async def test_retries_opt_in(self) -> None:
+        transport, _ = _counting([200])
+        assert EHRBaseConfig().retry is None
+        assert _wrap_transport(transport, EHRBaseConfig()) is transport
+
+    async def test_disabled(self) -> None:
+        transport, _ = _counting([200])
+        assert _wrap_transport(transport, EHRBaseConfig(retry=None)) is transport
+
+    async def test_retries_do_not_trip_breaker_early(self) -> None:
+        """Every attempt counts towards the breaker, and an open circuit is not retried."""
+        transport, requests = _counting([503])
+        config = EHRBaseConfig(
+            retry=FAST, circuit_breaker=CircuitBreakerPolicy(failure_threshold=2)
+        )
+        async with _client(_wrap_transport(transport, config)) as client:
+            with pytest.raises(CircuitOpenError):
+                await client.get(f"{BASE}/ehr/e1")
+        assert len(requests) == 2
@@ -1,15 +1,47 @@
 """Tests for canonical JSON serialization."""
 
+import copy
+
 import pytest
+from pydantic import BaseModel, field_serializer
 
 from oehrpy.rm import (
+    CLUSTER,
     CODE_PHRASE,
     DV_CODED_TEXT,
     DV_QUANTITY,
     DV_TEXT,
+    ELEMENT,
+    ITEM_TREE,
     TERMINOLOGY_ID,
 )
-from oehrpy.serialization import from_canonical, to_canonical
+from oehrpy.serialization import from_canonical, get_type_registry, register_type, to_canonical
+from oehrpy.serialization.canonical import (
+    _SERIALIZERS,
+    _TYPE_REGISTRY,
+    _get_serializer,
+    _lookup_type,
+    _to_canonical_via_model_dump,
+)
+
+
+def _item_tree() -> ITEM_TREE:
+    """Build a small ITEM_TREE with nested clusters and polymorphic values."""
+    code = CODE_PHRASE(terminology_id=TERMINOLOGY_ID(value="openehr"), code_string="382")
+    elements = [
+        ELEMENT(
+            archetype_node_id=f"at000{i}",
+            name=DV_TEXT(value=f"Element {i}"),
+            value=DV_QUANTITY(magnitude=float(i), units="mm[Hg]", property=code),
+        )
+        for i in range(3)
+    ]
+    cluster = CLUSTER(
+        archetype_node_id="openEHR-EHR-CLUSTER.test.v1",
+        name=DV_TEXT(value="Cluster"),
+        items=elements,
+    )
+    return ITEM_TREE(archetype_node_id="at0001", name=DV_TEXT(value="Tree"), items=[cluster])
 
 
 class TestToCanonical:
@@ -59,6 +91,80 @@ class TestToCanonical:
         assert canonical["hyperlink"] is None
 
 
+class TestCompiledSerializer:
+    """Tests for the compiled single-pass serializers behind to_canonical."""
+
+    @pytest.mark.parametrize("exclude_none", [True, False])
+    @pytest.mark.parametrize("by_alias", [True, False])
+    def test_matches_model_dump_path(self, exclude_none: bool, by_alias: bool) -> None:
+        """Test the compiled output equals the model_dump based output."""
+        tree = _item_tree()
+
+        compiled = to_canonical(tree, exclude_none=exclude_none, by_alias=by_alias)
+        legacy = _to_canonical_via_model_dump(tree, exclude_none=exclude_none, by_alias=by_alias)
+
+        assert compiled == legacy
+        assert list(compiled) == list(legacy)
+
+    def test_nested_polymorphic_types(self) -> None:
+        """Test that _type is emitted for models held in untyped fields."""
+        canonical = to_canonical(_item_tree())
+
+        cluster = canonical["items"][0]
+        assert cluster["_type"] == "CLUSTER"
+        assert cluster["items"][0]["_type"] == "ELEMENT"
+        assert cluster["items"][0]["value"]["_type"] == "DV_QUANTITY"
+        assert cluster["items"][0]["name"]["_type"] == "DV_TEXT"
+
+    def test_serializer_compiled_once_per_class(self) -> None:
+        """Test that serializers are cached per model class."""
+        to_canonical(DV_TEXT(value="a"))
+        serializer = _SERIALIZERS[DV_TEXT]
+
+        to_canonical(DV_TEXT(value="b"))
+
+        assert _get_serializer(DV_TEXT) is serializer
+
+    def test_output_does_not_alias_model_state(self) -> None:
+        """Test that mutating the output leaves the model untouched."""
+        tree = _item_tree()
+        canonical = to_canonical(tree)
+
+        canonical["items"].clear()
+
+        assert tree.items is not None
+        assert len(tree.items) == 1
+
+    def test_model_inside_plain_dict_gets_type(self) -> None:
+        """Test that models nested in plain dict values are typed too."""
+        element = ELEMENT(
+            archetype_node_id="at0001",
+            name={"value": "Name", "mappings": [DV_TEXT(value="x")]},
+        )
+
+        canonical = to_canonical(element)
+
+        assert canonical["name"]["mappings"][0] == {
+            "_type": "DV_TEXT",
+            "type": "DV_TEXT",
+            "value": "x",
+        }
+
+    def test_custom_serializer_falls_back_to_model_dump(self) -> None:
+        """Test that models with field serializers keep their custom output."""
+
+        class UpperText(BaseModel):
+            value: str
+
+            @field_serializer("value")
+            def _upper(self, value: str) -> str:
+                return value.upper()
+
+        canonical = to_canonical(UpperText(value="hello"))
+
+        assert canonical == {"_type": "UpperText", "value": "HELLO"}
+
+
 class TestFromCanonical:
     """Tests for from_canonical function."""
 
@@ -135,6 +241,118 @@ class TestFromCanonical:
             from_canonical(data, expected_type=DV_QUANTITY)
 
 
+class TestFromCanonicalNested:
+    """Tests for resolving nested polymorphic nodes in from_canonical."""
+
+    def test_resolves_untyped_fields(self) -> None:
+        """Test that nested nodes in Any fields become RM instances."""
+        data = to_canonical(_item_tree())
+
+        result = from_canonical(data, expected_type=ITEM_TREE)
+
+        assert result.items is not None
+        cluster = result.items[0]
+        assert isinstance(cluster, CLUSTER)
+        assert isinstance(cluster.items[0], ELEMENT)
+        assert isinstance(cluster.items[0].value, DV_QUANTITY)
+        assert isinstance(cluster.items[0].name, DV_TEXT)
+        assert cluster.items[0].value.property.terminology_id.value == "openehr"
+
+    def test_does_not_mutate_input(self) -> None:
+        """Test that the input data keeps all nested _type fields."""
+        data = to_canonical(_item_tree())
+        snapshot = copy.deepcopy(data)
+
+        from_canonical(data)
+
+        assert data == snapshot
+        assert data["items"][0]["items"][0]["value"]["_type"] == "DV_QUANTITY"
+
+    def test_input_reusable(self) -> None:
+        """Test that the same input can be deserialized repeatedly."""
+        data = to_canonical(_item_tree())
+
+        first = from_canonical(data)
+        second = from_canonical(data)
+
+        assert first == second
+
+    def test_unknown_nested_type_kept_as_dict(self) -> None:
+        """Test that unregistered nested types stay dicts with their _type."""
+        data = {
+            "_type": "ELEMENT",
+            "archetype_node_id": "at0001",
+            "name": {"_type": "DV_TEXT", "value": "Name"},
+            "value": {"_type": "CUSTOM_VALUE", "inner": {"_type": "DV_TEXT", "value": "x"}},
+        }
+
+        result = from_canonical(data, expected_type=ELEMENT)
+
+        assert result.value["_type"] == "CUSTOM_VALUE"
+        assert isinstance(result.value["inner"], DV_TEXT)
+
+    def test_untyped_subtrees_are_shared(self) -> None:
+        """Test that dicts without typed nodes are not copied."""
+        feeder = {"system": "legacy", "ids": [1, 2, 3]}
+        data = {
+            "_type": "ELEMENT",
+            "archetype_node_id": "at0001",
+            "name": {"_type": "DV_TEXT", "value": "Name"},
+            "null_reason": feeder,
+        }
+
+        result = from_canonical(data, expected_type=ELEMENT)
+
+        assert result.null_reason is feeder
+
+    def test_round_trip_preserves_types(self) -> None:
+        """Test that canonical output survives a deserialize/serialize cycle."""
+        data = to_canonical(_item_tree())
+
+        assert to_canonical(from_canonical(data)) == data
+
+
+class TestTypeRegistry:
+    """Tests for the lazily populated _type registry."""
+
+    def test_lookup_registers_rm_type_on_demand(self) -> None:
+        """Test that RM classes are registered when first looked up."""
+        _TYPE_REGISTRY.pop("DV_BOOLEAN", None)
+
+        cls = _lookup_type("DV_BOOLEAN")
+
+        assert cls is not None
+        assert cls.__name__ == "DV_BOOLEAN"
+        assert _TYPE_REGISTRY["DV_BOOLEAN"] is cls
+
+    def test_lookup_unknown_type(self) -> None:
+        """Test that unknown types are not registered."""
+        assert _lookup_type("UNKNOWN_TYPE") is None
+        assert "UNKNOWN_TYPE" not in _TYPE_REGISTRY
+
+    def test_get_type_registry_includes_all_rm_types(self) -> None:
+        """Test that the public registry view covers all RM classes."""
+        registry = get_type_registry()
+
+        assert registry["COMPOSITION"].__name__ == "COMPOSITION"
+        assert len(registry) >= 134
+
+    def test_registered_type_takes_precedence(self) -> None:
+        """Test that explicitly registered classes override RM classes."""
+
+        class DV_TEXT(BaseModel):  # noqa: N801
+            value: str
+
+        original = _lookup_type("DV_TEXT")
+        try:
+            register_type(DV_TEXT)
+            result = from_canonical({"_type": "DV_TEXT", "value": "x"})
+            assert type(result) is DV_TEXT
+        finally:
+            assert original is not None
+            register_type(original)
+
+
 class TestRoundTrip:
     """Tests for serialization round-trip."""
 
@@ -0,0 +1,337 @@
+"""Unit tests for the synchronous client."""
+
+from __future__ import annotations
+
+import inspect
+import json
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from oehrpy.client import (
+    CircuitBreakerPolicy,
+    ContributionChange,
+    EHRBaseClient,
+    EHRBaseConfig,
+    EHRBaseError,
+    NotFoundError,
+    OperationClass,
+    RequestLimit,
+    RetryPolicy,
+    SyncEHRBaseClient,
+    ValidationError,
+    create_sync_transport,
+)
+from oehrpy.client.sync import _SyncRetryTransport
+
+EHR_ID = "7d44b88c-4199-4bad-97dc-d78268e01398"
+BASE = "http://localhost:8080/ehrbase"
+WEB_TEMPLATE = {"templateId": "t", "tree": {"id": "t", "rmType": "COMPOSITION", "children": []}}
+
+
+def _client(handler: Callable[[httpx.Request], httpx.Response]) -> SyncEHRBaseClient:
+    client = SyncEHRBaseClient(base_url=BASE, transport=httpx.MockTransport(handler))
+    client.connect()
+    return client
+
+
+def _rows_handler(total: int, requests: list[dict[str, Any]]) -> Callable[..., httpx.Response]:
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        with lock:
+            requests.append(body)
+        offset, fetch = body.get("offset", 0), body.get("fetch", total)
+        rows = [[i] for i in range(offset, min(total, offset + fetch))]
+        return httpx.Response(200, json={"q": body["q"], "columns": [{"name": "i"}], "rows": rows})
+
+    return handler
+
+
+class TestParity:
+    def test_mirrors_every_public_method(self) -> None:
+        async_methods = {
+            name
+            for name, _ in inspect.getmembers(EHRBaseClient, inspect.isfunction)
+            if not name.startswith("_")
+        }
+        sync_methods = {
+            name
+            for name, _ in inspect.getmembers(SyncEHRBaseClient, inspect.isfunction)
+            if not name.startswith("_")
+        }
+        assert async_methods <= sync_methods
+
+    def test_docstrings_shared(self) -> None:
+        assert SyncEHRBaseClient.get_ehr.__doc__ == EHRBaseClient.get_ehr.__doc__
+
+
+class TestRequests:
+    def test_get_ehr_reuses_connection_pool(self) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"ehr_id": {"value": EHR_ID}})
+
+        with SyncEHRBaseClient(base_url=BASE, transport=httpx.MockTransport(handler)) as client:
+            http = client.client
+            assert client.get_ehr(EHR_ID).ehr_id == EHR_ID
+            assert client.get_ehr(EHR_ID).ehr_id == EHR_ID
+            assert client.client is http
+
+        assert [r.url.path for r in requests] == [f"/ehrbase/rest/openehr/v1/ehr/{EHR_ID}"] * 2
+        assert requests[0].headers["Accept"] == "application/json"
+
+    def test_error_mapping_shared(self) -> None:
+        client = _client(lambda request: httpx.Response(404))
+        with pytest.raises(NotFoundError):
+            client.get_ehr(EHR_ID)
+
+        client = _client(lambda request: httpx.Response(400, json={"message": "bad flat"}))
+        with pytest.raises(ValidationError, match="bad flat"):
+            client.create_composition(EHR_ID, {"a": 1}, template_id="t")
+
+    def test_requires_connect(self) -> None:
+        client = SyncEHRBaseClient()
+        with pytest.raises(RuntimeError, match="not connected"):
+            client.get_ehr(EHR_ID)
+
+    def test_health_check(self) -> None:
+        assert _client(lambda request: httpx.Response(200)).health_check()
+        assert not _client(lambda request: httpx.Response(503)).health_check()
+
+    def test_web_template_cached(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(200, json=WEB_TEMPLATE)
+
+        client = _client(handler)
+        parsed = client.get_parsed_web_template("t")
+        assert client.get_parsed_web_template("t") is parsed
+        assert client.get_web_template("t") == WEB_TEMPLATE
+        assert calls == 1
+        client.clear_web_template_cache()
+        assert client.get_web_template("t") == WEB_TEMPLATE
+        assert calls == 2
+
+    def test_concurrent_threads(self) -> None:
+        client = _client(lambda request: httpx.Response(200, json={"ehr_id": {"value": EHR_ID}}))
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: client.get_ehr(EHR_ID), range(50)))
+        assert {r.ehr_id for r in results} == {EHR_ID}
+
+
+class TestQueries:
+    def test_query(self) -> None:
+        requests: list[dict[str, Any]] = []
+        client = _client(_rows_handler(3, requests))
+        result = client.query("SELECT i", offset=1, fetch=5)
+        assert result.rows == [[1], [2]]
+        assert requests == [{"q": "SELECT i", "offset": 1, "fetch": 5}]
+
+    @pytest.mark.parametrize("prefetch", [True, False])
+    def test_iter_query(self, prefetch: bool) -> None:
+        requests: list[dict[str, Any]] = []
+        client = _client(_rows_handler(25, requests))
+
+        rows = list(client.iter_query("SELECT i", page_size=10, prefetch=prefetch))
+
+        assert rows == [[i] for i in range(25)]
+        assert sorted(r["offset"] for r in requests) == [0, 10, 20]
+
+    def test_iter_query_server_ignoring_paging(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"rows": [[i] for i in range(25)]})
+
+        with pytest.raises(EHRBaseError, match="25 rows but 10 were requested"):
+            list(_client(handler).iter_query("SELECT i", page_size=10))
+
+    def test_iter_query_early_exit(self) -> None:
+        requests: list[dict[str, Any]] = []
+        client = _client(_rows_handler(100, requests))
+        rows = client.iter_query("SELECT i", page_size=10)
+        assert next(iter(rows)) == [0]
+        rows.close()  # type: ignore[attr-defined]
+        assert len(requests) <= 2
+
+    def test_stream_query(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.dumps({"q": "SELECT i", "columns": [{"name": "i"}], "rows": [[1], [2]]})
+            return httpx.Response(200, content=iter([body[:7].encode(), body[7:].encode()]))
+
+        with _client(handler).stream_query("SELECT i") as result:
+            assert list(result) == [[1], [2]]
+            assert result.column_names == ["i"]
+
+    def test_stream_query_error(self) -> None:
+        client = _client(lambda request: httpx.Response(400, json={"message": "bad AQL"}))
+        with pytest.raises(ValidationError, match="bad AQL"), client.stream_query("x"):
+            pass
+
+
+class TestBulk:
+    def test_results_and_stats(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            ehr_id = request.url.path.split("/")[-2]
+            if ehr_id == "bad":
+                return httpx.Response(422, json={"message": "invalid"})
+            return httpx.Response(201, json={"uid": {"value": f"{ehr_id}::s::1"}})
+
+        client = _client(handler)
+        items = [(f"e{i}", {"x": i}, "t") for i in range(20)] + [("bad", {}, "t")]
+        upload = client.create_compositions_bulk(items, max_concurrency=4)
+        results = sorted(upload, key=lambda r: r.index)
+
+        assert len(results) == 21
+        assert all(r.ok for r in results[:20])
+        assert isinstance(results[20].error, ValidationError)
+        assert results[3].response is not None
+        assert results[3].response.uid == "e3::s::1"
+        assert upload.stats.submitted == 21
+        assert upload.stats.succeeded == 20
+        assert upload.stats.failed == 1
+
+    def test_invalid_concurrency(self) -> None:
+        with pytest.raises(ValueError, match="max_concurrency"):
+            _client(lambda r: httpx.Response(201)).create_compositions_bulk([], max_concurrency=0)
+
+
+class TestTransport:
+    def test_retry(self) -> None:
+        statuses = iter([503, 200])
+        transport = _SyncRetryTransport(
+            httpx.MockTransport(lambda request: httpx.Response(next(statuses))),
+            RetryPolicy(backoff_base=0.001, backoff_max=0.001),
+        )
+        with httpx.Client(transport=transport) as client:
+            assert client.get(f"{BASE}/rest/openehr/v1/ehr/e1").status_code == 200
+
+    def test_create_sync_transport(self) -> None:
+        transport = create_sync_transport()
+        assert isinstance(transport, httpx.HTTPTransport)
+        transport.close()
+        transport = create_sync_transport(EHRBaseConfig(retry=RetryPolicy()))
+        assert isinstance(transport, _SyncRetryTransport)
+        transport.close()
+
+    def test_environment_proxy(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+        monkeypatch.delenv("NO_PROXY", raising=False)
+        monkeypatch.delenv("no_proxy", raising=False)
+        with patch("oehrpy.client.sync.httpx.HTTPTransport") as transport_cls:
+            create_sync_transport(EHRBaseConfig(base_url="https://ehr.example.org/ehrbase"))
+
+        assert transport_cls.call_args.kwargs["proxy"] == "http://proxy.example:3128"
+
+    @pytest.mark.parametrize(
+        "setting",
+        [
+            {"max_connections_per_host": 4},
+            {"circuit_breaker": CircuitBreakerPolicy()},
+            {"request_limits": {OperationClass.AQL: RequestLimit(rate=5)}},
+        ],
+    )
+    def test_async_only_settings_rejected(self, setting: dict[str, Any]) -> None:
+        config = EHRBaseConfig(**setting)
+        with pytest.raises(ValueError, match=next(iter(setting))):
+            create_sync_transport(config)
+        with pytest.raises(ValueError, match=next(iter(setting))):
+            SyncEHRBaseClient(config=config)
+
+    def test_shared_transport_not_closed(self) -> None:
+        transport = create_sync_transport()
+        with SyncEHRBaseClient(transport=transport):
+            pass
+        with SyncEHRBaseClient(transport=transport) as client:
+            assert client.client is not None
+        transport.close()
+
+
+class TestBlockingOperations:
+    async def test_usable_inside_event_loop(self) -> None:
+        client = _client(lambda request: httpx.Response(200, json={"ehr_id": {"value": EHR_ID}}))
+        assert isinstance(client.client, httpx.Client)
+        assert client.get_ehr(EHR_ID).ehr_id == EHR_ID
+
+    def test_transport_error_reaches_operation(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        client = _client(handler)
+        assert not client.health_check()
+        with pytest.raises(httpx.ConnectError):
+            client.get_ehr(EHR_ID)
+
+    def test_update_template_falls_back_to_admin_delete_and_upload(self) -> None:
+        template_xml = (
+            '<template xmlns="http://schemas.openehr.org/v1">'
+            "<template_id><value>t</value></template_id></template>"
+        )
+        requests: list[tuple[str, str, str | None]] = []
+        responses = iter([httpx.Response(405), httpx.Response(405), httpx.Response(204)])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(
+                (request.method, request.url.path, request.headers.get("Authorization"))
+            )
+            return next(responses, httpx.Response(201))
+
+        config = EHRBaseConfig(base_url=BASE, admin_username="admin", admin_password="secret")
+        with SyncEHRBaseClient(config=config, transport=httpx.MockTransport(handler)) as client:
+            assert client.update_template("t", template_xml).template_id == "t"
+
+        assert [(method, path) for method, path, _ in requests] == [
+            ("PUT", "/ehrbase/rest/openehr/v1/definition/template/adl1.4/t"),
+            ("DELETE", "/ehrbase/rest/openehr/v1/definition/template/adl1.4/t"),
+            ("DELETE", "/ehrbase/rest/admin/template/t"),
+            ("POST", "/ehrbase/rest/openehr/v1/definition/template/adl1.4"),
+        ]
+        assert requests[1][2] is None
+        assert requests[2][2] is not None and requests[2][2].startswith("Basic ")
+
+
+class TestContributionsBatched:
+    def test_ordered_per_ehr_and_skips_after_failure(self) -> None:
+        lock = threading.Lock()
+        committed: dict[str, list[list[int]]] = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            ehr_id = request.url.path.split("/")[-2]
+            numbers = [v["data"]["n"] for v in json.loads(request.content)["versions"]]
+            with lock:
+                if ehr_id == "bad" and committed.get(ehr_id):
+                    return httpx.Response(422, json={"message": "invalid version"})
+                committed.setdefault(ehr_id, []).append(numbers)
+            return httpx.Response(201, json={"uid": {"value": f"c-{ehr_id}"}})
+
+        changes = [
+            ContributionChange(ehr_id, composition={"n": i})
+            for i in range(6)
+            for ehr_id in ("a", "b", "bad")
+        ]
+        upload = _client(handler).create_contributions_batched(
+            changes, max_versions=2, max_concurrency=3
+        )
+        results = list(upload)
+
+        assert committed == {
+            "a": [[0, 1], [2, 3], [4, 5]],
+            "b": [[0, 1], [2, 3], [4, 5]],
+            "bad": [[0, 1]],
+        }
+        bad = sorted((r for r in results if r.chunk.ehr_id == "bad"), key=lambda r: r.index)
+        assert [(r.ok, r.skipped) for r in bad] == [(True, False), (False, False), (False, True)]
+        assert isinstance(bad[1].error, ValidationError)
+        assert upload.stats.succeeded == 7
+        assert upload.stats.skipped == 1
+        assert upload.stats.versions_committed == 14
@@ -21,6 +21,7 @@ from oehrpy.client.ehrbase import (
     TemplateResponse,
     ValidationError,
 )
+from oehrpy.client.template_cache import CachedWebTemplate
 
 SAMPLE_OPT_XML = """\
 <?xml version="1.0" encoding="UTF-8"?>
@@ -240,8 +241,8 @@ class TestDeleteTemplate:
     @pytest.mark.asyncio()
     async def test_cache_invalidation(self, ehrbase_client: EHRBaseClient) -> None:
         """Successful delete clears web template cache for that template."""
-        ehrbase_client._web_template_cache["Test Template.v1"] = {"tree": {}}
-        ehrbase_client._web_template_cache["Other Template"] = {"tree": {}}
+        ehrbase_client.web_template_cache.set("Test Template.v1", CachedWebTemplate({"tree": {}}))
+        ehrbase_client.web_template_cache.set("Other Template", CachedWebTemplate({"tree": {}}))
 
         ehrbase_client._client.delete = AsyncMock(
             return_value=_mock_response(204),
@@ -249,8 +250,8 @@ class TestDeleteTemplate:
 
         await ehrbase_client.delete_template("Test Template.v1")
 
-        assert "Test Template.v1" not in ehrbase_client._web_template_cache
-        assert "Other Template" in ehrbase_client._web_template_cache
+        assert "Test Template.v1" not in ehrbase_client.web_template_cache
+        assert "Other Template" in ehrbase_client.web_template_cache
 
 
 # --- update_template ---
@@ -390,7 +391,7 @@ class TestUpdateTemplate:
     @pytest.mark.asyncio()
     async def test_cache_invalidation_on_put(self, ehrbase_client: EHRBaseClient) -> None:
         """Successful PUT update clears web template cache."""
-        ehrbase_client._web_template_cache["Test Template.v1"] = {"tree": {}}
+        ehrbase_client.web_template_cache.set("Test Template.v1", CachedWebTemplate({"tree": {}}))
 
         ehrbase_client._client.put = AsyncMock(
             return_value=_mock_response(204),
@@ -398,12 +399,12 @@ class TestUpdateTemplate:
 
         await ehrbase_client.update_template("Test Template.v1", SAMPLE_OPT_XML)
 
-        assert "Test Template.v1" not in ehrbase_client._web_template_cache
+        assert "Test Template.v1" not in ehrbase_client.web_template_cache
 
     @pytest.mark.asyncio()
     async def test_cache_invalidation_on_fallback(self, ehrbase_client: EHRBaseClient) -> None:
         """Successful fallback update clears web template cache."""
-        ehrbase_client._web_template_cache["Test Template.v1"] = {"tree": {}}
+        ehrbase_client.web_template_cache.set("Test Template.v1", CachedWebTemplate({"tree": {}}))
 
         ehrbase_client._client.put = AsyncMock(
             return_value=_mock_response(405, text="Method Not Allowed"),
@@ -417,7 +418,7 @@ class TestUpdateTemplate:
 
         await ehrbase_client.update_template("Test Template.v1", SAMPLE_OPT_XML)
 
-        assert "Test Template.v1" not in ehrbase_client._web_template_cache
+        assert "Test Template.v1" not in ehrbase_client.web_template_cache
 
 
 # --- CDRType ---
@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
+import json
+import pickle
+import random
+from pathlib import Path
 from typing import Any
 
 import pytest
 
 from oehrpy.validation import (
     FlatValidator,
+    ValidationIndex,
+    compile_index,
     enumerate_valid_paths,
     parse_web_template,
+    validate_composition,
+    validate_with_index,
 )
-from oehrpy.validation.platforms import get_dialect
-from oehrpy.validation.suggestions import suggest_path, suggest_segment
+from oehrpy.validation.platforms import PlatformType, get_dialect
+from oehrpy.validation.suggestions import PathSuggester, suggest_path, suggest_segment
 
 # ─── Fixtures ───────────────────────────────────────────────────────
 
@@ -416,6 +424,81 @@ class TestSuggestions:
         assert "causative_agent" in suggestions
 
 
+class TestPathSuggester:
+    """Tests for the trigram suggestion index."""
+
+    PATHS = [
+        "vitals/blood_pressure/systolic|magnitude",
+        "vitals/blood_pressure/systolic|unit",
+        "vitals/blood_pressure/diastolic|magnitude",
+        "vitals/blood_pressure/diastolic|unit",
+        "vitals/body_temperature/temperature|magnitude",
+        "vitals/body_temperature/temperature|unit",
+        "vitals/pulse/rate|magnitude",
+        "vitals/pulse/rate|unit",
+    ]
+
+    @pytest.mark.parametrize(
+        "invalid",
+        [
+            "vitals/blood_pressure/systolc|magnitude",
+            "vitals/blod_pressure/diastolic|unit",
+            "vitals/body_temperature/temprature|magnitude",
+            "vitals/pulse/rate|magnitdue",
+        ],
+    )
+    def test_matches_difflib(self, invalid: str) -> None:
+        suggester = PathSuggester(self.PATHS)
+        assert suggester.suggest(invalid) == suggest_path(invalid, self.PATHS)
+
+    @pytest.mark.parametrize("platform", ["ehrbase", "better"])
+    def test_matches_difflib_on_repository_template(self, platform: PlatformType) -> None:
+        path = Path(__file__).parent.parent / "web_template.json"
+        web_template = json.loads(path.read_text(encoding="utf-8"))
+        valid_paths = FlatValidator.from_web_template(web_template, platform=platform).valid_paths
+        suggester = PathSuggester(valid_paths)
+        rng = random.Random(0)
+
+        # difflib takes tens of milliseconds per key, so check a sample
+        for valid in rng.sample(valid_paths, 50):
+            # Delete, insert or replace one character
+            i = rng.randrange(len(valid))
+            char = rng.choice("abcdefghijklmnopqrstuvwxyz_:/|0")
+            key = rng.choice(
+                [
+                    valid[:i] + valid[i + 1 :],
+                    valid[:i] + char + valid[i:],
+                    valid[:i] + char + valid[i + 1 :],
+                ]
+            )
+            assert suggester.suggest(key) == suggest_path(key, valid_paths), key
+
+    def test_no_match(self) -> None:
+        assert PathSuggester(self.PATHS).suggest("zzz/qqq") == []
+
+    def test_cached_results_are_copies(self) -> None:
+        suggester = PathSuggester(self.PATHS)
+        first = suggester.suggest("vitals/pulse/rat|unit")
+        assert first[0] == "vitals/pulse/rate|unit"
+        first.append("mutated")
+        assert suggester.suggest("vitals/pulse/rat|unit") == first[:-1]
+
+    def test_only_common_trigrams_matches_difflib(self) -> None:
+        suggester = PathSuggester(self.PATHS, max_frequency=0.0)
+        invalid = "vitals/pulse/rate|unitt"
+        assert suggester.suggest(invalid) == suggest_path(invalid, self.PATHS)
+
+    def test_used_by_validator(self) -> None:
+        validator = FlatValidator.from_web_template(_make_web_template())
+        flat = _make_valid_flat()
+        flat["adverse_reaction_lst/adverse_reaction/comment|value"] = "x"
+
+        (error,) = validator.validate(flat).errors
+
+        assert error.suggestion == "adverse_reaction_list/adverse_reaction/comment|value"
+        assert "suggester" in vars(validator.index)
+
+
 # ─── Platform Dialects ───────────────────────────────────────────────
 
 
@@ -597,6 +680,262 @@ class TestCtxPathValidation:
         assert result.info == []
 
 
+class TestValidationIndex:
+    """Tests for the compiled, cached validation index."""
+
+    def test_compiled_once_per_platform(self) -> None:
+        parsed = parse_web_template(_make_web_template())
+        index = compile_index(parsed, "ehrbase")
+
+        assert compile_index(parsed, "ehrbase") is index
+        assert compile_index(parsed, "better") is not index
+        assert FlatValidator(parsed).index is index
+        assert list(index.valid_paths) == enumerate_valid_paths(parsed, "ehrbase")
+        context = index.find("adverse_reaction_list/context")
+        assert context is not None
+        assert list(context.children) == ["start_time", "setting"]
+        temperature = index.find("adverse_reaction_list/adverse_reaction/temperature")
+        assert temperature is not None
+        assert temperature.rm_type == "DV_QUANTITY"
+
+    def test_validate_composition_uses_cached_index(self) -> None:
+        parsed = parse_web_template(_make_web_template())
+        flat = _make_valid_flat()
+        flat["adverse_reaction_list/adverse_reaction/temperature|unit"] = "Cel"
+
+        first = validate_composition(flat, parsed)
+        assert parsed._indexes["ehrbase"].valid_paths
+        assert validate_composition(flat, parsed) == first
+        assert first.is_valid
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        wt = _make_web_template()
+        wt["tree"]["children"][5]["children"][0]["originalName"] = "Substance/Agent"
+        validator = FlatValidator.from_web_template(wt, platform="better")
+        validator.save(tmp_path / "template.idx")
+
+        loaded = FlatValidator.load(tmp_path / "template.idx")
+
+        flat = _make_valid_flat()
+        flat["adverse_reaction_list/adverse_reaction/substance|value"] = "Penicillin"
+        flat["adverse_reaction_list/adverse_reaction/comment|code"] = "x"
+        assert loaded.platform == "better"
+        assert loaded.template_id == validator.template_id
+        assert loaded.index == validator.index
+        assert loaded.validate(flat) == validator.validate(flat)
+
+    def test_pickle_leaves_out_suggester(self) -> None:
+        validator = FlatValidator.from_web_template(_make_web_template())
+        flat = _make_valid_flat()
+        flat["adverse_reaction_lst/adverse_reaction/comment|value"] = "x"
+        expected = validator.validate(flat)
+        assert "suggester" in vars(validator.index)
+
+        copy = pickle.loads(pickle.dumps(validator.index))
+
+        assert "suggester" not in vars(copy)
+        assert copy == validator.index
+        assert validate_with_index(flat, copy) == expected
+
+    def test_load_rejects_other_pickles(self, tmp_path: Path) -> None:
+        path = tmp_path / "other.idx"
+        path.write_bytes(pickle.dumps({"not": "an index"}))
+        with pytest.raises(ValueError, match="ValidationIndex"):
+            ValidationIndex.load(path)
+
+    def test_requires_template_or_index(self) -> None:
+        with pytest.raises(ValueError, match="ValidationIndex"):
+            FlatValidator()
+
+
+class TestSegmentTrie:
+    """Tests for diagnosing unknown keys with one descent of the segment trie."""
+
+    def test_match_stops_at_first_failing_segment(self) -> None:
+        index = compile_index(parse_web_template(_make_web_template()))
+
+        match = index.match("adverse_reaction_list/adverse_reaction:1/statuss:0/x|code")
+
+        assert [node.id for node in match.nodes] == ["adverse_reaction_list", "adverse_reaction"]
+        assert match.failing_segment == 2
+        assert match.node is None
+        assert match.indexed
+        assert match.suffix == "|code"
+        assert match.stripped == "adverse_reaction_list/adverse_reaction/statuss/x|code"
+
+    def test_match_of_known_node(self) -> None:
+        index = compile_index(parse_web_template(_make_web_template()))
+
+        match = index.match("adverse_reaction_list/adverse_reaction/status|value")
+
+        assert match.failing_segment is None
+        assert match.node is not None
+        assert match.node.rm_type == "DV_CODED_TEXT"
+        assert match.parent is match.nodes[1]
+        assert not match.indexed
+
+    def test_inner_segment_typo_suggests_existing_paths(self) -> None:
+        validator = FlatValidator.from_web_template(_make_web_template())
+        flat = _make_valid_flat()
+        key = "adverse_reaction_list/adverse_reactio/status|code"
+        flat[key] = "x"
+
+        (error,) = validator.validate(flat).errors
+
+        assert error.suggestion == "adverse_reaction_list/adverse_reaction/status|code"
+        assert error.valid_alternatives == [
+            "adverse_reaction_list/adverse_reaction/status|code",
+            "adverse_reaction_list/adverse_reaction/status",
+            "adverse_reaction_list/adverse_reaction/status|value",
+        ]
+        assert error.valid_alternatives == suggest_path(key, validator.valid_paths)
+
+    def test_index_on_suffix_is_index_mismatch(self) -> None:
+        validator = FlatValidator.from_web_template(_make_web_template())
+        flat = _make_valid_flat()
+        flat["adverse_reaction_list/adverse_reaction/temperature|unit:0"] = "Cel"
+
+        (error,) = validator.validate(flat).errors
+
+        assert error.error_type == "index_mismatch"
+        assert error.suggestion == "adverse_reaction_list/adverse_reaction/temperature|unit"
+
+    def test_first_renamed_node_in_template_order_wins(self) -> None:
+        wt = _make_web_template()
+        children = wt["tree"]["children"][5]["children"]
+        children[0]["originalName"] = "Substance"
+        children[1]["originalName"] = "Agent"
+        validator = FlatValidator.from_web_template(wt)
+        flat = _make_valid_flat()
+        flat["adverse_reaction_list/adverse_reaction/agent/substance|value"] = "x"
+
+        (error,) = validator.validate(flat).errors
+
+        assert '"Substance" is now "causative_agent"' in error.message
+        assert (
+            error.suggestion == "adverse_reaction_list/adverse_reaction/agent/causative_agent|value"
+        )
+
+
+class TestValidateMany:
+    """Tests for batch validation."""
+
+    def _compositions(self, count: int) -> list[dict[str, Any]]:
+        compositions = []
+        for i in range(count):
+            flat = _make_valid_flat()
+            if i % 3 == 0:
+                flat[f"adverse_reaction_list/adverse_reaction:{i}/comment|code"] = "x"
+            if i % 5 == 0:
+                del flat["adverse_reaction_list/composer|name"]
+            compositions.append(flat)
+        return compositions
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_results_in_order_with_stats(self, workers: int) -> None:
+        validator = FlatValidator.from_web_template(_make_web_template())
+        compositions = self._compositions(30)
+
+        batch = validator.validate_many(iter(compositions), workers=workers, chunksize=4)
+        results = list(batch)
+
+        assert results == [validator.validate(c) for c in compositions]
+        assert batch.stats.validated == 30
+        assert batch.stats.invalid == 10
+        assert batch.stats.errors == {"adverse_reaction_list/adverse_reaction:*/comment|code": 10}
+        assert batch.stats.error_types == {"wrong_suffix": 10}
+        assert batch.stats.warnings == {"adverse_reaction_list/composer|name": 6}
+
+    def test_iterated_once(self) -> None:
+        batch = FlatValidator.from_web_template(_make_web_template()).validate_many([])
+        assert list(batch) == []
+        with pytest.raises(RuntimeError, match="once"):
+            iter(batch)
+
+    def test_invalid_arguments(self) -> None:
+        validator = FlatValidator.from_web_template(_make_web_template())
+        with pytest.raises(ValueError, match="workers"):
+            validator.validate_many([], workers=0)
+
+
+class TestValidationSession:
+    """Tests for incremental validation of an edited composition."""
+
+    def test_initial_result_matches_validate(self) -> None:
+        validator = FlatValidator.from_web_template(_make_web_template())
+        flat = _make_valid_flat()
+        flat["adverse_reaction_list/adverse_reaction/nonexistent|value"] = "x"
+
+        session = validator.session(flat)
+
+        assert session.result == validator.validate(flat)
+        assert session.paths == list(flat)
+
+    def test_added_and_removed_errors(self) -> None:
+        validator = FlatValidator.from_web_template(_make_web_template())
+        flat = _make_valid_flat()
+        session = validator.session(flat)
+        bad = "adverse_reaction_list/adverse_reaction/statuss|code"
+
+        diff = session.update(added=[bad])
+
+        flat[bad] = "x"
+        assert [e.path for e in diff.added_errors] == [bad]
+        assert not diff.removed_errors
+        assert session.result == validator.validate(flat)
+
+        diff = session.update(removed=[bad])
+
+        assert diff.removed_errors == [validator.validate(flat).errors[0]]
+        assert session.result.is_valid
+
+    def test_required_field_warnings(self) -> None:
+        validator = FlatValidator.from_web_template(_make_web_template())
+        flat = _make_valid_flat()
+        session = validator.session(flat)
+        composer = "adverse_reaction_list/composer|name"
+
+        diff = session.update(removed=[composer])
+
+        (warning,) = diff.added_warnings
+        assert warning.error_type == "missing_required"
+        assert not diff.added_errors
+
+        diff = session.update(added=[composer])
+
+        assert diff.removed_warnings == [warning]
+        assert session.result.warnings == []
+
+    def test_ctx_keys(self) -> None:
+        validator = FlatValidator.from_web_template(_make_web_template())
+        session = validator.session(_make_valid_flat())
+
+        diff = session.update(added=["ctx/language", "ctx/nonsense"])
+
+        assert [w.path for w in diff.added_warnings] == ["ctx/nonsense"]
+        assert len(session.result.info) == 1
+
+        session.update(removed=["ctx/language", "ctx/nonsense"])
+
+        assert session.result.info == []
+        assert session.result.warnings == []
+
+    def test_changed_and_repeated_paths_keep_diagnoses(self) -> None:
+        validator = FlatValidator.from_web_template(_make_web_template())
+        flat = _make_valid_flat()
+        flat["adverse_reaction_list/adverse_reaction/nonexistent|value"] = "x"
+        session = validator.session(flat)
+
+        diff = session.update(
+            added=["adverse_reaction_list/category|code"],
+            removed=["adverse_reaction_list/unknown"],
+            changed=list(flat),
+        )
+
+        assert diff.is_empty
+        assert session.result == validator.validate(flat)
+
+
 # ─── Integration-style Tests ─────────────────────────────────────────
 
 
@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+import os
+import pickle
+import time
+from pathlib import Path
 from typing import Any
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import httpx
 import pytest
 
 from oehrpy.client.ehrbase import EHRBaseClient, EHRBaseConfig
+from oehrpy.client.template_cache import (
+    CachedWebTemplate,
+    DiskWebTemplateCache,
+    MemoryWebTemplateCache,
+)
+from oehrpy.validation import FlatValidator
 
 
 def _fake_web_template(template_id: str = "test-template") -> dict[str, Any]:
@@ -26,6 +36,17 @@ def _fake_web_template(template_id: str = "test-template") -> dict[str, Any]:
     }
 
 
+def _wt_response(
+    status_code: int = 200, json_data: dict[str, Any] | None = None, etag: str | None = None
+) -> httpx.Response:
+    """Build a fake Web Template response."""
+    resp = MagicMock(spec=httpx.Response)
+    resp.status_code = status_code
+    resp.json.return_value = json_data
+    resp.headers = httpx.Headers({"ETag": etag} if etag else {})
+    return resp
+
+
 @pytest.fixture()
 def client() -> EHRBaseClient:
     config = EHRBaseConfig(base_url="http://localhost:8080/ehrbase")
@@ -36,14 +57,13 @@ class TestWebTemplateCaching:
     """Tests for in-memory web template caching (ADR-0005)."""
 
     def test_cache_starts_empty(self, client: EHRBaseClient) -> None:
-        assert client._web_template_cache == {}
+        assert isinstance(client.web_template_cache, MemoryWebTemplateCache)
+        assert len(client.web_template_cache) == 0
 
     @pytest.mark.asyncio()
     async def test_get_web_template_caches_result(self, client: EHRBaseClient) -> None:
         wt = _fake_web_template()
-        mock_response = AsyncMock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.json.return_value = wt
+        mock_response = _wt_response(200, wt)
 
         client._client = AsyncMock(spec=httpx.AsyncClient)
         client._client.get = AsyncMock(return_value=mock_response)
@@ -61,9 +81,7 @@ class TestWebTemplateCaching:
     @pytest.mark.asyncio()
     async def test_get_web_template_bypass_cache(self, client: EHRBaseClient) -> None:
         wt = _fake_web_template()
-        mock_response = AsyncMock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.json.return_value = wt
+        mock_response = _wt_response(200, wt)
 
         client._client = AsyncMock(spec=httpx.AsyncClient)
         client._client.get = AsyncMock(return_value=mock_response)
@@ -78,9 +96,7 @@ class TestWebTemplateCaching:
     @pytest.mark.asyncio()
     async def test_get_web_template_sends_accept_header(self, client: EHRBaseClient) -> None:
         wt = _fake_web_template()
-        mock_response = AsyncMock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.json.return_value = wt
+        mock_response = _wt_response(200, wt)
 
         client._client = AsyncMock(spec=httpx.AsyncClient)
         client._client.get = AsyncMock(return_value=mock_response)
@@ -91,20 +107,180 @@ class TestWebTemplateCaching:
         assert call_kwargs.kwargs["headers"]["Accept"] == "application/openehr.wt+json"
 
     def test_clear_cache_all(self, client: EHRBaseClient) -> None:
-        client._web_template_cache["a"] = {"tree": {}}
-        client._web_template_cache["b"] = {"tree": {}}
+        client.web_template_cache.set("a", CachedWebTemplate({"tree": {}}))
+        client.web_template_cache.set("b", CachedWebTemplate({"tree": {}}))
 
         client.clear_web_template_cache()
-        assert client._web_template_cache == {}
+        assert len(client.web_template_cache) == 0
 
     def test_clear_cache_specific(self, client: EHRBaseClient) -> None:
-        client._web_template_cache["a"] = {"tree": {}}
-        client._web_template_cache["b"] = {"tree": {}}
+        client.web_template_cache.set("a", CachedWebTemplate({"tree": {}}))
+        client.web_template_cache.set("b", CachedWebTemplate({"tree": {}}))
 
         client.clear_web_template_cache("a")
-        assert "a" not in client._web_template_cache
-        assert "b" in client._web_template_cache
+        assert "a" not in client.web_template_cache
+        assert "b" in client.web_template_cache
 
     def test_clear_cache_nonexistent_key_is_noop(self, client: EHRBaseClient) -> None:
         client.clear_web_template_cache("nonexistent")
-        assert client._web_template_cache == {}
+        assert len(client.web_template_cache) == 0
+
+
+class TestRevalidation:
+    """Tests for TTL expiry and ETag revalidation."""
+
+    @pytest.mark.asyncio()
+    async def test_stale_entry_revalidated_with_etag(self) -> None:
+        cache = MemoryWebTemplateCache(ttl=60)
+        client = EHRBaseClient(web_template_cache=cache)
+        client._client = AsyncMock(spec=httpx.AsyncClient)
+        wt = _fake_web_template()
+        client._client.get = AsyncMock(return_value=_wt_response(200, wt, etag='"v1"'))
+
+        await client.get_web_template("test-template")
+        first = cache.get("test-template")
+        assert first is not None
+        first.stored_at -= 120  # expire it
+
+        client._client.get = AsyncMock(return_value=_wt_response(304))
+        result = await client.get_web_template("test-template")
+
+        assert result is wt
+        headers = client._client.get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        entry = cache.get("test-template")
+        assert entry is not None
+        assert entry.is_fresh(cache.ttl)
+        assert entry.etag == '"v1"'
+
+    @pytest.mark.asyncio()
+    async def test_changed_template_replaces_entry(self) -> None:
+        cache = MemoryWebTemplateCache(ttl=0)
+        client = EHRBaseClient(web_template_cache=cache)
+        client._client = AsyncMock(spec=httpx.AsyncClient)
+        client._client.get = AsyncMock(
+            return_value=_wt_response(200, _fake_web_template("old"), etag='"v1"')
+        )
+        await client.get_web_template("t")
+
+        new = _fake_web_template("new")
+        client._client.get = AsyncMock(return_value=_wt_response(200, new, etag='"v2"'))
+
+        assert await client.get_web_template("t") == new
+        entry = cache.get("t")
+        assert entry is not None
+        assert entry.etag == '"v2"'
+
+    @pytest.mark.asyncio()
+    async def test_fresh_entry_not_revalidated(self) -> None:
+        client = EHRBaseClient(web_template_cache=MemoryWebTemplateCache(ttl=3600))
+        client._client = AsyncMock(spec=httpx.AsyncClient)
+        client._client.get = AsyncMock(return_value=_wt_response(200, _fake_web_template()))
+
+        await client.get_web_template("t")
+        await client.get_web_template("t")
+        assert client._client.get.call_count == 1
+
+    @pytest.mark.asyncio()
+    async def test_parsed_template_cached(self, client: EHRBaseClient) -> None:
+        client._client = AsyncMock(spec=httpx.AsyncClient)
+        client._client.get = AsyncMock(return_value=_wt_response(200, _fake_web_template()))
+
+        parsed = await client.get_parsed_web_template("test-template")
+        assert parsed.tree_id == "test_composition"
+        assert await client.get_parsed_web_template("test-template") is parsed
+
+        validator = await FlatValidator.from_ehrbase(client, "test-template")
+        assert validator.template_id == "test-template"
+        assert client._client.get.call_count == 1
+
+
+class TestMemoryWebTemplateCache:
+    def test_lru_eviction(self) -> None:
+        cache = MemoryWebTemplateCache(max_size=2)
+        cache.set("a", CachedWebTemplate({}))
+        cache.set("b", CachedWebTemplate({}))
+        cache.get("a")
+        cache.set("c", CachedWebTemplate({}))
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_invalid_size(self) -> None:
+        with pytest.raises(ValueError, match="max_size"):
+            MemoryWebTemplateCache(max_size=0)
+
+    def test_freshness(self) -> None:
+        entry = CachedWebTemplate({}, stored_at=time.time() - 10)
+        assert entry.is_fresh(None)
+        assert entry.is_fresh(60)
+        assert not entry.is_fresh(5)
+
+
+class TestDiskWebTemplateCache:
+    def test_round_trip_includes_parsed(self, tmp_path: Path) -> None:
+        DiskWebTemplateCache(tmp_path).set("t", CachedWebTemplate(_fake_web_template(), "e1"))
+
+        # A second instance, as in another process
+        entry = DiskWebTemplateCache(tmp_path).get("t")
+        assert entry is not None
+        assert entry.web_template == _fake_web_template()
+        assert entry.etag == "e1"
+        assert entry._parsed is not None
+        assert entry.parsed.tree_id == "test_composition"
+
+    def test_reuses_loaded_entry_until_file_changes(self, tmp_path: Path) -> None:
+        writer = DiskWebTemplateCache(tmp_path)
+        reader = DiskWebTemplateCache(tmp_path)
+        writer.set("t", CachedWebTemplate(_fake_web_template("one")))
+
+        first = reader.get("t")
+        assert reader.get("t") is first
+
+        writer.set("t", CachedWebTemplate(_fake_web_template("two")))
+        path = next(tmp_path.glob("*.wt.pickle"))
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        second = reader.get("t")
+        assert second is not None
+        assert second.web_template["templateId"] == "two"
+
+    def test_missing_and_corrupt(self, tmp_path: Path) -> None:
+        cache = DiskWebTemplateCache(tmp_path)
+        assert cache.get("missing") is None
+
+        cache.set("t", CachedWebTemplate(_fake_web_template()))
+        path = next(tmp_path.glob("*.wt.pickle"))
+        path.write_bytes(b"not a pickle")
+        assert DiskWebTemplateCache(tmp_path).get("t") is None
+
+        path.write_bytes(pickle.dumps({"not": "an entry"}))
+        assert DiskWebTemplateCache(tmp_path).get("t") is None
+
+    def test_delete_and_clear(self, tmp_path: Path) -> None:
+        cache = DiskWebTemplateCache(tmp_path / "nested")
+        cache.set("a", CachedWebTemplate(_fake_web_template()))
+        cache.set("b", CachedWebTemplate(_fake_web_template()))
+
+        cache.delete("a")
+        cache.delete("a")
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+
+        cache.clear()
+        assert cache.get("b") is None
+        assert list((tmp_path / "nested").iterdir()) == []
+
+    @pytest.mark.asyncio()
+    async def test_shared_between_clients(self, tmp_path: Path) -> None:
+        first = EHRBaseClient(web_template_cache=DiskWebTemplateCache(tmp_path))
+        first._client = AsyncMock(spec=httpx.AsyncClient)
+        first._client.get = AsyncMock(return_value=_wt_response(200, _fake_web_template()))
+        await first.get_web_template("t")
+
+        second = EHRBaseClient(web_template_cache=DiskWebTemplateCache(tmp_path))
+        second._client = AsyncMock(spec=httpx.AsyncClient)
+        parsed = await second.get_parsed_web_template("t")
+
+        assert parsed.template_id == "test-template"
+        second._client.get.assert_not_called()